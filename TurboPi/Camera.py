@@ -5,6 +5,7 @@ import cv2
 import time
 import threading
 import numpy as np
+import HiwonderSDK.Undistort as Undistort
 from CameraCalibration.CalibrationConfig import *
 
 # 调用USB摄像头/Call USB camera
@@ -13,22 +14,26 @@ if sys.version_info.major == 2:
     print('Please run this program with python3!')
     sys.exit(0)
 
+# 重新打开摄像头失败后的等待时间（秒），每次失败加倍，最多 RETRY_MAX
+# Wait after a failed reopen (seconds), doubled on every failure up to RETRY_MAX
+RETRY_MIN = 0.5
+RETRY_MAX = 8.0
+
 class Camera:
     def __init__(self, resolution=(640, 480)):
         self.cap = None
+        self.retry_delay = RETRY_MIN
         self.width = resolution[0]
         self.height = resolution[1]
         self.frame = None
         self.opened = False
         
-        #加载参数 Load parameter 
-        self.param_data = np.load(calibration_param_path + '.npz')
-        #获取参数 obtain parameter 
-        dim = tuple(self.param_data['dim_array'])
-        k = np.array(self.param_data['k_array'].tolist())
-        d = np.array(self.param_data['d_array'].tolist())
-        p = cv2.fisheye.estimateNewCameraMatrixForUndistortRectify(k, d, dim ,None).copy()
-        self.map1, self.map2 = cv2.fisheye.initUndistortRectifyMap(k, d, np.eye(3), p, dim, cv2.CV_16SC2)
+        self.correction = False
+        
+        #矫正映射表：按标定文件哈希和分辨率缓存在磁盘上，只在第一次或标定更新后计算
+        #Remap tables: cached on disk by calibration hash and resolution, computed only once per calibration
+        self.undistort = Undistort.UndistortMaps(calibration_param_path + '.npz', resolution)
+        self.map1, self.map2 = self.undistort.map1, self.undistort.map2
         
         self.th = threading.Thread(target=self.camera_task, args=(), daemon=True)
         self.th.start()
@@ -36,14 +41,39 @@ class Camera:
     def camera_open(self, correction=False):
         try:
             self.cap = cv2.VideoCapture(-1)
-            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc('Y', 'U', 'Y', 'V'))
-            self.cap.set(cv2.CAP_PROP_FPS, 30)
-            self.cap.set(cv2.CAP_PROP_SATURATION, 40)
+            self.camera_config(self.cap)
+            self.retry_delay = RETRY_MIN
             self.correction = correction
             self.opened = True
         except Exception as e:
             print('打开摄像头失败 Fail to open camera:', e)
 
+    def undistort_roi(self, img, roi):
+        # 只矫正画面中的一个区域 (x, y, 宽, 高)，img 为未矫正的画面（camera_open(correction=False)）
+        # Correct only one region (x, y, w, h) of an uncorrected frame (camera_open(correction=False))
+        return self.undistort.remap_roi(img, roi)
+
+    def camera_config(self, cap):
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc('Y', 'U', 'Y', 'V'))
+        cap.set(cv2.CAP_PROP_FPS, 30)
+        cap.set(cv2.CAP_PROP_SATURATION, 40)
+
+    def camera_reopen(self):
+        # 重新打开摄像头，失败后按退避时间等待，避免空转占满CPU
+        # Reopen the camera, backing off after a failure instead of spinning
+        if self.cap is not None:
+            self.cap.release()
+        cap = cv2.VideoCapture(-1)
+        ret, _ = cap.read()
+        if ret:
+            self.camera_config(cap)
+            self.cap = cap
+            self.retry_delay = RETRY_MIN
+        else:
+            cap.release()
+            time.sleep(self.retry_delay)
+            self.retry_delay = min(self.retry_delay * 2, RETRY_MAX)
+
     def camera_close(self):
         try:
             self.opened = False
@@ -58,30 +88,22 @@ class Camera:
     def camera_task(self):
         while True:
             try:
-                if self.opened and self.cap.isOpened():
+                if self.opened and self.cap is not None and self.cap.isOpened():
                     ret, frame_tmp = self.cap.read()
                     if ret:
                         frame_resize = cv2.resize(frame_tmp, (self.width, self.height), interpolation=cv2.INTER_NEAREST)
                         
                         if self.correction:
-                            self.frame = cv2.remap(frame_resize, self.map1, self.map2, interpolation=cv2.INTER_LINEAR, borderMode=cv2.BORDER_CONSTANT)
+                            self.frame = self.undistort.remap(frame_resize)
                         else:
                             self.frame = frame_resize
                             
                         ret = False
                     else:
                         self.frame = None
-                        self.cap.release()
-                        cap = cv2.VideoCapture(-1)
-                        ret, _ = cap.read()
-                        if ret:
-                            self.cap = cap
+                        self.camera_reopen()
                 elif self.opened:
-                    self.cap.release()
-                    cap = cv2.VideoCapture(-1)
-                    ret, _ = cap.read()
-                    if ret:
-                        self.cap = cap              
+                    self.camera_reopen()
                 else:
                     time.sleep(0.01)
             except Exception as e:
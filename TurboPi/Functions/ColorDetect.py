@@ -10,6 +10,8 @@ import Camera
 import threading
 import numpy as np
 import yaml_handle
+import HiwonderSDK.Blob as Blob
+import HiwonderSDK.ColorModel as ColorModel
 import HiwonderSDK.Board as Board
 
 # 颜色识别 COlor Recognition 
@@ -22,12 +24,12 @@ servo1 = 1500
 servo2 = 1500
 target_color = ('red', 'green', 'blue')
 
-lab_data = None
+color_model = ColorModel.ColorModel(yaml_handle.lab_file_path)  # lab_config.yaml 修改后自动重新加载 Reloaded automatically when lab_config.yaml changes
 servo_data = None
 def load_config():
-    global lab_data, servo_data
+    global servo_data
     
-    lab_data = yaml_handle.get_yaml_data(yaml_handle.lab_file_path)
+    color_model.reload()
     servo_data = yaml_handle.get_yaml_data(yaml_handle.servo_file_path)
 
 # 初始位置  Initial Position 
@@ -131,21 +133,10 @@ def set_rgb(color):
         Board.RGB.setPixelColor(1, Board.PixelColor(0, 0, 0))
         Board.RGB.show()
 
-# 找出面积最大的轮廓 Find the maximum contour 
-# 参数为要比较的轮廓的列表 Parameters are the list of contours to be compared 
-def getAreaMaxContour(contours):
-    contour_area_temp = 0
-    contour_area_max = 0
-    area_max_contour = None
-
-    for c in contours:  # 历遍所有轮廓  loop over the contours
-        contour_area_temp = math.fabs(cv2.contourArea(c))  # 计算轮廓面积 Calculate the contour area 
-        if contour_area_temp > contour_area_max:
-            contour_area_max = contour_area_temp
-            if contour_area_temp > 300:  # 只有在面积大于300时，最大面积的轮廓才是有效的，以过滤干扰   Only when the area is greater than 300, the maximum contour takes effect to filter the interference
-                area_max_contour = c
-
-    return area_max_contour, contour_area_max  # 返回最大的轮廓  Return the maximum contour
+# 找出面积最大的色块 Find the largest blob 
+# 参数为二值掩码，返回该色块的轮廓和面积 Parameter is the binary mask, returns the contour and area of the largest blob 
+def getAreaMaxContour(mask):
+    return Blob.getAreaMaxContour(mask, 300)  # 面积大于300时轮廓才有效 The contour is valid only when the area is greater than 300
 
 # 机器人移动逻辑处理 Robot Movement Processing
 def move():
@@ -220,18 +211,11 @@ def run(img):
     areaMaxContour_max = 0
     if not start_pick_up:
         for i in target_color:
-            if i in lab_data:
-                frame_mask = cv2.inRange(frame_lab,
-                                             (lab_data[i]['min'][0],
-                                              lab_data[i]['min'][1],
-                                              lab_data[i]['min'][2]),
-                                             (lab_data[i]['max'][0],
-                                              lab_data[i]['max'][1],
-                                              lab_data[i]['max'][2]))  #对原图像和掩模进行位运算 Bitwise operation of the original image and mask
+            if i in color_model:
+                frame_mask = color_model.inRange(frame_lab, i)  #对原图像和掩模进行位运算 Bitwise operation of the original image and mask
                 opened = cv2.morphologyEx(frame_mask, cv2.MORPH_OPEN, np.ones((3, 3), np.uint8))  # 开运算 Opening 
                 closed = cv2.morphologyEx(opened, cv2.MORPH_CLOSE, np.ones((3, 3), np.uint8))  # 闭运算 Closing
-                contours = cv2.findContours(closed, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_NONE)[-2]  # 找出轮廓 Find contour
-                areaMaxContour, area_max = getAreaMaxContour(contours)  # 找出最大轮廓 Find the maximum contour
+                areaMaxContour, area_max = getAreaMaxContour(closed)  # 找出最大轮廓 Find the maximum contour
                 if areaMaxContour is not None:
                     if area_max > max_area:  # 找最大面积 Find the maximum area
                         max_area = area_max
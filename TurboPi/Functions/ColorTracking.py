@@ -11,6 +11,8 @@ import argparse
 import threading
 import numpy as np
 import yaml_handle
+import HiwonderSDK.Blob as Blob
+import HiwonderSDK.ColorModel as ColorModel
 import HiwonderSDK.PID as PID
 import HiwonderSDK.Misc as Misc
 import HiwonderSDK.Board as Board
@@ -44,12 +46,12 @@ car_y_pid = PID.PID(P=1.00, I=0.001, D=0.0001)
 servo_x_pid = PID.PID(P=0.06, I=0.0003, D=0.0006)  
 servo_y_pid = PID.PID(P=0.06, I=0.0003, D=0.0006)
 
-lab_data = None
+color_model = ColorModel.ColorModel(yaml_handle.lab_file_path)  # lab_config.yaml 修改后自动重新加载 Reloaded automatically when lab_config.yaml changes
 servo_data = None
 def load_config():
-    global lab_data, servo_data
+    global servo_data
     
-    lab_data = yaml_handle.get_yaml_data(yaml_handle.lab_file_path)
+    color_model.reload()
     servo_data = yaml_handle.get_yaml_data(yaml_handle.servo_file_path)
 
 
@@ -173,19 +175,10 @@ def setVehicleFollowing(state):
         car_stop()
     return (True, ())
 
-# 找出面积最大的轮廓 Find the maximum contour 
-# 参数为要比较的轮廓的列表 Parameters are the list of contours to be compared 
-def getAreaMaxContour(contours):
-    contour_area_temp = 0
-    contour_area_max = 0
-    areaMaxContour = None
-    for c in contours:  # 历遍所有轮廓 Loop over the contours
-        contour_area_temp = math.fabs(cv2.contourArea(c))  # 计算轮廓面积 Calculate the contour area 
-        if contour_area_temp > contour_area_max:
-            contour_area_max = contour_area_temp
-            if contour_area_temp > 300:  # 只有在面积大于300时，最大面积的轮廓才是有效的，以过滤干扰 Only when the area is greater than 300, the maximum contour takes effect to filter the interference
-                areaMaxContour = c
-    return areaMaxContour, contour_area_max  # 返回最大的轮廓 Return the maximum contour
+# 找出面积最大的色块 Find the largest blob 
+# 参数为二值掩码，返回该色块的轮廓和面积 Parameter is the binary mask, returns the contour and area of the largest blob 
+def getAreaMaxContour(mask):
+    return Blob.getAreaMaxContour(mask, 300)  # 面积大于300时轮廓才有效 The contour is valid only when the area is greater than 300
 
 # 机器人移动逻辑处理 Movement Processing
 def move():
@@ -281,18 +274,11 @@ def run(img):
     area_max = 0
     areaMaxContour = 0
     for i in target_color:
-        if i in lab_data:
-            frame_mask = cv2.inRange(frame_lab,
-                                         (lab_data[i]['min'][0],
-                                          lab_data[i]['min'][1],
-                                          lab_data[i]['min'][2]),
-                                         (lab_data[i]['max'][0],
-                                          lab_data[i]['max'][1],
-                                          lab_data[i]['max'][2]))  #对原图像和掩模进行位运算  Bitwise operation of the original 
+        if i in color_model:
+            frame_mask = color_model.inRange(frame_lab, i)  #对原图像和掩模进行位运算  Bitwise operation of the original 
             opened = cv2.morphologyEx(frame_mask, cv2.MORPH_OPEN, np.ones((3, 3), np.uint8))  # 开运算 Opening 
             closed = cv2.morphologyEx(opened, cv2.MORPH_CLOSE, np.ones((3, 3), np.uint8))  # 闭运算 Closing
-            contours = cv2.findContours(closed, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_NONE)[-2]  # 找出轮廓  Find contour
-            areaMaxContour, area_max = getAreaMaxContour(contours)  # 找出最大轮廓 Find the maximum contour
+            areaMaxContour, area_max = getAreaMaxContour(closed)  # 找出最大轮廓 Find the maximum contour
     if area_max > 1000:  # 有找到最大面积 Find the maximum contour
         (center_x, center_y), radius = cv2.minEnclosingCircle(areaMaxContour)  # 获取最小外接圆 Obtain the minimum circumcircle of an object
         color_radius = int(Misc.map(radius, 0, size[0], 0, img_w))
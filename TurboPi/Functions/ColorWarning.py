@@ -10,6 +10,8 @@ import Camera
 import threading
 import numpy as np
 import yaml_handle
+import HiwonderSDK.Blob as Blob
+import HiwonderSDK.ColorModel as ColorModel
 import HiwonderSDK.Board as Board
 
 if sys.version_info.major == 2:
@@ -26,13 +28,13 @@ __isRunning = False
 detect_color = 'None'
 target_color = ('red', 'green', 'blue')
 
-lab_data = None
+color_model = ColorModel.ColorModel(yaml_handle.lab_file_path)  # lab_config.yaml 修改后自动重新加载
 servo_data = None
 def load_config():
-    global lab_data, servo_data
+    global servo_data
     global servo1, servo2
     
-    lab_data = yaml_handle.get_yaml_data(yaml_handle.lab_file_path)
+    color_model.reload()
     servo_data = yaml_handle.get_yaml_data(yaml_handle.servo_file_path)
     servo1 = servo_data['servo1']
     servo2 = servo_data['servo2']
@@ -69,21 +71,10 @@ range_rgb = {
     'white': (255, 255, 255),
 }
 
-# 找出面积最大的轮廓
-# 参数为要比较的轮廓的列表
-def getAreaMaxContour(contours):
-    contour_area_max = 0
-    contour_area_temp = 0
-    area_max_contour = None
-
-    for c in contours:  # 历遍所有轮廓
-        contour_area_temp = math.fabs(cv2.contourArea(c))  # 计算轮廓面积
-        if contour_area_temp > contour_area_max:
-            contour_area_max = contour_area_temp
-            if contour_area_temp > 300:  # 只有在面积大于300时，最大面积的轮廓才是有效的，以过滤干扰
-                area_max_contour = c
-
-    return area_max_contour, contour_area_max  # 返回最大的轮廓
+# 找出面积最大的色块
+# 参数为二值掩码，返回该色块的轮廓和面积
+def getAreaMaxContour(mask):
+    return Blob.getAreaMaxContour(mask, 300)  # 面积大于300时轮廓才有效
    
 
 #设置扩展板的RGB灯颜色使其跟要追踪的颜色一致
@@ -127,18 +118,11 @@ def run(img):
     color_area_max = None
     areaMaxContour_max = 0
     for i in target_color:
-        if i in lab_data:
-            frame_mask = cv2.inRange(frame_lab,
-                                         (lab_data[i]['min'][0],
-                                          lab_data[i]['min'][1],
-                                          lab_data[i]['min'][2]),
-                                         (lab_data[i]['max'][0],
-                                          lab_data[i]['max'][1],
-                                          lab_data[i]['max'][2]))  #对原图像和掩模进行位运算
+        if i in color_model:
+            frame_mask = color_model.inRange(frame_lab, i)  #对原图像和掩模进行位运算
             opened = cv2.morphologyEx(frame_mask, cv2.MORPH_OPEN, np.ones((3, 3), np.uint8))  # 开运算
             closed = cv2.morphologyEx(opened, cv2.MORPH_CLOSE, np.ones((3, 3), np.uint8))  # 闭运算
-            contours = cv2.findContours(closed, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_NONE)[-2]  # 找出轮廓
-            areaMaxContour, area_max = getAreaMaxContour(contours)  # 找出最大轮廓
+            areaMaxContour, area_max = getAreaMaxContour(closed)  # 找出最大轮廓
             if areaMaxContour is not None:
                 if area_max > max_area:  # 找最大面积
                     max_area = area_max
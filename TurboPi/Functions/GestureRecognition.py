@@ -12,6 +12,7 @@ import numpy as np
 import yaml_handle
 import mediapipe as mp
 import HiwonderSDK.Board as Board
+from HiwonderSDK.Gesture import GestureFilter, classify_landmarks
 import HiwonderSDK.mecanum as mecanum
 
 # 手势识别 Gesture Recognition 
@@ -20,7 +21,14 @@ car = mecanum.MecanumChassis()
 mp_hands = mp.solutions.hands
 mp_drawing = mp.solutions.drawing_utils
 mp_drawing_styles = mp.solutions.drawing_styles
-hands = mp_hands.Hands(model_complexity=0,min_detection_confidence=0.5,min_tracking_confidence=0.5)
+hands = None
+
+# 第一次识别时才创建手部模型（导入模块时不加载）  Create the hand model on first use, not at import
+def get_hands():
+    global hands
+    if hands is None:
+        hands = mp_hands.Hands(model_complexity=0,min_detection_confidence=0.5,min_tracking_confidence=0.5)
+    return hands
 
 
 if sys.version_info.major == 2:
@@ -56,6 +64,7 @@ def reset():
     stop_st = False
     gesture_num = None
     results_lock = False
+    gesture_filter.reset()
     servo1 = servo_data['servo1'] - 350
     servo2 = servo_data['servo2']
 
@@ -156,94 +165,13 @@ th.setDaemon(True)
 th.start()
 
 
-def vector_2d_angle(v1, v2):
-    # 求两个向量夹角 calculate the angle bwteen two vectors
-    
-    v1_x = v1[0]
-    v1_y = v1[1]
-    v2_x = v2[0]
-    v2_y = v2[1]
-    try:
-        angle_ = math.degrees(math.acos(
-            (v1_x * v2_x + v1_y * v2_y) / (((v1_x ** 2 + v1_y ** 2) ** 0.5) * ((v2_x ** 2 + v2_y ** 2) ** 0.5))))
-    except:
-        angle_ = 65535.0
-    if angle_ > 180.0:
-        angle_ = 65535.0
-    return angle_
-
-def hand_angle(hand_):
-    # 获取对应的手指相关向量的角度 Obtain the angle of the related vector of corresponding finger
-    
-    angle_list = []
-    # ---------------------------- thumb
-    angle_ = vector_2d_angle(
-        ((int(hand_[0][0]) - int(hand_[2][0])), (int(hand_[0][1]) - int(hand_[2][1]))),
-        ((int(hand_[3][0]) - int(hand_[4][0])), (int(hand_[3][1]) - int(hand_[4][1])))
-    )
-    angle_list.append(angle_)
-    # ---------------------------- index
-    angle_ = vector_2d_angle(
-        ((int(hand_[0][0]) - int(hand_[6][0])), (int(hand_[0][1]) - int(hand_[6][1]))),
-        ((int(hand_[7][0]) - int(hand_[8][0])), (int(hand_[7][1]) - int(hand_[8][1])))
-    )
-    angle_list.append(angle_)
-    # ---------------------------- middle
-    angle_ = vector_2d_angle(
-        ((int(hand_[0][0]) - int(hand_[10][0])), (int(hand_[0][1]) - int(hand_[10][1]))),
-        ((int(hand_[11][0]) - int(hand_[12][0])), (int(hand_[11][1]) - int(hand_[12][1])))
-    )
-    angle_list.append(angle_)
-    # ---------------------------- ring
-    angle_ = vector_2d_angle(
-        ((int(hand_[0][0]) - int(hand_[14][0])), (int(hand_[0][1]) - int(hand_[14][1]))),
-        ((int(hand_[15][0]) - int(hand_[16][0])), (int(hand_[15][1]) - int(hand_[16][1])))
-    )
-    angle_list.append(angle_)
-    # ---------------------------- pink
-    angle_ = vector_2d_angle(
-        ((int(hand_[0][0]) - int(hand_[18][0])), (int(hand_[0][1]) - int(hand_[18][1]))),
-        ((int(hand_[19][0]) - int(hand_[20][0])), (int(hand_[19][1]) - int(hand_[20][1])))
-    )
-    angle_list.append(angle_)
-    return angle_list
-
-def gesture(angle_list):
-    # 用手指相关的角度来定义手势 Define gesture according to the finger angle 
-    
-    gesture_num = 0
-    thr_angle = 65.0
-    thr_angle_s = 49.0
-    thr_angle_thumb = 53.0
-    if 65535.0 not in angle_list:
-        if (angle_list[0] > 5) and (angle_list[1] < thr_angle_s) and (angle_list[2] > thr_angle) and (
-                angle_list[3] > thr_angle) and (angle_list[4] > thr_angle):
-            gesture_num = 1
-        elif (angle_list[0] > thr_angle_thumb) and (angle_list[1] < thr_angle_s) and (angle_list[2] < thr_angle_s) and (
-                angle_list[3] > thr_angle) and (angle_list[4] > thr_angle):
-            gesture_num = 2
-        elif (angle_list[0] > thr_angle_thumb) and (angle_list[1] < thr_angle_s) and (angle_list[2] < thr_angle_s) and (
-                angle_list[3] < thr_angle_s) and (angle_list[4] > thr_angle):
-            gesture_num = 3
-        elif (angle_list[0] > thr_angle_thumb) and (angle_list[1] < thr_angle_s) and (angle_list[2] < thr_angle_s) and (
-                angle_list[3] < thr_angle_s) and (angle_list[4] < thr_angle_s):
-            gesture_num = 4
-        elif (angle_list[0] < thr_angle_s) and (angle_list[1] < thr_angle_s) and (angle_list[2] < thr_angle_s) and (
-                angle_list[3] < thr_angle_s) and (angle_list[4] < thr_angle_s):
-            gesture_num = 5
-        elif (angle_list[0] < thr_angle_s) and (angle_list[1] > thr_angle) and (angle_list[2] > thr_angle) and (
-                angle_list[3] > thr_angle) and (angle_list[4] < thr_angle_s):
-            gesture_num = 6
-
-    return gesture_num
-
 # 机器人图像处理  Image processing
-results_list = []
+# 手势时间平滑：最近5帧中同一手势至少3帧才执行  Temporal smoothing: a gesture needs 3 of the last 5 frames
+gesture_filter = GestureFilter(window=5, min_votes=3)
 def run(img):
     global __isRunning
     global gesture_num
     global results_lock
-    global results_list
     
     if not __isRunning:  # 检测是否开启玩法，没有开启则返回原图像  Detect whether the game is started, if not, the orginal image will be returned
         return img
@@ -255,22 +183,23 @@ def run(img):
     img_copy = img.copy()
     img_h, img_w = img.shape[:2]
     imgRGB = cv2.cvtColor(img_copy, cv2.COLOR_BGR2RGB)
-    results = hands.process(imgRGB)
+    results = get_hands().process(imgRGB)
     
+    gesture_results = 0
     if results.multi_hand_landmarks:
         for hand_landmarks in results.multi_hand_landmarks:
             mp_drawing.draw_landmarks(img, hand_landmarks, mp_hands.HAND_CONNECTIONS)
-            hand_local = [(landmark.x * img_w, landmark.y * img_h) for landmark in hand_landmarks.landmark]
-            if hand_local:
-                angle_list = hand_angle(hand_local)
-                gesture_results = gesture(angle_list)
-                cv2.putText(img, str(gesture_results), (20, 50), 0, 2, (255, 100, 0), 3)
-                if gesture_results:
-                    results_list.append(gesture_results)
-                    if len(results_list) == 5:
-                        gesture_num = np.mean(np.array(results_list))
-                        results_lock = True
-                        results_list = []
+        # 所有手的关键点 (N, 21, 2)，一次计算所有手的手势  Landmarks of all hands, classified in one call
+        hand_local = np.array([[(landmark.x * img_w, landmark.y * img_h) for landmark in hand_landmarks.landmark]
+                               for hand_landmarks in results.multi_hand_landmarks], dtype=np.float32)
+        gesture_results = int(classify_landmarks(hand_local)[0])
+        cv2.putText(img, str(gesture_results), (20, 50), 0, 2, (255, 100, 0), 3)
+
+    gesture_results = gesture_filter.update(gesture_results)
+    if gesture_results:
+        gesture_num = gesture_results
+        results_lock = True
+        gesture_filter.reset()
     
     return img
 
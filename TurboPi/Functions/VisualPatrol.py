@@ -11,6 +11,8 @@ import argparse
 import threading
 import numpy as np
 import yaml_handle
+import HiwonderSDK.ColorModel as ColorModel
+import HiwonderSDK.LineTracker as LineTracker
 import HiwonderSDK.PID as PID
 import HiwonderSDK.Misc as Misc
 import HiwonderSDK.Board as Board
@@ -43,12 +45,12 @@ range_rgb = {
 }
 
 
-lab_data = None
+color_model = ColorModel.ColorModel(yaml_handle.lab_file_path)  # lab_config.yaml 修改后自动重新加载 Reloaded automatically when lab_config.yaml changes
 servo_data = None
 def load_config():
-    global lab_data, servo_data
+    global servo_data
     
-    lab_data = yaml_handle.get_yaml_data(yaml_handle.lab_file_path)
+    color_model.reload()
     servo_data = yaml_handle.get_yaml_data(yaml_handle.servo_file_path)
 
 # 初始位置  Initial Position 
@@ -115,22 +117,6 @@ def setBuzzer(timer):
 def car_stop():
     car.set_velocity(0,90,0)  # 关闭所有电机 Turn off all motors 
     
-# 找出面积最大的轮廓 Find the maximum contour 
-# 参数为要比较的轮廓的列表 Parameters are the list of contours to be compared 
-def getAreaMaxContour(contours):
-    contour_area_temp = 0
-    contour_area_max = 0
-    area_max_contour = None
-
-    for c in contours:  # 历遍所有轮廓 Loop over the contours
-        contour_area_temp = math.fabs(cv2.contourArea(c))  # 计算轮廓面积 Calculate the contour area 
-        if contour_area_temp > contour_area_max:
-            contour_area_max = contour_area_temp
-            if contour_area_temp >= 5:  # 只有在面积大于300时，最大面积的轮廓才是有效的，以过滤干扰 Only when the area is greater than 300, the maximum contour takes effect to filter the interference
-                area_max_contour = c
-
-    return area_max_contour, contour_area_max  # 返回最大的轮廓 Return the maximum contour
-
 # 机器人移动逻辑处理 Movement Processing
 car_en = False
 def move():
@@ -165,77 +151,38 @@ roi = [ # [ROI, weight]
         (430, 460,  0, 640, 0.6)
        ]
 
-roi_h1 = roi[0][0]
-roi_h2 = roi[1][0] - roi[0][0]
-roi_h3 = roi[2][0] - roi[1][0]
-
-roi_h_list = [roi_h1, roi_h2, roi_h3]
+# 只处理三个ROI的像素行，用列投影找线条中心（比例坐标，与画面分辨率无关）
+# Only the rows of the three ROIs are processed; the line centre comes from a column projection
+line_tracker = LineTracker.LineTracker([(r[0] / size[1], r[1] / size[1], r[4]) for r in roi])
 
 # 机器人图像处理 mage processing
 def run(img):
     global line_centerx
     global target_color
     
-    img_copy = img.copy()
     img_h, img_w = img.shape[:2]
     
     if not __isRunning or target_color == ():
         return img
-     
-    frame_resize = cv2.resize(img_copy, size, interpolation=cv2.INTER_NEAREST)
-    frame_gb = cv2.GaussianBlur(frame_resize, (3, 3), 3)         
-    centroid_x_sum = 0
-    weight_sum = 0
-    center_ = []
-    n = 0
-
-    #将图像分割成上中下三个部分，这样处理速度会更快，更精确 The image is segrated into upper, middlle and lower parts, which will be faster and more accurate
-    for r in roi:
-        roi_h = roi_h_list[n]
-        n += 1       
-        blobs = frame_gb[r[0]:r[1], r[2]:r[3]]
-        frame_lab = cv2.cvtColor(blobs, cv2.COLOR_BGR2LAB)  # 将图像转换到LAB空间  Convert image into LAB space
-        area_max = 0
-        areaMaxContour = 0
-        for i in target_color:
-            if i in lab_data:
-                detect_color = i
-                frame_mask = cv2.inRange(frame_lab,
-                                         (lab_data[i]['min'][0],
-                                          lab_data[i]['min'][1],
-                                          lab_data[i]['min'][2]),
-                                         (lab_data[i]['max'][0],
-                                          lab_data[i]['max'][1],
-                                          lab_data[i]['max'][2]))  #对原图像和掩模进行位运算 Bitwise operation of the original image and mask
-                eroded = cv2.erode(frame_mask, cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3)))  #腐蚀 Erosion 
-                dilated = cv2.dilate(eroded, cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))) #膨胀 Dilated
-
-        cnts = cv2.findContours(dilated , cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_TC89_L1)[-2]#找出所有轮廓 Find the maximum contour
-        cnt_large, area = getAreaMaxContour(cnts)#找到最大面积的轮廓 Find the maximum area
-        if cnt_large is not None:#如果轮廓不为空 If the contour is not null
-            rect = cv2.minAreaRect(cnt_large)#最小外接矩形 Get the the minAreaRect 
-            box = np.int0(cv2.boxPoints(rect))#最小外接矩形的四个顶点 Get the four corners of the minimum exterior rectangle
-            for i in range(4):
-                box[i, 1] = box[i, 1] + (n - 1)*roi_h + roi[0][0]
-                box[i, 1] = int(Misc.map(box[i, 1], 0, size[1], 0, img_h))
-            for i in range(4):                
-                box[i, 0] = int(Misc.map(box[i, 0], 0, size[0], 0, img_w))
-
-            cv2.drawContours(img, [box], -1, (0,0,255,255), 2)#画出四个点组成的矩形  Draw the rectangle
-        
-            #获取矩形的对角点 Obtain the diagonal point of rectangle
-            pt1_x, pt1_y = box[0, 0], box[0, 1]
-            pt3_x, pt3_y = box[2, 0], box[2, 1]            
-            center_x, center_y = (pt1_x + pt3_x) / 2, (pt1_y + pt3_y) / 2#中心点  Center point
-            cv2.circle(img, (int(center_x), int(center_y)), 5, (0,0,255), -1)#画出中心点    Draw the center point     
-            center_.append([center_x, center_y])                        
-            #按权重不同对上中下三个中心点进行求和  Sum up the upper, middle and lower center points according to different weights
-            centroid_x_sum += center_x * r[4]
-            weight_sum += r[4]
-    if weight_sum != 0:
-        #求最终得到的中心点  Get the final center point
-        cv2.circle(img, (line_centerx, int(center_y)), 10, (0,255,255), -1)#画出中心点 Draw the center point
-        line_centerx = int(centroid_x_sum / weight_sum)  
+    
+    colors = [i for i in target_color if i in color_model]
+    if not colors:
+        line_centerx = -1
+        return img
+    
+    color_model.maybe_reload()
+    # 所有目标颜色合成一个掩码（任意一种颜色都算线条） All target colors in one mask
+    result = line_tracker.track(img, color_model, colors)
+    
+    middles = line_tracker.layout(img_h)[3]
+    for center_x, center_y in zip(result.centers, middles):
+        if not np.isnan(center_x):
+            cv2.circle(img, (int(center_x), int(center_y)), 5, (0,0,255), -1)#画出每个ROI的中心点 Draw the center point of each ROI
+    
+    if result.center is not None:
+        #按权重合成的中心点，换算到 size 坐标  Weighted center point, mapped to `size` coordinates
+        line_centerx = int(result.center * size[0] / img_w)
+        cv2.circle(img, (int(result.center), int(middles[-1])), 10, (0,255,255), -1)#画出中心点 Draw the center point
     else:
         line_centerx = -1
     return img
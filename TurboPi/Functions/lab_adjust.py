@@ -8,6 +8,7 @@ import time
 import Camera
 import numpy as np
 import yaml_handle
+import HiwonderSDK.Blob as Blob
 
 # 颜色阈值
 if sys.version_info.major == 2:
@@ -47,21 +48,10 @@ def saveLABValue(color):
     
     return (True, (), 'SaveLABValue')
 
-# 找出面积最大的轮廓
-# 参数为要比较的轮廓的列表
-def getAreaMaxContour(contours):
-    contour_area_temp = 0
-    contour_area_max = 0
-    area_max_contour = None
-
-    for c in contours:  # 历遍所有轮廓
-        contour_area_temp = math.fabs(cv2.contourArea(c))  # 计算轮廓面积
-        if contour_area_temp > contour_area_max:
-            contour_area_max = contour_area_temp
-            if contour_area_temp > 10:  # 只有在面积大于10时，最大面积的轮廓才是有效的，以过滤干扰
-                area_max_contour = c
-
-    return area_max_contour, contour_area_max  # 返回最大的轮廓
+# 找出面积最大的色块
+# 参数为二值掩码，返回该色块的轮廓和面积
+def getAreaMaxContour(mask):
+    return Blob.getAreaMaxContour(mask, 10)  # 面积大于10时轮廓才有效
 
 lab_data = None
 def load_config():
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# encoding:utf-8
+# 色块提取 Blob extraction
+# 用 cv2.connectedComponentsWithStats 一次C层调用得到所有色块的面积、质心和外接矩形，
+# 代替 findContours + Python循环逐个调用 cv2.contourArea
+# One C-level call to cv2.connectedComponentsWithStats returns area, centroid and
+# bounding box of every blob, replacing findContours + a Python loop over cv2.contourArea
+import cv2
+import numpy as np
+
+
+class Blob:
+    """单个色块 A single blob
+
+    area: 像素面积 Pixel area
+    cx, cy: 质心 Centroid
+    x, y, w, h: 外接矩形 Bounding box
+    """
+
+    __slots__ = ('label', 'area', 'cx', 'cy', 'x', 'y', 'w', 'h', '_labels')
+
+    def __init__(self, label, stats, centroid, labels):
+        self.label = label
+        self.x = int(stats[cv2.CC_STAT_LEFT])
+        self.y = int(stats[cv2.CC_STAT_TOP])
+        self.w = int(stats[cv2.CC_STAT_WIDTH])
+        self.h = int(stats[cv2.CC_STAT_HEIGHT])
+        self.area = int(stats[cv2.CC_STAT_AREA])
+        self.cx = float(centroid[0])
+        self.cy = float(centroid[1])
+        self._labels = labels
+
+    @property
+    def center(self):
+        return self.cx, self.cy
+
+    @property
+    def bbox(self):
+        return self.x, self.y, self.w, self.h
+
+    def mask(self):
+        """外接矩形范围内该色块的掩码 Mask of this blob inside its bounding box"""
+        roi = self._labels[self.y:self.y + self.h, self.x:self.x + self.w]
+        return np.where(roi == self.label, np.uint8(255), np.uint8(0))
+
+    def contour(self):
+        """该色块的外轮廓（只在外接矩形内查找）
+        Outer contour of this blob (searched only inside its bounding box)
+        """
+        contours = cv2.findContours(self.mask(), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_NONE,
+                                    offset=(self.x, self.y))[-2]
+        return max(contours, key=len)
+
+    def __repr__(self):
+        return 'Blob(area=%d, center=(%.1f, %.1f), bbox=%s)' % (self.area, self.cx, self.cy, self.bbox)
+
+
+def find_blobs(mask, top_k=1, min_area=0, connectivity=8):
+    """找出面积最大的前 top_k 个色块 Find the top_k largest blobs
+
+    参数 Args:
+        mask: 二值掩码（非0为前景） Binary mask, non-zero is foreground
+        top_k: 返回的色块数，None表示全部 Number of blobs to return, None for all
+        min_area: 最小面积，小于该值的色块被忽略 Blobs smaller than this are ignored
+        connectivity: 4 或 8 连通 4 or 8 connectivity
+
+    返回 Returns:
+        按面积从大到小排列的 Blob 列表 List of Blob sorted by area, largest first
+    """
+    n, labels, stats, centroids = cv2.connectedComponentsWithStats(mask, connectivity=connectivity)
+    if n <= 1:
+        return []
+
+    # 标签0是背景 Label 0 is the background
+    areas = stats[1:, cv2.CC_STAT_AREA]
+    if top_k == 1:
+        order = [int(np.argmax(areas))]
+    else:
+        order = np.argsort(-areas, kind='stable')
+        if top_k is not None:
+            order = order[:top_k]
+
+    blobs = []
+    for i in order:
+        if areas[i] < min_area:
+            break
+        label = int(i) + 1
+        blobs.append(Blob(label, stats[label], centroids[label], labels))
+    return blobs
+
+
+def largest_blob(mask, min_area=0, connectivity=8):
+    """面积最大的色块，没有时返回None Largest blob, or None"""
+    blobs = find_blobs(mask, 1, min_area, connectivity)
+    return blobs[0] if blobs else None
+
+
+def getAreaMaxContour(mask, min_area=300):
+    """兼容原 getAreaMaxContour 的返回值：(最大色块的轮廓, 最大面积)
+    面积不大于 min_area 时轮廓为 None
+    Same return value as the old getAreaMaxContour: (contour of the largest blob, max area).
+    The contour is None when the area is not greater than min_area
+    """
+    blob = largest_blob(mask)
+    if blob is None:
+        return None, 0
+    if blob.area <= min_area:
+        return None, blob.area
+    return blob.contour(), blob.area
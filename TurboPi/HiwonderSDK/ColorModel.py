@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# encoding:utf-8
+# LAB颜色模型 LAB color model
+# 从 lab_config.yaml 加载各颜色的LAB阈值，编译为L/A/B三个通道的位查找表：
+# 每种颜色占一位，三个通道查表结果按位与即得到像素属于哪些颜色，一次遍历分类所有颜色。
+# 文件修改时间变化后自动重新加载（lab_adjust 保存阈值后无需重启服务）。
+# Loads the LAB thresholds of every color from lab_config.yaml and compiles them into
+# per-channel bit lookup tables: one bit per color, AND the three channel lookups to get
+# the colors a pixel belongs to, classifying all colors in one pass.
+# Reloads automatically when the file's mtime changes (no restart after lab_adjust saves).
+import os
+import time
+import threading
+import cv2
+import yaml
+import numpy as np
+
+DEFAULT_PATH = '/home/pi/TurboPi/lab_config.yaml'
+
+
+class _Compiled:
+    """一次加载的编译结果（整体替换，读取方拿到的总是一致的一组数据）
+    Compiled result of one load, replaced as a whole so readers always see a consistent set
+    """
+
+    __slots__ = ('ranges', 'lut', 'bits', 'version')
+
+    def __init__(self, ranges, version):
+        self.ranges = ranges
+        self.version = version
+        n = len(ranges)
+        if n <= 8:
+            dtype = np.uint8
+        elif n <= 16:
+            dtype = np.uint16
+        elif n <= 31:
+            dtype = np.int32
+        else:
+            raise ValueError('too many colors in lab config: %d' % n)
+
+        self.lut = np.zeros((1, 256, 3), dtype=dtype)
+        self.bits = {}
+        for bit, (name, (lower, upper)) in enumerate(ranges.items()):
+            for ch in range(3):
+                self.lut[0, lower[ch]:upper[ch] + 1, ch] |= dtype(1 << bit)
+            self.bits[name] = 1 << bit
+
+
+class ColorModel:
+    """LAB颜色模型 LAB color model"""
+
+    # 检查文件修改时间的最短间隔（秒） Minimum interval between mtime checks (seconds)
+    CHECK_INTERVAL = 1.0
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._next_check = 0.0
+        self._compiled = _Compiled({}, 0)
+        self.reload()
+
+    # ===== 加载 Loading =====
+
+    @staticmethod
+    def parse(data):
+        """lab_config 数据 -> {颜色: ((Lmin, Amin, Bmin), (Lmax, Amax, Bmax))}"""
+        ranges = {}
+        for name, item in (data or {}).items():
+            lower = tuple(int(v) for v in item['min'])
+            upper = tuple(int(v) for v in item['max'])
+            if len(lower) != 3 or len(upper) != 3:
+                raise ValueError('bad lab range for %s' % name)
+            ranges[name] = (lower, upper)
+        return ranges
+
+    def reload(self):
+        """重新加载配置文件，失败时保留原来的模型
+        Reload the config file, keeping the previous model on failure
+
+        返回 Returns: 是否加载成功 whether the load succeeded
+        """
+        with self._lock:
+            try:
+                mtime = os.stat(self.path).st_mtime
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    ranges = self.parse(yaml.safe_load(f))
+                self._compiled = _Compiled(ranges, self._compiled.version + 1)
+                self._mtime = mtime
+                return True
+            except Exception as e:
+                print('ColorModel: failed to load %s: %s' % (self.path, e))
+                return False
+            finally:
+                self._next_check = time.monotonic() + self.CHECK_INTERVAL
+
+    def maybe_reload(self):
+        """文件修改时间变化时重新加载（最多每 CHECK_INTERVAL 秒检查一次）
+        Reload when the file's mtime has changed (checked at most every CHECK_INTERVAL seconds)
+
+        返回 Returns: 是否重新加载了 whether a reload happened
+        """
+        now = time.monotonic()
+        if now < self._next_check:
+            return False
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            self._next_check = now + self.CHECK_INTERVAL
+            return False
+        if mtime == self._mtime:
+            self._next_check = now + self.CHECK_INTERVAL
+            return False
+        return self.reload()
+
+    # ===== 查询 Queries =====
+
+    @property
+    def version(self):
+        """每次成功加载加1，缓存可据此失效 Incremented on every successful load"""
+        return self._compiled.version
+
+    @property
+    def names(self):
+        return list(self._compiled.ranges)
+
+    @property
+    def ranges(self):
+        return dict(self._compiled.ranges)
+
+    def __contains__(self, name):
+        return name in self._compiled.ranges
+
+    # ===== 分类 Classification =====
+
+    def classify(self, lab_image, compiled=None):
+        """LAB图像 -> 每个像素的颜色位图 LAB image -> per-pixel color bitmap"""
+        compiled = compiled or self._compiled
+        l, a, b = cv2.split(cv2.LUT(lab_image, compiled.lut))
+        return cv2.bitwise_and(cv2.bitwise_and(l, a), b)
+
+    def mask(self, bits, name, compiled=None):
+        """从位图中取出指定颜色的二值掩码 Binary mask of one color from the bitmap"""
+        compiled = compiled or self._compiled
+        return cv2.compare(cv2.bitwise_and(bits, compiled.bits[name]), 0, cv2.CMP_GT)
+
+    def mask_any(self, bits, names, compiled=None):
+        """属于任意一种指定颜色的像素的掩码 Mask of pixels belonging to any of the colors"""
+        compiled = compiled or self._compiled
+        value = 0
+        for name in names:
+            value |= compiled.bits[name]
+        return cv2.compare(cv2.bitwise_and(bits, value), 0, cv2.CMP_GT)
+
+    def snapshot(self):
+        """当前的编译结果，配合 classify/mask 的 compiled 参数保证同一帧使用同一版本
+        The current compiled model; pass it to classify/mask to use one version for a whole frame
+        """
+        return self._compiled
+
+    def inRange(self, lab_image, name):
+        """单个颜色的掩码，与 cv2.inRange(lab, min, max) 结果相同
+        Mask of a single color, same result as cv2.inRange(lab, min, max)
+        """
+        self.maybe_reload()
+        lower, upper = self._compiled.ranges[name]
+        return cv2.inRange(lab_image, lower, upper)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# encoding:utf-8
+# 手势分类 Gesture classification
+# 根据手部21个关键点计算五根手指的弯曲角度，再按角度阈值表判断手势编号（0表示无法识别）。
+# 关键点为 (21, 2) 数组，也可以是 (N, 21, 2)：多只手或连续多帧一次计算。
+# 由 Functions/GestureRecognition 和车载服务的手势识别共用。
+# Computes the bend angle of the five fingers from the 21 hand landmarks and maps the angles
+# to a gesture number (0 = unknown) with a threshold table. Landmarks are a (21, 2) array or
+# (N, 21, 2) for several hands / a window of frames at once.
+# Shared by Functions/GestureRecognition and the vehicle service's gesture recognition.
+import collections
+import numpy as np
+
+# 每根手指的关键点：(指根, 指尖前一节, 指尖)，角度为 手腕->指根 与 指尖前一节->指尖 的夹角
+# Landmarks per finger: (base, joint before tip, tip); the angle is between wrist->base and joint->tip
+FINGER_BASE = np.array([2, 6, 10, 14, 18])
+FINGER_JOINT = np.array([3, 7, 11, 15, 19])
+FINGER_TIP = np.array([4, 8, 12, 16, 20])
+
+# 角度阈值（度）：小于 STRAIGHT 为伸直，大于 BENT（拇指为 THUMB_BENT）为弯曲
+# Angle thresholds (degrees): below STRAIGHT is extended, above BENT is folded
+STRAIGHT = 49.0
+BENT = 65.0
+THUMB_BENT = 53.0
+
+_INF = np.inf
+
+# 手势表：(编号, 每根手指角度的下限, 上限)，按顺序匹配第一个满足的手势
+# 手指顺序：拇指、食指、中指、无名指、小指
+# Gesture table: (number, lower bounds, upper bounds per finger); the first matching row wins
+# Finger order: thumb, index, middle, ring, pinky
+GESTURES = (
+    (1, (5.0, -_INF, BENT, BENT, BENT), (_INF, STRAIGHT, _INF, _INF, _INF)),
+    (2, (THUMB_BENT, -_INF, -_INF, BENT, BENT), (_INF, STRAIGHT, STRAIGHT, _INF, _INF)),
+    (3, (THUMB_BENT, -_INF, -_INF, -_INF, BENT), (_INF, STRAIGHT, STRAIGHT, STRAIGHT, _INF)),
+    (4, (THUMB_BENT, -_INF, -_INF, -_INF, -_INF), (_INF, STRAIGHT, STRAIGHT, STRAIGHT, STRAIGHT)),
+    (5, (-_INF, -_INF, -_INF, -_INF, -_INF), (STRAIGHT, STRAIGHT, STRAIGHT, STRAIGHT, STRAIGHT)),
+    (6, (-_INF, BENT, BENT, BENT, -_INF), (STRAIGHT, _INF, _INF, _INF, STRAIGHT)),
+)
+
+_NUMBERS = np.array([0] + [g[0] for g in GESTURES])
+_LOWER = np.array([g[1] for g in GESTURES])
+_UPPER = np.array([g[2] for g in GESTURES])
+
+
+def finger_angles(landmarks):
+    # 五根手指的弯曲角度 Bend angle of the five fingers
+    # landmarks: (..., 21, 2) -> (..., 5)，无法计算的角度（关键点重合）为 nan
+    pts = np.asarray(landmarks, dtype=np.float32)
+    v1 = pts[..., :1, :] - pts[..., FINGER_BASE, :]
+    v2 = pts[..., FINGER_JOINT, :] - pts[..., FINGER_TIP, :]
+    dot = np.einsum('...ij,...ij->...i', v1, v2)
+    norm = np.linalg.norm(v1, axis=-1) * np.linalg.norm(v2, axis=-1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cos = dot / norm
+    return np.degrees(np.arccos(np.clip(cos, -1.0, 1.0)))
+
+
+def classify(angles):
+    # 按手势表分类 Classify with the gesture table
+    # angles: (..., 5) -> (...,) 手势编号，含 nan 或没有匹配的手势为0
+    angles = np.asarray(angles, dtype=np.float32)[..., None, :]
+    match = ((angles > _LOWER) & (angles < _UPPER)).all(axis=-1)
+    # 第一个匹配的手势；都不匹配时 argmax 为0，对应编号0
+    first = np.where(match.any(axis=-1), match.argmax(axis=-1) + 1, 0)
+    return _NUMBERS[first]
+
+
+def classify_landmarks(landmarks):
+    # 关键点 -> 手势编号 Landmarks to gesture number, (..., 21, 2) -> (...,)
+    return classify(finger_angles(landmarks))
+
+
+def hand_angle(hand_):
+    # 获取对应的手指相关向量的角度 Obtain the angle of the related vector of corresponding finger
+    return finger_angles(hand_).tolist()
+
+
+def gesture(angle_list):
+    # 用手指相关的角度来定义手势 Define gesture according to the finger angle
+    angles = np.asarray(angle_list, dtype=np.float32)
+    # 兼容旧的无效角度标记 65535 Legacy invalid-angle marker
+    angles = np.where(angles > 180.0, np.nan, angles)
+    return int(classify(angles))
+
+
+class GestureFilter:
+    # 手势时间平滑 Temporal smoothing of gestures
+    # 保存最近 window 帧的手势编号，某个编号至少出现 min_votes 次才切换为该手势，
+    # 单帧误识别不会改变结果；没有手（编号0）同样需要多数票才会清除结果。
+    # Keeps the last `window` gesture numbers; the output switches only when a number has at
+    # least `min_votes` votes, so single-frame misclassifications don't change it.
+
+    def __init__(self, window=5, min_votes=3):
+        self.min_votes = min_votes
+        self._history = collections.deque(maxlen=window)
+        self.gesture = 0
+
+    def update(self, number):
+        # 加入一帧的手势编号，返回平滑后的手势 Add one frame's gesture, return the smoothed gesture
+        self._history.append(int(number))
+        counts = np.bincount(np.fromiter(self._history, dtype=np.int64, count=len(self._history)))
+        best = int(counts.argmax())
+        if counts[best] >= self.min_votes:
+            self.gesture = best
+        return self.gesture
+
+    def reset(self):
+        self._history.clear()
+        self.gesture = 0
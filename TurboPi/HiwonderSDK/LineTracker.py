@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# encoding:utf-8
+# 摄像头巡线 Camera line tracking
+# 只处理画面中几条水平ROI带的像素行：所有ROI的行一次取出、一次LAB转换和颜色查表，
+# 再对掩码按ROI做列投影（每一列有多少个线条像素），取每个ROI中最宽的连续线段的中心，
+# 按权重合成线条位置。任意数量的ROI都在同一次处理中完成，不需要轮廓查找。
+# Processes only the pixel rows of a few horizontal ROI bands: the rows of all ROIs are
+# gathered, converted to LAB and classified once; the mask is then projected onto columns
+# per ROI (line pixels per column), the centre of the widest run in each ROI is taken, and
+# the ROI centres are combined by weight. Any number of ROIs in one pass, no contours.
+from typing import NamedTuple, Optional
+
+import cv2
+import numpy as np
+
+# ROI：(上边, 下边, 权重)，上下边为画面高度的比例（对应 640x480 画面的 240-280/340-380/430-460 行）
+# ROI: (top, bottom, weight), top/bottom as fractions of the frame height
+DEFAULT_ROIS = (
+    (0.500, 0.583, 0.1),
+    (0.708, 0.792, 0.3),
+    (0.896, 0.958, 0.6),
+)
+
+
+class LineResult(NamedTuple):
+    """巡线结果 Line tracking result"""
+    offset: float           # 线条相对画面中心的偏移（-1到1，负数偏左），没有线条时为0
+    confidence: float       # 找到线条的ROI权重之和 / 总权重（0到1）
+    center: Optional[float]  # 合成的线条中心x（像素），没有线条时为None
+    centers: np.ndarray     # 每个ROI的线条中心x（像素），没有线条的ROI为nan
+
+
+class LineTracker:
+    """列投影巡线 Column-projection line tracker"""
+
+    def __init__(self, rois=DEFAULT_ROIS, min_fill=0.5, min_width=0.01):
+        """
+        rois: ROI列表 (上边, 下边, 权重)，比例坐标
+        min_fill: 一列中线条像素至少占ROI高度的比例，该列才算有线条（代替腐蚀/膨胀去噪）
+        min_width: 线段至少占画面宽度的比例
+        """
+        self.rois = tuple(rois)
+        self.min_fill = min_fill
+        self.min_width = min_width
+        self.weights = np.array([r[2] for r in self.rois], dtype=np.float64)
+        self._layouts = {}
+
+    def layout(self, height):
+        """某个画面高度下各ROI的像素行 Pixel rows of every ROI for a frame height
+
+        返回 Returns: (所有ROI的行号, 每个ROI在其中的起始位置, 每个ROI的行数, 每个ROI的中间行)
+        """
+        layout = self._layouts.get(height)
+        if layout is None:
+            bands = []
+            for top, bottom, _ in self.rois:
+                y0 = min(height - 1, max(0, int(round(top * height))))
+                y1 = min(height, max(y0 + 1, int(round(bottom * height))))
+                bands.append((y0, y1))
+            rows = np.concatenate([np.arange(y0, y1) for y0, y1 in bands])
+            heights = np.array([y1 - y0 for y0, y1 in bands])
+            offsets = np.concatenate([[0], np.cumsum(heights)[:-1]])
+            middles = np.array([(y0 + y1) // 2 for y0, y1 in bands])
+            layout = self._layouts[height] = (rows, offsets, heights, middles)
+        return layout
+
+    def strip(self, image):
+        """取出所有ROI的像素行（一次拷贝） Gather the rows of all ROIs (one copy)"""
+        rows = self.layout(image.shape[0])[0]
+        return image[rows]
+
+    def track_mask(self, mask, height):
+        """根据ROI行的掩码计算线条位置 Line position from the mask of the ROI rows
+
+        mask: strip() 行对应的二值掩码 (行数, 宽度)
+        height: 原画面高度
+        """
+        _, offsets, heights, _ = self.layout(height)
+        width = mask.shape[1]
+
+        # 列投影：每个ROI每一列的线条像素数 (ROI数, 宽度)  Column histogram per ROI
+        hist = np.add.reduceat(mask > 0, offsets, axis=0, dtype=np.int32)
+        occupied = hist >= heights[:, None] * self.min_fill
+
+        # 每个ROI中所有连续线段的起止列  Start/end columns of every run
+        padded = np.zeros((len(heights), width + 2), dtype=np.int8)
+        padded[:, 1:-1] = occupied
+        edges = np.diff(padded, axis=1)
+        run_rows, starts = np.nonzero(edges == 1)
+        _, ends = np.nonzero(edges == -1)
+        lengths = ends - starts
+
+        centers = np.full(len(heights), np.nan)
+        if len(lengths):
+            # 每个ROI中最宽的线段：按 (ROI, 宽度) 排序后取每个ROI的最后一个
+            # Widest run per ROI: sort by (ROI, length) and take the last of each ROI
+            order = np.lexsort((lengths, run_rows))
+            last = np.append(run_rows[order][1:] != run_rows[order][:-1], True)
+            best = order[last]
+            best = best[lengths[best] >= max(1, self.min_width * width)]
+
+            # 线段内按列像素数加权的中心（前缀和，一次算出所有ROI）
+            # Centre weighted by column counts inside the run (prefix sums for all ROIs)
+            xs = np.arange(width)
+            mass = np.zeros((len(heights), width + 1))
+            moment = np.zeros((len(heights), width + 1))
+            np.cumsum(hist, axis=1, dtype=np.float64, out=mass[:, 1:])
+            np.cumsum(hist * xs, axis=1, dtype=np.float64, out=moment[:, 1:])
+            r, s, e = run_rows[best], starts[best], ends[best]
+            centers[r] = (moment[r, e] - moment[r, s]) / (mass[r, e] - mass[r, s])
+
+        found = ~np.isnan(centers)
+        weight = self.weights[found].sum()
+        if weight <= 0:
+            return LineResult(0.0, 0.0, None, centers)
+        center = float((centers[found] * self.weights[found]).sum() / weight)
+        half = width / 2.0
+        return LineResult((center - half) / half, float(weight / self.weights.sum()), center, centers)
+
+    def track(self, image, color_model, names, compiled=None):
+        """在BGR画面中跟踪指定颜色的线条 Track a line of the given colors in a BGR frame
+
+        color_model: ColorModel；names: 颜色名列表，任意一种颜色都算线条
+        """
+        compiled = compiled or color_model.snapshot()
+        lab = cv2.cvtColor(self.strip(image), cv2.COLOR_BGR2LAB)
+        mask = color_model.mask_any(color_model.classify(lab, compiled), names, compiled)
+        return self.track_mask(mask, image.shape[0])
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# encoding:utf-8
+# 鱼眼畸变矫正 Fisheye undistortion
+# 矫正映射表按 (标定文件哈希, 输出分辨率) 缓存到磁盘，之后用 np.load(mmap_mode='r') 直接映射，
+# 不再每次创建 Camera 时重新计算；标定文件重新生成后哈希变化，自动重新计算。
+# 只需要部分画面时可以只矫正指定的ROI：从映射表中取出对应的行列，cv2.remap 只计算这些输出像素。
+# Remap tables are cached on disk keyed by (calibration file hash, output resolution) and
+# memory-mapped with np.load(mmap_mode='r') instead of being recomputed for every Camera;
+# a new calibration changes the hash and the tables are rebuilt.
+# Consumers that need only part of the frame can correct just their ROI: the matching rows
+# and columns are sliced out of the tables so cv2.remap computes only those output pixels.
+import hashlib
+import os
+
+import cv2
+import numpy as np
+
+# 映射表算法版本，修改计算方式后加1使旧缓存失效 Bump to invalidate old caches
+MAP_VERSION = 1
+
+
+def calibration_hash(path):
+    """标定文件内容的哈希 Hash of the calibration file contents"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def compute_maps(k, d, dim, size):
+    """计算矫正映射表 Compute the remap tables
+
+    k, d: 标定得到的内参和畸变参数 intrinsics and distortion from calibration
+    dim: 标定图像尺寸 (宽, 高)；size: 输出尺寸 (宽, 高)，与标定尺寸不同时按比例缩放内参
+    返回 Returns: (map1, map2)，CV_16SC2 格式
+    """
+    k = np.array(k, dtype=np.float64)
+    sx, sy = size[0] / float(dim[0]), size[1] / float(dim[1])
+    k[0, :] *= sx
+    k[1, :] *= sy
+    k[2, 2] = 1.0
+    d = np.array(d, dtype=np.float64)
+    p = cv2.fisheye.estimateNewCameraMatrixForUndistortRectify(k, d, tuple(size), None).copy()
+    return cv2.fisheye.initUndistortRectifyMap(k, d, np.eye(3), p, tuple(size), cv2.CV_16SC2)
+
+
+class UndistortMaps:
+    """一个输出分辨率的矫正映射表 Remap tables for one output resolution"""
+
+    def __init__(self, param_path, size, cache_dir=None):
+        """
+        param_path: 标定参数文件（calibration_param.npz）
+        size: 输出尺寸 (宽, 高)
+        cache_dir: 缓存目录，默认为标定文件旁边的 undistort_cache
+        """
+        self.param_path = param_path
+        self.size = (int(size[0]), int(size[1]))
+        self.cache_dir = cache_dir or os.path.join(os.path.dirname(os.path.abspath(param_path)), 'undistort_cache')
+        self.key = '%s_%dx%d_v%d' % (calibration_hash(param_path)[:16], self.size[0], self.size[1], MAP_VERSION)
+        self.cached = False
+        self.map1, self.map2 = self._load()
+
+    def _paths(self):
+        base = os.path.join(self.cache_dir, self.key)
+        return base + '_map1.npy', base + '_map2.npy'
+
+    def _load(self):
+        """从缓存映射，没有缓存时计算并保存 Map from cache, or compute and save"""
+        paths = self._paths()
+        try:
+            maps = tuple(np.load(p, mmap_mode='r') for p in paths)
+            if maps[0].shape[:2] == maps[1].shape[:2] == (self.size[1], self.size[0]):
+                self.cached = True
+                return maps
+        except (OSError, ValueError):
+            pass
+
+        param_data = np.load(self.param_path)
+        maps = compute_maps(param_data['k_array'], param_data['d_array'],
+                            tuple(param_data['dim_array']), self.size)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            for path, table in zip(paths, maps):
+                # 先写临时文件再改名，其他进程不会读到写了一半的文件
+                # Write then rename so other processes never see a partial file
+                tmp = '%s.%d.tmp.npy' % (path[:-4], os.getpid())
+                np.save(tmp, table)
+                os.replace(tmp, path)
+        except OSError as e:
+            print('Undistort: failed to cache maps in %s: %s' % (self.cache_dir, e))
+        return maps
+
+    def _check(self, image):
+        if image.shape[1] != self.size[0] or image.shape[0] != self.size[1]:
+            raise ValueError('image size %dx%d does not match maps %dx%d'
+                             % (image.shape[1], image.shape[0], self.size[0], self.size[1]))
+
+    def remap(self, image):
+        """矫正整个画面 Correct the whole frame"""
+        self._check(image)
+        return cv2.remap(image, self.map1, self.map2, interpolation=cv2.INTER_LINEAR,
+                         borderMode=cv2.BORDER_CONSTANT)
+
+    def remap_roi(self, image, roi):
+        """只矫正一个区域 Correct one region only
+
+        image: 未矫正的整个画面 the whole uncorrected frame
+        roi: 矫正后画面中的区域 (x, y, 宽, 高)，超出画面的部分被裁掉
+        返回 Returns: 该区域的矫正图像，与 remap(image) 的对应区域相同
+        """
+        self._check(image)
+        x, y, w, h = roi
+        x0, y0 = max(0, int(x)), max(0, int(y))
+        x1, y1 = min(self.size[0], int(x + w)), min(self.size[1], int(y + h))
+        if x1 <= x0 or y1 <= y0:
+            return image[0:0, 0:0]
+        # 映射表中的坐标是原画面的绝对坐标，输入仍然是整个画面
+        # The tables hold absolute source coordinates, so the source stays the whole frame
+        return cv2.remap(image, self.map1[y0:y1, x0:x1], self.map2[y0:y1, x0:x1],
+                         interpolation=cv2.INTER_LINEAR, borderMode=cv2.BORDER_CONSTANT)
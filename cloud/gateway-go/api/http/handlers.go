@@ -6,11 +6,13 @@ import (
 	"encoding/json"
 	"fmt"
 	"net/http"
+	"strconv"
 	"time"
 
 	"github.com/gin-gonic/gin"
 	"github.com/sirupsen/logrus"
 
+	"blockly-gateway/internal/message"
 	"blockly-gateway/internal/pool"
 )
 
@@ -125,12 +127,23 @@ func (h *Handlers) CameraSnapshot(c *gin.Context) {
 	// 生成唯一的请求ID
 	requestID := fmt.Sprintf("cam_%d", time.Now().UnixNano())
 
-	// 创建请求消息
+	// 创建请求消息，附带可选的快照规格：最大宽度、JPEG质量、ROI（"x,y,w,h" 比例坐标）
+	// 车载会再按到网关的链路往返时间自动降低规格
+	requestData := map[string]interface{}{
+		"request_id": requestID,
+	}
+	if v, err := strconv.Atoi(c.Query("max_width")); err == nil && v > 0 {
+		requestData["max_width"] = v
+	}
+	if v, err := strconv.Atoi(c.Query("quality")); err == nil && v > 0 {
+		requestData["quality"] = v
+	}
+	if roi := c.Query("roi"); roi != "" {
+		requestData["roi"] = roi
+	}
 	requestMsg := map[string]interface{}{
 		"type": "camera_snapshot_request",
-		"data": map[string]interface{}{
-			"request_id": requestID,
-		},
+		"data": requestData,
 	}
 
 	msgBytes, err := json.Marshal(requestMsg)
@@ -158,7 +171,34 @@ func (h *Handlers) CameraSnapshot(c *gin.Context) {
 		return
 	}
 
-	// 解析响应
+	imageBytes, err := decodeSnapshotResponse(respData)
+	if err != nil {
+		httpLogger.Errorf("解析摄像头响应失败: %v", err)
+		h.sendPlaceholderImage(c)
+		return
+	}
+
+	if len(imageBytes) == 0 {
+		httpLogger.Warnf("摄像头图像为空: request_id=%s", requestID)
+		h.sendPlaceholderImage(c)
+		return
+	}
+
+	c.Data(http.StatusOK, "image/jpeg", imageBytes)
+	httpLogger.Infof("摄像头图像已返回: request_id=%s, size=%d", requestID, len(imageBytes))
+}
+
+// decodeSnapshotResponse 从摄像头响应中取出JPEG数据
+// 支持二进制快照帧和 JSON+base64 两种格式（注册时协商，旧版车载只发JSON）
+func decodeSnapshotResponse(respData []byte) ([]byte, error) {
+	if message.IsSnapshotFrame(respData) {
+		frame, err := message.DecodeSnapshotFrame(respData)
+		if err != nil {
+			return nil, err
+		}
+		return frame.JPEG, nil
+	}
+
 	var resp struct {
 		Type string `json:"type"`
 		Data struct {
@@ -167,27 +207,15 @@ func (h *Handlers) CameraSnapshot(c *gin.Context) {
 		} `json:"data"`
 	}
 	if err := json.Unmarshal(respData, &resp); err != nil {
-		httpLogger.Errorf("解析摄像头响应失败: %v", err)
-		h.sendPlaceholderImage(c)
-		return
+		return nil, err
 	}
 
 	// 解码Base64图像
 	imageBytes, err := base64.StdEncoding.DecodeString(resp.Data.Image)
 	if err != nil {
-		httpLogger.Errorf("解码Base64图像失败: %v", err)
-		h.sendPlaceholderImage(c)
-		return
+		return nil, fmt.Errorf("解码Base64图像失败: %w", err)
 	}
-
-	if len(imageBytes) == 0 {
-		httpLogger.Warnf("摄像头图像为空: request_id=%s", requestID)
-		h.sendPlaceholderImage(c)
-		return
-	}
-
-	c.Data(http.StatusOK, "image/jpeg", imageBytes)
-	httpLogger.Infof("摄像头图像已返回: request_id=%s, size=%d", requestID, len(imageBytes))
+	return imageBytes, nil
 }
 
 // sendPlaceholderImage 发送占位图像
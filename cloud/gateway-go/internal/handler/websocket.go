@@ -121,7 +121,7 @@ func (h *WebSocketHandler) handleConnection(conn *pool.Connection) {
 	// 消息读取循环
 	msgCount := 0
 	for {
-		_, data, err := conn.WS.ReadMessage()
+		msgType, data, err := conn.WS.ReadMessage()
 		if err != nil {
 			if websocket.IsUnexpectedCloseError(err, websocket.CloseGoingAway, websocket.CloseAbnormalClosure) {
 				wsLogger.Warnf("读取消息错误: conn_id=%s, error=%v", conn.ID, err)
@@ -134,7 +134,11 @@ func (h *WebSocketHandler) handleConnection(conn *pool.Connection) {
 		msgCount++
 		wsLogger.Debugf("收到消息 #%d: conn_id=%s, len=%d", msgCount, conn.ID, len(data))
 
-		// 处理消息
+		// 处理消息（二进制消息目前只有摄像头快照帧）
+		if msgType == websocket.BinaryMessage {
+			h.handleBinaryMessage(conn, data)
+			continue
+		}
 		h.handleMessage(conn, data)
 	}
 }
@@ -168,6 +172,25 @@ func (h *WebSocketHandler) handleMessage(conn *pool.Connection, data []byte) {
 	}
 }
 
+// handleBinaryMessage 处理二进制消息
+func (h *WebSocketHandler) handleBinaryMessage(conn *pool.Connection, data []byte) {
+	if conn.Type != message.ConnTypeVehicle {
+		wsLogger.Warnf("忽略非车载连接的二进制消息: conn_id=%s", conn.ID)
+		return
+	}
+
+	frame, err := message.DecodeSnapshotFrame(data)
+	if err != nil {
+		wsLogger.Warnf("二进制消息解码失败: %v", err)
+		return
+	}
+
+	// 原样交给等待的HTTP请求，由请求方取出JPEG数据
+	if !conn.DeliverResponse(frame.RequestID, data) {
+		wsLogger.Debugf("快照帧没有等待的请求: request_id=%s", frame.RequestID)
+	}
+}
+
 // handleHeartbeat 处理心跳消息
 func (h *WebSocketHandler) handleHeartbeat(conn *pool.Connection, msg *message.Message) {
 	if conn.Type == message.ConnTypeVehicle && conn.VehicleID != "" {
@@ -201,7 +224,19 @@ func (h *WebSocketHandler) handleVehicleRegister(conn *pool.Connection, msg *mes
 	// 更新连接池中的映射：将连接从clients移到vehicles
 	h.pool.RegisterVehicle(conn)
 
-	wsLogger.Infof("车辆注册成功: vehicle_id=%s, conn_id=%s", regData.VehicleID, conn.ID)
+	// 协商快照传输格式：双方都支持时使用二进制快照帧
+	binarySnapshot := 0
+	if regData.Capabilities.BinarySnapshot >= message.SnapshotFrameVersion {
+		binarySnapshot = message.SnapshotFrameVersion
+	}
+	if ack, err := message.EncodeRegisterAck(binarySnapshot); err == nil {
+		if err := conn.Send(ack); err != nil {
+			wsLogger.Warnf("发送注册确认失败: %v", err)
+		}
+	}
+
+	wsLogger.Infof("车辆注册成功: vehicle_id=%s, conn_id=%s, binary_snapshot=%d",
+		regData.VehicleID, conn.ID, binarySnapshot)
 }
 
 // handleClientRegister 处理前端客户端注册
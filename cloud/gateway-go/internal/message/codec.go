@@ -51,6 +51,17 @@ func EncodePong() ([]byte, error) {
 	return json.Marshal(resp)
 }
 
+// EncodeRegisterAck 编码车辆注册确认（携带协商结果）
+func EncodeRegisterAck(binarySnapshot int) ([]byte, error) {
+	resp := map[string]interface{}{
+		"type": "register_ack",
+		"data": RegisterAckData{
+			BinarySnapshot: binarySnapshot,
+		},
+	}
+	return json.Marshal(resp)
+}
+
 // MustEncode 编码消息，panic失败情况
 func MustEncode(msg *Message) []byte {
 	data, err := Encode(msg)
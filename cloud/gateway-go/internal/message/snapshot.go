@@ -0,0 +1,86 @@
+// Package message 二进制摄像头快照帧
+package message
+
+import (
+	"encoding/binary"
+	"fmt"
+)
+
+// SnapshotFrameVersion 二进制快照帧格式版本（注册时协商）
+const SnapshotFrameVersion = 1
+
+// snapshotHeaderSize 固定头部长度
+//
+// 头部（大端序）:
+//
+//	偏移  长度  字段
+//	0     2     魔数 "BC"
+//	2     1     版本
+//	3     1     request_id 长度 n
+//	4     4     帧序号
+//	8     8     采集时刻（Unix毫秒）
+//	16    2     图像宽度
+//	18    2     图像高度
+//	20    n     request_id（UTF-8）
+//	20+n  ...   JPEG数据
+const snapshotHeaderSize = 20
+
+var snapshotMagic = [2]byte{'B', 'C'}
+
+// SnapshotFrame 二进制摄像头快照帧
+type SnapshotFrame struct {
+	RequestID   string
+	Seq         uint32
+	TimestampMs uint64
+	Width       uint16
+	Height      uint16
+	JPEG        []byte
+}
+
+// IsSnapshotFrame 判断数据是否为二进制快照帧
+func IsSnapshotFrame(data []byte) bool {
+	return len(data) >= snapshotHeaderSize && data[0] == snapshotMagic[0] && data[1] == snapshotMagic[1]
+}
+
+// DecodeSnapshotFrame 解码二进制快照帧（JPEG数据引用原缓冲区，不复制）
+func DecodeSnapshotFrame(data []byte) (*SnapshotFrame, error) {
+	if !IsSnapshotFrame(data) {
+		return nil, fmt.Errorf("不是快照帧: len=%d", len(data))
+	}
+	if data[2] != SnapshotFrameVersion {
+		return nil, fmt.Errorf("不支持的快照帧版本: %d", data[2])
+	}
+
+	idLen := int(data[3])
+	if len(data) < snapshotHeaderSize+idLen {
+		return nil, fmt.Errorf("快照帧长度不足: len=%d", len(data))
+	}
+
+	return &SnapshotFrame{
+		RequestID:   string(data[snapshotHeaderSize : snapshotHeaderSize+idLen]),
+		Seq:         binary.BigEndian.Uint32(data[4:8]),
+		TimestampMs: binary.BigEndian.Uint64(data[8:16]),
+		Width:       binary.BigEndian.Uint16(data[16:18]),
+		Height:      binary.BigEndian.Uint16(data[18:20]),
+		JPEG:        data[snapshotHeaderSize+idLen:],
+	}, nil
+}
+
+// EncodeSnapshotFrame 编码二进制快照帧
+func EncodeSnapshotFrame(f *SnapshotFrame) ([]byte, error) {
+	if len(f.RequestID) > 255 {
+		return nil, fmt.Errorf("request_id过长: %d", len(f.RequestID))
+	}
+
+	buf := make([]byte, snapshotHeaderSize+len(f.RequestID)+len(f.JPEG))
+	buf[0], buf[1] = snapshotMagic[0], snapshotMagic[1]
+	buf[2] = SnapshotFrameVersion
+	buf[3] = byte(len(f.RequestID))
+	binary.BigEndian.PutUint32(buf[4:8], f.Seq)
+	binary.BigEndian.PutUint64(buf[8:16], f.TimestampMs)
+	binary.BigEndian.PutUint16(buf[16:18], f.Width)
+	binary.BigEndian.PutUint16(buf[18:20], f.Height)
+	copy(buf[snapshotHeaderSize:], f.RequestID)
+	copy(buf[snapshotHeaderSize+len(f.RequestID):], f.JPEG)
+	return buf, nil
+}
@@ -0,0 +1,44 @@
+// Package message 二进制快照帧测试
+package message
+
+import (
+	"testing"
+
+	"github.com/stretchr/testify/assert"
+)
+
+func TestSnapshotFrameRoundTrip(t *testing.T) {
+	frame := &SnapshotFrame{
+		RequestID:   "cam_1700000000000",
+		Seq:         42,
+		TimestampMs: 1700000000123,
+		Width:       320,
+		Height:      240,
+		JPEG:        []byte{0xFF, 0xD8, 0x01, 0x02, 0xFF, 0xD9},
+	}
+
+	data, err := EncodeSnapshotFrame(frame)
+	assert.NoError(t, err)
+	assert.True(t, IsSnapshotFrame(data))
+	assert.Equal(t, 20+len(frame.RequestID)+len(frame.JPEG), len(data))
+
+	decoded, err := DecodeSnapshotFrame(data)
+	assert.NoError(t, err)
+	assert.Equal(t, frame, decoded)
+}
+
+func TestSnapshotFrameRejectsJSON(t *testing.T) {
+	data := []byte(`{"type":"camera_snapshot_response","data":{}}`)
+	assert.False(t, IsSnapshotFrame(data))
+
+	_, err := DecodeSnapshotFrame(data)
+	assert.Error(t, err)
+}
+
+func TestSnapshotFrameTruncated(t *testing.T) {
+	data, _ := EncodeSnapshotFrame(&SnapshotFrame{RequestID: "cam_1"})
+	data[3] = 200 // request_id 长度超出数据
+
+	_, err := DecodeSnapshotFrame(data)
+	assert.Error(t, err)
+}
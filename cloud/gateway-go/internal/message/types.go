@@ -80,7 +80,20 @@ type ClientRegisterData struct {
 
 // VehicleRegisterData 车载服务注册数据
 type VehicleRegisterData struct {
-	VehicleID string `json:"vehicle_id"`
+	VehicleID    string              `json:"vehicle_id"`
+	Capabilities VehicleCapabilities `json:"capabilities"`
+}
+
+// VehicleCapabilities 车载服务能力
+type VehicleCapabilities struct {
+	// BinarySnapshot 车载支持的二进制快照帧版本，0表示只支持JSON+base64
+	BinarySnapshot int `json:"binary_snapshot,omitempty"`
+}
+
+// RegisterAckData 注册确认数据
+type RegisterAckData struct {
+	// BinarySnapshot 网关接受的二进制快照帧版本，0表示使用JSON+base64
+	BinarySnapshot int `json:"binary_snapshot"`
 }
 
 // HeartbeatData 心跳数据
@@ -0,0 +1,75 @@
+"""
+基准测试 - 连通域色块提取 vs findContours + contourArea 循环
+
+在合成掩码（320x240，随机分布若干色块和噪点）上对比找最大色块的两种方式：
+1. findContours + Python循环逐个 contourArea，再对最大轮廓求 moments（原实现）
+2. HiwonderSDK.Blob.largest_blob（connectedComponentsWithStats，一次C层调用）
+
+同时检查两种方式找到的质心是否一致。
+
+运行: python tests/benchmarks/bench_blob_extraction.py
+"""
+
+import os
+import sys
+import timeit
+
+import cv2
+import numpy as np
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../TurboPi'))
+
+import HiwonderSDK.Blob as Blob
+
+N = 500
+
+
+def make_mask(blobs: int, noise: int, seed: int = 0):
+    """生成带若干色块和噪点的掩码"""
+    rng = np.random.default_rng(seed)
+    mask = np.zeros((240, 320), dtype=np.uint8)
+    for _ in range(blobs):
+        center = (int(rng.integers(20, 300)), int(rng.integers(20, 220)))
+        cv2.circle(mask, center, int(rng.integers(5, 30)), 255, -1)
+    ys = rng.integers(0, 240, noise)
+    xs = rng.integers(0, 320, noise)
+    mask[ys, xs] = 255
+    return mask
+
+
+def contour_loop(mask):
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    max_area = 0
+    max_contour = None
+    for contour in contours:
+        area = cv2.contourArea(contour)
+        if area > max_area:
+            max_area = area
+            max_contour = contour
+    if max_contour is None:
+        return None
+    m = cv2.moments(max_contour)
+    return m['m10'] / m['m00'], m['m01'] / m['m00']
+
+
+def connected_components(mask):
+    blob = Blob.largest_blob(mask)
+    return blob.center if blob is not None else None
+
+
+def main():
+    print(f"{'场景':<16}{'轮廓循环 us':>12}{'连通域 us':>12}{'加速比':>8}{'质心偏差':>10}")
+    for name, blobs, noise in (('单个色块', 1, 0), ('10个色块', 10, 0),
+                               ('10个色块+噪点', 10, 500), ('50个色块+噪点', 50, 2000)):
+        mask = make_mask(blobs, noise)
+        t_contour = timeit.timeit(lambda: contour_loop(mask), number=N) / N
+        t_blob = timeit.timeit(lambda: connected_components(mask), number=N) / N
+        a, b = contour_loop(mask), connected_components(mask)
+        diff = np.hypot(a[0] - b[0], a[1] - b[1]) if a and b else float('nan')
+        print(f"{name:<16}{t_contour * 1e6:>12.1f}{t_blob * 1e6:>12.1f}"
+              f"{t_contour / t_blob:>7.1f}x{diff:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
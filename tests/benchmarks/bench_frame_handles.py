@@ -0,0 +1,74 @@
+"""
+基准测试 - 只读帧句柄 vs 加锁复制
+
+对比视觉调用获取最新帧的两种方式（320x240x3）：
+1. 加锁后 copy()（原 _read_frame / get_latest_frame）
+2. 读取 FrameSlot.latest（新实现，只读数组，不复制）
+
+统计每次获取的耗时和内存分配量（tracemalloc）。
+后台有一个30fps的发布线程，模拟相机读取线程。
+
+运行: python tests/benchmarks/bench_frame_handles.py
+"""
+
+import os
+import sys
+import threading
+import time
+import timeit
+import tracemalloc
+
+import numpy as np
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../vehicle'))
+
+from core.frame import FrameSlot
+
+N = 20000
+
+
+def main():
+    lock = threading.Lock()
+    shared = {'frame': np.zeros((240, 320, 3), dtype=np.uint8)}
+    slot = FrameSlot()
+    slot.publish(np.zeros((240, 320, 3), dtype=np.uint8))
+
+    running = True
+
+    def camera():
+        while running:
+            image = np.zeros((240, 320, 3), dtype=np.uint8)
+            with lock:
+                shared['frame'] = image
+            slot.publish(image.copy())
+            time.sleep(1 / 30)
+
+    writer = threading.Thread(target=camera, daemon=True)
+    writer.start()
+
+    def copy_under_lock():
+        with lock:
+            return shared['frame'].copy()
+
+    def read_handle():
+        frame = slot.latest
+        return frame.image
+
+    print(f"{'方式':<18}{'us/次':>10}{'分配KB/次':>12}")
+    for name, fn in (('加锁复制', copy_under_lock), ('只读帧句柄', read_handle)):
+        elapsed = timeit.timeit(fn, number=N)
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        kept = [fn() for _ in range(200)]
+        allocated = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        del kept
+        print(f"{name:<18}{elapsed / N * 1e6:>10.2f}{allocated / 200 / 1024:>12.1f}")
+
+    running = False
+    writer.join()
+
+
+if __name__ == '__main__':
+    main()
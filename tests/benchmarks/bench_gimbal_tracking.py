@@ -0,0 +1,198 @@
+"""
+基准测试 - 云台颜色跟踪的延迟与CPU占用
+
+用合成画面（红色色块沿正弦轨迹移动，30fps）对比两种跟踪方式：
+1. 轮询（原 TurboPi/Functions/ColorTracking）：检测结果写入全局变量，
+   另一个线程每10ms更新一次PID并写两个舵机
+2. 按帧更新（新实现 GimbalTracker）：每个新帧检测一次，只在有新结果时更新PID，
+   角度不变时不写舵机
+
+舵机写入只计数不访问硬件。统计：
+- 延迟：帧发布到基于该帧结果的舵机指令发出的时间
+- CPU：进程CPU时间 / 墙钟时间
+- 舵机写入次数
+
+运行: python tests/benchmarks/bench_gimbal_tracking.py
+"""
+
+import math
+import os
+import sys
+import threading
+import time
+
+import cv2
+import numpy as np
+
+# 添加项目路径
+ROOT = os.path.join(os.path.dirname(__file__), '../..')
+sys.path.insert(0, os.path.join(ROOT, 'vehicle'))
+sys.path.insert(0, os.path.join(ROOT, 'TurboPi'))
+
+import HiwonderSDK.PID as PID
+from core.visual_servo import VisualServo
+
+WIDTH, HEIGHT = 320, 240
+FPS = 30
+DURATION = 5.0
+
+KERNEL = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
+
+
+def make_frames(count: int):
+    """生成色块沿正弦轨迹移动的画面"""
+    frames = []
+    for i in range(count):
+        frame = np.full((HEIGHT, WIDTH, 3), 40, dtype=np.uint8)
+        x = int(WIDTH / 2 + 100 * math.sin(i * 2 * math.pi / 90))
+        y = int(HEIGHT / 2 + 60 * math.sin(i * 2 * math.pi / 150))
+        cv2.circle(frame, (x, y), 20, (0, 0, 220), -1)
+        frames.append(frame)
+    return frames
+
+
+def detect_red(frame):
+    """与 VisionController 相同的检测流程，返回 (x, y) 或 None"""
+    hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+    mask = cv2.bitwise_or(cv2.inRange(hsv, (0, 100, 100), (10, 255, 255)),
+                          cv2.inRange(hsv, (170, 100, 100), (180, 255, 255)))
+    mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, KERNEL)
+    mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, KERNEL)
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    if not contours:
+        return None
+    c = max(contours, key=cv2.contourArea)
+    m = cv2.moments(c)
+    if m['m00'] <= 0:
+        return None
+    return m['m10'] / m['m00'], m['m01'] / m['m00']
+
+
+class FrameSource:
+    """以固定帧率发布画面的相机模拟"""
+
+    def __init__(self, frames):
+        self._frames = frames
+        self.lock = threading.Lock()
+        self.frame = None
+        self.seq = 0
+        self.stamp = 0.0
+        self.running = True
+
+    def run(self):
+        interval = 1.0 / FPS
+        next_t = time.perf_counter()
+        i = 0
+        while self.running:
+            with self.lock:
+                self.frame = self._frames[i % len(self._frames)]
+                self.seq += 1
+                self.stamp = time.perf_counter()
+            i += 1
+            next_t += interval
+            time.sleep(max(0.0, next_t - time.perf_counter()))
+
+    def latest(self):
+        with self.lock:
+            return self.seq, self.frame, self.stamp
+
+
+def run_polling(source: FrameSource, stop: threading.Event, stats: dict):
+    """原实现：检测线程 + 10ms舵机线程"""
+    shared = {'center': None, 'stamp': 0.0, 'used': True}
+
+    def detect_loop():
+        last = 0
+        while not stop.is_set():
+            seq, frame, stamp = source.latest()
+            if seq == last:
+                time.sleep(0.001)
+                continue
+            last = seq
+            center = detect_red(frame)
+            shared['center'], shared['stamp'], shared['used'] = center, stamp, False
+
+    def move_loop():
+        x_pid = PID.PID(P=0.06, I=0.0003, D=0.0006)
+        y_pid = PID.PID(P=0.06, I=0.0003, D=0.0006)
+        servo_x, servo_y = 1500, 1500
+        while not stop.is_set():
+            center = shared['center']
+            if center is not None:
+                x_pid.SetPoint = WIDTH / 2
+                x_pid.update(center[0])
+                servo_x = max(800, min(2200, servo_x + int(x_pid.output)))
+                y_pid.SetPoint = HEIGHT / 2
+                y_pid.update(center[1])
+                servo_y = max(1200, min(1900, servo_y - int(y_pid.output)))
+                stats['writes'] += 2
+                if not shared['used']:
+                    shared['used'] = True
+                    stats['latency'].append(time.perf_counter() - shared['stamp'])
+            time.sleep(0.01)
+
+    threads = [threading.Thread(target=detect_loop), threading.Thread(target=move_loop)]
+    for t in threads:
+        t.start()
+    return threads
+
+
+def run_per_frame(source: FrameSource, stop: threading.Event, stats: dict):
+    """新实现：每个新帧检测一次，合并写入"""
+    servo = VisualServo()
+
+    def loop():
+        last = 0
+        h = v = 90
+        while not stop.is_set():
+            seq, frame, stamp = source.latest()
+            if seq == last:
+                stop.wait(0.005)
+                continue
+            last = seq
+            center = detect_red(frame)
+            if center is None:
+                continue
+            nh, nv = servo.update(h, v, center, (WIDTH, HEIGHT))
+            nh, nv = round(nh), round(nv)
+            if (nh, nv) != (h, v):
+                h, v = nh, nv
+                stats['writes'] += 1
+            stats['latency'].append(time.perf_counter() - stamp)
+
+    thread = threading.Thread(target=loop)
+    thread.start()
+    return [thread]
+
+
+def measure(name, runner, frames):
+    source = FrameSource(frames)
+    stop = threading.Event()
+    stats = {'writes': 0, 'latency': []}
+    camera = threading.Thread(target=source.run)
+    camera.start()
+
+    wall0, cpu0 = time.perf_counter(), time.process_time()
+    threads = runner(source, stop, stats)
+    time.sleep(DURATION)
+    stop.set()
+    for t in threads:
+        t.join()
+    wall, cpu = time.perf_counter() - wall0, time.process_time() - cpu0
+    source.running = False
+    camera.join()
+
+    latency = np.array(stats['latency']) * 1000
+    print(f"{name:<14}{np.mean(latency):>10.2f}{np.percentile(latency, 95):>10.2f}"
+          f"{cpu / wall * 100:>9.1f}%{stats['writes'] / wall:>12.1f}")
+
+
+def main():
+    frames = make_frames(450)
+    print(f"{'方式':<14}{'平均延迟ms':>10}{'P95延迟ms':>10}{'CPU':>10}{'舵机写入/秒':>12}")
+    measure('轮询 10ms', run_polling, frames)
+    measure('按帧更新', run_per_frame, frames)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+基准测试 - HAL调用跟踪 vs 每次调用 logger.info
+
+对比三种方式记录一次 qianjin(speed) 调用的开销：
+1. logger.info(f"...")，INFO级别，输出到处理器（原实现）
+2. logger.debug(f"...")，DEBUG未开启（f-string仍会被格式化）
+3. hal_trace.record(op, speed)（新实现）
+
+运行: python tests/benchmarks/bench_hal_trace.py
+"""
+
+import io
+import logging
+import os
+import sys
+import timeit
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../vehicle'))
+
+from core.trace import TraceRing
+
+N = 200000
+
+
+def main():
+    logger = logging.getLogger('bench.hal')
+    logger.propagate = False
+    handler = logging.StreamHandler(io.StringIO())
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    logger.addHandler(handler)
+
+    ring = TraceRing(4096)
+    op = ring.register_op('qianjin', ('speed',))
+    speed = 50
+
+    def log_info():
+        logger.info(f"前进: 速度={speed}")
+
+    def log_debug_disabled():
+        logger.debug(f"前进: 速度={speed}")
+
+    def trace_record():
+        ring.record(op, speed)
+
+    logger.setLevel(logging.INFO)
+    results = [
+        ('logger.info (handler)', timeit.timeit(log_info, number=N)),
+        ('logger.debug (disabled)', timeit.timeit(log_debug_disabled, number=N)),
+        ('hal_trace.record', timeit.timeit(trace_record, number=N)),
+    ]
+
+    base = results[0][1]
+    print(f"{'方式':<26}{'ns/调用':>10}{'加速比':>10}")
+    for name, total in results:
+        print(f"{name:<26}{total / N * 1e9:>10.0f}{base / total:>9.1f}x")
+
+    # 导出开销只在需要时付出
+    export = timeit.timeit(lambda: ring.snapshot(200), number=100)
+    print(f"\n导出200条记录: {export / 100 * 1e3:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+基准测试 - 摄像头快照传输：JSON+base64 vs 二进制快照帧
+
+对比车载端发送一张快照的两种格式：
+1. JSON+base64（原 camera_snapshot_response）
+2. 二进制快照帧（固定头部 + request_id + JPEG原始字节）
+
+统计每种格式的消息大小、车载端编码耗时，以及在限速链路上的估算延迟：
+延迟 = 编码耗时 + 单程时延 + 消息大小 / 带宽。
+JPEG数据用随机字节代替（与JPEG一样不可压缩），大小覆盖常见的320x240快照。
+
+运行: python tests/benchmarks/bench_snapshot_transport.py
+"""
+
+import base64
+import json
+import os
+import sys
+import time
+import timeit
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../vehicle'))
+
+from connection.snapshot_frame import encode_snapshot_frame, decode_snapshot_frame
+
+N = 2000
+REQUEST_ID = 'cam_1700000000000000000'
+JPEG_SIZES_KB = (10, 25, 40)
+# (名称, 带宽 bit/s, 单程时延 s)
+LINKS = (
+    ('512kbps/100ms', 512_000, 0.100),
+    ('2Mbps/50ms', 2_000_000, 0.050),
+    ('10Mbps/20ms', 10_000_000, 0.020),
+)
+
+
+def encode_json(jpeg: bytes) -> bytes:
+    return json.dumps({
+        'type': 'camera_snapshot_response',
+        'data': {'request_id': REQUEST_ID, 'image': base64.b64encode(jpeg).decode('ascii')},
+        'vehicle_id': 'vehicle-001',
+        'timestamp': int(time.time()),
+    }).encode('utf-8')
+
+
+def encode_binary(jpeg: bytes) -> bytes:
+    return encode_snapshot_frame(REQUEST_ID, 1234, int(time.time() * 1000), 320, 240, jpeg)
+
+
+def main():
+    # 确认编码结果可以解回原始JPEG
+    sample = os.urandom(1024)
+    assert decode_snapshot_frame(encode_binary(sample)).jpeg == sample
+
+    for size_kb in JPEG_SIZES_KB:
+        jpeg = os.urandom(size_kb * 1024)
+        print(f"\nJPEG {size_kb} KB")
+        print(f"{'格式':<14}{'消息KB':>10}{'编码us':>10}" + ''.join(f"{name:>16}" for name, _, _ in LINKS))
+        for name, fn in (('JSON+base64', encode_json), ('二进制帧', encode_binary)):
+            size = len(fn(jpeg))
+            encode_s = timeit.timeit(lambda: fn(jpeg), number=N) / N
+            latencies = [encode_s + delay + size * 8 / bandwidth for _, bandwidth, delay in LINKS]
+            print(f"{name:<14}{size / 1024:>10.1f}{encode_s * 1e6:>10.1f}"
+                  + ''.join(f"{lat * 1000:>14.1f}ms" for lat in latencies))
+
+
+if __name__ == '__main__':
+    main()
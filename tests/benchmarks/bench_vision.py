@@ -0,0 +1,502 @@
+"""
+基准测试 - 视觉流水线
+
+离线测量各视觉阶段的耗时，不需要摄像头：
+- 车载视觉（VisionController 离线模式）：LAB分类、颜色掩码、色块提取、
+  单色检测、同一帧多色检测、JPEG编码、摄像头巡线、运动检测、
+  畸变矫正（映射表加载/整个画面/区域）、二维码识别（整个画面/跟踪区域）、
+  人脸/手部模型推理（需要 mediapipe）、手势分类
+- TurboPi 玩法的 run(img)：ColorDetect、ColorWarning、LineFollower、VisualPatrol
+  （硬件对象被替换为空设备，测试期间不会驱动电机、舵机、蜂鸣器和灯）
+
+输入为合成场景（色块、巡线轨迹、二维码、噪声、光照变化，见 scenes.py），
+也可以加入录像（视频文件或图片目录）。每个阶段报告平均/P95耗时、FPS和
+每次调用的内存分配峰值（tracemalloc）。
+
+与基线比较时，任何阶段的平均耗时超过基线 (1 + 容差) 倍，或基线中的阶段
+没有结果（出错或被跳过），退出码为1，可用于CI。
+
+只导入视觉相关的HAL模块（不执行 hal/__init__），玩法的硬件SDK模块替换为空设备，
+不需要树莓派的硬件库，在小车上运行也不会创建电机/云台控制器。
+基线与设备相关，应在参考设备（小车上的树莓派）上记录。
+
+运行:
+    python tests/benchmarks/bench_vision.py
+    python tests/benchmarks/bench_vision.py --clip recordings/track.mp4
+    python tests/benchmarks/bench_vision.py --save-baseline
+    python tests/benchmarks/bench_vision.py --check --tolerance 0.3
+"""
+
+import argparse
+import importlib
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+import types
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+VEHICLE = os.path.join(HERE, '../../vehicle')
+TURBOPI = os.path.join(HERE, '../../TurboPi')
+
+# 添加项目路径
+sys.path.insert(0, VEHICLE)
+sys.path.insert(0, os.path.join(TURBOPI, 'Functions'))
+sys.path.insert(0, TURBOPI)
+sys.path.insert(0, HERE)
+
+# 离线模式：视觉控制器不打开摄像头
+os.environ.setdefault('CAMERA_ENABLED', 'false')
+os.environ.setdefault('TURBOPI_PATH', TURBOPI)
+
+# 只导入视觉相关的HAL模块：hal 包注册为不执行 __init__ 的包，
+# 不加载电机/舵机/传感器控制器（需要 RPi.GPIO，在小车上还会创建全局硬件对象并驱动云台）
+_hal = types.ModuleType('hal')
+_hal.__path__ = [os.path.join(VEHICLE, 'hal')]
+sys.modules.setdefault('hal', _hal)
+
+import scenes
+
+DEFAULT_BASELINE = os.path.join(HERE, 'baselines', 'vision.json')
+
+# 车载画面尺寸与 TurboPi 玩法的画面尺寸
+VEHICLE_SIZE = (320, 240)
+FUNCTION_SIZE = (640, 480)
+
+COLOR_SCENES = ('blobs', 'noise', 'dark', 'bright')
+
+
+# ===== 阶段注册 =====
+
+class Stage:
+    """一个被测阶段
+
+    prepare(ctx, image) 在计时之外准备输入，run(ctx, arg) 是被计时的部分。
+    """
+
+    def __init__(self, name: str, run: Callable, scene_names: Tuple[str, ...],
+                 prepare: Optional[Callable] = None, size: Tuple[int, int] = VEHICLE_SIZE):
+        self.name = name
+        self.run = run
+        self.scene_names = scene_names
+        self.prepare = prepare or (lambda ctx, image: image)
+        self.size = size
+
+
+STAGES: List[Stage] = []
+
+
+def stage(name: str, scene_names: Tuple[str, ...] = COLOR_SCENES,
+          prepare: Optional[Callable] = None, size: Tuple[int, int] = VEHICLE_SIZE):
+    """注册阶段的装饰器"""
+    def register(fn):
+        STAGES.append(Stage(name, fn, scene_names, prepare, size))
+        return fn
+    return register
+
+
+class Context:
+    """阶段共用的被测对象（按需创建）"""
+
+    def __init__(self):
+        self._vision = None
+        self._seq = 0
+
+    @property
+    def vision(self):
+        if self._vision is None:
+            from hal.vision_controller import VisionController
+            self._vision = VisionController(open_camera=False)
+        return self._vision
+
+    def next_seq(self) -> int:
+        self._seq += 1
+        return self._seq
+
+
+# ===== 车载视觉 =====
+
+def _bits(ctx, image):
+    from hal.vision_controller import color_model
+    model = color_model.snapshot()
+    return model, ctx.vision._classify(image, model)
+
+
+def _mask(ctx, image):
+    model, bits = _bits(ctx, image)
+    return ctx.vision._mask_from_bits(bits, model, 'hong')
+
+
+@stage('vision.classify', prepare=lambda ctx, image: (image, _bits(ctx, image)[0]))
+def _classify(ctx, arg):
+    image, model = arg
+    return ctx.vision._classify(image, model)
+
+
+@stage('vision.mask', prepare=_bits)
+def _mask_from_bits(ctx, arg):
+    model, bits = arg
+    return ctx.vision._mask_from_bits(bits, model, 'hong')
+
+
+@stage('vision.find_blob', prepare=_mask)
+def _find_blob(ctx, mask):
+    return ctx.vision._find_blob(mask)
+
+
+@stage('vision.detect_color')
+def _detect_color(ctx, image):
+    return ctx.vision._detect_color_in_frame(image, 'hong')
+
+
+@stage('vision.detect_all')
+def _detect_all(ctx, image):
+    # 同一帧检测所有颜色（shibieyanse_duo 的计算量），分类结果在帧内复用
+    from hal.vision_controller import available_colors
+    frame_id = ctx.next_seq()
+    return [ctx.vision._detect_color_in_frame(image, c, frame_id) for c in available_colors()]
+
+
+def _frame_handle(ctx, image):
+    from core.frame import FrameHandle
+    return FrameHandle(ctx.next_seq(), image.copy())
+
+
+@stage('stream.jpeg', scene_names=('blobs', 'noise'), prepare=_frame_handle)
+def _jpeg(ctx, frame):
+    from stream.jpeg_cache import JpegCache
+    return JpegCache().get_image(frame)
+
+
+@stage('line.track', scene_names=('line', 'noise'), prepare=_frame_handle)
+def _line_track(ctx, frame):
+    # 摄像头巡线：只处理ROI行 + 列投影
+    from hal.camera_line_tracker import camera_line_tracker
+    return camera_line_tracker._line_task(frame, 'hei')
+
+
+@stage('motion.detect', scene_names=('blobs', 'noise'), prepare=_frame_handle)
+def _motion_detect(ctx, frame):
+    # 运动检测：缩小灰度图 + 背景差分（每次调用都是新帧，背景逐帧更新）
+    from hal.motion_detector import motion_detector
+    return motion_detector.task(frame)
+
+
+@stage('undistort.load_maps', scene_names=('blobs',))
+def _undistort_load(ctx, image):
+    # 矫正映射表：从磁盘缓存映射（第一次预热时计算并写入缓存）
+    import HiwonderSDK.Undistort as Undistort
+    from hal.vision_controller import CALIBRATION_PATH
+    return Undistort.UndistortMaps(CALIBRATION_PATH, (image.shape[1], image.shape[0]))
+
+
+@stage('undistort.full', scene_names=('blobs',), prepare=_frame_handle)
+def _undistort_full(ctx, frame):
+    return ctx.vision.get_undistort_maps(frame.size).remap(frame.image)
+
+
+@stage('undistort.roi', scene_names=('blobs',), prepare=_frame_handle)
+def _undistort_roi(ctx, frame):
+    # 只矫正画面下三分之一（巡线ROI所在的区域）
+    return ctx.vision.undistort_roi(frame, (0, frame.height * 2 // 3, frame.width, frame.height // 3))
+
+
+@stage('qr.decode', scene_names=('qr',))
+def _qr_decode(ctx, image):
+    from hal.qr_reader import decode_qr
+    h, w = image.shape[:2]
+    return decode_qr(image, (0, 0, w, h))
+
+
+def _qr_region(ctx, image):
+    # 先在整个画面识别一次，得到跟踪区域
+    from core.roi import RoiTracker
+    from hal.qr_reader import decode_qr
+    h, w = image.shape[:2]
+    tracker = RoiTracker()
+    result = decode_qr(image, (0, 0, w, h))
+    if result is not None:
+        tracker.hit(result.rect)
+    return image, tracker.region(w, h)
+
+
+@stage('qr.decode_roi', scene_names=('qr',), prepare=_qr_region)
+def _qr_decode_roi(ctx, arg):
+    from hal.qr_reader import decode_qr
+    image, region = arg
+    return decode_qr(image, region)
+
+
+def _inference_stage(kind: str):
+    # 缩小、转RGB和推理（与推理线程处理一帧相同），模型第一次使用时加载
+    def run(ctx, frame):
+        from hal.inference_worker import inference_worker
+        model = inference_worker._models[kind]
+        if not inference_worker._ensure_loaded(model):
+            raise RuntimeError(model.error)
+        inference_worker.step(frame, [model])
+    return run
+
+
+for _kind in ('face', 'hand'):
+    STAGES.append(Stage(f'inference.{_kind}', _inference_stage(_kind), ('blobs',), _frame_handle))
+
+
+def _landmarks(ctx, image):
+    # 两只手 x 5帧的随机关键点（手势分类的计算量与画面内容无关）
+    rng = np.random.default_rng(ctx.next_seq())
+    return rng.uniform(0, image.shape[1], (5, 2, 21, 2)).astype(np.float32)
+
+
+@stage('gesture.classify', scene_names=('blobs',), prepare=_landmarks)
+def _gesture_classify(ctx, landmarks):
+    from HiwonderSDK.Gesture import classify_landmarks
+    return classify_landmarks(landmarks)
+
+
+# ===== TurboPi 玩法 =====
+
+class _NullDevice:
+    """吸收所有硬件调用"""
+
+    def __getattr__(self, name):
+        return self
+
+    def __call__(self, *args, **kwargs):
+        return self
+
+
+# 玩法导入的硬件SDK模块（导入时就会打开GPIO/I2C），导入玩法前替换为空设备
+HARDWARE_MODULES = ('HiwonderSDK.Board', 'HiwonderSDK.mecanum', 'HiwonderSDK.FourInfrared')
+
+
+class _NullModule(types.ModuleType):
+    """所有属性都是空设备的模块"""
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return _NullDevice()
+
+
+def _install_null_hardware():
+    """替换硬件SDK模块，配置文件改用仓库中的 TurboPi 配置（玩法默认读取 /home/pi/TurboPi）"""
+    import HiwonderSDK
+    for name in HARDWARE_MODULES:
+        if not isinstance(sys.modules.get(name), _NullModule):
+            module = sys.modules[name] = _NullModule(name)
+            setattr(HiwonderSDK, name.rsplit('.', 1)[1], module)
+
+    import yaml_handle
+    yaml_handle.lab_file_path = os.path.join(TURBOPI, 'lab_config.yaml')
+    yaml_handle.servo_file_path = os.path.join(TURBOPI, 'servo_config.yaml')
+
+
+# 玩法 -> (场景, 目标颜色)
+FUNCTIONS = {
+    'ColorDetect': (COLOR_SCENES, ('red', 'green', 'blue')),
+    'ColorWarning': (COLOR_SCENES, ('red', 'green', 'blue')),
+    'LineFollower': (('line',), ('black',)),
+    'VisualPatrol': (('line',), ('black',)),
+}
+
+_function_modules: Dict[str, object] = {}
+
+
+def load_function(name: str):
+    """导入玩法模块并替换硬件对象，失败时抛出异常"""
+    if name not in _function_modules:
+        _install_null_hardware()
+        module = importlib.import_module(name)
+        for attr in ('Board', 'car', 'infrared'):
+            if hasattr(module, attr):
+                setattr(module, attr, _NullDevice())
+        if hasattr(module, 'load_config'):
+            module.load_config()
+        module.start()
+        if hasattr(module, 'setTargetColor'):
+            module.setTargetColor(FUNCTIONS[name][1])
+        _function_modules[name] = module
+    return _function_modules[name]
+
+
+def _function_stage(name: str):
+    def run(ctx, image):
+        return load_function(name).run(image)
+    return run
+
+
+for _name, (_scenes, _) in FUNCTIONS.items():
+    STAGES.append(Stage(f'function.{_name}.run', _function_stage(_name), _scenes, size=FUNCTION_SIZE))
+
+
+# ===== 测量 =====
+
+def measure(ctx: Context, st: Stage, frames: List[np.ndarray], repeat: int) -> dict:
+    """测量一个阶段在一组帧上的耗时和内存分配"""
+    args = [st.prepare(ctx, f) for f in frames]
+
+    # 预热
+    for arg in args[:3]:
+        st.run(ctx, arg)
+
+    times = []
+    for _ in range(repeat):
+        args = [st.prepare(ctx, f) for f in frames]
+        for arg in args:
+            t0 = time.perf_counter()
+            st.run(ctx, arg)
+            times.append(time.perf_counter() - t0)
+
+    # 内存分配单独测量（tracemalloc 会拖慢执行）
+    peaks = []
+    args = [st.prepare(ctx, f) for f in frames]
+    tracemalloc.start()
+    for arg in args:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        st.run(ctx, arg)
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+
+    times_ms = np.array(times) * 1000
+    mean = float(times_ms.mean())
+    return {
+        'mean_ms': round(mean, 3),
+        'p95_ms': round(float(np.percentile(times_ms, 95)), 3),
+        'fps': round(1000 / mean, 1) if mean > 0 else None,
+        'alloc_kb': round(float(np.mean(peaks)) / 1024, 1),
+        'calls': len(times),
+    }
+
+
+def run_all(clip: Optional[str], repeat: int, only: Optional[str]) -> Tuple[Dict[str, dict], Dict[str, str]]:
+    """运行选中的阶段
+
+    Returns:
+        (结果, 失败的阶段|场景 -> 错误信息)
+    """
+    ctx = Context()
+    frames_by_size = {}
+    results = {}
+    failed = {}
+
+    for st in STAGES:
+        if only and only not in st.name:
+            continue
+        if st.size not in frames_by_size:
+            frames = scenes.make_scenes(st.size)
+            if clip:
+                frames['clip'] = scenes.load_clip(clip, st.size)
+            frames_by_size[st.size] = frames
+        frames = frames_by_size[st.size]
+
+        names = [n for n in st.scene_names if n in frames]
+        if clip and frames.get('clip'):
+            names.append('clip')
+        for scene in names:
+            key = f"{st.name}|{scene}"
+            try:
+                results[key] = measure(ctx, st, frames[scene], repeat)
+            except Exception as e:
+                failed[key] = f"{type(e).__name__}: {e}"
+                print(f"跳过 {key}: {failed[key]}")
+    return results, failed
+
+
+def expected_keys(baseline: Dict[str, float], clip: Optional[str], only: Optional[str]) -> List[str]:
+    """本次运行应当产生结果的基线条目（--only 未选中的阶段和没有提供录像时的录像条目除外）"""
+    keys = []
+    for key in baseline:
+        name, _, scene = key.partition('|')
+        if only and only not in name:
+            continue
+        if scene == 'clip' and not clip:
+            continue
+        keys.append(key)
+    return keys
+
+
+def print_table(results: Dict[str, dict], baseline: Optional[Dict[str, float]] = None):
+    print(f"{'阶段|场景':<40}{'平均ms':>10}{'P95ms':>10}{'FPS':>10}{'分配KB':>10}{'基线比':>10}")
+    for key, r in results.items():
+        ratio = ''
+        if baseline and key in baseline and baseline[key] > 0:
+            ratio = f"{r['mean_ms'] / baseline[key]:.2f}"
+        fps = f"{r['fps']:.1f}" if r['fps'] else '-'
+        print(f"{key:<40}{r['mean_ms']:>10.3f}{r['p95_ms']:>10.3f}{fps:>10}{r['alloc_kb']:>10.1f}{ratio:>10}")
+
+
+def machine_info() -> dict:
+    import cv2
+    return {
+        'machine': platform.machine(),
+        'node': platform.node(),
+        'python': platform.python_version(),
+        'opencv': cv2.__version__,
+        'numpy': np.__version__,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='视觉流水线基准测试')
+    parser.add_argument('--clip', help='录像：视频文件或图片目录')
+    parser.add_argument('--repeat', type=int, default=5, help='每组帧重复次数')
+    parser.add_argument('--only', help='只运行名称包含该字符串的阶段')
+    parser.add_argument('--json', help='把结果写入JSON文件')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='基线文件')
+    parser.add_argument('--save-baseline', action='store_true', help='把本次结果记录为基线')
+    parser.add_argument('--check', action='store_true', help='与基线比较，变慢超过容差或缺少结果时退出码为1')
+    parser.add_argument('--tolerance', type=float, default=0.3, help='允许变慢的比例')
+    args = parser.parse_args()
+
+    results, failed = run_all(args.clip, args.repeat, args.only)
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+        baseline = saved.get('results', {})
+        if saved.get('machine', {}).get('machine') != platform.machine():
+            print(f"注意: 基线记录于 {saved.get('machine')}，与本机不同")
+
+    print_table(results, baseline)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'machine': machine_info(), 'results': results}, f, indent=2, ensure_ascii=False)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({'machine': machine_info(),
+                       'results': {k: r['mean_ms'] for k, r in results.items()}},
+                      f, indent=2, ensure_ascii=False, sort_keys=True)
+        print(f"基线已保存: {args.baseline}")
+
+    if args.check:
+        if baseline is None:
+            print(f"没有基线文件: {args.baseline}（先在参考设备上运行 --save-baseline）")
+            sys.exit(2)
+        regressions = [
+            (key, r['mean_ms'], baseline[key]) for key, r in results.items()
+            if key in baseline and r['mean_ms'] > baseline[key] * (1 + args.tolerance)
+        ]
+        for key, now, base in regressions:
+            print(f"性能回归: {key} {base:.3f}ms -> {now:.3f}ms")
+        # 基线中有、本次没有结果的阶段（出错、被跳过或已删除）同样视为回归
+        missing = [key for key in expected_keys(baseline, args.clip, args.only) if key not in results]
+        for key in missing:
+            print(f"没有结果: {key}（{failed.get(key, '阶段不存在')}）")
+        if regressions or missing:
+            sys.exit(1)
+        print(f"未发现性能回归（容差 {args.tolerance:.0%}）")
+
+
+if __name__ == '__main__':
+    main()
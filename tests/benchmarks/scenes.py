@@ -0,0 +1,130 @@
+"""
+基准测试 - 合成场景与录像帧
+
+为视觉基准测试生成可重复的测试画面（固定随机种子）：
+- blobs: 浅灰地面上的红/绿/蓝色块
+- line: 白色地面上弯曲的黑色巡线轨迹
+- qr: 画面中的二维码（OpenCV 没有二维码编码器时跳过）
+- noise: 色块场景叠加高斯噪声
+- dark / bright: 色块场景整体变暗/变亮（光照变化）
+
+录像可以是视频文件或图片目录，load_clip() 按顺序读出若干帧。
+"""
+
+import os
+from typing import Dict, Iterator, List, Tuple
+
+import cv2
+import numpy as np
+
+# 色块颜色（BGR），落在 lab_config.yaml 对应颜色的LAB范围内
+BLOB_COLORS = {
+    'red': (0, 0, 220),
+    'green': (40, 180, 40),
+    'blue': (200, 60, 0),
+}
+
+
+def blobs(size: Tuple[int, int] = (320, 240), seed: int = 0) -> np.ndarray:
+    """浅灰地面上随机分布的色块"""
+    w, h = size
+    rng = np.random.default_rng(seed)
+    img = np.full((h, w, 3), 170, dtype=np.uint8)
+    for color in BLOB_COLORS.values():
+        for _ in range(2):
+            center = (int(rng.integers(w // 8, w * 7 // 8)), int(rng.integers(h // 8, h * 7 // 8)))
+            radius = int(rng.integers(w // 32, w // 10))
+            cv2.circle(img, center, radius, color, -1)
+    return img
+
+
+def line(size: Tuple[int, int] = (320, 240), seed: int = 0) -> np.ndarray:
+    """白色地面上的弯曲黑线（从画面底部延伸到顶部）"""
+    w, h = size
+    rng = np.random.default_rng(seed)
+    img = np.full((h, w, 3), 230, dtype=np.uint8)
+    phase = rng.uniform(0, np.pi)
+    ys = np.arange(h)
+    xs = w / 2 + (w / 5) * np.sin(ys / h * np.pi + phase)
+    points = np.stack([xs, ys], axis=1).astype(np.int32)
+    cv2.polylines(img, [points], False, (20, 20, 20), max(4, w // 20))
+    return img
+
+
+def qr(size: Tuple[int, int] = (320, 240), seed: int = 0) -> np.ndarray:
+    """画面中央的二维码，OpenCV 不支持编码时返回None"""
+    encoder = getattr(cv2, 'QRCodeEncoder', None)
+    if encoder is None:
+        return None
+    w, h = size
+    code = encoder.create().encode(f'blockly-{seed}')
+    side = min(w, h) * 2 // 3
+    code = cv2.resize(code, (side, side), interpolation=cv2.INTER_NEAREST)
+    img = np.full((h, w, 3), 200, dtype=np.uint8)
+    y0, x0 = (h - side) // 2, (w - side) // 2
+    img[y0:y0 + side, x0:x0 + side] = cv2.cvtColor(code, cv2.COLOR_GRAY2BGR)
+    return img
+
+
+def noise(size: Tuple[int, int] = (320, 240), seed: int = 0) -> np.ndarray:
+    """色块场景叠加高斯噪声"""
+    rng = np.random.default_rng(seed + 1)
+    img = blobs(size, seed).astype(np.int16)
+    img += rng.normal(0, 20, img.shape).astype(np.int16)
+    return np.clip(img, 0, 255).astype(np.uint8)
+
+
+def lighting(gain: float):
+    def scene(size: Tuple[int, int] = (320, 240), seed: int = 0) -> np.ndarray:
+        return cv2.convertScaleAbs(blobs(size, seed), alpha=gain)
+    return scene
+
+
+SCENES = {
+    'blobs': blobs,
+    'line': line,
+    'qr': qr,
+    'noise': noise,
+    'dark': lighting(0.6),
+    'bright': lighting(1.4),
+}
+
+
+def make_scenes(size: Tuple[int, int] = (320, 240), count: int = 4,
+                names=None) -> Dict[str, List[np.ndarray]]:
+    """生成各场景的若干帧（不同随机种子），不支持的场景被跳过"""
+    result = {}
+    for name in names or SCENES:
+        frames = [SCENES[name](size, seed) for seed in range(count)]
+        if all(f is not None for f in frames):
+            result[name] = frames
+    return result
+
+
+def load_clip(path: str, size: Tuple[int, int] = (320, 240), limit: int = 120) -> List[np.ndarray]:
+    """读取录像：视频文件或图片目录，缩放到 size"""
+    def frames() -> Iterator[np.ndarray]:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                img = cv2.imread(os.path.join(path, name))
+                if img is not None:
+                    yield img
+        else:
+            cap = cv2.VideoCapture(path)
+            try:
+                while True:
+                    ret, img = cap.read()
+                    if not ret:
+                        break
+                    yield img
+            finally:
+                cap.release()
+
+    result = []
+    for img in frames():
+        if img.shape[1] != size[0] or img.shape[0] != size[1]:
+            img = cv2.resize(img, size, interpolation=cv2.INTER_AREA)
+        result.append(img)
+        if len(result) >= limit:
+            break
+    return result
@@ -0,0 +1,49 @@
+"""
+测试二进制摄像头快照帧
+"""
+
+import pytest
+import os
+import sys
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../vehicle'))
+
+from connection.snapshot_frame import (
+    HEADER, SNAPSHOT_FRAME_VERSION, encode_snapshot_frame, decode_snapshot_frame
+)
+
+
+class TestSnapshotFrame:
+    """测试快照帧编解码"""
+
+    def test_round_trip(self):
+        """测试编码后解码得到原始字段"""
+        jpeg = b'\xff\xd8' + bytes(range(256)) + b'\xff\xd9'
+        data = encode_snapshot_frame('cam_123', 42, 1700000000123, 320, 240, jpeg)
+        assert len(data) == HEADER.size + len('cam_123') + len(jpeg)
+
+        frame = decode_snapshot_frame(data)
+        assert frame.request_id == 'cam_123'
+        assert frame.seq == 42
+        assert frame.timestamp_ms == 1700000000123
+        assert (frame.width, frame.height) == (320, 240)
+        assert frame.jpeg == jpeg
+
+    def test_header_layout(self):
+        """测试头部布局与网关一致：魔数、版本、request_id长度"""
+        data = encode_snapshot_frame('r', 1, 0, 0, 0, b'')
+        assert HEADER.size == 20
+        assert data[:2] == b'BC'
+        assert data[2] == SNAPSHOT_FRAME_VERSION
+        assert data[3] == 1
+
+    def test_reject_json(self):
+        """测试JSON消息不会被当作快照帧"""
+        with pytest.raises(ValueError):
+            decode_snapshot_frame(b'{"type": "camera_snapshot_response", "data": {}}')
+
+    def test_request_id_too_long(self):
+        """测试request_id过长"""
+        with pytest.raises(ValueError):
+            encode_snapshot_frame('x' * 300, 1, 0, 0, 0, b'')
@@ -0,0 +1,59 @@
+"""
+测试核心组件 - 指数退避
+"""
+
+import pytest
+import os
+import sys
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../vehicle'))
+
+from core.backoff import Backoff
+
+
+class TestBackoff:
+    """测试指数退避"""
+
+    def test_growth_and_cap(self):
+        """测试等待时间逐次加倍且不超过上限"""
+        backoff = Backoff(initial=0.5, maximum=3.0, jitter=0.0)
+        delays = [backoff.next_delay() for _ in range(5)]
+        assert delays == [0.5, 1.0, 2.0, 3.0, 3.0]
+        assert backoff.attempts == 5
+
+    def test_reset(self):
+        """测试成功后回到初始等待时间"""
+        backoff = Backoff(initial=0.5, maximum=3.0, jitter=0.0)
+        backoff.next_delay()
+        backoff.next_delay()
+        backoff.reset()
+        assert backoff.next_delay() == 0.5
+
+    def test_long_outage(self):
+        """测试长时间失败（数千次）后不溢出，等待时间保持在上限"""
+        backoff = Backoff(initial=0.5, maximum=10.0, jitter=0.0)
+        for _ in range(5000):
+            delay = backoff.next_delay()
+        assert delay == 10.0
+        assert backoff.peek() == 10.0
+        assert backoff.attempts == 5000
+
+    def test_long_outage_jitter(self):
+        """测试带抖动时长时间失败后仍不超过上限"""
+        backoff = Backoff(initial=0.5, maximum=10.0, jitter=0.1)
+        delays = [backoff.next_delay() for _ in range(3000)]
+        assert max(delays) <= 10.0
+        assert min(delays[-100:]) >= 9.0
+
+    def test_jitter_bounds(self):
+        """测试抖动范围"""
+        backoff = Backoff(initial=1.0, maximum=10.0, jitter=0.1)
+        for _ in range(20):
+            backoff.reset()
+            assert 0.9 <= backoff.next_delay() <= 1.1
+
+    def test_invalid(self):
+        """测试无效参数"""
+        with pytest.raises(ValueError):
+            Backoff(initial=2.0, maximum=1.0)
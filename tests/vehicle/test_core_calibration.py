@@ -0,0 +1,64 @@
+"""
+测试核心组件 - 电机标定
+"""
+
+import pytest
+import os
+import sys
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../vehicle'))
+
+from core.calibration import MotorCalibration
+
+
+class TestMotorCalibration:
+    """测试电机标定表"""
+
+    def test_identity(self):
+        """测试默认标定不改变速度"""
+        calibration = MotorCalibration()
+        assert calibration.is_identity()
+        assert calibration.apply([50, -50, 30, 0]).tolist() == [50, -50, 30, 0]
+
+    def test_gain(self):
+        """测试增益"""
+        calibration = MotorCalibration(gain=[1.0, 0.9, 1.0, 0.9])
+        assert calibration.apply([50, 50, 50, 50]).tolist() == [50, 45, 50, 45]
+
+    def test_deadband(self):
+        """测试死区补偿只作用于非零速度"""
+        calibration = MotorCalibration(deadband=[5, 5, 5, 5])
+        assert calibration.apply([10, -10, 0, 1]).tolist() == [15, -15, 0, 6]
+
+    def test_direction(self):
+        """测试方向"""
+        calibration = MotorCalibration(direction=[1, -1, 1, 1], deadband=[0, 5, 0, 0])
+        assert calibration.apply([40, 40, 40, 40]).tolist() == [40, -45, 40, 40]
+
+    def test_clip(self):
+        """测试结果限制在-100到100"""
+        calibration = MotorCalibration(gain=[1.5, 1, 1, 1])
+        assert calibration.apply([80, 0, 0, 0]).tolist()[0] == 100
+
+    def test_invalid(self):
+        """测试非法参数"""
+        with pytest.raises(ValueError):
+            MotorCalibration(direction=[1, 0, 1, 1])
+        with pytest.raises(ValueError):
+            MotorCalibration(gain=[1, 1, 1])
+
+    def test_save_load(self, tmp_path):
+        """测试YAML读写"""
+        path = str(tmp_path / 'motor_calibration.yaml')
+        calibration = MotorCalibration(gain=[1.0, 0.95, 1.0, 0.95], deadband=[3, 3, 3, 3],
+                                       model={'cm_per_unit': 0.45})
+        calibration.save(path)
+        loaded = MotorCalibration.load(path)
+        assert loaded.gain.tolist() == [1.0, 0.95, 1.0, 0.95]
+        assert loaded.deadband.tolist() == [3, 3, 3, 3]
+        assert loaded.model == {'cm_per_unit': 0.45}
+
+    def test_load_missing(self, tmp_path):
+        """测试文件不存在时使用默认标定"""
+        assert MotorCalibration.load(str(tmp_path / 'missing.yaml')).is_identity()
@@ -0,0 +1,61 @@
+"""
+测试核心组件 - 只读帧句柄
+"""
+
+import pytest
+import os
+import sys
+
+import numpy as np
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../vehicle'))
+
+from core.frame import FrameHandle, FrameSlot
+
+
+class TestFrameSlot:
+    """测试帧发布槽"""
+
+    def test_publish_read_only(self):
+        """测试发布后的图像只读且不复制"""
+        slot = FrameSlot()
+        image = np.zeros((240, 320, 3), dtype=np.uint8)
+        handle = slot.publish(image)
+        assert slot.latest is handle
+        assert handle.image is image
+        assert handle.size == (320, 240)
+        with pytest.raises(ValueError):
+            handle.image[0, 0, 0] = 1
+
+    def test_sequence(self):
+        """测试帧序号单调递增，清空后不回退"""
+        slot = FrameSlot()
+        assert slot.seq == 0
+        slot.publish(np.zeros((2, 2, 3), dtype=np.uint8))
+        slot.publish(np.zeros((2, 2, 3), dtype=np.uint8))
+        assert slot.seq == 2
+        slot.clear()
+        assert slot.latest is None
+        assert slot.publish(np.zeros((2, 2, 3), dtype=np.uint8)).seq == 3
+
+
+class TestCaptureMetrics:
+    """测试采集统计"""
+
+    def test_fps_and_drops(self):
+        """测试帧率和按间隔估算的丢帧数"""
+        from core.frame import CaptureMetrics
+        metrics = CaptureMetrics(nominal_fps=30)
+        for i in range(10):
+            metrics.record(i / 30.0)
+        assert metrics.fps == pytest.approx(30.0)
+        assert metrics.dropped == 0
+        # 间隔3个标称周期，中间丢了2帧
+        metrics.record(12 / 30.0)
+        assert metrics.dropped == 2
+
+    def test_frame_age(self):
+        """测试帧龄"""
+        handle = FrameHandle(1, np.zeros((2, 2, 3), dtype=np.uint8), timestamp=10.0)
+        assert handle.age(now=10.25) == pytest.approx(0.25)
@@ -0,0 +1,68 @@
+"""
+测试核心组件 - 视觉结果板与订阅计数
+"""
+
+import pytest
+import os
+import sys
+import threading
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../vehicle'))
+
+from core.results import ResultsBoard, SubscriptionSet
+
+
+class TestResultsBoard:
+    """测试结果板"""
+
+    def test_publish_get(self):
+        """测试发布和读取最新结果"""
+        board = ResultsBoard()
+        assert board.get('k') is None
+        board.publish('k', 3, 1.0, (10, 20, 600))
+        entry = board.get('k')
+        assert entry.seq == 3
+        assert entry.value == (10, 20, 600)
+
+    def test_wait_newer(self):
+        """测试等待更新的结果"""
+        board = ResultsBoard()
+        board.publish('k', 1, 0.0, None)
+        assert board.wait('k', after_seq=1, timeout=0.01) is None
+
+        timer = threading.Timer(0.02, board.publish, args=('k', 2, 0.0, 'new'))
+        timer.start()
+        entry = board.wait('k', after_seq=1, timeout=1.0)
+        assert entry is not None and entry.value == 'new'
+
+
+class TestSubscriptionSet:
+    """测试订阅计数与租约"""
+
+    def test_ref_counting(self):
+        """测试引用计数归零后不再活跃"""
+        subs = SubscriptionSet()
+        subs.acquire('a')
+        subs.acquire('a')
+        assert subs.release('a') is False
+        assert 'a' in subs.active()
+        assert subs.release('a') is True
+        assert subs.active() == set()
+
+    def test_lease_expiry(self):
+        """测试租约续期与过期"""
+        subs = SubscriptionSet()
+        assert subs.lease('b', ttl=1.0, now=0.0) is True
+        assert subs.lease('b', ttl=1.0, now=0.5) is False
+        assert subs.active(now=1.2) == {'b'}
+        assert subs.expire(now=1.6) == {'b'}
+        assert subs.active(now=1.6) == set()
+
+    def test_lease_with_subscription(self):
+        """测试有订阅时租约过期不影响活跃状态"""
+        subs = SubscriptionSet()
+        subs.acquire('c')
+        subs.lease('c', ttl=1.0, now=0.0)
+        assert subs.expire(now=2.0) == set()
+        assert 'c' in subs.active(now=2.0)
@@ -0,0 +1,62 @@
+"""
+测试核心组件 - 目标区域跟踪
+"""
+
+import pytest
+import os
+import sys
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../vehicle'))
+
+from core.roi import RoiTracker, expand_rect
+
+
+class TestExpandRect:
+    """测试区域扩展"""
+
+    def test_expand(self):
+        """测试四周按比例扩展"""
+        assert expand_rect((100, 100, 40, 20), 0.5, 320, 240) == (80, 90, 80, 40)
+
+    def test_clip_to_frame(self):
+        """测试扩展后裁剪到画面内"""
+        assert expand_rect((0, 0, 40, 40), 0.5, 50, 50) == (0, 0, 50, 50)
+        assert expand_rect((300, 220, 20, 20), 1.0, 320, 240) == (280, 200, 40, 40)
+
+
+class TestRoiTracker:
+    """测试目标区域跟踪"""
+
+    def test_full_frame_without_target(self):
+        """测试没有目标时识别整个画面"""
+        tracker = RoiTracker()
+        assert not tracker.tracking
+        assert tracker.region(320, 240) == (0, 0, 320, 240)
+
+    def test_region_after_hit(self):
+        """测试识别成功后只识别目标附近"""
+        tracker = RoiTracker(margin=0.5)
+        tracker.hit((100, 100, 40, 40))
+        assert tracker.tracking
+        assert tracker.region(320, 240) == (80, 80, 80, 80)
+
+    def test_fallback_after_misses(self):
+        """测试连续失败后回到整个画面"""
+        tracker = RoiTracker(max_misses=3)
+        tracker.hit((100, 100, 40, 40))
+        tracker.miss()
+        tracker.miss()
+        assert tracker.tracking
+        tracker.miss()
+        assert not tracker.tracking
+        assert tracker.region(320, 240) == (0, 0, 320, 240)
+
+    def test_hit_resets_misses(self):
+        """测试识别成功后失败计数清零"""
+        tracker = RoiTracker(max_misses=2)
+        tracker.hit((100, 100, 40, 40))
+        tracker.miss()
+        tracker.hit((110, 100, 40, 40))
+        tracker.miss()
+        assert tracker.tracking
@@ -0,0 +1,79 @@
+"""
+测试核心组件 - HAL调用跟踪环形缓冲区
+"""
+
+import pytest
+import os
+import sys
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../vehicle'))
+
+from core.trace import TraceRing
+
+
+class TestTraceRing:
+    """测试跟踪环形缓冲区"""
+
+    def setup_method(self):
+        """每个测试方法前的设置"""
+        self.ring = TraceRing(16)
+        self.op_qianjin = self.ring.register_op('qianjin', ('speed',))
+        self.op_servo = self.ring.register_op('set_servo', ('servo_id', 'angle'))
+
+    def test_capacity_power_of_two(self):
+        """测试容量向上取整为2的幂"""
+        assert TraceRing(100).capacity == 128
+        assert TraceRing(16).capacity == 16
+
+    def test_register_op_idempotent(self):
+        """测试重复注册返回相同操作码"""
+        assert self.ring.register_op('qianjin', ('speed',)) == self.op_qianjin
+        assert self.op_qianjin != self.op_servo
+
+    def test_register_op_too_many_args(self):
+        """测试参数过多"""
+        with pytest.raises(ValueError):
+            self.ring.register_op('bad', ('a', 'b', 'c', 'd'))
+
+    def test_record_and_snapshot(self):
+        """测试记录与导出"""
+        self.ring.record(self.op_qianjin, 50)
+        self.ring.record(self.op_servo, 2, 95.5)
+
+        entries = self.ring.snapshot()
+        assert len(entries) == 2
+        assert entries[0]['op'] == 'qianjin'
+        assert entries[0]['args'] == {'speed': 50}
+        assert entries[1]['args'] == {'servo_id': 2, 'angle': 95.5}
+        assert entries[0]['t'] <= entries[1]['t']
+
+    def test_wraparound_keeps_latest(self):
+        """测试写满后覆盖最旧的记录"""
+        for i in range(40):
+            self.ring.record(self.op_qianjin, i)
+
+        entries = self.ring.snapshot()
+        assert len(self.ring) == 16
+        assert [e['args']['speed'] for e in entries] == list(range(24, 40))
+        assert entries[-1]['seq'] == 39
+
+    def test_snapshot_limit(self):
+        """测试导出条数限制"""
+        for i in range(10):
+            self.ring.record(self.op_qianjin, i)
+        entries = self.ring.snapshot(limit=3)
+        assert [e['args']['speed'] for e in entries] == [7, 8, 9]
+
+    def test_format(self):
+        """测试格式化为文本"""
+        self.ring.record(self.op_servo, 1, 90)
+        text = self.ring.format()
+        assert 'set_servo(servo_id=1, angle=90)' in text
+
+    def test_clear(self):
+        """测试清空"""
+        self.ring.record(self.op_qianjin, 50)
+        self.ring.clear()
+        assert len(self.ring) == 0
+        assert self.ring.snapshot() == []
@@ -0,0 +1,152 @@
+"""
+测试核心组件 - 轨迹规划与完成句柄
+"""
+
+import pytest
+import os
+import sys
+import threading
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../vehicle'))
+
+from core.handle import CompletionHandle, DONE, CANCELLED
+from core.trajectory import MotionModel, TrapezoidProfile, rotate, straight, arc
+
+
+def integrate(profile, dt=0.0005):
+    """数值积分速度曲线，得到走过的距离"""
+    total = 0.0
+    t = 0.0
+    while t < profile.duration:
+        total += profile.velocity(t) * dt
+        t += dt
+    return total
+
+
+class TestTrapezoidProfile:
+    """测试梯形速度曲线"""
+
+    def test_trapezoid(self):
+        """测试能加速到巡航速度时为梯形"""
+        profile = TrapezoidProfile(100, cruise=20, accel=100)
+        assert profile.peak == 20
+        assert profile.t_cruise > 0
+        assert integrate(profile) == pytest.approx(100, rel=0.01)
+
+    def test_triangle(self):
+        """测试距离太短时退化为三角形"""
+        profile = TrapezoidProfile(1, cruise=20, accel=100)
+        assert profile.t_cruise == 0
+        assert profile.peak < 20
+        assert integrate(profile) == pytest.approx(1, rel=0.01)
+
+    def test_velocity_bounds(self):
+        """测试曲线首尾速度为0"""
+        profile = TrapezoidProfile(50, cruise=20, accel=100)
+        assert profile.velocity(0) == 0
+        assert profile.velocity(profile.duration) == 0
+        assert profile.velocity(profile.duration / 2) == 20
+
+    def test_invalid(self):
+        """测试非法参数"""
+        with pytest.raises(ValueError):
+            TrapezoidProfile(10, cruise=0, accel=100)
+
+
+class TestTrajectories:
+    """测试轨迹生成"""
+
+    def setup_method(self):
+        """每个测试方法前的设置"""
+        self.model = MotionModel(cm_per_unit=0.5, deg_per_unit=3.6, accel_units=250)
+
+    def test_rotate_direction(self):
+        """测试旋转方向"""
+        right = rotate(self.model, 90, 50)
+        left = rotate(self.model, -90, 50)
+        t = right.duration / 2
+        assert right.command(t)[0] == 0
+        assert right.command(t)[1] > 0
+        assert left.command(t)[1] < 0
+
+    def test_rotate_cruise_speed(self):
+        """测试匀速段电机指令等于设定速度"""
+        traj = rotate(self.model, 360, 50)
+        assert traj.command(traj.duration / 2)[1] == pytest.approx(50)
+
+    def test_straight_backward(self):
+        """测试后退"""
+        traj = straight(self.model, -30, 40)
+        forward, turn = traj.command(traj.duration / 2)
+        assert forward < 0
+        assert turn == 0
+
+    def test_arc(self):
+        """测试圆弧的前进量与转向量比例"""
+        traj = arc(self.model, 20, 90, 40)
+        forward, turn = traj.command(traj.duration / 2)
+        assert forward > 0 and turn > 0
+        assert traj.profile.distance == pytest.approx(20 * 3.14159265 / 2, rel=1e-4)
+
+    def test_arc_small_radius_wheel_limit(self):
+        """测试半径小于轮距时外侧轮子不超过上限，圆弧角度和时间保持一致"""
+        unlimited = arc(self.model, 5, 90, 40)
+        forward, turn = unlimited.command(unlimited.duration / 2)
+        assert forward + abs(turn) > 80
+
+        traj = arc(self.model, 5, 90, 40, max_wheel=80)
+        peak = max(f + abs(t) for f, t in
+                   (traj.command(i * traj.duration / 200) for i in range(201)))
+        assert peak <= 80 + 1e-6
+        forward, turn = traj.command(traj.duration / 2)
+        assert turn / forward == pytest.approx(unlimited.turn_gain / unlimited.forward_gain)
+        assert traj.duration > unlimited.duration
+
+        # 按转向量积分得到的转角仍为90度
+        heading = integrate(traj.profile) * traj.turn_gain * self.model.deg_per_unit
+        assert heading == pytest.approx(90, rel=0.01)
+
+    def test_arc_large_radius_not_slowed(self):
+        """测试外侧轮子未超过上限时速度不变"""
+        assert arc(self.model, 100, 90, 40, max_wheel=80).duration == \
+            pytest.approx(arc(self.model, 100, 90, 40).duration)
+
+    def test_arc_invalid_radius(self):
+        """测试非法半径"""
+        with pytest.raises(ValueError):
+            arc(self.model, 0, 90, 40)
+
+
+class TestCompletionHandle:
+    """测试完成句柄"""
+
+    def test_finish(self):
+        """测试正常完成"""
+        handle = CompletionHandle('test')
+        threading.Timer(0.01, handle._finish).start()
+        assert handle.wait(1.0) is True
+        assert handle.done() is True
+        assert handle.status == DONE
+
+    def test_wait_timeout(self):
+        """测试等待超时"""
+        handle = CompletionHandle('test')
+        assert handle.wait(0.01) is False
+        assert handle.done() is False
+
+    def test_cancel(self):
+        """测试取消并调用回调"""
+        cancelled = []
+        handle = CompletionHandle('test', on_cancel=cancelled.append)
+        handle.cancel()
+        assert handle.status == CANCELLED
+        assert cancelled == [handle]
+        assert handle.wait(0) is False
+
+    def test_finish_after_cancel_ignored(self):
+        """测试取消后再完成不改变状态"""
+        handle = CompletionHandle('test')
+        handle.cancel()
+        handle._finish()
+        assert handle.status == CANCELLED
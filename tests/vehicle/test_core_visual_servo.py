@@ -0,0 +1,61 @@
+"""
+测试核心组件 - 视觉伺服
+"""
+
+import pytest
+import os
+import sys
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../vehicle'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../TurboPi'))
+
+from core.visual_servo import VisualServo, error_of
+
+SIZE = (320, 240)
+
+
+class TestVisualServo:
+    """测试云台视觉伺服"""
+
+    def test_centered_target(self):
+        """测试目标在死区内不调整"""
+        servo = VisualServo()
+        assert servo.update(90, 90, (161, 119), SIZE) == (90, 90)
+
+    def test_target_right_and_up(self):
+        """测试目标偏右上时水平、垂直角度都增大"""
+        servo = VisualServo()
+        h, v = servo.update(90, 90, (300, 20), SIZE)
+        assert h > 90
+        assert v > 90
+
+    def test_target_left_and_down(self):
+        """测试目标偏左下时水平、垂直角度都减小"""
+        servo = VisualServo()
+        h, v = servo.update(90, 90, (10, 230), SIZE)
+        assert h < 90
+        assert v < 90
+
+    def test_clamped(self):
+        """测试角度不超出范围"""
+        servo = VisualServo(min_angle=0, max_angle=180)
+        h, _ = servo.update(179.5, 90, (320, 120), SIZE)
+        assert h == 180
+
+
+class TestErrorOf:
+    """测试归一化误差"""
+
+    def test_center(self):
+        """测试画面中心误差为0"""
+        assert error_of((160, 120), SIZE) == (0.0, 0.0)
+
+    def test_corners(self):
+        """测试画面边缘误差为 ±1"""
+        assert error_of((0, 240), SIZE) == (-1.0, 1.0)
+        assert error_of((320, 0), SIZE) == (1.0, -1.0)
+
+    def test_no_target(self):
+        """测试未检测到目标返回None"""
+        assert error_of(None, SIZE) is None
@@ -0,0 +1,84 @@
+"""
+测试硬件抽象层 - 摄像头巡线
+"""
+
+import pytest
+import os
+import sys
+
+import numpy as np
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../vehicle'))
+
+# 导入时不打开摄像头
+os.environ.setdefault('CAMERA_ENABLED', 'false')
+
+from core.frame import FrameHandle
+from hal.camera_line_tracker import CameraLineTracker
+
+
+class FakeWorker:
+    def register_task(self, kind, task):
+        self.task = task
+
+
+class FakeVision:
+    """记录区域矫正请求的视觉控制器；矫正映射为恒等变换（直接裁剪）"""
+
+    def __init__(self, calibrated=True, undistort=False):
+        self.worker = FakeWorker()
+        self.undistort = undistort
+        self.calibrated = calibrated
+        self.rois = []
+
+    def undistort_roi(self, frame, roi):
+        self.rois.append(roi)
+        if not self.calibrated:
+            return None
+        x, y, w, h = roi
+        return frame.image[y:y + h, x:x + w]
+
+
+def frame_with_line(x0, x1):
+    """白底，x0-x1 列为黑色竖线"""
+    image = np.full((240, 320, 3), 255, dtype=np.uint8)
+    image[:, x0:x1] = 0
+    return FrameHandle(1, image)
+
+
+class TestCameraLineTracker:
+    """测试巡线区域矫正"""
+
+    def test_band_covers_all_rois(self):
+        """测试只矫正包含所有ROI的水平带，结果与整个画面相同"""
+        frame = frame_with_line(220, 240)
+        plain = CameraLineTracker(FakeVision(), undistort=False)._line_task(frame, 'hei')
+        vision = FakeVision()
+        result = CameraLineTracker(vision, undistort=True)._line_task(frame, 'hei')
+
+        assert vision.rois == [(0, 120, 320, 110)]
+        assert result.offset == pytest.approx(plain.offset, abs=0.01)
+        assert result.confidence == plain.confidence == 1.0
+        assert result.offset > 0.3
+
+    def test_no_calibration_uses_frame(self):
+        """测试没有标定参数时使用原画面"""
+        frame = frame_with_line(80, 100)
+        vision = FakeVision(calibrated=False)
+        result = CameraLineTracker(vision, undistort=True)._line_task(frame, 'hei')
+        assert len(vision.rois) == 1
+        assert result.confidence == 1.0
+        assert result.offset < -0.3
+
+    def test_whole_frame_undistorted(self):
+        """测试整个画面已经矫正时不再矫正区域"""
+        vision = FakeVision(undistort=True)
+        CameraLineTracker(vision, undistort=True)._line_task(frame_with_line(150, 170), 'hei')
+        assert vision.rois == []
+
+    def test_disabled(self):
+        """测试默认不矫正"""
+        vision = FakeVision()
+        CameraLineTracker(vision, undistort=False)._line_task(frame_with_line(150, 170), 'hei')
+        assert vision.rois == []
@@ -0,0 +1,139 @@
+"""
+测试硬件抽象层 - 直行跑偏标定
+"""
+
+import pytest
+import os
+import sys
+import time
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../vehicle'))
+
+from core.calibration import MotorCalibration
+from hal.drift_calibration import DriftCalibrator
+
+
+class RecordingMotion:
+    """记录运动命令的电机控制器"""
+
+    max_speed = 80
+
+    def __init__(self):
+        self.calibration = MotorCalibration()
+        self.commands = []
+
+    def qianjin(self, speed):
+        self.commands.append(('qianjin', speed))
+
+    def houtui(self, speed):
+        self.commands.append(('houtui', speed))
+
+    def tingzhi(self):
+        self.commands.append(('tingzhi',))
+
+    def set_calibration(self, calibration, save=False):
+        self.calibration = calibration
+
+
+class CenteredSensor:
+    """黑线始终在中间"""
+
+    def xunxian(self):
+        return [False, True, True, False]
+
+
+class DriftingSensor:
+    """黑线逐渐移向右侧（车身向左跑偏），每轮都需要修正"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def xunxian(self):
+        self.calls += 1
+        if self.calls % 50 < 25:
+            return [False, True, True, False]
+        return [False, False, True, True]
+
+
+@pytest.fixture
+def calibrator():
+    return DriftCalibrator(RecordingMotion(), CenteredSensor())
+
+
+def wait_idle(calibrator, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while calibrator.running and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+class TestClampParams:
+    """测试标定参数限制"""
+
+    def test_limits(self, calibrator):
+        """测试速度、时间、轮数限制在安全范围内"""
+        assert calibrator.clamp_params(500, 600, 50) == (80, DriftCalibrator.MAX_DURATION, DriftCalibrator.MAX_RUNS)
+        assert calibrator.clamp_params(-60, 0, 0) == (60, 0.5, 1)
+        assert calibrator.clamp_params(1, 2, 3)[0] == DriftCalibrator.MIN_SPEED
+
+    def test_numeric_strings(self, calibrator):
+        """测试数字字符串可以接受"""
+        assert calibrator.clamp_params('40', '2.5', '3') == (40, 2.5, 3)
+
+    @pytest.mark.parametrize('params', [('fast', 2, 3), (40, None, 3), (40, 2, 'x'), (40, float('nan'), 3)])
+    def test_invalid(self, calibrator, params):
+        """测试非数字参数抛出 ValueError"""
+        with pytest.raises(ValueError):
+            calibrator.clamp_params(*params)
+
+
+class TestBackgroundJob:
+    """测试后台标定任务"""
+
+    def test_start_returns_immediately(self, calibrator):
+        """测试开始标定立即返回，完成后可以查询结果"""
+        status = calibrator.start(speed=40, duration=0.5, runs=1, save=False)
+        assert status['state'] == 'running'
+        assert status['params']['duration'] == 0.5
+        wait_idle(calibrator)
+        status = calibrator.get_status()
+        assert status['state'] == 'done'
+        assert len(status['result']['runs']) == 1
+
+    def test_start_while_running(self, calibrator):
+        """测试标定期间不能再次开始"""
+        calibrator.start(duration=0.5, runs=1, save=False)
+        with pytest.raises(RuntimeError):
+            calibrator.start()
+        calibrator.cancel()
+        wait_idle(calibrator)
+
+    def test_cancel(self, calibrator):
+        """测试中止标定后停车"""
+        calibrator.start(duration=5, runs=5, save=False)
+        time.sleep(0.05)
+        assert calibrator.cancel() is True
+        wait_idle(calibrator)
+        assert calibrator.get_status()['state'] == 'cancelled'
+        assert calibrator._motion.commands[-1] == ('tingzhi',)
+
+    def test_cancel_when_idle(self, calibrator):
+        """测试没有标定时中止返回False"""
+        assert calibrator.cancel() is False
+
+    def test_cancel_restores_calibration(self):
+        """测试中止后恢复标定前的增益（不保留迭代到一半的结果）"""
+        motion = RecordingMotion()
+        original = motion.calibration
+        calibrator = DriftCalibrator(motion, DriftingSensor())
+        calibrator.start(duration=0.5, runs=5, save=False)
+
+        deadline = time.monotonic() + 5.0
+        while motion.calibration is original and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert motion.calibration is not original
+
+        calibrator.cancel()
+        wait_idle(calibrator)
+        assert calibrator.get_status()['state'] == 'cancelled'
+        assert motion.calibration is original
@@ -0,0 +1,95 @@
+"""
+测试硬件抽象层 - 云台控制器
+"""
+
+import pytest
+import os
+import sys
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../vehicle'))
+
+from hal.gimbal_controller import (
+    GimbalController,
+    angle_to_pulse,
+    _AxisMotion,
+    gimbal_controller
+)
+
+
+class TestAxisMotion:
+    """测试单轴运动估算"""
+
+    def test_instant(self):
+        """测试立即到位"""
+        motion = _AxisMotion(90)
+        motion.retarget(120, 0.0, now=10.0)
+        assert motion.position(10.0) == 120
+
+    def test_interpolation(self):
+        """测试线性插值"""
+        motion = _AxisMotion(90)
+        motion.retarget(130, 2.0, now=10.0)
+        assert motion.position(10.0) == 90
+        assert motion.position(11.0) == pytest.approx(110)
+        assert motion.position(12.5) == 130
+
+    def test_retarget_from_midpoint(self):
+        """测试运动中途改变目标从估算位置出发"""
+        motion = _AxisMotion(0)
+        motion.retarget(100, 1.0, now=0.0)
+        motion.retarget(0, 1.0, now=0.5)
+        assert motion.start == pytest.approx(50)
+        assert motion.position(1.0) == pytest.approx(25)
+
+
+class TestGimbalSmoothMove:
+    """测试云台平滑运动"""
+
+    def test_angle_to_pulse(self):
+        """测试角度脉宽换算"""
+        assert angle_to_pulse(0) == 500
+        assert angle_to_pulse(90) == 1500
+        assert angle_to_pulse(180) == 2500
+
+    def test_move_to_handle(self):
+        """测试平滑运动返回句柄并在到位后完成"""
+        handle = gimbal_controller.move_to(60, 100, duration=0.05)
+        assert gimbal_controller.horizontal_angle == 60
+        assert handle.wait(1.0) is True
+        assert gimbal_controller.get_position() == {'horizontal': 60, 'vertical': 100}
+        gimbal_controller.fuwei()
+
+    def test_move_done_clears_handle(self):
+        """测试平滑运动到位后不再视为正在运动，跟踪写入在角度不变时跳过"""
+        handle = gimbal_controller.move_to(100, 80, duration=0.05)
+        assert handle.wait(1.0) is True
+        assert gimbal_controller._move_handle is None
+        assert gimbal_controller.is_moving() is False
+        assert gimbal_controller.track_to(100, 80) is False
+        gimbal_controller.fuwei()
+
+    def test_move_superseded(self):
+        """测试新指令打断平滑运动"""
+        handle = gimbal_controller.move_to(0, 90, duration=5)
+        gimbal_controller.fuwei()
+        assert handle.done() is True
+        assert handle.wait(0) is False
+
+    def test_track_to_coalesced(self):
+        """测试跟踪写入在角度不变时跳过"""
+        gimbal_controller.fuwei()
+        assert gimbal_controller.track_to(100.2, 80.4) is True
+        assert gimbal_controller.track_to(99.8, 79.6) is False
+        assert gimbal_controller.horizontal_angle == 100
+        gimbal_controller.fuwei()
+
+
+class TestGimbalTrackerStop:
+    """测试云台跟踪的停止方式"""
+
+    def test_tingzhi_keeps_tracking(self):
+        """测试 tingzhi() 只停车轮，不停止云台跟踪"""
+        from hal.gimbal_tracker import gimbal_tracker
+        from hal.motion_controller import motion_controller
+        assert gimbal_tracker.stop not in motion_controller._stop_listeners
@@ -0,0 +1,189 @@
+"""
+测试硬件抽象层 - 人脸/手势推理线程（用桩模型代替 mediapipe）
+"""
+
+import pytest
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../vehicle'))
+
+# 导入时不打开摄像头
+os.environ.setdefault('CAMERA_ENABLED', 'false')
+
+from core.frame import FrameSlot
+from hal.inference_worker import InferenceWorker
+
+
+class FakeVision:
+    """离线摄像头：inject_frame 发布一帧，与 VisionController 的发布方式相同"""
+
+    def __init__(self):
+        self._frames = FrameSlot()
+        self._cond = threading.Condition()
+
+    def inject_frame(self, image=None, timestamp=None):
+        if image is None:
+            image = np.zeros((240, 320, 3), dtype=np.uint8)
+        frame = self._frames.publish(image, timestamp)
+        with self._cond:
+            self._cond.notify_all()
+        return frame
+
+    def get_frame(self):
+        return self._frames.latest
+
+    def get_frame_count(self):
+        return self._frames.seq
+
+    def wait_next_frame(self, last_id=None, timeout=1.0):
+        with self._cond:
+            if last_id is None:
+                last_id = self._frames.seq
+            return self._cond.wait_for(lambda: self._frames.seq != last_id, timeout)
+
+
+class StubModel:
+    """桩模型：记录加载次数和每次推理的输入，可以让推理阻塞"""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.loads = 0
+        self.calls = []
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def loader(self):
+        self.loads += 1
+        if self.fail:
+            raise ImportError('No module named mediapipe')
+        return self
+
+    def infer(self, instance, rgb, frame_size):
+        assert instance is self
+        self.calls.append((rgb.shape, frame_size))
+        self.entered.set()
+        self.release.wait(2.0)
+        return ['face']
+
+
+def wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+@pytest.fixture
+def vision():
+    return FakeVision()
+
+
+def make_worker(vision, model, input_width=160):
+    worker = InferenceWorker(vision)
+    worker.FRAME_TIMEOUT = 0.02
+    worker.register_model('face', model.loader, model.infer, input_width)
+    return worker
+
+
+class TestLazyLoading:
+    """测试模型在第一次订阅时才加载"""
+
+    def test_not_loaded_until_read(self, vision):
+        """测试注册时不加载，第一次读取后在推理线程中加载一次"""
+        model = StubModel()
+        worker = make_worker(vision, model)
+        assert model.loads == 0
+        assert worker.get_status()['models']['face']['loaded'] is False
+
+        assert worker.read('face') is None
+        assert wait_until(lambda: worker.get_status()['models']['face']['loaded'])
+        for _ in range(5):
+            worker.read('face')
+        time.sleep(0.05)
+        assert model.loads == 1
+
+    def test_failed_load_not_retried(self, vision):
+        """测试加载失败时记录错误，不再重试，积木返回未检测到"""
+        model = StubModel(fail=True)
+        worker = make_worker(vision, model)
+        worker.read('face')
+        assert wait_until(lambda: worker.get_status()['models']['face']['error'] is not None)
+        for _ in range(5):
+            vision.inject_frame()
+            assert worker.read('face') is None
+            time.sleep(0.02)
+        assert model.loads == 1
+        assert model.calls == []
+        assert 'mediapipe' in worker.get_status()['models']['face']['error']
+        assert worker.shibie_renlian() is False
+
+    def test_unknown_model(self, vision):
+        """测试读取未注册的模型报错"""
+        worker = make_worker(vision, StubModel())
+        with pytest.raises(ValueError):
+            worker.read('pose')
+
+
+class TestFrameDropping:
+    """测试只处理最新帧"""
+
+    def test_frames_during_inference_dropped(self, vision):
+        """测试推理期间到达的旧帧被跳过并计为丢帧"""
+        model = StubModel()
+        worker = make_worker(vision, model)
+        worker.read('face')
+        assert wait_until(lambda: model.loads == 1)
+
+        model.release.clear()
+        vision.inject_frame()
+        assert model.entered.wait(2.0)
+        for _ in range(4):
+            vision.inject_frame()
+        model.release.set()
+
+        assert wait_until(lambda: worker.frames == 2)
+        assert worker.dropped == 3
+        assert worker.board.get('face').seq == 5
+        assert len(model.calls) == 2
+
+    def test_input_resized(self, vision):
+        """测试输入缩小到模型宽度，推理函数收到整个画面的尺寸"""
+        model = StubModel()
+        worker = make_worker(vision, model, input_width=160)
+        worker._models['face'].instance = model.loader()
+        worker.step(vision.inject_frame(), [worker._models['face']])
+        assert model.calls == [((120, 160, 3), (320, 240))]
+
+
+class TestResultTtl:
+    """测试结果有效期"""
+
+    def _publish(self, vision, worker, model, age):
+        worker._models['face'].instance = model.loader()
+        frame = vision.inject_frame(timestamp=time.monotonic() - age)
+        worker.step(frame, [worker._models['face']])
+
+    def test_fresh_result(self, vision):
+        """测试 RESULT_TTL 内的结果可以读到"""
+        model = StubModel()
+        worker = make_worker(vision, model)
+        self._publish(vision, worker, model, 0.0)
+        assert worker.read('face') == ['face']
+        assert worker.shibie_renlian() is True
+
+    def test_expired_result(self, vision):
+        """测试超过 RESULT_TTL 的结果视为没有检测到"""
+        model = StubModel()
+        worker = make_worker(vision, model)
+        self._publish(vision, worker, model, InferenceWorker.RESULT_TTL + 0.1)
+        assert worker.read('face') is None
+        assert worker.shibie_renlian() is False
@@ -0,0 +1,218 @@
+"""
+测试硬件抽象层 - 巡线引擎
+"""
+
+import pytest
+import os
+import sys
+import threading
+import time
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../vehicle'))
+
+from hal.line_follower import (
+    line_offset,
+    LineFollowEngine,
+    EVENT_INTERSECTION, EVENT_LOST, EVENT_FOUND,
+    line_follower
+)
+
+
+CENTER = [False, True, True, False]
+RIGHT = [False, False, True, True]
+LEFT = [True, True, False, False]
+CROSS = [True, True, True, True]
+NONE = [False, False, False, False]
+
+
+class ScriptedSensor:
+    """按顺序返回预设读数的巡线传感器，最后一个读数一直重复"""
+
+    def __init__(self, *readings):
+        self._lock = threading.Lock()
+        self._readings = list(readings)
+        self.last_seen = {}
+
+    def script(self, *readings):
+        """替换之后的读数"""
+        with self._lock:
+            self._readings = list(readings)
+
+    def xunxian(self):
+        now = time.monotonic()
+        with self._lock:
+            states = self._readings.pop(0) if len(self._readings) > 1 else self._readings[0]
+        self.last_seen[tuple(states)] = now
+        return list(states)
+
+
+class RecordingMotion:
+    """记录 drive() 指令的电机桩"""
+
+    def __init__(self):
+        self.commands = []
+        self._stop_listeners = []
+
+    def drive(self, forward, turn):
+        self.commands.append((forward, turn))
+
+    def add_stop_listener(self, listener):
+        self._stop_listeners.append(listener)
+
+    def tingzhi(self):
+        for listener in self._stop_listeners:
+            listener()
+        self.commands.append((0, 0))
+
+
+def run_engine(sensor, speed=40, duration=0.1, kp=8.0):
+    """运行巡线引擎一段时间，返回 (引擎, 电机桩, 事件列表)"""
+    motion = RecordingMotion()
+    engine = LineFollowEngine(motion, sensor, rate_hz=200)
+    engine.set_pid(kp)
+    events = []
+    engine.on_event(lambda event, ts: events.append((event, ts)))
+    engine.start(speed)
+    time.sleep(duration)
+    return engine, motion, events
+
+
+def wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+class TestLineOffset:
+    """测试黑线偏移计算"""
+
+    def test_centered(self):
+        """测试中间两路检测到黑线"""
+        assert line_offset([False, True, True, False]) == 0
+
+    def test_left(self):
+        """测试黑线偏左"""
+        assert line_offset([True, False, False, False]) == -3
+        assert line_offset([False, True, False, False]) == -1
+
+    def test_right(self):
+        """测试黑线偏右"""
+        assert line_offset([False, False, True, True]) == 2
+
+    def test_lost(self):
+        """测试脱线"""
+        assert line_offset([False, False, False, False]) is None
+
+
+class TestLineFollowEngine:
+    """测试巡线引擎"""
+
+    def test_next_event_empty(self):
+        """测试没有事件时返回空字符串"""
+        assert line_follower.next_event() == ''
+
+    def test_event_queue_order(self):
+        """测试事件按产生顺序读出"""
+        line_follower._emit(EVENT_INTERSECTION)
+        line_follower._emit(EVENT_LOST)
+        assert line_follower.next_event() == EVENT_INTERSECTION
+        assert line_follower.next_event() == EVENT_LOST
+        assert line_follower.next_event() == ''
+
+    def test_stop_when_not_running(self):
+        """测试未运行时停止不抛出异常"""
+        line_follower.stop()
+        assert line_follower.is_running() is False
+
+
+class TestControlLoop:
+    """测试巡线控制循环"""
+
+    def test_line_right_turns_right(self):
+        """测试黑线偏右时右转（转向量为正），偏左时左转"""
+        engine, motion, _ = run_engine(ScriptedSensor(RIGHT))
+        engine.stop()
+        assert motion.commands[0] == (40, 16)
+        assert motion.commands[-1] == (0, 0)
+
+        engine, motion, _ = run_engine(ScriptedSensor(LEFT))
+        engine.stop()
+        assert motion.commands[0] == (40, -16)
+
+    def test_centered_goes_straight(self):
+        """测试黑线居中时直行，指令不变时不重复写电机"""
+        engine, motion, _ = run_engine(ScriptedSensor(CENTER))
+        engine.stop(brake=False)
+        assert motion.commands == [(40, 0)]
+        assert engine.loop_count > 1
+
+    def test_turn_limited_to_speed(self):
+        """测试转向量不超过前进速度"""
+        engine, motion, _ = run_engine(ScriptedSensor([False, False, False, True]), speed=10)
+        engine.stop()
+        assert motion.commands[0] == (10, 10)
+
+    def test_lost_grace_period(self):
+        """测试短暂脱线时按上次转向继续行驶，超过宽限时间才停车并产生脱线事件"""
+        sensor = ScriptedSensor(RIGHT)
+        engine, motion, events = run_engine(sensor, duration=0.05)
+        sensor.script(NONE)
+        assert wait_until(lambda: events)
+        seen_at = sensor.last_seen[tuple(RIGHT)]
+        engine.stop(brake=False)
+
+        assert events[0][0] == EVENT_LOST
+        # 宽限时间从最后一次看到黑线算起
+        assert events[0][1] - seen_at >= LineFollowEngine.LOST_GRACE - 0.001
+        assert events[0][1] - seen_at < LineFollowEngine.LOST_GRACE + 0.1
+        assert engine.next_event() == EVENT_LOST
+        # 宽限期内保持上次的指令，之后停车
+        assert motion.commands == [(40, 16), (0, 0)]
+
+    def test_short_gap_no_event(self):
+        """测试脱线时间短于宽限时间时不产生事件"""
+        gap = [NONE] * 10   # 200Hz 下约 0.05 秒
+        engine, motion, events = run_engine(ScriptedSensor(CENTER, *gap, CENTER), duration=0.3)
+        engine.stop(brake=False)
+        assert events == []
+        assert motion.commands == [(40, 0)]
+
+    def test_found_after_lost(self):
+        """测试脱线后重新找到黑线时产生事件并恢复行驶"""
+        sensor = ScriptedSensor(NONE)
+        engine, motion, events = run_engine(sensor, duration=0.0)
+        assert wait_until(lambda: events)
+        sensor.script(CENTER)
+        assert wait_until(lambda: len(events) == 2)
+        engine.stop(brake=False)
+        assert [e for e, _ in events] == [EVENT_LOST, EVENT_FOUND]
+        assert motion.commands[-1] == (40, 0)
+
+    def test_intersection(self):
+        """测试4路全黑时产生一次路口事件（去抖）并直行通过"""
+        sensor = ScriptedSensor(RIGHT, CROSS)
+        engine, motion, events = run_engine(sensor, duration=0.2)
+        engine.stop(brake=False)
+        assert [e for e, _ in events] == [EVENT_INTERSECTION]
+        assert motion.commands == [(40, 16), (40, 0)]
+
+    def test_second_intersection_after_debounce(self):
+        """测试离开路口超过去抖时间后再次到达路口时产生新的事件"""
+        sensor = ScriptedSensor(CROSS)
+        engine, motion, events = run_engine(sensor, duration=0.05)
+        sensor.script(CENTER)
+        time.sleep(LineFollowEngine.INTERSECTION_DEBOUNCE + 0.1)
+        sensor.script(CROSS)
+        assert wait_until(lambda: len(events) == 2)
+        engine.stop(brake=False)
+        assert [e for e, _ in events] == [EVENT_INTERSECTION, EVENT_INTERSECTION]
+
+    def test_tingzhi_stops_engine(self):
+        """测试 tingzhi() 时巡线引擎一并停止"""
+        engine, motion, _ = run_engine(ScriptedSensor(CENTER), duration=0.02)
+        motion.tingzhi()
+        assert not engine.is_running()
@@ -0,0 +1,63 @@
+"""
+测试硬件抽象层 - 运动检测
+"""
+
+import pytest
+import os
+import sys
+
+import numpy as np
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../vehicle'))
+
+from hal.motion_detector import MotionDetector, NO_MOTION
+
+
+def scene(square=None):
+    """灰色背景，可选一个白色方块 (x, y, 边长)"""
+    img = np.full((240, 320, 3), 100, dtype=np.uint8)
+    if square is not None:
+        x, y, side = square
+        img[y:y + side, x:x + side] = 255
+    return img
+
+
+class TestMotionDetector:
+    """测试运动检测"""
+
+    def test_first_frame_seeds_background(self):
+        """测试第一帧只建立背景"""
+        detector = MotionDetector()
+        assert detector.process(scene(), 1) == NO_MOTION
+
+    def test_static_scene(self):
+        """测试画面不变时没有运动"""
+        detector = MotionDetector()
+        for seq in range(1, 5):
+            result = detector.process(scene(), seq)
+        assert result.area == 0.0
+        assert result.center is None
+
+    def test_moving_object(self):
+        """测试出现物体时报告面积和重心（整个画面坐标）"""
+        detector = MotionDetector()
+        detector.process(scene(), 1)
+        result = detector.process(scene((200, 100, 40)), 2)
+        assert result.area == pytest.approx(40 * 40 / (320 * 240), rel=0.3)
+        assert result.center[0] == pytest.approx(220, abs=8)
+        assert result.center[1] == pytest.approx(120, abs=8)
+
+    def test_same_frame_cached(self):
+        """测试同一帧重复处理返回相同结果，背景只更新一次"""
+        detector = MotionDetector()
+        detector.process(scene(), 1)
+        first = detector.process(scene((200, 100, 40)), 2)
+        assert detector.process(scene((200, 100, 40)), 2) is first
+
+    def test_reseed_after_gap(self):
+        """测试长时间没有处理后重新建立背景"""
+        detector = MotionDetector()
+        detector.process(scene(), 1)
+        gap = 2 + MotionDetector.RESEED_GAP
+        assert detector.process(scene((200, 100, 40)), gap) == NO_MOTION
@@ -0,0 +1,120 @@
+"""
+测试硬件抽象层 - 二维码识别
+"""
+
+import pytest
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../vehicle'))
+
+from hal.qr_reader import QrReader, QrResult
+
+
+class IdleVision:
+    """没有新画面的摄像头"""
+
+    def wait_next_frame(self, last_id, timeout):
+        time.sleep(timeout)
+        return False
+
+    def get_frame(self):
+        return None
+
+
+class ScriptedDecoder:
+    """按顺序返回预设结果的识别函数，记录每次的识别区域"""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.regions = []
+
+    def __call__(self, image, region, max_width):
+        self.regions.append(region)
+        return self.results.pop(0) if self.results else None
+
+
+def frame(seq, timestamp):
+    return SimpleNamespace(image=np.zeros((240, 320, 3), dtype=np.uint8),
+                           seq=seq, timestamp=timestamp)
+
+
+def found(data='hello'):
+    return QrResult(data, (100, 80, 60, 60), 0, 0.0)
+
+
+def make_reader(decoder, loader=lambda: None):
+    return QrReader(IdleVision(), decoder=decoder, loader=loader)
+
+
+class TestQrReader:
+    """测试二维码识别"""
+
+    def test_step_stamps_result_with_frame(self):
+        """测试识别结果使用帧的序号和采集时刻"""
+        reader = make_reader(ScriptedDecoder(found()))
+        now = time.monotonic()
+        result = reader.step(frame(7, now))
+        assert result.data == 'hello'
+        assert result.seq == 7
+        assert result.timestamp == now
+        assert reader.found == 1
+
+    def test_read_within_ttl(self):
+        """测试结果在 RESULT_TTL 内可以读到"""
+        reader = make_reader(ScriptedDecoder(found()))
+        reader.step(frame(1, time.monotonic()))
+        assert reader.read().data == 'hello'
+        assert reader.shibie_erweima() == 'hello'
+
+    def test_read_after_ttl_expired(self):
+        """测试结果超过 RESULT_TTL 后视为没有二维码"""
+        reader = make_reader(ScriptedDecoder(found()))
+        reader.step(frame(1, time.monotonic() - QrReader.RESULT_TTL - 0.1))
+        assert reader.read() is None
+        assert reader.shibie_erweima() is None
+
+    def test_miss_keeps_last_result(self):
+        """测试一次没有识别到不清除上次结果（由 TTL 决定何时失效）"""
+        reader = make_reader(ScriptedDecoder(found(), None))
+        now = time.monotonic()
+        reader.step(frame(1, now))
+        assert reader.step(frame(2, now)) is None
+        assert reader.read().seq == 1
+
+    def test_tracking_region_after_hit(self):
+        """测试识别到之后在二维码附近的区域内识别"""
+        decoder = ScriptedDecoder(found(), found())
+        reader = make_reader(decoder)
+        now = time.monotonic()
+        reader.step(frame(1, now))
+        reader.step(frame(2, now))
+        assert decoder.regions[0] == (0, 0, 320, 240)
+        x, y, w, h = decoder.regions[1]
+        assert w < 320 and h < 240
+        assert x <= 100 and y <= 80 and x + w >= 160 and y + h >= 140
+        assert reader.roi_decodes == 1
+
+    def test_missing_library(self):
+        """测试识别库加载失败：记录错误，积木返回None，不再重试"""
+        calls = []
+
+        def loader():
+            calls.append(1)
+            raise ImportError('No module named pyzbar')
+
+        reader = make_reader(ScriptedDecoder(), loader)
+        assert reader.shibie_erweima() is None
+        reader._thread.join(timeout=2)
+        assert not reader._thread.is_alive()
+
+        status = reader.get_status()
+        assert 'pyzbar' in status['error']
+        assert status['running'] is False
+        assert reader.shibie_erweima() is None
+        assert len(calls) == 1
@@ -0,0 +1,65 @@
+"""
+测试硬件抽象层 - 轨迹控制器
+"""
+
+import pytest
+import os
+import sys
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../vehicle'))
+
+from core.calibration import MotorCalibration
+from core.handle import DONE
+from core.trajectory import MotionModel
+from hal.trajectory_controller import TrajectoryController
+
+
+class RecordingMotion:
+    """记录电机指令的运动控制器"""
+
+    max_speed = 80
+
+    def __init__(self):
+        self.calibration = MotorCalibration()
+        self.commands = []
+
+    def add_stop_listener(self, listener):
+        pass
+
+    def drive(self, forward, turn):
+        self.commands.append((forward, turn))
+
+
+@pytest.fixture
+def controller():
+    # 加速度很大，轨迹在几十毫秒内完成
+    return TrajectoryController(RecordingMotion(), MotionModel(2.0, 30.0, 100000))
+
+
+class TestTrajectoryArguments:
+    """测试积木参数限制（不抛出异常）"""
+
+    @pytest.mark.parametrize('speed', [0, -40, 500])
+    def test_speed_clamped(self, controller, speed):
+        """测试速度为0、负数或超过上限时按限制后的速度执行"""
+        handle = controller.zou_juli(2, speed)
+        assert handle.wait(2.0)
+        forwards = [abs(f) for f, _ in controller._motion.commands]
+        assert 0 < max(forwards) <= RecordingMotion.max_speed
+
+    def test_zero_degrees(self, controller):
+        """测试角度为0时立即完成，不驱动电机"""
+        handle = controller.zhuan_jiaodu(0)
+        assert handle.status == DONE
+        assert controller._motion.commands == []
+
+    def test_zero_distance(self, controller):
+        """测试距离为0时立即完成"""
+        assert controller.zou_juli(0, 50).status == DONE
+        assert controller.hu_xing(20, 0).status == DONE
+
+    def test_zero_radius_rotates(self, controller):
+        """测试半径为0的圆弧为原地旋转"""
+        assert controller.hu_xing(0, 30, 50).wait(2.0)
+        assert all(f == 0 for f, _ in controller._motion.commands)
@@ -0,0 +1,112 @@
+"""
+测试硬件抽象层 - 视觉控制器（离线模式，帧由 inject_frame 送入）
+"""
+
+import pytest
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../vehicle'))
+
+# 导入时不打开摄像头
+os.environ.setdefault('CAMERA_ENABLED', 'false')
+
+from hal.vision_controller import VisionController
+
+
+def scene(bgr=(0, 0, 255)):
+    """灰色背景，中间一个色块"""
+    img = np.full((240, 320, 3), 128, dtype=np.uint8)
+    img[80:160, 120:200] = bgr
+    return img
+
+
+@pytest.fixture
+def vision():
+    controller = VisionController(open_camera=False)
+    yield controller
+    controller.release()
+
+
+@pytest.fixture
+def classify_calls(monkeypatch):
+    """记录每次LAB查表分类"""
+    calls = []
+    classify = VisionController._classify
+
+    def counting(frame, model):
+        calls.append(frame)
+        return classify(frame, model)
+
+    monkeypatch.setattr(VisionController, '_classify', staticmethod(counting))
+    return calls
+
+
+class TestPerFrameMemo:
+    """测试同一帧的颜色分类只计算一次"""
+
+    def test_repeated_reads_classify_once(self, vision, classify_calls):
+        """测试同一帧重复识别多种颜色只分类一次"""
+        vision.inject_frame(scene())
+        for _ in range(5):
+            result = vision.shibieyanse_duo(['hong', 'lan', 'lv'])
+        assert len(classify_calls) == 1
+        x, y, area = result['hong']
+        assert (x, y) == pytest.approx((160, 120), abs=2)
+        assert result['lan'] is None and result['lv'] is None
+        assert vision.shibieyanse('hong')
+
+    def test_new_frame_classified_again(self, vision, classify_calls):
+        """测试新帧到来后重新分类"""
+        vision.inject_frame(scene())
+        vision.shibieyanse_duo(['hong', 'lan'])
+        vision.inject_frame(scene((200, 80, 0)))
+        result = vision.shibieyanse_duo(['hong', 'lan'])
+        assert len(classify_calls) == 2
+        assert result['hong'] is None
+        assert result['lan'] is not None
+
+    def test_detection_result_cached(self, vision):
+        """测试同一帧同一颜色的检测结果直接复用"""
+        frame = vision.inject_frame(scene())
+        first = vision._detect_color_in_frame(frame.image, 'hong', frame.seq)
+        assert vision._detect_color_in_frame(frame.image, 'hong', frame.seq) is first
+
+    def test_no_frame(self, vision, classify_calls):
+        """测试还没有画面时返回未检测到，不做分类"""
+        assert vision.shibieyanse_duo(['hong']) == {'hong': None}
+        assert classify_calls == []
+
+
+class TestWaitNextFrame:
+    """测试等待新帧"""
+
+    def test_wakes_on_publish(self, vision):
+        """测试发布新帧时立即唤醒"""
+        last = vision.get_frame_count()
+        timer = threading.Timer(0.05, vision.inject_frame, args=(scene(),))
+        timer.start()
+        t0 = time.monotonic()
+        assert vision.wait_next_frame(last, timeout=2.0)
+        assert time.monotonic() - t0 < 1.0
+        assert vision.get_frame().seq == last + 1
+        timer.join()
+
+    def test_times_out_without_frame(self, vision):
+        """测试没有新帧时等到超时返回False"""
+        vision.inject_frame(scene())
+        last = vision.get_frame_count()
+        t0 = time.monotonic()
+        assert not vision.wait_next_frame(last, timeout=0.1)
+        assert time.monotonic() - t0 >= 0.09
+
+    def test_already_newer_frame(self, vision):
+        """测试已经有比 last_id 更新的帧时不等待"""
+        vision.inject_frame(scene())
+        vision.inject_frame(scene())
+        assert vision.wait_next_frame(1, timeout=0.0)
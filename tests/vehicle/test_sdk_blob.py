@@ -0,0 +1,89 @@
+"""
+测试 HiwonderSDK - 色块提取
+"""
+
+import pytest
+import os
+import sys
+
+import cv2
+import numpy as np
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../TurboPi'))
+
+from HiwonderSDK.Blob import find_blobs, getAreaMaxContour, largest_blob
+
+
+def mask_with(*rects):
+    """320x240 掩码，按 (x, y, 宽, 高) 画出矩形色块"""
+    mask = np.zeros((240, 320), dtype=np.uint8)
+    for x, y, w, h in rects:
+        mask[y:y + h, x:x + w] = 255
+    return mask
+
+
+class TestFindBlobs:
+    """测试连通域色块提取"""
+
+    def test_empty_mask(self):
+        """测试没有前景时返回空列表"""
+        assert find_blobs(mask_with()) == []
+        assert largest_blob(mask_with()) is None
+
+    def test_stats(self):
+        """测试面积、质心和外接矩形"""
+        blob = largest_blob(mask_with((100, 50, 40, 20)))
+        assert blob.area == 800
+        assert blob.center == pytest.approx((119.5, 59.5))
+        assert blob.bbox == (100, 50, 40, 20)
+
+    def test_sorted_by_area(self):
+        """测试按面积从大到小排列，top_k 限制数量"""
+        mask = mask_with((0, 0, 10, 10), (50, 50, 30, 30), (200, 100, 20, 20))
+        assert [b.area for b in find_blobs(mask, top_k=None)] == [900, 400, 100]
+        assert [b.area for b in find_blobs(mask, top_k=2)] == [900, 400]
+        assert largest_blob(mask).area == 900
+
+    def test_min_area(self):
+        """测试小于最小面积的色块被忽略"""
+        mask = mask_with((0, 0, 10, 10), (50, 50, 30, 30))
+        assert [b.area for b in find_blobs(mask, top_k=None, min_area=200)] == [900]
+        assert largest_blob(mask, min_area=1000) is None
+
+    def test_connectivity(self):
+        """测试只在对角相接的两个方块：8连通为一个色块，4连通为两个"""
+        mask = mask_with((10, 10, 10, 10), (20, 20, 10, 10))
+        assert len(find_blobs(mask, top_k=None, connectivity=8)) == 1
+        assert len(find_blobs(mask, top_k=None, connectivity=4)) == 2
+
+    def test_blob_mask_excludes_other_blobs(self):
+        """测试色块掩码只包含自己，不包含外接矩形内的其他色块"""
+        mask = mask_with((0, 0, 60, 10), (0, 10, 10, 50), (30, 30, 5, 5))
+        blob = largest_blob(mask)
+        assert blob.bbox == (0, 0, 60, 60)
+        assert int(np.count_nonzero(blob.mask())) == blob.area
+
+    def test_contour_in_frame_coordinates(self):
+        """测试轮廓坐标是整个画面的坐标"""
+        blob = largest_blob(mask_with((100, 50, 40, 20)))
+        x, y, w, h = cv2.boundingRect(blob.contour())
+        assert (x, y, w, h) == (100, 50, 40, 20)
+
+
+class TestGetAreaMaxContour:
+    """测试与原 getAreaMaxContour 兼容"""
+
+    def test_largest(self):
+        """测试返回最大色块的轮廓和面积"""
+        contour, area = getAreaMaxContour(mask_with((0, 0, 10, 10), (50, 50, 30, 30)))
+        assert area == 900
+        assert cv2.boundingRect(contour) == (50, 50, 30, 30)
+
+    def test_below_min_area(self):
+        """测试面积不大于 min_area 时轮廓为None，面积照常返回"""
+        assert getAreaMaxContour(mask_with((0, 0, 10, 10)), min_area=100) == (None, 100)
+
+    def test_empty(self):
+        """测试没有色块时返回 (None, 0)"""
+        assert getAreaMaxContour(mask_with()) == (None, 0)
@@ -0,0 +1,155 @@
+"""
+测试 HiwonderSDK - LAB颜色模型
+"""
+
+import pytest
+import itertools
+import os
+import sys
+
+import cv2
+import numpy as np
+import yaml
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../TurboPi'))
+
+from HiwonderSDK.ColorModel import ColorModel
+
+REPO_CONFIG = os.path.join(os.path.dirname(__file__), '../../TurboPi/lab_config.yaml')
+
+CONFIG = {
+    'red': {'min': [0, 150, 130], 'max': [255, 255, 255]},
+    'blue': {'min': [0, 126, 0], 'max': [130, 185, 120]},
+    'green': {'min': [0, 81, 106], 'max': [252, 118, 255]},
+}
+
+
+def write_config(path, data, mtime=None):
+    with open(path, 'w', encoding='utf-8') as f:
+        yaml.safe_dump(data, f)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    path = str(tmp_path / 'lab_config.yaml')
+    write_config(path, CONFIG, mtime=1000000)
+    return path
+
+
+def lab_image():
+    return np.random.default_rng(0).integers(0, 256, (60, 80, 3), dtype=np.uint8)
+
+
+def lab(l, a, b):
+    """4x4 的纯色LAB图像（1x1 的数组会被 OpenCV 当作标量）"""
+    return np.full((4, 4, 3), (l, a, b), dtype=np.uint8)
+
+
+class TestClassify:
+    """测试位查找表分类"""
+
+    def test_same_as_in_range(self, config_path):
+        """测试每种颜色的掩码与 cv2.inRange 相同"""
+        model = ColorModel(config_path)
+        image = lab_image()
+        bits = model.classify(image)
+        for name, (lower, upper) in model.ranges.items():
+            expected = cv2.inRange(image, lower, upper)
+            assert np.array_equal(model.mask(bits, name), expected), name
+
+    def test_mask_any(self, config_path):
+        """测试多种颜色的并集掩码"""
+        model = ColorModel(config_path)
+        image = lab_image()
+        bits = model.classify(image)
+        expected = cv2.bitwise_or(model.mask(bits, 'red'), model.mask(bits, 'blue'))
+        assert np.array_equal(model.mask_any(bits, ['red', 'blue']), expected)
+
+    def test_names(self, config_path):
+        """测试颜色名称"""
+        model = ColorModel(config_path)
+        assert sorted(model.names) == ['blue', 'green', 'red']
+        assert 'red' in model
+        assert 'orange' not in model
+
+    def test_bad_range(self):
+        """测试阈值不是三个通道时报错"""
+        with pytest.raises(ValueError):
+            ColorModel.parse({'red': {'min': [0, 150], 'max': [255, 255, 255]}})
+
+
+class TestHotReload:
+    """测试文件修改后自动重新加载"""
+
+    def test_reload_on_mtime_change(self, config_path):
+        """测试文件修改时间变化后重新加载"""
+        model = ColorModel(config_path)
+        version = model.version
+        data = dict(CONFIG, yellow={'min': [60, 100, 150], 'max': [255, 145, 255]})
+        write_config(config_path, data, mtime=1000100)
+        model._next_check = 0.0
+        assert model.maybe_reload()
+        assert 'yellow' in model
+        assert model.version == version + 1
+
+    def test_unchanged_file_not_reloaded(self, config_path):
+        """测试修改时间不变时不重新加载"""
+        model = ColorModel(config_path)
+        model._next_check = 0.0
+        assert not model.maybe_reload()
+        assert model.version == 1
+
+    def test_check_interval(self, config_path):
+        """测试 CHECK_INTERVAL 内不检查文件"""
+        model = ColorModel(config_path)
+        write_config(config_path, {'red': CONFIG['red']}, mtime=1000100)
+        assert not model.maybe_reload()
+        assert 'blue' in model
+
+    def test_bad_file_keeps_model(self, config_path):
+        """测试新文件无法解析时保留原来的模型"""
+        model = ColorModel(config_path)
+        with open(config_path, 'w', encoding='utf-8') as f:
+            f.write('red: {min: [0, 1]}\n')
+        os.utime(config_path, (1000100, 1000100))
+        model._next_check = 0.0
+        assert not model.maybe_reload()
+        assert sorted(model.names) == ['blue', 'green', 'red']
+        assert model.version == 1
+
+    def test_snapshot_is_consistent(self, config_path):
+        """测试重新加载不影响已经取得的快照"""
+        model = ColorModel(config_path)
+        snapshot = model.snapshot()
+        write_config(config_path, {'red': CONFIG['red']}, mtime=1000100)
+        model._next_check = 0.0
+        model.maybe_reload()
+        bits = model.classify(lab(40, 160, 60), snapshot)
+        assert model.mask(bits, 'blue', snapshot)[0, 0] == 255
+        assert 'blue' not in model
+
+
+class TestRepoConfig:
+    """测试仓库中的 lab_config.yaml"""
+
+    def test_warm_colors_disjoint(self):
+        """测试红色、橙色、黄色的阈值互不重叠"""
+        ranges = ColorModel(REPO_CONFIG).ranges
+        for first, second in itertools.combinations(['red', 'orange', 'yellow'], 2):
+            (lo1, hi1), (lo2, hi2) = ranges[first], ranges[second]
+            overlap = all(max(lo1[ch], lo2[ch]) <= min(hi1[ch], hi2[ch]) for ch in range(3))
+            assert not overlap, (first, second)
+
+    def test_red_orange_boundary(self):
+        """测试红橙交界处的像素只属于一种颜色"""
+        model = ColorModel(REPO_CONFIG)
+        bits = model.classify(lab(171, 171, 202))
+        assert model.mask(bits, 'red')[0, 0] == 255
+        assert model.mask(bits, 'orange')[0, 0] == 0
+        bits = model.classify(cv2.cvtColor(np.full((4, 4, 3), (0, 165, 255), dtype=np.uint8),
+                                          cv2.COLOR_BGR2LAB))
+        assert model.mask(bits, 'orange')[0, 0] == 255
+        assert model.mask(bits, 'red')[0, 0] == 0
@@ -0,0 +1,112 @@
+"""
+测试 HiwonderSDK - 手势分类
+"""
+
+import pytest
+import math
+import os
+import sys
+
+import numpy as np
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../TurboPi'))
+
+from HiwonderSDK.Gesture import (
+    GestureFilter, classify, classify_landmarks, finger_angles, gesture, hand_angle
+)
+
+# 五根手指的方向（度），手腕在原点
+DIRECTIONS = (150, 110, 90, 70, 50)
+
+
+def make_hand(straight):
+    """生成关键点：伸直的手指指尖远离手腕，弯曲的手指指尖折回手腕方向"""
+    pts = np.zeros((21, 2), dtype=np.float32)
+    for i, (direction, is_straight) in enumerate(zip(DIRECTIONS, straight)):
+        d = np.array([math.cos(math.radians(direction)), math.sin(math.radians(direction))])
+        base, joint, tip = 2 + 4 * i, 3 + 4 * i, 4 + 4 * i
+        pts[base - 1] = d * 20
+        pts[base] = d * 40
+        pts[joint] = d * 60
+        pts[tip] = d * (80 if is_straight else 40)
+    return pts
+
+
+OPEN = make_hand((True, True, True, True, True))
+ONE = make_hand((False, True, False, False, False))
+TWO = make_hand((False, True, True, False, False))
+SIX = make_hand((True, False, False, False, True))
+FIST = make_hand((False, False, False, False, False))
+
+
+class TestFingerAngles:
+    """测试手指角度"""
+
+    def test_straight_and_bent(self):
+        """测试伸直为0度、弯曲为180度"""
+        angles = finger_angles(ONE)
+        assert angles.shape == (5,)
+        assert angles[1] == pytest.approx(0.0, abs=0.1)
+        assert angles[0] == pytest.approx(180.0, abs=0.1)
+
+    def test_batch_shape(self):
+        """测试多只手一次计算"""
+        angles = finger_angles(np.stack([OPEN, ONE, TWO]))
+        assert angles.shape == (3, 5)
+        np.testing.assert_allclose(angles[1], finger_angles(ONE))
+
+    def test_degenerate(self):
+        """测试关键点重合时角度为nan，分类为0"""
+        angles = finger_angles(np.zeros((21, 2)))
+        assert np.isnan(angles).all()
+        assert classify(angles) == 0
+
+
+class TestClassify:
+    """测试手势表分类"""
+
+    def test_gestures(self):
+        """测试各手势"""
+        assert classify_landmarks(OPEN) == 5
+        assert classify_landmarks(ONE) == 1
+        assert classify_landmarks(TWO) == 2
+        assert classify_landmarks(SIX) == 6
+        assert classify_landmarks(FIST) == 0
+
+    def test_batch(self):
+        """测试多只手/连续多帧一次分类"""
+        result = classify_landmarks(np.stack([OPEN, ONE, TWO, SIX, FIST]))
+        assert result.tolist() == [5, 1, 2, 6, 0]
+
+    def test_legacy_api(self):
+        """测试兼容旧接口：hand_angle 返回列表，65535 为无效角度"""
+        assert gesture(hand_angle(ONE)) == 1
+        assert gesture([65535.0, 0, 90, 90, 90]) == 0
+
+
+class TestGestureFilter:
+    """测试手势时间平滑"""
+
+    def test_needs_votes(self):
+        """测试同一手势达到票数才切换"""
+        f = GestureFilter(window=5, min_votes=3)
+        assert f.update(1) == 0
+        assert f.update(1) == 0
+        assert f.update(1) == 1
+
+    def test_ignores_spike(self):
+        """测试单帧误识别不改变结果"""
+        f = GestureFilter(window=5, min_votes=3)
+        for _ in range(3):
+            f.update(2)
+        assert f.update(5) == 2
+        assert f.update(2) == 2
+
+    def test_reset(self):
+        f = GestureFilter()
+        for _ in range(3):
+            f.update(4)
+        f.reset()
+        assert f.gesture == 0
+        assert f.update(4) == 0
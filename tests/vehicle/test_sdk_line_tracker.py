@@ -0,0 +1,83 @@
+"""
+测试 HiwonderSDK - 列投影巡线
+"""
+
+import pytest
+import os
+import sys
+
+import numpy as np
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../TurboPi'))
+
+from HiwonderSDK.LineTracker import LineTracker
+
+HEIGHT, WIDTH = 240, 320
+
+
+def strip_mask(tracker, columns, rois=None):
+    """生成ROI行的掩码：每个ROI中 columns 指定的列为线条（255）"""
+    _, offsets, heights, _ = tracker.layout(HEIGHT)
+    mask = np.zeros((heights.sum(), WIDTH), dtype=np.uint8)
+    for i, (offset, height) in enumerate(zip(offsets, heights)):
+        if rois is None or i in rois:
+            for x0, x1 in columns:
+                mask[offset:offset + height, x0:x1] = 255
+    return mask
+
+
+class TestLineTracker:
+    """测试列投影巡线"""
+
+    def test_layout(self):
+        """测试ROI行按画面高度换算"""
+        tracker = LineTracker()
+        rows, offsets, heights, middles = tracker.layout(HEIGHT)
+        assert len(rows) == heights.sum()
+        assert offsets.tolist() == [0, heights[0], heights[0] + heights[1]]
+        assert rows[0] == 120
+
+    def test_centered_line(self):
+        """测试线条在正中时偏移为0、置信度为1"""
+        tracker = LineTracker()
+        result = tracker.track_mask(strip_mask(tracker, [(150, 170)]), HEIGHT)
+        assert result.offset == pytest.approx((159.5 - 160) / 160)
+        assert result.confidence == pytest.approx(1.0)
+
+    def test_left_line(self):
+        """测试线条偏左时偏移为负"""
+        tracker = LineTracker()
+        result = tracker.track_mask(strip_mask(tracker, [(20, 40)]), HEIGHT)
+        assert result.offset < -0.7
+
+    def test_no_line(self):
+        """测试没有线条"""
+        tracker = LineTracker()
+        result = tracker.track_mask(strip_mask(tracker, []), HEIGHT)
+        assert result.offset == 0.0
+        assert result.confidence == 0.0
+        assert result.center is None
+        assert np.isnan(result.centers).all()
+
+    def test_widest_run(self):
+        """测试同一ROI中有多段时取最宽的一段"""
+        tracker = LineTracker()
+        result = tracker.track_mask(strip_mask(tracker, [(10, 14), (200, 240)]), HEIGHT)
+        assert result.center == pytest.approx(219.5)
+
+    def test_partial_confidence(self):
+        """测试只有部分ROI看到线条时置信度为其权重占比"""
+        tracker = LineTracker()
+        result = tracker.track_mask(strip_mask(tracker, [(100, 120)], rois={2}), HEIGHT)
+        assert result.confidence == pytest.approx(0.6)
+        assert np.isnan(result.centers[0]) and np.isnan(result.centers[1])
+        assert result.centers[2] == pytest.approx(109.5)
+
+    def test_noise_ignored(self):
+        """测试零散噪声点不算线条"""
+        tracker = LineTracker()
+        mask = strip_mask(tracker, [])
+        mask[::3, ::7] = 255
+        result = tracker.track_mask(mask, HEIGHT)
+        assert result.confidence == 0.0
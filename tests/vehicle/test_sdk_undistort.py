@@ -0,0 +1,84 @@
+"""
+测试 HiwonderSDK - 鱼眼畸变矫正映射表
+"""
+
+import pytest
+import os
+import sys
+
+import numpy as np
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../TurboPi'))
+
+from HiwonderSDK.Undistort import UndistortMaps
+
+SIZE = (320, 240)
+
+
+@pytest.fixture
+def calibration(tmp_path):
+    """640x480 标定尺寸的合成标定参数文件"""
+    path = tmp_path / 'calibration_param.npz'
+    k = np.array([[300.0, 0.0, 320.0], [0.0, 300.0, 240.0], [0.0, 0.0, 1.0]])
+    d = np.array([[-0.05], [0.01], [0.0], [0.0]])
+    np.savez(path, dim_array=np.array([640, 480]), k_array=k, d_array=d)
+    return str(path)
+
+
+def frame():
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, (SIZE[1], SIZE[0], 3), dtype=np.uint8)
+
+
+class TestUndistortMaps:
+    """测试矫正映射表"""
+
+    def test_maps_match_output_size(self, calibration, tmp_path):
+        """测试映射表按输出尺寸计算（标定尺寸不同时缩放内参）"""
+        maps = UndistortMaps(calibration, SIZE, str(tmp_path / 'cache'))
+        assert maps.map1.shape[:2] == (SIZE[1], SIZE[0])
+        assert maps.remap(frame()).shape == (SIZE[1], SIZE[0], 3)
+
+    def test_cache_is_memory_mapped(self, calibration, tmp_path):
+        """测试第二次从磁盘缓存映射，结果与计算的相同"""
+        cache = str(tmp_path / 'cache')
+        first = UndistortMaps(calibration, SIZE, cache)
+        second = UndistortMaps(calibration, SIZE, cache)
+        assert not first.cached
+        assert second.cached
+        assert isinstance(second.map1, np.memmap)
+        assert np.array_equal(first.map1, second.map1)
+        assert np.array_equal(first.map2, second.map2)
+
+    def test_cache_keyed_by_resolution_and_calibration(self, calibration, tmp_path):
+        """测试分辨率或标定参数变化时使用不同的缓存"""
+        cache = str(tmp_path / 'cache')
+        small = UndistortMaps(calibration, SIZE, cache)
+        large = UndistortMaps(calibration, (640, 480), cache)
+        assert small.key != large.key
+
+        data = dict(np.load(calibration))
+        data['d_array'] = data['d_array'] * 2
+        np.savez(calibration, **data)
+        assert UndistortMaps(calibration, SIZE, cache).key != small.key
+
+    def test_roi_matches_full_remap(self, calibration, tmp_path):
+        """测试只矫正区域的结果与整个画面矫正后裁剪的相同"""
+        maps = UndistortMaps(calibration, SIZE, str(tmp_path / 'cache'))
+        image = frame()
+        full = maps.remap(image)
+        roi = maps.remap_roi(image, (40, 160, 200, 80))
+        assert np.array_equal(roi, full[160:240, 40:240])
+
+    def test_roi_clipped(self, calibration, tmp_path):
+        """测试超出画面的区域被裁掉"""
+        maps = UndistortMaps(calibration, SIZE, str(tmp_path / 'cache'))
+        assert maps.remap_roi(frame(), (300, 200, 100, 100)).shape == (40, 20, 3)
+        assert maps.remap_roi(frame(), (400, 0, 10, 10)).size == 0
+
+    def test_size_mismatch(self, calibration, tmp_path):
+        """测试画面尺寸与映射表不同时报错"""
+        maps = UndistortMaps(calibration, SIZE, str(tmp_path / 'cache'))
+        with pytest.raises(ValueError):
+            maps.remap(np.zeros((480, 640, 3), dtype=np.uint8))
@@ -0,0 +1,66 @@
+"""
+测试视频流 - 快照规格协商
+"""
+
+import pytest
+import os
+import sys
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../vehicle'))
+
+from stream.adaptive import SnapshotPolicy, TIERS, parse_roi
+
+
+class TestSnapshotPolicy:
+    """测试按RTT选择快照规格"""
+
+    def test_no_rtt_unlimited(self):
+        """测试还没有测得RTT时使用最高档"""
+        policy = SnapshotPolicy()
+        assert policy.limits() == (TIERS[0][1], TIERS[0][2])
+
+    def test_slow_link_downgrades(self):
+        """测试链路变慢时降低宽度和质量"""
+        policy = SnapshotPolicy()
+        policy.record_rtt(0.05)
+        fast = policy.limits()
+        for _ in range(20):
+            policy.record_rtt(2.0)
+        assert policy.limits() == (TIERS[-1][1], TIERS[-1][2])
+        assert policy.limits()[1] < fast[1]
+
+    def test_request_is_capped(self):
+        """测试请求值与链路上限取较小值"""
+        policy = SnapshotPolicy()
+        policy.record_rtt(0.3)
+        spec = policy.resolve({'max_width': 320, 'quality': 90})
+        assert spec['max_width'] == 240
+        assert spec['quality'] == 65
+        spec = policy.resolve({'max_width': 100, 'quality': 30})
+        assert spec == {'max_width': 100, 'quality': 30, 'roi': None}
+
+    def test_not_adaptive(self):
+        """测试关闭自适应时只使用请求值"""
+        policy = SnapshotPolicy()
+        policy.record_rtt(2.0)
+        spec = policy.resolve({'quality': 90, 'adaptive': False})
+        assert spec == {'max_width': None, 'quality': 90, 'roi': None}
+
+
+class TestParseRoi:
+    """测试ROI解析"""
+
+    def test_string_and_list(self):
+        assert parse_roi('0.25,0.25,0.5,0.5') == (0.25, 0.25, 0.5, 0.5)
+        assert parse_roi([0.5, 0.5, 1.0, 1.0]) == (0.5, 0.5, 0.5, 0.5)
+
+    def test_full_frame(self):
+        assert parse_roi('0,0,1,1') is None
+        assert parse_roi(None) is None
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            parse_roi('0.1,0.2')
+        with pytest.raises(ValueError):
+            parse_roi('1,1,0.5,0.5')
@@ -0,0 +1,165 @@
+"""
+测试视频流 - JPEG编码缓存
+"""
+
+import pytest
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../vehicle'))
+
+from core.frame import FrameHandle
+from stream import jpeg_cache as jpeg_cache_module
+from stream.jpeg_cache import JpegCache
+
+
+class CountingEncoder:
+    """代替 cv2.imencode：记录编码次数，可以让每次编码变慢"""
+
+    def __init__(self, monkeypatch, delay=0.0):
+        self.delay = delay
+        self.calls = []
+        self._lock = threading.Lock()
+        self._imencode = jpeg_cache_module.cv2.imencode
+        monkeypatch.setattr(jpeg_cache_module.cv2, 'imencode', self)
+
+    def __call__(self, ext, image, params):
+        with self._lock:
+            self.calls.append((image.shape[1], image.shape[0], params[1]))
+        if self.delay:
+            time.sleep(self.delay)
+        return self._imencode(ext, image, params)
+
+    @property
+    def count(self):
+        return len(self.calls)
+
+
+def frame(seq, width=320, height=240):
+    image = np.random.default_rng(seq).integers(0, 255, (height, width, 3), dtype=np.uint8)
+    return FrameHandle(seq, image)
+
+
+class TestJpegCacheKey:
+    """测试缓存键 (帧序号, 质量, 最大宽度, ROI)"""
+
+    def test_same_spec_encoded_once(self, monkeypatch):
+        """测试同一帧同一规格只编码一次"""
+        encoder = CountingEncoder(monkeypatch)
+        cache = JpegCache()
+        f = frame(1)
+        first = cache.get(f, 70)
+        assert cache.get(f, 70) == first
+        assert encoder.count == 1
+        assert cache.hits == 1 and cache.misses == 1
+
+    def test_each_field_is_part_of_key(self, monkeypatch):
+        """测试质量、最大宽度、ROI、帧序号不同时分别编码"""
+        encoder = CountingEncoder(monkeypatch)
+        cache = JpegCache()
+        f = frame(1)
+        cache.get_image(f, 70)
+        cache.get_image(f, 50)
+        cache.get_image(f, 70, max_width=160)
+        cache.get_image(f, 70, roi=(0.0, 0.0, 0.5, 0.5))
+        cache.get_image(frame(2), 70)
+        assert encoder.count == 5
+        assert cache.get_stats()['entries'] == 5
+
+    def test_equivalent_specs_share_entry(self, monkeypatch):
+        """测试等价的规格（宽度不小于原图、整个画面的ROI、ROI舍入）共用一份结果"""
+        encoder = CountingEncoder(monkeypatch)
+        cache = JpegCache()
+        f = frame(1)
+        cache.get_image(f, 70)
+        cache.get_image(f, 70, max_width=640)
+        cache.get_image(f, 70, roi=(0, 0, 1, 1))
+        cache.get_image(f, 70, roi=(0.25, 0.25, 0.5, 0.5))
+        cache.get_image(f, 70, roi=(0.251, 0.249, 0.5, 0.5))
+        assert encoder.count == 2
+
+    def test_variant_size(self, monkeypatch):
+        """测试ROI裁剪和最大宽度缩小后的图像尺寸"""
+        CountingEncoder(monkeypatch)
+        cache = JpegCache()
+        image = cache.get_image(frame(1), 70, max_width=160, roi=(0.0, 0.0, 0.5, 1.0))
+        assert (image.width, image.height) == (160, 240)
+        image = cache.get_image(frame(1), 70, max_width=80)
+        assert (image.width, image.height) == (80, 60)
+
+
+class TestJpegCacheEviction:
+    """测试LRU淘汰"""
+
+    def test_oldest_evicted(self, monkeypatch):
+        """测试超过容量时淘汰最久没有使用的条目"""
+        encoder = CountingEncoder(monkeypatch)
+        cache = JpegCache(capacity=2)
+        f1, f2, f3 = frame(1), frame(2), frame(3)
+        cache.get(f1)
+        cache.get(f2)
+        cache.get(f3)
+        assert cache.get_stats()['entries'] == 2
+        cache.get(f1)
+        assert encoder.count == 4
+
+    def test_hit_refreshes_entry(self, monkeypatch):
+        """测试命中的条目移到最新，不会被淘汰"""
+        encoder = CountingEncoder(monkeypatch)
+        cache = JpegCache(capacity=2)
+        f1, f2, f3 = frame(1), frame(2), frame(3)
+        cache.get(f1)
+        cache.get(f2)
+        cache.get(f1)
+        cache.get(f3)
+        cache.get(f1)
+        assert encoder.count == 3
+        cache.get(f2)
+        assert encoder.count == 4
+
+
+class TestJpegCacheSingleFlight:
+    """测试同一规格的并发请求只编码一次"""
+
+    def _concurrent(self, cache, calls):
+        results = [None] * len(calls)
+        barrier = threading.Barrier(len(calls))
+
+        def worker(i, f, kwargs):
+            barrier.wait()
+            results[i] = cache.get_image(f, **kwargs)
+
+        threads = [threading.Thread(target=worker, args=(i, f, kwargs))
+                   for i, (f, kwargs) in enumerate(calls)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=5)
+        return results
+
+    def test_same_key_encoded_once(self, monkeypatch):
+        """测试同时请求同一帧同一规格时只有一个线程编码"""
+        encoder = CountingEncoder(monkeypatch, delay=0.1)
+        cache = JpegCache()
+        f = frame(1)
+        results = self._concurrent(cache, [(f, {'quality': 70})] * 8)
+        assert encoder.count == 1
+        assert all(r is results[0] for r in results)
+        assert cache.misses == 1 and cache.hits == 7
+
+    def test_different_keys_encoded_separately(self, monkeypatch):
+        """测试同时请求不同质量或ROI时各自编码"""
+        encoder = CountingEncoder(monkeypatch, delay=0.1)
+        cache = JpegCache()
+        f = frame(1)
+        calls = [(f, {'quality': 70}), (f, {'quality': 50}),
+                 (f, {'quality': 70, 'roi': (0.0, 0.0, 0.5, 0.5)})] * 3
+        results = self._concurrent(cache, calls)
+        assert encoder.count == 3
+        assert cache.get_stats()['entries'] == 3
+        assert len({r.data for r in results}) == 3
@@ -0,0 +1,190 @@
+"""
+测试视频流 - MJPEG推流
+"""
+
+import pytest
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../vehicle'))
+
+from core.frame import FrameSlot
+from stream.jpeg_cache import JpegCache
+from stream.mjpeg import MjpegBroadcaster, StreamClient
+
+
+class FakeVision:
+    """离线摄像头：inject_frame 发布一帧，与 VisionController 的发布方式相同"""
+
+    def __init__(self):
+        self._frames = FrameSlot()
+        self._cond = threading.Condition()
+
+    def inject_frame(self, image, timestamp=None):
+        frame = self._frames.publish(image, timestamp)
+        with self._cond:
+            self._cond.notify_all()
+        return frame
+
+    def get_frame(self):
+        return self._frames.latest
+
+    def wait_next_frame(self, last_id=None, timeout=1.0):
+        with self._cond:
+            if last_id is None:
+                last_id = self._frames.seq
+            return self._cond.wait_for(lambda: self._frames.seq != last_id, timeout)
+
+
+# 送入两帧之间的间隔（秒），大于 1/MAX_FPS 并留出调度抖动的余量
+FRAME_GAP = 0.1
+
+
+def image(value):
+    return np.full((48, 64, 3), value, dtype=np.uint8)
+
+
+def wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+@pytest.fixture
+def stream():
+    vision = FakeVision()
+    cache = JpegCache()
+    broadcaster = MjpegBroadcaster(vision, cache)
+    broadcaster.FRAME_TIMEOUT = 0.05
+    yield vision, cache, broadcaster
+    for client in list(broadcaster._clients):
+        broadcaster.close(client)
+
+
+def inject(vision, broadcaster, value):
+    """送入一帧并等编码线程开始处理（分发可能还没完成）"""
+    frames = broadcaster.frames
+    vision.inject_frame(image(value))
+    assert wait_until(lambda: broadcaster.frames > frames)
+
+
+class TestStreamClient:
+    """测试观看者槽位和帧率限制"""
+
+    def test_slot_keeps_latest(self):
+        """测试没有取走的旧帧被覆盖并计为丢帧"""
+        client = StreamClient(max_fps=30, quality=70)
+        client.offer(b'1', 0.0)
+        client.offer(b'2', 0.1)
+        client.offer(b'3', 0.2)
+        assert client.next(timeout=0.1) == b'3'
+        assert client.dropped == 2
+        assert client.sent == 1
+        assert client.next(timeout=0.05) is None
+
+    def test_due(self):
+        """测试按帧率限制"""
+        client = StreamClient(max_fps=10, quality=70)
+        client.offer(b'1', 100.0)
+        assert not client.due(100.05)
+        assert client.due(100.11)
+
+    def test_close_wakes_reader(self):
+        """测试关闭时等待中的读取立即返回"""
+        client = StreamClient(max_fps=10, quality=70)
+        threading.Timer(0.05, client.close).start()
+        t0 = time.monotonic()
+        assert client.next(timeout=2.0) is None
+        assert time.monotonic() - t0 < 1.0
+
+
+class TestMjpegBroadcaster:
+    """测试单编码线程分发"""
+
+    def test_slow_client_drops(self, stream):
+        """测试慢的观看者只保留最新一帧，不影响快的观看者"""
+        vision, cache, broadcaster = stream
+        slow = broadcaster.open(max_fps=30)
+        fast = broadcaster.open(max_fps=30)
+        received = []
+
+        def consume():
+            while not fast.closed:
+                data = fast.next(timeout=0.05)
+                if data is not None:
+                    received.append(data)
+
+        reader = threading.Thread(target=consume)
+        reader.start()
+        for value in range(5):
+            inject(vision, broadcaster, value * 50)
+            time.sleep(FRAME_GAP)
+        assert wait_until(lambda: len(received) == 5)
+        broadcaster.close(fast)
+        reader.join(timeout=2)
+
+        assert fast.dropped == 0
+        assert slow.dropped == 4
+        assert slow.next(timeout=0.1) == received[-1]
+
+    def test_fps_cap(self, stream):
+        """测试每个观看者的帧率上限"""
+        vision, cache, broadcaster = stream
+        capped = broadcaster.open(max_fps=2)
+        full = broadcaster.open(max_fps=30)
+        for value in range(4):
+            inject(vision, broadcaster, value * 40)
+            time.sleep(FRAME_GAP)
+        assert full.dropped == 3
+        assert capped.dropped == 0
+        assert capped.next(timeout=0.1) is not None
+        assert capped.next(timeout=0.05) is None
+
+    def test_one_encode_per_quality(self, stream):
+        """测试同一帧同一质量只编码一次，所有观看者共用"""
+        vision, cache, broadcaster = stream
+        clients = [broadcaster.open(max_fps=30, quality=q) for q in (70, 70, 70, 50)]
+        inject(vision, broadcaster, 128)
+        data = [c.next(timeout=1.0) for c in clients]
+        assert broadcaster.encodes == 2
+        assert cache.misses == 2
+        assert data[0] is data[1] is data[2]
+        assert data[3] != data[0]
+
+    def test_thread_stops_when_last_client_leaves(self, stream):
+        """测试最后一个观看者离开后编码线程退出，新的观看者加入时重新启动"""
+        vision, cache, broadcaster = stream
+        first = broadcaster.open()
+        second = broadcaster.open()
+        thread = broadcaster._thread
+        assert thread.is_alive()
+
+        broadcaster.close(first)
+        time.sleep(broadcaster.FRAME_TIMEOUT * 3)
+        assert thread.is_alive()
+
+        broadcaster.close(second)
+        thread.join(timeout=1)
+        assert not thread.is_alive()
+        assert broadcaster._thread is None
+
+        client = broadcaster.open()
+        assert broadcaster._thread.is_alive()
+        inject(vision, broadcaster, 200)
+        assert client.next(timeout=0.5) is not None
+
+    def test_max_clients(self, stream):
+        """测试超过最大观看者数量时拒绝"""
+        vision, cache, broadcaster = stream
+        broadcaster.MAX_CLIENTS = 2
+        assert broadcaster.open() is not None
+        assert broadcaster.open() is not None
+        assert broadcaster.open() is None
@@ -37,6 +37,9 @@ from connection.manager import init_connection_manager
 # 导入硬件抽象层和执行器
 import hal
 from executor import ProcessManager
+from stream.adaptive import snapshot_policy
+from stream.jpeg_cache import jpeg_cache
+from stream.mjpeg import MjpegBroadcaster, BOUNDARY, multipart_chunk
 
 # 从配置文件加载配置
 def load_config():
@@ -69,6 +72,9 @@ connection_manager = init_connection_manager(
 # 初始化进程管理器（带HAL模块）
 process_manager = ProcessManager(hal_module=hal)
 
+# 视频流：一个编码线程分发给所有观看者
+mjpeg_broadcaster = MjpegBroadcaster(hal.vision_controller, jpeg_cache)
+
 
 # ===== 路由 =====
 
@@ -96,31 +102,150 @@ def get_status():
             'connected': connection_manager.is_connected(),
             'busy': proc_status['executing'],
             'process_id': proc_status.get('process_id'),
-            'sensors': sensor_data
+            'sensors': sensor_data,
+            'line_follower': hal.line_follower.get_status(),
+            'trajectory': hal.trajectory_controller.get_status(),
+            'drift_calibration': hal.drift_calibrator.get_status(),
+            'gimbal_tracker': hal.gimbal_tracker.get_status(),
+            'qr_reader': hal.qr_reader.get_status(),
+            'inference': hal.inference_worker.get_status(),
+            'camera': hal.vision_controller.get_metrics(),
+            'vision': hal.vision_controller.worker.get_status(),
+            'jpeg_cache': jpeg_cache.get_stats(),
+            'snapshot_policy': snapshot_policy.get_status(),
+            'stream': mjpeg_broadcaster.get_status()
+        }
+    })
+
+
+@app.route('/api/calibration/motor', methods=['GET'])
+def get_motor_calibration():
+    """获取电机标定"""
+    return jsonify({
+        'success': True,
+        'data': hal.motion_controller.calibration.to_dict()
+    })
+
+
+@app.route('/api/calibration/motor/drift', methods=['POST'])
+def run_drift_calibration():
+    """开始直行跑偏标定（小车需放在直线测试条上）
+
+    标定在后台运行，立即返回；通过 GET 同一路径查询进度和结果。
+    速度、时间和轮数会被限制在安全范围内（速度不超过 MOTOR_MAX_SPEED，每轮最多5秒，最多5轮）。
+    """
+    if process_manager.get_status()['executing']:
+        return jsonify({'success': False, 'error': '有代码正在执行，无法标定'}), 409
+
+    params = request.get_json(silent=True)
+    if params is None:
+        params = {}
+    if not isinstance(params, dict):
+        return jsonify({'success': False, 'error': '参数必须是JSON对象'}), 400
+
+    try:
+        status = hal.drift_calibrator.start(
+            speed=params.get('speed', 40),
+            duration=params.get('duration', 2.0),
+            runs=params.get('runs', 3),
+            save=bool(params.get('save', True))
+        )
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except RuntimeError as e:
+        return jsonify({'success': False, 'error': str(e)}), 409
+    return jsonify({'success': True, 'data': status}), 202
+
+
+@app.route('/api/calibration/motor/drift', methods=['GET'])
+def get_drift_calibration():
+    """查询跑偏标定的进度和结果"""
+    return jsonify({'success': True, 'data': hal.drift_calibrator.get_status()})
+
+
+@app.route('/api/calibration/motor/drift', methods=['DELETE'])
+def cancel_drift_calibration():
+    """中止跑偏标定（停车，不保存）"""
+    if not hal.drift_calibrator.cancel():
+        return jsonify({'success': False, 'error': '没有正在进行的标定'}), 409
+    return jsonify({'success': True, 'data': hal.drift_calibrator.get_status()})
+
+
+@app.route('/api/trace')
+def get_trace():
+    """导出最近的HAL调用跟踪记录"""
+    limit = request.args.get('limit', 200, type=int)
+    return jsonify({
+        'success': True,
+        'data': {
+            'capacity': hal.hal_trace.capacity,
+            'entries': hal.hal_trace.snapshot(limit)
         }
     })
 
 
 @app.route('/camera/snapshot')
 def camera_snapshot():
-    """摄像头快照"""
+    """摄像头快照（同一帧同一规格的JPEG只编码一次，所有请求共用）
+
+    查询参数:
+        max_width: 最大宽度，超过时等比缩小
+        quality: JPEG质量（10-95）
+        roi: 只返回画面中的区域 "x,y,w,h"（比例坐标 0-1）
+    """
     try:
-        import cv2
-        # 读取一帧
-        if hal.vision_controller._read_frame():
-            frame = hal.vision_controller.current_frame
-            # 编码为JPEG
-            ret, jpg = cv2.imencode('.jpg', frame)
-            if ret:
-                from flask import Response
-                jpg_bytes = jpg.tobytes()
-                return Response(jpg_bytes, mimetype='image/jpeg')
+        # 局域网直连，不按云端链路的RTT降级
+        spec = snapshot_policy.resolve({
+            'max_width': request.args.get('max_width', type=int),
+            'quality': request.args.get('quality', type=int),
+            'roi': request.args.get('roi'),
+            'adaptive': False
+        })
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    try:
+        from flask import Response
+        # 读取最新帧（只读句柄，不复制）
+        frame = hal.vision_controller.get_frame()
+        if frame is not None:
+            jpeg = jpeg_cache.get_image(frame, **spec)
+            if jpeg is not None:
+                return Response(jpeg.data, mimetype='image/jpeg')
         return '', 404
     except Exception as e:
         logger.error(f"获取摄像头快照失败: {e}")
         return '', 500
 
 
+@app.route('/camera/stream')
+def camera_stream():
+    """摄像头MJPEG视频流
+
+    查询参数:
+        fps: 帧率上限（默认15，最高30）
+        quality: JPEG质量（10-95）
+    """
+    from flask import Response
+    client = mjpeg_broadcaster.open(
+        request.args.get('fps', type=float),
+        request.args.get('quality', type=int)
+    )
+    if client is None:
+        return jsonify({'success': False, 'error': '观看人数已满'}), 503
+
+    def generate():
+        try:
+            while not client.closed:
+                data = client.next(timeout=1.0)
+                if data is not None:
+                    yield multipart_chunk(data)
+        finally:
+            mjpeg_broadcaster.close(client)
+
+    return Response(generate(), mimetype=f'multipart/x-mixed-replace; boundary={BOUNDARY}')
+
+
 # ===== SocketIO事件处理 =====
 
 @socketio.on('connect')
@@ -300,29 +425,31 @@ def handle_cloud_message(data):
         logger.info(f"收到摄像头快照请求: {request_id}")
 
         try:
-            import base64
-            import cv2
-            # 读取摄像头帧
-            if hal.vision_controller._read_frame():
-                frame = hal.vision_controller.current_frame
-                # 编码为JPEG
-                ret, buffer = cv2.imencode('.jpg', frame)
-                if ret:
-                    jpg_bytes = buffer.tobytes()
-                    image_base64 = base64.b64encode(jpg_bytes).decode('utf-8')
-
-                    # 发送响应
-                    connection_manager.send_camera_snapshot(request_id, image_base64)
-                    logger.info(f"摄像头快照已发送: request_id={request_id}, size={len(jpg_bytes)}")
+            # 读取最新帧（只读句柄，不复制），JPEG与其他快照请求共用缓存
+            frame = hal.vision_controller.get_frame()
+            if frame is not None:
+                # 请求的 max_width/quality/roi 与当前链路（心跳RTT）的上限合并
+                try:
+                    spec = snapshot_policy.resolve(payload)
+                except ValueError as e:
+                    logger.warning(f"快照参数无效，使用默认规格: {e}")
+                    spec = snapshot_policy.resolve()
+                jpeg = jpeg_cache.get_image(frame, **spec)
+                if jpeg is not None:
+                    # 发送响应（网关支持时为二进制帧，否则为 JSON+base64）
+                    connection_manager.send_camera_snapshot(
+                        request_id, jpeg.data, frame, (jpeg.width, jpeg.height))
+                    logger.info(f"摄像头快照已发送: request_id={request_id}, "
+                                f"{jpeg.width}x{jpeg.height}, quality={spec['quality']}, size={len(jpeg.data)}")
                 else:
                     logger.warning("摄像头编码失败")
-                    connection_manager.send_camera_snapshot(request_id, "")
+                    connection_manager.send_camera_snapshot(request_id)
             else:
                 logger.warning("无法读取摄像头帧")
-                connection_manager.send_camera_snapshot(request_id, "")
+                connection_manager.send_camera_snapshot(request_id)
         except Exception as e:
             logger.error(f"处理摄像头快照请求失败: {e}")
-            connection_manager.send_camera_snapshot(request_id, "")
+            connection_manager.send_camera_snapshot(request_id)
 
 
 # ===== 主程序 =====
@@ -341,7 +468,8 @@ def create_app():
     connection_manager.set_callbacks(
         on_connect=lambda: logger.info('已连接到云端'),
         on_disconnect=lambda: logger.warning('与云端断开连接'),
-        on_error=lambda e: logger.error(f'连接错误: {e}')
+        on_error=lambda e: logger.error(f'连接错误: {e}'),
+        on_rtt=snapshot_policy.record_rtt
     )
 
     return app
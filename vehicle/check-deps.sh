@@ -65,6 +65,7 @@ if [ $IS_RPI -eq 1 ]; then
     check_item "RPi.GPIO" "python3 -c 'import RPi.GPIO'" "pip3 install RPi.GPIO"
     check_item "smbus2" "python3 -c 'import smbus2'" "pip3 install smbus2"
     check_item "rpi_ws281x" "python3 -c 'import rpi_ws281x'" "pip3 install rpi-ws281x"
+    check_item "pyzbar (libzbar0)" "python3 -c 'import pyzbar.pyzbar'" "sudo apt install libzbar0 && pip3 install pyzbar"
     echo ""
 fi
 
@@ -86,6 +87,7 @@ echo ""
 echo "=== 可选工具 ==="
 check_item "uv (包管理器)" "command -v uv" "curl -LsSf https://astral.sh/uv/install.sh | sh"
 check_item "gunicorn (WSGI服务器)" "command -v gunicorn" "pip3 install gunicorn"
+check_item "mediapipe (人脸/手势识别)" "python3 -c 'import mediapipe'" "pip3 install mediapipe"
 echo ""
 
 # ===== 检查 TurboPi 路径 =====
@@ -8,6 +8,7 @@
 4. 消息发送和接收
 """
 
+import base64
 import json
 import logging
 import os
@@ -17,6 +18,8 @@ import threading
 import websocket
 from typing import Callable, Dict, Optional
 
+from .snapshot_frame import SNAPSHOT_FRAME_VERSION, encode_snapshot_frame
+
 # 配置日志
 logging.basicConfig(
     level=logging.INFO,
@@ -42,6 +45,8 @@ class VehicleConnectionManager:
         # 心跳定时器
         self._heartbeat_timer: Optional[threading.Timer] = None
         self._heartbeat_interval = 10  # 心跳间隔（秒），应小于 gateway 的超时时间（25秒）
+        self._heartbeat_sent_at: Optional[float] = None
+        self.rtt: Optional[float] = None  # 最近一次心跳的往返时间（秒）
 
         # 保存原始域名用于 SNI（Server Name Indication）
         # 当使用 IP 地址连接时，需要告诉服务器证书对应的域名
@@ -70,12 +75,19 @@ class VehicleConnectionManager:
         self._skip_ssl_verify = os.getenv('WS_SKIP_SSL_VERIFY', 'false').lower() == 'true'
 
         # 消息处理器
-        self.message_handlers: Dict[str, Callable] = {}
+        self.message_handlers: Dict[str, Callable] = {
+            'register_ack': self._handle_register_ack,
+            'pong': self._handle_pong,
+        }
+
+        # 快照传输格式：网关在注册确认中同意后使用二进制快照帧，否则使用 JSON+base64
+        self.binary_snapshot = False
 
         # 连接状态回调
         self.on_connect_cb: Optional[Callable] = None
         self.on_disconnect_cb: Optional[Callable] = None
         self.on_error_cb: Optional[Callable] = None
+        self.on_rtt_cb: Optional[Callable] = None
 
     def register_handler(self, msg_type: str, handler: Callable):
         """注册消息处理器"""
@@ -84,11 +96,13 @@ class VehicleConnectionManager:
     def set_callbacks(self,
                       on_connect: Optional[Callable] = None,
                       on_disconnect: Optional[Callable] = None,
-                      on_error: Optional[Callable] = None):
-        """设置连接状态回调"""
+                      on_error: Optional[Callable] = None,
+                      on_rtt: Optional[Callable] = None):
+        """设置连接状态回调（on_rtt 在每次测得心跳往返时间时调用，参数为秒）"""
         self.on_connect_cb = on_connect
         self.on_disconnect_cb = on_disconnect
         self.on_error_cb = on_error
+        self.on_rtt_cb = on_rtt
 
     def connect(self) -> websocket.WebSocketApp:
         """连接到云端（带自动重连）"""
@@ -153,6 +167,7 @@ class VehicleConnectionManager:
             """连接关闭回调"""
             logger.info(f"WebSocket连接已关闭: {close_status_code} - {close_msg}")
             self.running = False
+            self.binary_snapshot = False
 
             # 停止心跳定时器
             self._stop_heartbeat_timer()
@@ -226,11 +241,18 @@ class VehicleConnectionManager:
                 "capabilities": {
                     "motion": True,
                     "sensors": ["ultrasonic", "infrared", "line", "battery"],
-                    "vision": True
+                    "vision": True,
+                    "binary_snapshot": SNAPSHOT_FRAME_VERSION
                 }
             }
         })
 
+    def _handle_register_ack(self, data: dict):
+        """处理注册确认（协商快照传输格式）"""
+        version = (data.get('data') or {}).get('binary_snapshot', 0)
+        self.binary_snapshot = version == SNAPSHOT_FRAME_VERSION
+        logger.info(f"注册已确认: 快照格式={'二进制' if self.binary_snapshot else 'JSON+base64'}")
+
     def send(self, message: dict):
         """发送消息到云端"""
         if self.ws and self.running:
@@ -250,12 +272,23 @@ class VehicleConnectionManager:
             logger.warning('未连接到云端，无法发送消息')
 
     def send_heartbeat(self):
-        """发送心跳"""
+        """发送心跳（网关回复pong，据此测量往返时间）"""
+        self._heartbeat_sent_at = time.monotonic()
         self.send({
             "type": "heartbeat",
             "data": {}
         })
 
+    def _handle_pong(self, data: dict):
+        """处理心跳响应，记录往返时间"""
+        sent_at, self._heartbeat_sent_at = self._heartbeat_sent_at, None
+        if sent_at is None:
+            return
+        self.rtt = time.monotonic() - sent_at
+        logger.debug(f"心跳往返时间: {self.rtt * 1000:.1f}ms")
+        if self.on_rtt_cb:
+            self.on_rtt_cb(self.rtt)
+
     def send_execution_started(self, execution_id: str):
         """发送执行开始事件"""
         self.send({
@@ -324,16 +357,43 @@ class VehicleConnectionManager:
             }
         })
 
-    def send_camera_snapshot(self, request_id: str, image_base64: str):
-        """发送摄像头快照响应"""
+    def send_camera_snapshot(self, request_id: str, jpg_bytes: bytes = b"", frame=None, size=None):
+        """发送摄像头快照响应
+
+        网关支持时以二进制快照帧发送JPEG原始字节，否则使用 JSON+base64。
+
+        Args:
+            request_id: 请求ID
+            jpg_bytes: JPEG数据，空表示没有图像
+            frame: 对应的帧句柄（提供帧序号和采集时刻）
+            size: JPEG图像的 (宽, 高)，缩小或裁剪过时传入，默认为帧的尺寸
+        """
+        if self.binary_snapshot and jpg_bytes and frame is not None:
+            timestamp_ms = int((time.time() - frame.age()) * 1000)
+            width, height = size or frame.size
+            payload = encode_snapshot_frame(request_id, frame.seq, timestamp_ms,
+                                            width, height, jpg_bytes)
+            self.send_binary(payload)
+            return
+
         self.send({
             "type": "camera_snapshot_response",
             "data": {
                 "request_id": request_id,
-                "image": image_base64
+                "image": base64.b64encode(jpg_bytes).decode('ascii') if jpg_bytes else ""
             }
         })
 
+    def send_binary(self, payload: bytes):
+        """发送二进制消息到云端"""
+        if self.ws and self.running:
+            try:
+                self.ws.send(payload, opcode=websocket.ABNF.OPCODE_BINARY)
+            except Exception as e:
+                logger.error(f"发送二进制消息失败: {e}")
+        else:
+            logger.warning('未连接到云端，无法发送消息')
+
     def is_connected(self) -> bool:
         """检查是否已连接"""
         return self.running and self.ws is not None
@@ -0,0 +1,49 @@
+"""
+核心组件 - 指数退避
+
+设备或连接失败后按 initial, initial*factor, ... 逐次加长等待时间，
+最长不超过 maximum；成功后 reset() 回到初始值。
+等待时间加入少量随机抖动，避免多个重试者同时重试。
+"""
+
+import random
+from typing import Optional
+
+
+class Backoff:
+    """带上限的指数退避"""
+
+    def __init__(self, initial: float = 0.5, maximum: float = 10.0,
+                 factor: float = 2.0, jitter: float = 0.1,
+                 rng: Optional[random.Random] = None):
+        if initial <= 0 or maximum < initial or factor < 1.0:
+            raise ValueError("退避参数无效")
+        self.initial = initial
+        self.maximum = maximum
+        self.factor = factor
+        self.jitter = jitter
+        self._rng = rng or random.Random()
+        self.attempts = 0
+        self._delay = initial
+
+    def peek(self) -> float:
+        """下一次的等待时间（不含抖动，不改变状态）"""
+        return self._delay
+
+    def next_delay(self) -> float:
+        """本次失败后应等待的时间（秒），并增加失败次数
+
+        每次由上一次的等待时间乘以 factor 得到，到达上限后保持不变
+        （不用 factor ** attempts，长时间失败后也不会溢出）。
+        """
+        delay = self._delay
+        self._delay = min(self.maximum, delay * self.factor)
+        self.attempts += 1
+        if self.jitter:
+            delay *= 1.0 + self._rng.uniform(-self.jitter, self.jitter)
+        return min(self.maximum, delay)
+
+    def reset(self) -> None:
+        """成功后调用，回到初始等待时间"""
+        self.attempts = 0
+        self._delay = self.initial
@@ -0,0 +1,116 @@
+"""
+核心组件 - 电机标定
+
+每辆车的4个轮子并不完全一样，直行时会跑偏。标定表记录每个轮子的：
+- gain: 增益，修正轮子之间的转速差
+- deadband: 死区补偿，电机速度很小时轮子不转，非零速度额外加上该值
+- direction: 方向，1或-1，用于修正接反的电机
+
+标定表保存在 TurboPi 目录下的 motor_calibration.yaml（与 servo_config.yaml 同目录），
+写电机前用一次数组运算统一应用到4个轮子。
+"""
+
+import logging
+import os
+from typing import Optional, Sequence
+
+import numpy as np
+import yaml
+
+# 配置日志
+logger = logging.getLogger(__name__)
+
+CALIBRATION_FILE = 'motor_calibration.yaml'
+MOTOR_COUNT = 4
+MOTOR_LIMIT = 100
+
+
+class MotorCalibration:
+    """电机标定表"""
+
+    def __init__(self, gain: Sequence[float] = (1.0,) * MOTOR_COUNT,
+                 deadband: Sequence[float] = (0.0,) * MOTOR_COUNT,
+                 direction: Sequence[int] = (1,) * MOTOR_COUNT,
+                 model: Optional[dict] = None):
+        self.gain = np.array(gain, dtype=np.float64)
+        self.deadband = np.array(deadband, dtype=np.float64)
+        self.direction = np.array(direction, dtype=np.float64)
+        # 轨迹速度模型参数（cm_per_unit, deg_per_unit, accel_units）
+        self.model = dict(model or {})
+        self._validate()
+        self._compile()
+
+    def _validate(self):
+        for name in ('gain', 'deadband', 'direction'):
+            if getattr(self, name).shape != (MOTOR_COUNT,):
+                raise ValueError(f"标定参数 {name} 必须包含{MOTOR_COUNT}个值")
+        if not np.all(np.isin(self.direction, (-1, 1))):
+            raise ValueError(f"方向只能是1或-1: {self.direction.tolist()}")
+        if np.any(self.gain <= 0):
+            raise ValueError(f"增益必须为正数: {self.gain.tolist()}")
+
+    def _compile(self):
+        """预先合并方向与增益、方向与死区，apply() 只需一次乘加"""
+        self._dir_gain = self.direction * self.gain
+        self._dir_deadband = self.direction * self.deadband
+
+    def apply(self, speeds) -> np.ndarray:
+        """把4个轮子的目标速度换算为实际写入的速度
+
+        Args:
+            speeds: (左前, 右前, 左后, 右后) 目标速度
+
+        Returns:
+            np.ndarray: 标定后的速度（int，范围 -100~100）
+        """
+        s = np.asarray(speeds, dtype=np.float64)
+        out = self._dir_gain * s + np.sign(s) * self._dir_deadband
+        return np.clip(np.rint(out), -MOTOR_LIMIT, MOTOR_LIMIT).astype(np.int64)
+
+    def is_identity(self) -> bool:
+        """是否为默认标定（不做任何修正）"""
+        return (np.all(self.gain == 1.0) and np.all(self.deadband == 0.0)
+                and np.all(self.direction == 1))
+
+    # ===== 读写 =====
+
+    def to_dict(self) -> dict:
+        data = {}
+        for i in range(MOTOR_COUNT):
+            data[f'motor{i + 1}'] = {
+                'gain': round(float(self.gain[i]), 4),
+                'deadband': round(float(self.deadband[i]), 2),
+                'direction': int(self.direction[i]),
+            }
+        if self.model:
+            data['model'] = dict(self.model)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'MotorCalibration':
+        data = data or {}
+        motors = [data.get(f'motor{i + 1}') or {} for i in range(MOTOR_COUNT)]
+        return cls(
+            gain=[float(m.get('gain', 1.0)) for m in motors],
+            deadband=[float(m.get('deadband', 0.0)) for m in motors],
+            direction=[int(m.get('direction', 1)) for m in motors],
+            model=data.get('model'),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> 'MotorCalibration':
+        """从YAML文件加载，文件不存在时返回默认标定"""
+        if not os.path.exists(path):
+            logger.info(f"未找到电机标定文件，使用默认标定: {path}")
+            return cls()
+        with open(path, 'r', encoding='utf-8') as f:
+            data = yaml.safe_load(f)
+        calibration = cls.from_dict(data)
+        logger.info(f"电机标定已加载: {path}")
+        return calibration
+
+    def save(self, path: str) -> None:
+        """保存到YAML文件"""
+        with open(path, 'w', encoding='utf-8') as f:
+            yaml.safe_dump(self.to_dict(), f, allow_unicode=True, sort_keys=True)
+        logger.info(f"电机标定已保存: {path}")
@@ -0,0 +1,134 @@
+"""
+核心组件 - 只读帧句柄
+
+相机读取线程每得到一帧就创建一个 FrameHandle，并用一次引用赋值发布出去。
+图像数组被设为只读（flags.writeable=False），多个线程可以同时持有同一帧，
+读取时不需要加锁，也不需要复制；需要修改图像的调用方自己 copy()。
+
+每帧带有采集时刻的单调时间戳，CaptureMetrics 据此统计实测帧率、丢帧和帧龄。
+"""
+
+import collections
+import time
+from typing import Optional
+
+import numpy as np
+
+
+class FrameHandle:
+    """不可变的相机帧
+
+    Attributes:
+        seq: 帧序号（从1开始单调递增）
+        image: 只读的 BGR 图像
+        timestamp: 采集时刻（time.monotonic()）
+    """
+
+    __slots__ = ('seq', 'image', 'timestamp')
+
+    def __init__(self, seq: int, image: np.ndarray, timestamp: Optional[float] = None):
+        image.flags.writeable = False
+        self.seq = seq
+        self.image = image
+        self.timestamp = time.monotonic() if timestamp is None else timestamp
+
+    def age(self, now: Optional[float] = None) -> float:
+        """帧龄（秒）：从采集到现在经过的时间"""
+        return (time.monotonic() if now is None else now) - self.timestamp
+
+    @property
+    def width(self) -> int:
+        return self.image.shape[1]
+
+    @property
+    def height(self) -> int:
+        return self.image.shape[0]
+
+    @property
+    def size(self):
+        """(宽, 高)"""
+        return self.image.shape[1], self.image.shape[0]
+
+    def __repr__(self):
+        return f"FrameHandle(seq={self.seq}, size={self.width}x{self.height})"
+
+
+class FrameSlot:
+    """最新帧的发布槽
+
+    只有一个写者（相机读取线程）。publish() 先构造好完整的 FrameHandle
+    再替换引用，读者通过 latest 拿到的总是某个完整的帧，不需要锁。
+    """
+
+    def __init__(self):
+        self._seq = 0
+        self.latest: Optional[FrameHandle] = None
+
+    @property
+    def seq(self) -> int:
+        """最新帧的序号，没有帧时为0"""
+        latest = self.latest
+        return latest.seq if latest is not None else 0
+
+    def publish(self, image: np.ndarray, timestamp: Optional[float] = None) -> FrameHandle:
+        """发布新帧（图像数组的所有权转交给帧句柄，之后不得再修改）"""
+        self._seq += 1
+        handle = FrameHandle(self._seq, image, timestamp)
+        self.latest = handle
+        return handle
+
+    def clear(self) -> None:
+        """清空（序号不回退，避免与旧帧的缓存混淆）"""
+        self.latest = None
+
+
+class CaptureMetrics:
+    """采集统计：实测帧率、丢帧数、读取失败数
+
+    丢帧按相邻两帧的时间间隔估算：间隔超过标称帧间隔的1.5倍时，
+    认为中间丢了 round(间隔/标称间隔) - 1 帧。
+    """
+
+    WINDOW = 30
+
+    def __init__(self, nominal_fps: float = 30.0):
+        self.nominal_fps = nominal_fps if nominal_fps and nominal_fps > 0 else 30.0
+        self._stamps = collections.deque(maxlen=self.WINDOW)
+        self.frames = 0
+        self.dropped = 0
+        self.failures = 0
+        self.read_time = 0.0
+
+    def record(self, timestamp: float, read_time: float = 0.0) -> None:
+        """记录成功采集的一帧"""
+        if self._stamps:
+            interval = timestamp - self._stamps[-1]
+            nominal = 1.0 / self.nominal_fps
+            if interval > 1.5 * nominal:
+                self.dropped += int(round(interval / nominal)) - 1
+        self._stamps.append(timestamp)
+        self.frames += 1
+        self.read_time = read_time
+
+    def record_failure(self) -> None:
+        """记录一次读取失败"""
+        self.failures += 1
+
+    @property
+    def fps(self) -> float:
+        """最近 WINDOW 帧的实测帧率"""
+        if len(self._stamps) < 2:
+            return 0.0
+        span = self._stamps[-1] - self._stamps[0]
+        return (len(self._stamps) - 1) / span if span > 0 else 0.0
+
+    def to_dict(self, latest: Optional[FrameHandle] = None) -> dict:
+        return {
+            'fps': round(self.fps, 1),
+            'nominal_fps': self.nominal_fps,
+            'frames': self.frames,
+            'dropped': self.dropped,
+            'failures': self.failures,
+            'read_ms': round(self.read_time * 1000, 2),
+            'frame_age_ms': round(latest.age() * 1000, 1) if latest is not None else None,
+        }
@@ -0,0 +1,69 @@
+"""
+核心组件 - 完成句柄
+
+后台执行的动作（轨迹、云台平滑转动等）立即返回一个句柄，
+积木程序可以用它等待动作完成、查询状态或取消。
+"""
+
+import threading
+from typing import Callable, Optional
+
+# 句柄状态
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+CANCELLED = 'cancelled'
+
+
+class CompletionHandle:
+    """动作完成句柄
+
+    示例:
+        h = zhuan_jiaodu(90)
+        h.wait()          # 阻塞直到转完
+        if h.done(): ...
+    """
+
+    def __init__(self, name: str = '', on_cancel: Optional[Callable[['CompletionHandle'], None]] = None):
+        self.name = name
+        self.status = PENDING
+        self._event = threading.Event()
+        self._on_cancel = on_cancel
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """等待动作结束
+
+        Args:
+            timeout: 最长等待秒数，None表示一直等待
+
+        Returns:
+            bool: True表示正常完成，False表示超时或被取消
+        """
+        self._event.wait(timeout)
+        return self.status == DONE
+
+    def done(self) -> bool:
+        """动作是否已结束（完成或取消）"""
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        """取消动作"""
+        if self._event.is_set():
+            return
+        if self._on_cancel is not None:
+            self._on_cancel(self)
+        self._finish(CANCELLED)
+
+    def _start(self) -> None:
+        """由执行者调用：动作开始"""
+        self.status = RUNNING
+
+    def _finish(self, status: str = DONE) -> None:
+        """由执行者调用：动作结束"""
+        if self._event.is_set():
+            return
+        self.status = status
+        self._event.set()
+
+    def __repr__(self) -> str:
+        return f"<CompletionHandle {self.name} {self.status}>"
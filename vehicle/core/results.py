@@ -0,0 +1,138 @@
+"""
+核心组件 - 视觉结果板与订阅计数
+
+- ResultsBoard: 后台视觉线程把每一帧的处理结果按键发布到结果板，
+  读取方直接取最新结果，或阻塞等待比某一帧更新的结果
+- SubscriptionSet: 按键引用计数的订阅集合，计数为0的键不再计算；
+  另外支持带有效期的租约（沙箱里的循环反复调用时自动续期，停止调用后过期）
+"""
+
+import threading
+import time
+from typing import Dict, Hashable, Optional, Set
+
+
+class ResultEntry:
+    """一条结果：来自哪一帧、该帧的采集时刻、结果值"""
+
+    __slots__ = ('seq', 'timestamp', 'value')
+
+    def __init__(self, seq: int, timestamp: float, value):
+        self.seq = seq
+        self.timestamp = timestamp
+        self.value = value
+
+    def __repr__(self):
+        return f"ResultEntry(seq={self.seq}, value={self.value!r})"
+
+
+class ResultsBoard:
+    """视觉结果板（单写多读）"""
+
+    def __init__(self):
+        self._entries: Dict[Hashable, ResultEntry] = {}
+        self._cond = threading.Condition()
+
+    def publish(self, key: Hashable, seq: int, timestamp: float, value) -> None:
+        """发布某一帧的结果"""
+        entry = ResultEntry(seq, timestamp, value)
+        with self._cond:
+            self._entries[key] = entry
+            self._cond.notify_all()
+
+    def get(self, key: Hashable) -> Optional[ResultEntry]:
+        """最新结果，没有时返回None"""
+        return self._entries.get(key)
+
+    def wait(self, key: Hashable, after_seq: int, timeout: float) -> Optional[ResultEntry]:
+        """等待比 after_seq 更新的结果，超时返回None"""
+        with self._cond:
+            ok = self._cond.wait_for(
+                lambda: (key in self._entries and self._entries[key].seq > after_seq),
+                timeout)
+            return self._entries[key] if ok else None
+
+    def discard(self, key: Hashable) -> None:
+        """删除结果（订阅取消后调用，避免读到过期结果）"""
+        with self._cond:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._cond:
+            self._entries.clear()
+
+
+class SubscriptionSet:
+    """引用计数的订阅集合 + 租约"""
+
+    def __init__(self, on_change=None):
+        self._lock = threading.Lock()
+        self._refs: Dict[Hashable, int] = {}
+        self._leases: Dict[Hashable, float] = {}
+        self._on_change = on_change
+
+    def acquire(self, key: Hashable) -> None:
+        """订阅计数加1"""
+        with self._lock:
+            self._refs[key] = self._refs.get(key, 0) + 1
+        self._changed()
+
+    def release(self, key: Hashable) -> bool:
+        """订阅计数减1
+
+        Returns:
+            bool: 该键是否已不再活跃（既没有订阅也没有有效租约）
+        """
+        with self._lock:
+            count = self._refs.get(key, 0) - 1
+            if count > 0:
+                self._refs[key] = count
+            else:
+                self._refs.pop(key, None)
+            inactive = key not in self._refs and key not in self._leases
+        self._changed()
+        return inactive
+
+    def lease(self, key: Hashable, ttl: float, now: Optional[float] = None) -> bool:
+        """获取或续期租约
+
+        Returns:
+            bool: 是否为新租约（之前该键不活跃）
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            is_new = key not in self._refs and self._leases.get(key, 0.0) <= now
+            self._leases[key] = now + ttl
+        if is_new:
+            self._changed()
+        return is_new
+
+    def expire(self, now: Optional[float] = None) -> Set[Hashable]:
+        """清除过期租约
+
+        Returns:
+            set: 因租约过期而不再活跃的键
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            expired = [k for k, t in self._leases.items() if t <= now]
+            for key in expired:
+                del self._leases[key]
+            return {k for k in expired if k not in self._refs}
+
+    def active(self, now: Optional[float] = None) -> Set[Hashable]:
+        """当前活跃的键"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            keys = set(self._refs)
+            keys.update(k for k, t in self._leases.items() if t > now)
+            return keys
+
+    def counts(self) -> Dict[Hashable, int]:
+        """各键的订阅计数（不含租约）"""
+        with self._lock:
+            return dict(self._refs)
+
+    def _changed(self):
+        if self._on_change is not None:
+            self._on_change()
@@ -0,0 +1,69 @@
+"""
+核心组件 - 目标区域跟踪
+
+识别成功后记住目标所在的区域，之后只在该区域（向外扩展一圈）内识别，
+减少需要处理的像素；在区域内连续识别失败若干次后回到整个画面。
+
+矩形均为像素坐标 (x, y, 宽, 高)。
+"""
+
+from typing import Optional, Tuple
+
+Rect = Tuple[int, int, int, int]
+
+
+def expand_rect(rect: Rect, margin: float, width: int, height: int) -> Rect:
+    """矩形四周各扩展 margin 倍的宽/高，并裁剪到画面内"""
+    x, y, w, h = rect
+    dx = int(w * margin)
+    dy = int(h * margin)
+    x0 = max(0, x - dx)
+    y0 = max(0, y - dy)
+    x1 = min(width, x + w + dx)
+    y1 = min(height, y + h + dy)
+    return x0, y0, max(0, x1 - x0), max(0, y1 - y0)
+
+
+class RoiTracker:
+    """目标区域跟踪（纯计算，不访问图像）"""
+
+    def __init__(self, margin: float = 0.5, max_misses: int = 3):
+        """
+        Args:
+            margin: 区域向外扩展的比例（相对目标宽/高）
+            max_misses: 区域内连续识别失败多少次后回到整个画面
+        """
+        self.margin = margin
+        self.max_misses = max_misses
+        self._rect: Optional[Rect] = None
+        self._misses = 0
+
+    def region(self, width: int, height: int) -> Rect:
+        """下一次识别的区域；没有跟踪目标时为整个画面"""
+        if self._rect is None:
+            return 0, 0, width, height
+        rect = expand_rect(self._rect, self.margin, width, height)
+        if rect[2] == 0 or rect[3] == 0:
+            return 0, 0, width, height
+        return rect
+
+    def hit(self, rect: Rect) -> None:
+        """识别成功：记录目标区域（整个画面坐标）"""
+        self._rect = rect
+        self._misses = 0
+
+    def miss(self) -> None:
+        """识别失败：区域内连续失败达到上限后放弃跟踪"""
+        if self._rect is None:
+            return
+        self._misses += 1
+        if self._misses >= self.max_misses:
+            self.reset()
+
+    def reset(self) -> None:
+        self._rect = None
+        self._misses = 0
+
+    @property
+    def tracking(self) -> bool:
+        return self._rect is not None
@@ -0,0 +1,151 @@
+"""
+核心组件 - HAL调用跟踪环形缓冲区
+
+替代每次HAL调用的 logger.info：
+- 记录时只写入固定大小的二进制数组（时间戳、操作码、参数），不做字符串格式化
+- 只有通过接口导出或出错时才格式化为文本
+- 写满后覆盖最旧的记录
+"""
+
+import itertools
+import logging
+import os
+import struct
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+# 配置日志
+logger = logging.getLogger(__name__)
+
+# 每条记录: 时间戳, 操作码, 参数1, 参数2, 参数3（5个double，共40字节）
+_ENTRY = struct.Struct('<5d')
+MAX_ARGS = 3
+
+
+class TraceRing:
+    """HAL调用跟踪环形缓冲区
+
+    记录路径只做一次计数器自增和一次 struct.pack_into，
+    可在多个线程中并发调用（计数器自增在GIL下是原子的）。
+    """
+
+    def __init__(self, capacity: int = 4096):
+        """初始化环形缓冲区
+
+        Args:
+            capacity: 记录条数，向上取整为2的幂
+        """
+        capacity = max(16, int(capacity))
+        capacity = 1 << (capacity - 1).bit_length()
+        self.capacity = capacity
+        self._mask = capacity - 1
+        self._buf = bytearray(_ENTRY.size * capacity)
+        self._counter = itertools.count()
+        self._written = 0
+
+        # 操作码注册表
+        self._op_lock = threading.Lock()
+        self._op_names: List[str] = ['?']
+        self._op_args: List[Sequence[str]] = [()]
+        self._op_index: Dict[str, int] = {}
+
+    # ===== 操作码 =====
+
+    def register_op(self, name: str, arg_names: Sequence[str] = ()) -> int:
+        """注册操作码（模块导入时调用一次）
+
+        Args:
+            name: 操作名称，如 'qianjin'
+            arg_names: 参数名称，导出时用于格式化，最多3个
+
+        Returns:
+            int: 操作码
+        """
+        if len(arg_names) > MAX_ARGS:
+            raise ValueError(f"操作 {name} 参数过多: {len(arg_names)} > {MAX_ARGS}")
+        with self._op_lock:
+            if name in self._op_index:
+                return self._op_index[name]
+            op = len(self._op_names)
+            self._op_names.append(name)
+            self._op_args.append(tuple(arg_names))
+            self._op_index[name] = op
+            return op
+
+    def op_name(self, op: int) -> str:
+        """获取操作码对应的名称"""
+        if 0 <= op < len(self._op_names):
+            return self._op_names[op]
+        return '?'
+
+    # ===== 记录 =====
+
+    def record(self, op: int, a0: float = 0, a1: float = 0, a2: float = 0,
+               _now=time.monotonic, _pack_into=_ENTRY.pack_into,
+               _size=_ENTRY.size) -> None:
+        """记录一次调用（热路径，不做任何格式化）"""
+        seq = next(self._counter)
+        _pack_into(self._buf, (seq & self._mask) * _size, _now(), op, a0, a1, a2)
+        self._written = seq + 1
+
+    def clear(self) -> None:
+        """清空缓冲区"""
+        self._counter = itertools.count()
+        self._written = 0
+
+    def __len__(self) -> int:
+        return min(self._written, self.capacity)
+
+    # ===== 导出 =====
+
+    def snapshot(self, limit: Optional[int] = None) -> List[dict]:
+        """导出最近的记录（按时间从旧到新）
+
+        Args:
+            limit: 最多导出的条数，None表示全部
+
+        Returns:
+            List[dict]: 每条记录包含 seq, t, op, args
+        """
+        end = self._written
+        count = min(end, self.capacity)
+        if limit is not None:
+            count = min(count, max(0, int(limit)))
+
+        entries = []
+        for seq in range(end - count, end):
+            t, op, *values = _ENTRY.unpack_from(self._buf, (seq & self._mask) * _ENTRY.size)
+            op = int(op)
+            arg_names = self._op_args[op] if op < len(self._op_args) else ()
+            entries.append({
+                'seq': seq,
+                't': round(t, 6),
+                'op': self.op_name(op),
+                'args': {name: _compact(v) for name, v in zip(arg_names, values)},
+            })
+        return entries
+
+    def format(self, limit: Optional[int] = 50) -> str:
+        """将最近的记录格式化为多行文本（用于错误日志）"""
+        lines = []
+        for entry in self.snapshot(limit):
+            args = ', '.join(f"{k}={v}" for k, v in entry['args'].items())
+            lines.append(f"#{entry['seq']} {entry['t']:.6f} {entry['op']}({args})")
+        return '\n'.join(lines)
+
+    def dump_to_log(self, log: logging.Logger = logger, limit: int = 50,
+                    level: int = logging.ERROR) -> None:
+        """把最近的记录写入日志"""
+        if len(self) == 0:
+            return
+        log.log(level, "最近的HAL调用记录:\n%s", self.format(limit))
+
+
+def _compact(value: float):
+    """整数值导出为int，其余保留float"""
+    return int(value) if value.is_integer() else value
+
+
+# 全局实例（HAL各控制器共用）
+hal_trace = TraceRing(int(os.getenv('HAL_TRACE_SIZE', '4096')))
@@ -0,0 +1,164 @@
+"""
+核心组件 - 轨迹规划
+
+把"转90度"、"走30厘米"、"沿半径20厘米的圆弧转90度"换算成
+随时间变化的电机指令（前进量, 转向量），带加减速斜坡：
+
+- MotionModel: 标定得到的速度模型（电机速度值 -> 厘米/秒、度/秒）
+- TrapezoidProfile: 梯形速度曲线（加速 - 匀速 - 减速），距离太短时退化为三角形
+- Trajectory: 速度曲线 + 指令映射，command(t) 返回 t 时刻的 (前进量, 转向量)
+"""
+
+import math
+import os
+from typing import Optional, Tuple
+
+
+class MotionModel:
+    """速度模型
+
+    假设在常用速度范围内，车速与电机速度值近似成正比。
+    系数需要在实际场地上标定（地面材质、电池电压都会影响）。
+    """
+
+    def __init__(self,
+                 cm_per_unit: float = None,
+                 deg_per_unit: float = None,
+                 accel_units: float = None):
+        """初始化速度模型
+
+        Args:
+            cm_per_unit: 电机速度每1单位对应的直线速度（厘米/秒）
+            deg_per_unit: 电机速度每1单位对应的原地旋转角速度（度/秒）
+            accel_units: 加减速斜率（电机速度单位/秒）
+        """
+        self.cm_per_unit = float(cm_per_unit or os.getenv('MOTION_CM_PER_UNIT', '0.5'))
+        self.deg_per_unit = float(deg_per_unit or os.getenv('MOTION_DEG_PER_UNIT', '3.6'))
+        self.accel_units = float(accel_units or os.getenv('MOTION_ACCEL_UNITS', '250'))
+
+    def to_dict(self) -> dict:
+        return {
+            'cm_per_unit': self.cm_per_unit,
+            'deg_per_unit': self.deg_per_unit,
+            'accel_units': self.accel_units,
+        }
+
+
+class TrapezoidProfile:
+    """梯形速度曲线
+
+    走完 distance 所需的速度随时间变化：以 accel 加速到 cruise，
+    匀速行驶，再以 accel 减速到0。距离不足以加速到 cruise 时为三角形曲线。
+    """
+
+    def __init__(self, distance: float, cruise: float, accel: float):
+        if cruise <= 0 or accel <= 0:
+            raise ValueError("速度和加速度必须为正数")
+        distance = abs(distance)
+        self.distance = distance
+
+        ramp_distance = cruise * cruise / accel
+        if distance >= ramp_distance:
+            self.peak = cruise
+            self.t_ramp = cruise / accel
+            self.t_cruise = (distance - ramp_distance) / cruise
+        else:
+            self.peak = math.sqrt(distance * accel)
+            self.t_ramp = self.peak / accel
+            self.t_cruise = 0.0
+        self.accel = accel
+        self.duration = 2 * self.t_ramp + self.t_cruise
+
+    def velocity(self, t: float) -> float:
+        """t 时刻的速度"""
+        if t <= 0 or t >= self.duration:
+            return 0.0
+        if t < self.t_ramp:
+            return self.accel * t
+        if t < self.t_ramp + self.t_cruise:
+            return self.peak
+        return self.accel * (self.duration - t)
+
+
+class Trajectory:
+    """轨迹：速度曲线 + 速度到电机指令的映射
+
+    command(t) = (velocity(t) * forward_gain, velocity(t) * turn_gain)
+    """
+
+    def __init__(self, name: str, profile: TrapezoidProfile,
+                 forward_gain: float, turn_gain: float):
+        self.name = name
+        self.profile = profile
+        self.forward_gain = forward_gain
+        self.turn_gain = turn_gain
+
+    @property
+    def duration(self) -> float:
+        return self.profile.duration
+
+    def command(self, t: float) -> Tuple[float, float]:
+        """t 时刻的电机指令 (前进量, 转向量)"""
+        v = self.profile.velocity(t)
+        return v * self.forward_gain, v * self.turn_gain
+
+
+# ===== 轨迹生成 =====
+
+def rotate(model: MotionModel, degrees: float, speed: int) -> Trajectory:
+    """原地旋转指定角度
+
+    Args:
+        degrees: 旋转角度，正数顺时针（右转），负数逆时针
+        speed: 最大电机速度值
+    """
+    sign = 1.0 if degrees >= 0 else -1.0
+    profile = TrapezoidProfile(degrees,
+                               cruise=abs(speed) * model.deg_per_unit,
+                               accel=model.accel_units * model.deg_per_unit)
+    return Trajectory('zhuan_jiaodu', profile, 0.0, sign / model.deg_per_unit)
+
+
+def straight(model: MotionModel, cm: float, speed: int) -> Trajectory:
+    """直线行驶指定距离
+
+    Args:
+        cm: 距离（厘米），负数后退
+        speed: 最大电机速度值
+    """
+    sign = 1.0 if cm >= 0 else -1.0
+    profile = TrapezoidProfile(cm,
+                               cruise=abs(speed) * model.cm_per_unit,
+                               accel=model.accel_units * model.cm_per_unit)
+    return Trajectory('zou_juli', profile, sign / model.cm_per_unit, 0.0)
+
+
+def arc(model: MotionModel, radius: float, degrees: float, speed: int,
+        max_wheel: Optional[float] = None) -> Trajectory:
+    """沿圆弧行驶
+
+    外侧轮子的指令为 前进量 + |转向量|，半径小时会比车身中心快很多。
+    给出 max_wheel 时前进量和转向量一起按比例降低，使外侧轮子不超过该值
+    （否则各轮子被单独限幅，实际走出的是另一条曲线，时间也对不上）。
+
+    Args:
+        radius: 圆弧半径（厘米），必须为正数
+        degrees: 圆心角，正数向右弯，负数向左弯
+        speed: 车身中心的最大电机速度值
+        max_wheel: 单个轮子的最大电机速度值，None 表示不限制
+    """
+    if radius <= 0:
+        raise ValueError(f"圆弧半径必须为正数: {radius}")
+    sign = 1.0 if degrees >= 0 else -1.0
+    length = radius * math.radians(abs(degrees))
+    forward_gain = 1.0 / model.cm_per_unit
+    # 线速度 v(厘米/秒) 对应角速度 v/radius(弧度/秒)
+    turn_gain = sign * math.degrees(1.0 / radius) / model.deg_per_unit
+
+    cruise = abs(speed) * model.cm_per_unit
+    if max_wheel is not None:
+        # 每厘米/秒线速度对应的外侧轮子指令
+        cruise = min(cruise, max_wheel / (forward_gain + abs(turn_gain)))
+    profile = TrapezoidProfile(length, cruise=cruise,
+                               accel=model.accel_units * model.cm_per_unit)
+    return Trajectory('hu_xing', profile, forward_gain, turn_gain)
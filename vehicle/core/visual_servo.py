@@ -0,0 +1,76 @@
+"""
+核心组件 - 视觉伺服
+
+根据目标在画面中的位置计算云台的新角度：
+- 误差归一化到 -1~1（画面中心为0），与分辨率无关
+- 水平、垂直各一个PID，只在有新的检测结果时更新
+- 误差在死区内不调整，避免云台在目标附近抖动
+
+角度方向与 GimbalController 一致：水平角度增大向右，垂直角度增大向上。
+"""
+
+from typing import Optional, Tuple
+
+import HiwonderSDK.PID as PID
+
+
+def error_of(target: Optional[Tuple[float, float]], frame_size: Tuple[int, int]) -> Optional[Tuple[float, float]]:
+    """目标的归一化误差，未检测到返回None"""
+    if target is None:
+        return None
+    width, height = frame_size
+    return ((target[0] - width / 2.0) / (width / 2.0),
+            (target[1] - height / 2.0) / (height / 2.0))
+
+
+class VisualServo:
+    """云台视觉伺服（纯计算，不访问硬件）"""
+
+    # PID参数：归一化误差 -> 每次检测的角度增量（度）
+    DEFAULT_KP = 6.0
+    DEFAULT_KI = 0.05
+    DEFAULT_KD = 0.1
+
+    # 死区（归一化误差）
+    DEADZONE = 0.04
+
+    def __init__(self, min_angle: float = 0, max_angle: float = 180,
+                 kp: float = DEFAULT_KP, ki: float = DEFAULT_KI, kd: float = DEFAULT_KD):
+        self.min_angle = min_angle
+        self.max_angle = max_angle
+        self._x_pid = PID.PID(P=kp, I=ki, D=kd)
+        self._y_pid = PID.PID(P=kp, I=ki, D=kd)
+
+    def reset(self) -> None:
+        """清除PID状态（重新开始跟踪或丢失目标后调用）"""
+        self._x_pid.clear()
+        self._y_pid.clear()
+
+    def _clamp(self, angle: float) -> float:
+        return max(self.min_angle, min(self.max_angle, angle))
+
+    def update(self, horizontal: float, vertical: float,
+               target: Tuple[float, float], frame_size: Tuple[int, int]) -> Tuple[float, float]:
+        """根据一次检测结果计算新的云台角度
+
+        Args:
+            horizontal: 当前水平角度
+            vertical: 当前垂直角度
+            target: 目标中心 (x, y)，像素
+            frame_size: 画面尺寸 (宽, 高)
+
+        Returns:
+            (新水平角度, 新垂直角度)
+        """
+        err_x, err_y = error_of(target, frame_size)
+
+        # SetPoint为0，输出 = -Kp*误差 ...
+        if abs(err_x) > self.DEADZONE:
+            self._x_pid.update(err_x)
+            # 目标偏右（err_x>0）时水平角度增大
+            horizontal = self._clamp(horizontal - self._x_pid.output)
+        if abs(err_y) > self.DEADZONE:
+            self._y_pid.update(err_y)
+            # 目标偏上（err_y<0）时垂直角度增大
+            vertical = self._clamp(vertical + self._y_pid.output)
+        return horizontal, vertical
@@ -12,6 +12,7 @@ import time
 import threading
 from typing import Any, Dict, Optional, Callable
 from RestrictedPython import compile_restricted
+from RestrictedPython.Eval import default_guarded_getitem
 from RestrictedPython.Guards import (safe_builtins, guarded_iter_unpack_sequence,
                                      guarded_unpack_sequence, safer_getattr)
 from RestrictedPython.PrintCollector import PrintCollector
@@ -86,6 +87,7 @@ class SandboxGlobals:
             # RestrictedPython需要的安全函数
             '_getattr_': safer_getattr,
             '_getiter_': iter,
+            '_getitem_': default_guarded_getitem,
             '_iter_unpack_sequence_': guarded_iter_unpack_sequence,
             '_unpack_sequence_': guarded_unpack_sequence,
         }
@@ -116,6 +118,11 @@ class SandboxGlobals:
             'set_servo', 'reset_servos'
         ]
 
+        # 轨迹函数（返回完成句柄，h.wait() 等待完成）
+        trajectory_funcs = [
+            'zhuan_jiaodu', 'zou_juli', 'hu_xing'
+        ]
+
         # 传感器函数
         sensor_funcs = [
             'heshengbo', 'heshengbo_juli',
@@ -123,19 +130,31 @@ class SandboxGlobals:
             'dianchi'
         ]
 
+        # 巡线引擎函数（后台闭环巡线）
+        line_follow_funcs = [
+            'xunxian_start', 'xunxian_stop', 'xunxian_shijian'
+        ]
+
         # 云台控制函数（按设计文档命名）
         gimbal_funcs = [
             'shang', 'xia', 'zuo', 'you', 'fuwei',
-            'yuntai_shang', 'yuntai_xia', 'yuntai_zuo', 'yuntai_you', 'yuntai_fuwei'
+            'yuntai_shang', 'yuntai_xia', 'yuntai_zuo', 'yuntai_you', 'yuntai_fuwei',
+            'yuntai_zhuandao', 'yuntai_weizhi',
+            'yuntai_genzong', 'yuntai_tingzhi_genzong'
         ]
 
         # 视觉函数
         vision_funcs = [
-            'shibieyanse'
+            'shibieyanse', 'shibieyanse_duo', 'dengdai_xinzhen',
+            'shibie_erweima',
+            'shibie_renlian', 'renlian_weizhi', 'shibie_shoushi',
+            'shexiangtou_xunxian',
+            'jiance_yundong', 'yundong_mianji', 'yundong_weizhi'
         ]
 
         # 导入函数
-        for func_name in motion_funcs + sensor_funcs + gimbal_funcs + vision_funcs:
+        for func_name in (motion_funcs + trajectory_funcs + sensor_funcs + line_follow_funcs
+                          + gimbal_funcs + vision_funcs):
             if hasattr(hal_module, func_name):
                 self._globals[func_name] = getattr(hal_module, func_name)
 
@@ -309,6 +328,7 @@ class CodeSandbox:
             result['success'] = False
             result['error'] = f'执行错误: {str(exception[0])}'
             logger.error(f"代码执行错误: {exception[0]}")
+            self._dump_hal_trace()
 
         # 从PrintCollector获取输出
         if self._print_collector:
@@ -316,10 +336,24 @@ class CodeSandbox:
         else:
             result['output'] = []
 
+        # 程序结束（包括超时）后停止云台跟踪等后台任务
+        self._stop_background_tasks()
         self._executing = False
 
         return result
 
+    def _dump_hal_trace(self):
+        """出错时把最近的HAL调用记录写入日志"""
+        trace = getattr(self.hal_module, 'hal_trace', None)
+        if trace is not None:
+            trace.dump_to_log(logger, limit=50)
+
+    def _stop_background_tasks(self):
+        """停止代码启动的后台任务（云台跟踪）"""
+        tracker = getattr(self.hal_module, 'gimbal_tracker', None)
+        if tracker is not None:
+            tracker.stop()
+
     def is_executing(self) -> bool:
         """检查是否正在执行代码"""
         return self._executing
@@ -332,6 +366,7 @@ class CodeSandbox:
             # 发送停止命令
             if self.hal_module and hasattr(self.hal_module, 'motion_controller'):
                 self.hal_module.motion_controller.tingzhi()
+            self._stop_background_tasks()
 
     def reset(self):
         """重置沙箱状态"""
@@ -372,6 +407,15 @@ class ProcessManager:
                 'process_id': self.current_process_id
             }
 
+        # 电机标定期间小车在自己行驶，不能同时执行代码
+        calibrator = getattr(self.hal_module, 'drift_calibrator', None)
+        if calibrator is not None and calibrator.running:
+            return {
+                'success': False,
+                'error': '正在标定电机，请等待标定完成',
+                'process_id': process_id
+            }
+
         self._stop_requested = False
         self.current_process_id = process_id or f"exec_{int(time.time())}"
 
@@ -401,6 +445,14 @@ class ProcessManager:
         if self.hal_module and hasattr(self.hal_module, 'motion_controller'):
             self.hal_module.motion_controller.tingzhi()
 
+        # 中止电机标定
+        if self.hal_module and hasattr(self.hal_module, 'drift_calibrator'):
+            self.hal_module.drift_calibrator.cancel()
+
+        # 停止云台跟踪
+        if self.hal_module and hasattr(self.hal_module, 'gimbal_tracker'):
+            self.hal_module.gimbal_tracker.stop()
+
         # 停止代码执行
         self.stop_execution()
 
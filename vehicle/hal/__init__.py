@@ -23,6 +23,8 @@ elif os.path.exists('/home/pi/TurboPi'):
     sys.path.insert(0, '/home/pi/TurboPi')
     sys.path.insert(0, '/home/pi/TurboPi/HiwonderSDK')
 
+from core.trace import TraceRing, hal_trace
+
 from .motion_controller import (
     MotionController,
     motion_controller,
@@ -42,20 +44,71 @@ from .sensor_controller import (
     dianchi
 )
 
+from .trajectory_controller import (
+    TrajectoryController,
+    trajectory_controller,
+    zhuan_jiaodu, zou_juli, hu_xing
+)
+
+from .line_follower import (
+    LineFollowEngine,
+    line_follower,
+    xunxian_start, xunxian_stop, xunxian_shijian
+)
+
+from .drift_calibration import (
+    DriftCalibrator,
+    drift_calibrator
+)
+
 from .gimbal_controller import (
     GimbalController,
     gimbal_controller,
     shang, xia, zuo, you, fuwei,
-    yuntai_shang, yuntai_xia, yuntai_zuo, yuntai_you, yuntai_fuwei
+    yuntai_shang, yuntai_xia, yuntai_zuo, yuntai_you, yuntai_fuwei,
+    yuntai_zhuandao, yuntai_weizhi
 )
 
 from .vision_controller import (
     VisionController,
     vision_controller,
-    shibieyanse
+    shibieyanse, shibieyanse_duo, dengdai_xinzhen
+)
+
+from .gimbal_tracker import (
+    GimbalTracker,
+    gimbal_tracker,
+    yuntai_genzong, yuntai_tingzhi_genzong
+)
+
+from .qr_reader import (
+    QrReader,
+    qr_reader,
+    shibie_erweima
+)
+
+from .inference_worker import (
+    InferenceWorker,
+    inference_worker,
+    shibie_renlian, renlian_weizhi, shibie_shoushi
+)
+
+from .camera_line_tracker import (
+    CameraLineTracker,
+    camera_line_tracker,
+    shexiangtou_xunxian
+)
+
+from .motion_detector import (
+    MotionDetector,
+    motion_detector,
+    jiance_yundong, yundong_mianji, yundong_weizhi
 )
 
 __all__ = [
+    # 调用跟踪
+    'TraceRing', 'hal_trace',
+
     # 运动控制器
     'MotionController', 'motion_controller',
     'qianjin', 'houtui', 'zuopingyi', 'youpingyi',
@@ -71,14 +124,46 @@ __all__ = [
     'xunxian', 'xunxian_zhong', 'xunxian_zuo', 'xunxian_you',
     'dianchi',
 
+    # 轨迹控制器
+    'TrajectoryController', 'trajectory_controller',
+    'zhuan_jiaodu', 'zou_juli', 'hu_xing',
+
+    # 电机标定
+    'DriftCalibrator', 'drift_calibrator',
+
+    # 巡线引擎
+    'LineFollowEngine', 'line_follower',
+    'xunxian_start', 'xunxian_stop', 'xunxian_shijian',
+
     # 云台控制器
     'GimbalController', 'gimbal_controller',
     'shang', 'xia', 'zuo', 'you', 'fuwei',
     'yuntai_shang', 'yuntai_xia', 'yuntai_zuo', 'yuntai_you', 'yuntai_fuwei',
+    'yuntai_zhuandao', 'yuntai_weizhi',
 
     # 视觉控制器
     'VisionController', 'vision_controller',
-    'shibieyanse',
+    'shibieyanse', 'shibieyanse_duo', 'dengdai_xinzhen',
+
+    # 云台颜色跟踪
+    'GimbalTracker', 'gimbal_tracker',
+    'yuntai_genzong', 'yuntai_tingzhi_genzong',
+
+    # 二维码识别
+    'QrReader', 'qr_reader',
+    'shibie_erweima',
+
+    # 人脸/手势识别
+    'InferenceWorker', 'inference_worker',
+    'shibie_renlian', 'renlian_weizhi', 'shibie_shoushi',
+
+    # 摄像头巡线
+    'CameraLineTracker', 'camera_line_tracker',
+    'shexiangtou_xunxian',
+
+    # 运动检测
+    'MotionDetector', 'motion_detector',
+    'jiance_yundong', 'yundong_mianji', 'yundong_weizhi',
 ]
 
 # 硬件必须可用，否则服务无法启动
@@ -0,0 +1,125 @@
+"""
+硬件抽象层 - 摄像头巡线
+
+用摄像头画面判断线条相对车身中心的位置（与4路巡线传感器的 line_follower 互补）：
+- 只处理画面下半部分几条水平ROI带的像素行，一次LAB转换和颜色查表
+- 对掩码做列投影，取每个ROI中最宽的连续线段的中心，按权重合成偏移量
+- 作为后台视觉线程的处理函数运行，每个新的相机帧只计算一次
+- 可选只矫正包含所有ROI的水平带的鱼眼畸变（LINE_UNDISTORT），不需要矫正整个画面
+
+算法见 TurboPi/HiwonderSDK/LineTracker（与 Functions/VisualPatrol 共用）。
+"""
+
+import logging
+import math
+import os
+import sys
+from typing import Optional, Tuple
+
+from core.frame import FrameHandle
+
+from .vision_controller import color_model, resolve_color, vision_controller
+
+# 配置日志
+logger = logging.getLogger(__name__)
+
+# TurboPi路径
+TURBOPI_PATH = os.getenv('TURBOPI_PATH', './TurboPi')
+if os.path.exists(TURBOPI_PATH):
+    sys.path.insert(0, TURBOPI_PATH)
+    sys.path.insert(0, os.path.join(TURBOPI_PATH, 'HiwonderSDK'))
+
+# 导入视觉SDK - 必须成功，否则服务无法运行
+try:
+    import numpy as np
+    import HiwonderSDK.LineTracker as LineTracker
+except Exception as e:
+    logger.error(f"巡线视觉模块加载失败: {e}")
+    raise RuntimeError(f"巡线视觉模块加载失败: {e}") from e
+
+
+# 是否只矫正巡线区域的鱼眼畸变（整个画面已矫正时不需要；没有标定参数时使用原画面）
+LINE_UNDISTORT = os.getenv('LINE_UNDISTORT', 'false').lower() == 'true'
+
+
+class CameraLineTracker:
+    """摄像头巡线（后台视觉线程的 'line' 处理函数）"""
+
+    def __init__(self, vision, rois=LineTracker.DEFAULT_ROIS, undistort: bool = LINE_UNDISTORT):
+        """
+        Args:
+            vision: 视觉控制器
+            rois: ROI列表 (上边, 下边, 权重)，画面高度的比例
+            undistort: 是否只矫正包含所有ROI的水平带
+        """
+        self._vision = vision
+        self._tracker = LineTracker.LineTracker(rois)
+        self.undistort = undistort
+
+        # 矫正用的水平带（画面高度的比例），以及换算到带内比例的ROI
+        top = min(r[0] for r in rois)
+        bottom = max(r[1] for r in rois)
+        self._band = (top, bottom)
+        self._band_tracker = LineTracker.LineTracker(
+            [((t - top) / (bottom - top), (b - top) / (bottom - top), w) for t, b, w in rois])
+
+        vision.worker.register_task('line', self._line_task)
+
+    def _line_task(self, frame: FrameHandle, color_name: str) -> 'LineTracker.LineResult':
+        """视觉线程的巡线处理函数"""
+        color_model.maybe_reload()
+        names = [resolve_color(color_name)]
+        if self.undistort and not self._vision.undistort:
+            band = self._undistorted_band(frame)
+            if band is not None:
+                return self._band_tracker.track(band, color_model, names)
+        return self._tracker.track(frame.image, color_model, names)
+
+    def _undistorted_band(self, frame: FrameHandle) -> Optional['np.ndarray']:
+        """矫正包含所有ROI的水平带，没有标定参数时返回None"""
+        y0 = int(self._band[0] * frame.height)
+        y1 = min(frame.height, int(math.ceil(self._band[1] * frame.height)))
+        band = self._vision.undistort_roi(frame, (0, y0, frame.width, y1 - y0))
+        return band if band is not None and band.size else None
+
+    def read(self, color_name: str = 'hei') -> Tuple[float, float]:
+        """读取最新帧的巡线结果（自动订阅）
+
+        Returns:
+            (偏移, 置信度)：偏移为 -1 到 1，负数表示线条偏左；
+            置信度为 0 到 1，0 表示没有看到线条（此时偏移为0）
+        """
+        if resolve_color(color_name) is None:
+            raise ValueError(f"未知颜色: {color_name}")
+        seq, result = self._vision.worker.read('line', color_name)
+        if result is None:
+            return 0.0, 0.0
+        return round(result.offset, 3), round(result.confidence, 3)
+
+
+# 全局实例
+camera_line_tracker = CameraLineTracker(vision_controller)
+
+
+# 便捷函数
+def shexiangtou_xunxian(color: str = 'hei') -> Tuple[float, float]:
+    """摄像头巡线：线条相对画面中心的位置
+
+    Args:
+        color: 线条颜色（'hei'-黑色, 'bai'-白色, 'hong'-红色 等）
+
+    Returns:
+        (偏移, 置信度)：偏移 -1 到 1，负数表示线条在左边；
+        置信度 0 到 1，越大表示越多的检测区域看到了线条，0 表示没有看到线条
+
+    示例:
+        >>> pianyi, zhixindu = shexiangtou_xunxian()
+        >>> if zhixindu > 0.5:
+        ...     if pianyi < -0.2:
+        ...         xiaozuozhuan(40)
+        ...     elif pianyi > 0.2:
+        ...         xiaoyouzhuan(40)
+        ...     else:
+        ...         qianjin(40)
+    """
+    return camera_line_tracker.read(color)
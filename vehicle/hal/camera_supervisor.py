@@ -0,0 +1,239 @@
+"""
+硬件抽象层 - 摄像头监管
+
+负责打开摄像头、断线后自动重连，并报告摄像头健康状态：
+- 并行探测索引 0-2（有些系统摄像头是 /dev/video1），总耗时约等于最慢的一次打开，
+  多个索引都能打开时使用最小的索引
+- 连续读取失败 FAILURE_LIMIT 次后释放设备，按带上限的指数退避重新探测
+- 重连只在相机读取线程中进行，服务的其他线程不会被阻塞
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Callable, Optional, Sequence, Tuple
+
+import cv2
+
+from core.backoff import Backoff
+
+# 配置日志
+logger = logging.getLogger(__name__)
+
+# 摄像头状态
+STATE_CONNECTED = 'connected'
+STATE_RECONNECTING = 'reconnecting'
+STATE_CLOSED = 'closed'
+
+
+def _open_index(index: int):
+    """打开一个摄像头索引，失败返回None"""
+    cap = cv2.VideoCapture(index)
+    if cap.isOpened():
+        return cap
+    cap.release()
+    return None
+
+
+def _release_late(future) -> None:
+    """探测超时后才打开成功的设备：打开完成时释放"""
+    try:
+        cap = future.result()
+    except Exception:
+        return
+    if cap is not None:
+        cap.release()
+
+
+class CameraSupervisor:
+    """摄像头监管：探测、读取、断线重连、健康状态"""
+
+    # 连续读取失败多少次后认为设备已断开
+    FAILURE_LIMIT = 10
+    # 一次探测的最长等待时间（秒）
+    PROBE_TIMEOUT = 5.0
+
+    def __init__(self, indices: Sequence[int] = (0, 1, 2),
+                 configure: Optional[Callable] = None,
+                 backoff: Optional[Backoff] = None):
+        """
+        Args:
+            indices: 依次优先的摄像头索引
+            configure: 打开设备后调用 configure(cap) 设置采集参数
+            backoff: 重连退避策略，默认 0.5 秒起、最长 10 秒
+        """
+        self.indices = tuple(indices)
+        self._configure = configure
+        self.backoff = backoff or Backoff(initial=0.5, maximum=10.0)
+        self._stop = threading.Event()
+
+        self.camera = None
+        self.index: Optional[int] = None
+        self.state = STATE_RECONNECTING
+
+        # 健康统计
+        self.consecutive_failures = 0
+        self.connects = 0
+        self.last_error: Optional[str] = None
+        self._connected_at: Optional[float] = None
+        self._retry_at: Optional[float] = None
+
+    @property
+    def connected(self) -> bool:
+        return self.camera is not None
+
+    # ===== 打开 =====
+
+    def probe(self) -> Optional[Tuple[int, object]]:
+        """并行尝试打开所有索引
+
+        Returns:
+            (索引, 设备)，优先返回最小的可用索引；都失败返回None
+        """
+        pool = ThreadPoolExecutor(max_workers=len(self.indices), thread_name_prefix="CameraProbe")
+        futures = [(idx, pool.submit(_open_index, idx)) for idx in self.indices]
+        pool.shutdown(wait=False)
+
+        found = None
+        deadline = time.monotonic() + self.PROBE_TIMEOUT
+        for idx, future in futures:
+            try:
+                cap = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except FutureTimeout:
+                logger.warning(f"打开摄像头超时: index={idx}")
+                future.add_done_callback(_release_late)
+                continue
+            except Exception as e:
+                logger.warning(f"打开摄像头异常: index={idx}: {e}")
+                continue
+
+            if cap is None:
+                continue
+            if found is None:
+                found = (idx, cap)
+            else:
+                cap.release()
+        return found
+
+    def connect(self) -> bool:
+        """探测并打开摄像头
+
+        Returns:
+            bool: 是否打开成功
+        """
+        found = self.probe()
+        if found is None:
+            self.last_error = f"无法打开摄像头（尝试了索引 {', '.join(map(str, self.indices))}）"
+            return False
+
+        index, cap = found
+        if self._configure is not None:
+            self._configure(cap)
+        if self._stop.is_set():
+            cap.release()
+            return False
+
+        self.index = index
+        self.consecutive_failures = 0
+        self.connects += 1
+        self._connected_at = time.monotonic()
+        self._retry_at = None
+        self.camera = cap
+        self.state = STATE_CONNECTED
+        self.backoff.reset()
+        logger.info(f"成功打开摄像头: index={index}")
+        return True
+
+    def reconnect(self) -> bool:
+        """按退避时间等待后重新探测（在相机读取线程中调用）
+
+        Returns:
+            bool: 是否重新连接成功；stop() 后立即返回False
+        """
+        delay = self.backoff.next_delay()
+        self._retry_at = time.monotonic() + delay
+        if self._stop.wait(delay):
+            return False
+        if self.connect():
+            logger.info("摄像头已重新连接")
+            return True
+        logger.warning(f"{self.last_error}，{self.backoff.peek():.1f} 秒后重试")
+        return False
+
+    # ===== 读取 =====
+
+    def read(self):
+        """读取一帧（只在相机读取线程中调用）
+
+        连续失败达到 FAILURE_LIMIT 次时释放设备，之后由 reconnect() 重新打开。
+
+        Returns:
+            (ret, frame)
+        """
+        camera = self.camera
+        if camera is None:
+            return False, None
+
+        try:
+            ret, frame = camera.read()
+        except Exception as e:
+            self.last_error = f"读取摄像头异常: {e}"
+            ret, frame = False, None
+
+        if ret and frame is not None:
+            self.consecutive_failures = 0
+            return True, frame
+
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= self.FAILURE_LIMIT:
+            self._disconnect(f"连续读取失败 {self.consecutive_failures} 次")
+        return False, None
+
+    def _disconnect(self, reason: str) -> None:
+        camera, self.camera = self.camera, None
+        self.state = STATE_RECONNECTING
+        self.last_error = reason
+        self._connected_at = None
+        logger.error(f"摄像头断开: {reason}，开始自动重连")
+        if camera is not None:
+            try:
+                camera.release()
+            except Exception as e:
+                logger.warning(f"释放摄像头异常: {e}")
+
+    def get_fps(self) -> float:
+        """设备报告的帧率，未连接时为0"""
+        camera = self.camera
+        return camera.get(cv2.CAP_PROP_FPS) if camera is not None else 0.0
+
+    # ===== 关闭 =====
+
+    def stop(self) -> None:
+        """中断正在进行的重连等待（读取线程随后退出）"""
+        self._stop.set()
+
+    def close(self) -> None:
+        """停止重连并释放摄像头（应在读取线程结束后调用）"""
+        self.stop()
+        camera, self.camera = self.camera, None
+        if camera is not None:
+            camera.release()
+            logger.info("摄像头已释放")
+        self.state = STATE_CLOSED
+
+    def get_status(self) -> dict:
+        """摄像头健康状态"""
+        now = time.monotonic()
+        connected_at = self._connected_at
+        retry_at = self._retry_at
+        return {
+            'state': self.state,
+            'index': self.index,
+            'consecutive_failures': self.consecutive_failures,
+            'reconnects': max(0, self.connects - 1),
+            'uptime_s': round(now - connected_at, 1) if connected_at is not None else None,
+            'retry_in_s': (round(max(0.0, retry_at - now), 1)
+                           if retry_at is not None and self.state == STATE_RECONNECTING else None),
+            'last_error': self.last_error,
+        }
@@ -0,0 +1,272 @@
+"""
+硬件抽象层 - 直行跑偏标定
+
+把小车放在一条笔直的黑线测试条上（中间两路传感器压线），
+以固定速度直行，用4路巡线传感器测量黑线偏移随时间的变化：
+- 偏移逐渐变小（黑线移向左侧）说明车身向右跑偏，左侧轮子偏快
+- 偏移逐渐变大（黑线移向右侧）说明车身向左跑偏，右侧轮子偏快
+
+根据偏移变化率按比例调整左右两侧轮子的增益，多轮迭代后保存标定文件。
+每轮结束后以相同速度和时间倒车回到起点。
+
+标定在后台线程中运行（HTTP请求立即返回，通过状态查询结果），
+参数限制在安全范围内；标定期间不能执行代码，紧急停止会中止标定。
+"""
+
+import logging
+import threading
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from core.calibration import MotorCalibration
+
+from .line_follower import line_offset
+from .motion_controller import motion_controller
+from .sensor_controller import sensor_controller
+
+# 配置日志
+logger = logging.getLogger(__name__)
+
+# 左侧轮子（左前, 左后）与右侧轮子（右前, 右后）在标定表中的下标
+LEFT_WHEELS = (0, 2)
+RIGHT_WHEELS = (1, 3)
+
+
+def drift_rate(samples: List[Tuple[float, float]]) -> Optional[float]:
+    """用最小二乘拟合偏移随时间的变化率
+
+    Args:
+        samples: [(时间, 偏移), ...]
+
+    Returns:
+        Optional[float]: 偏移变化率（每秒），样本不足返回None
+    """
+    if len(samples) < 5:
+        return None
+    data = np.asarray(samples, dtype=np.float64)
+    t = data[:, 0] - data[0, 0]
+    if t[-1] <= 0:
+        return None
+    slope, _ = np.polyfit(t, data[:, 1], 1)
+    return float(slope)
+
+
+def corrected_gains(gain: np.ndarray, rate: float, k: float) -> np.ndarray:
+    """根据跑偏率调整左右两侧增益，并归一化使最大增益为1
+
+    Args:
+        gain: 当前4个轮子的增益
+        rate: 偏移变化率（正数表示黑线移向右侧，即车身向左跑偏）
+        k: 修正系数
+    """
+    gain = gain.astype(np.float64).copy()
+    correction = max(-0.2, min(0.2, k * rate))
+    gain[list(LEFT_WHEELS)] *= 1.0 + correction
+    gain[list(RIGHT_WHEELS)] *= 1.0 - correction
+    return gain / gain.max()
+
+
+class CalibrationCancelled(Exception):
+    """标定被中止"""
+
+
+class DriftCalibrator:
+    """直行跑偏标定"""
+
+    SAMPLE_INTERVAL = 0.01
+    # 每单位偏移变化率对应的增益修正比例
+    CORRECTION_GAIN = 0.05
+    # 跑偏率小于该值认为已经走直
+    TOLERANCE = 0.05
+
+    # 参数范围：最低速度（低于该值轮子可能不转），每轮最长直行时间（秒），最多轮数
+    MIN_SPEED = 20
+    MAX_DURATION = 5.0
+    MAX_RUNS = 5
+
+    def __init__(self, motion, sensor):
+        self._motion = motion
+        self._sensor = sensor
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._status = {'state': 'idle', 'params': None, 'result': None, 'error': None}
+
+    # ===== 参数 =====
+
+    def clamp_params(self, speed, duration, runs) -> Tuple[int, float, int]:
+        """把参数限制在安全范围内
+
+        Raises:
+            ValueError: 参数不是数字
+        """
+        try:
+            speed = abs(int(float(speed)))
+            duration = float(duration)
+            runs = int(float(runs))
+        except (TypeError, ValueError, OverflowError):
+            raise ValueError("speed、duration、runs 必须是数字")
+        if duration != duration:
+            raise ValueError("duration 必须是数字")
+        speed = max(self.MIN_SPEED, min(self._motion.max_speed, speed))
+        duration = max(0.5, min(self.MAX_DURATION, duration))
+        runs = max(1, min(self.MAX_RUNS, runs))
+        return speed, duration, runs
+
+    # ===== 后台任务 =====
+
+    @property
+    def running(self) -> bool:
+        """标定是否正在进行"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, speed=40, duration=2.0, runs=3, save: bool = True) -> dict:
+        """在后台线程中开始标定
+
+        Returns:
+            dict: 标定状态（见 get_status）
+
+        Raises:
+            ValueError: 参数不是数字
+            RuntimeError: 已经在标定
+        """
+        speed, duration, runs = self.clamp_params(speed, duration, runs)
+        with self._lock:
+            if self.running:
+                raise RuntimeError("正在标定")
+            self._cancel.clear()
+            self._status = {
+                'state': 'running',
+                'params': {'speed': speed, 'duration': duration, 'runs': runs, 'save': bool(save)},
+                'result': None,
+                'error': None,
+            }
+            self._thread = threading.Thread(
+                target=self._job,
+                args=(speed, duration, runs, bool(save)),
+                daemon=True,
+                name="DriftCalibration"
+            )
+            self._thread.start()
+        return self.get_status()
+
+    def cancel(self) -> bool:
+        """中止正在进行的标定（停车，不保存）"""
+        if not self.running:
+            return False
+        self._cancel.set()
+        self._motion.tingzhi()
+        return True
+
+    def get_status(self) -> dict:
+        """获取标定状态：state 为 idle/running/done/cancelled/failed"""
+        return dict(self._status)
+
+    def _job(self, speed: int, duration: float, runs: int, save: bool):
+        try:
+            result = self.run(speed, duration, runs, save)
+            self._status.update(state='done', result=result)
+        except CalibrationCancelled:
+            logger.warning("跑偏标定已中止")
+            self._status.update(state='cancelled')
+        except Exception as e:
+            logger.error(f"跑偏标定失败: {e}")
+            self._status.update(state='failed', error=str(e))
+        finally:
+            self._motion.tingzhi()
+
+    def _sleep(self, seconds: float):
+        """可被中止的等待"""
+        if self._cancel.wait(seconds):
+            raise CalibrationCancelled()
+
+    def _measure(self, speed: int, duration: float) -> Tuple[Optional[float], float]:
+        """直行一次并采样偏移
+
+        Returns:
+            (跑偏率, 实际行驶时间)，脱线时提前结束
+        """
+        samples = []
+        start = time.monotonic()
+        self._motion.qianjin(speed)
+        try:
+            while True:
+                now = time.monotonic()
+                if now - start >= duration:
+                    break
+                if self._cancel.is_set():
+                    raise CalibrationCancelled()
+                offset = line_offset(self._sensor.xunxian())
+                if offset is None:
+                    logger.warning("标定过程中脱线，提前结束本轮")
+                    break
+                samples.append((now, offset))
+                self._sleep(self.SAMPLE_INTERVAL)
+        finally:
+            self._motion.tingzhi()
+        return drift_rate(samples), time.monotonic() - start
+
+    def run(self, speed: int = 40, duration: float = 2.0, runs: int = 3,
+            save: bool = True) -> dict:
+        """执行标定（阻塞，参数先限制在安全范围内）
+
+        Args:
+            speed: 直行速度
+            duration: 每轮直行时间（秒）
+            runs: 最多迭代轮数
+            save: 是否保存到标定文件
+
+        Returns:
+            dict: 每轮的跑偏率和最终增益
+
+        Raises:
+            CalibrationCancelled: 标定被中止（恢复原来的标定，不保存）
+        """
+        speed, duration, runs = self.clamp_params(speed, duration, runs)
+        original = self._motion.calibration
+        calibration = original
+        history = []
+
+        try:
+            for i in range(runs):
+                rate, elapsed = self._measure(speed, duration)
+                history.append({'run': i + 1, 'drift_rate': rate, 'gain': calibration.gain.tolist()})
+                logger.info(f"跑偏标定第{i + 1}轮: 跑偏率={rate}, 增益={calibration.gain.tolist()}")
+
+                # 倒车回到起点
+                self._sleep(0.3)
+                self._motion.houtui(speed)
+                try:
+                    self._sleep(elapsed)
+                finally:
+                    self._motion.tingzhi()
+                self._sleep(0.3)
+
+                if rate is None or abs(rate) < self.TOLERANCE:
+                    break
+
+                calibration = MotorCalibration(
+                    gain=corrected_gains(calibration.gain, rate, self.CORRECTION_GAIN),
+                    deadband=calibration.deadband,
+                    direction=calibration.direction,
+                    model=calibration.model,
+                )
+                self._motion.set_calibration(calibration)
+        except BaseException:
+            # 中止或失败：恢复标定前的增益，不保留迭代到一半的结果
+            self._motion.set_calibration(original)
+            raise
+
+        if save:
+            self._motion.set_calibration(calibration, save=True)
+
+        return {
+            'runs': history,
+            'calibration': calibration.to_dict(),
+        }
+
+
+# 全局实例
+drift_calibrator = DriftCalibrator(motion_controller, sensor_controller)
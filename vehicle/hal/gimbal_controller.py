@@ -9,6 +9,12 @@
 import logging
 import os
 import sys
+import threading
+import time
+from typing import Optional
+
+from core.handle import CompletionHandle, CANCELLED
+from core.trace import hal_trace
 
 # 配置日志
 logger = logging.getLogger(__name__)
@@ -28,6 +34,53 @@ except Exception as e:
     raise RuntimeError(f"云台硬件SDK加载失败: {e}") from e
 
 
+# 跟踪操作码
+_OP_MOVE_HORIZONTAL = hal_trace.register_op('yuntai_horizontal', ('from', 'to'))
+_OP_MOVE_VERTICAL = hal_trace.register_op('yuntai_vertical', ('from', 'to'))
+_OP_FUWEI = hal_trace.register_op('yuntai_fuwei')
+_OP_MOVE_TO = hal_trace.register_op('yuntai_move_to', ('horizontal', 'vertical', 'duration_ms'))
+_OP_TRACK = hal_trace.register_op('yuntai_track', ('horizontal', 'vertical'))
+
+
+def angle_to_pulse(angle: float) -> int:
+    """舵机角度转换为脉宽（与 Board.setPWMServoAngle 的换算一致）"""
+    return int(500 + angle * 2000 / 180)
+
+
+class _AxisMotion:
+    """单轴运动段
+
+    舵机收到带时间的指令后在 duration 内匀速转到目标，
+    这里按同样的线性模型估算任意时刻的角度，读取时不需要I/O。
+    """
+
+    __slots__ = ('start', 'target', 't0', 'duration')
+
+    def __init__(self, angle: float):
+        self.start = angle
+        self.target = angle
+        self.t0 = 0.0
+        self.duration = 0.0
+
+    def position(self, now: float) -> float:
+        """估算 now 时刻的角度"""
+        if self.duration <= 0:
+            return self.target
+        progress = (now - self.t0) / self.duration
+        if progress >= 1.0:
+            return self.target
+        if progress <= 0.0:
+            return self.start
+        return self.start + (self.target - self.start) * progress
+
+    def retarget(self, target: float, duration: float, now: float) -> None:
+        """从当前估算位置开始新的运动段"""
+        self.start = self.position(now)
+        self.target = target
+        self.t0 = now
+        self.duration = duration
+
+
 class GimbalController:
     """云台控制器
 
@@ -48,9 +101,19 @@ class GimbalController:
     # 每次移动的步进角度
     STEP_ANGLE = 10
 
+    # 跟踪指令的舵机转动时间（毫秒），与相机帧间隔相当
+    TRACK_TIME_MS = 30
+
     def __init__(self):
-        self.horizontal_angle = self.CENTER_ANGLE  # 水平角度
-        self.vertical_angle = self.CENTER_ANGLE    # 垂直角度
+        self.horizontal_angle = self.CENTER_ANGLE  # 水平角度（目标）
+        self.vertical_angle = self.CENTER_ANGLE    # 垂直角度（目标）
+
+        # 运动估算与平滑运动句柄
+        self._lock = threading.Lock()
+        self._h_motion = _AxisMotion(self.CENTER_ANGLE)
+        self._v_motion = _AxisMotion(self.CENTER_ANGLE)
+        self._move_handle: Optional[CompletionHandle] = None
+        self._move_timer: Optional[threading.Timer] = None
 
         # 初始化云台到中位
         Board.setPWMServoAngle(self.SERVO_HORIZONTAL, self.CENTER_ANGLE)
@@ -68,9 +131,10 @@ class GimbalController:
             delta: 角度变化量，正数向右，负数向左
         """
         new_angle = self._clamp_angle(self.horizontal_angle + delta)
-        logger.info(f"云台水平移动: {self.horizontal_angle}° -> {new_angle}°")
+        hal_trace.record(_OP_MOVE_HORIZONTAL, self.horizontal_angle, new_angle)
+        logger.debug("云台水平移动: %s° -> %s°", self.horizontal_angle, new_angle)
         Board.setPWMServoAngle(self.SERVO_HORIZONTAL, new_angle)
-        self.horizontal_angle = new_angle
+        self._set_instant(horizontal=new_angle)
 
     def _move_vertical(self, delta: int) -> None:
         """垂直移动云台
@@ -79,9 +143,10 @@ class GimbalController:
             delta: 角度变化量，正数向上，负数向下
         """
         new_angle = self._clamp_angle(self.vertical_angle + delta)
-        logger.info(f"云台垂直移动: {self.vertical_angle}° -> {new_angle}°")
+        hal_trace.record(_OP_MOVE_VERTICAL, self.vertical_angle, new_angle)
+        logger.debug("云台垂直移动: %s° -> %s°", self.vertical_angle, new_angle)
         Board.setPWMServoAngle(self.SERVO_VERTICAL, new_angle)
-        self.vertical_angle = new_angle
+        self._set_instant(vertical=new_angle)
 
     # ===== 基础控制 =====
 
@@ -103,11 +168,11 @@ class GimbalController:
 
     def fuwei(self) -> None:
         """云台复位到中位"""
-        logger.info("云台复位")
+        hal_trace.record(_OP_FUWEI)
+        logger.debug("云台复位")
         Board.setPWMServoAngle(self.SERVO_HORIZONTAL, self.CENTER_ANGLE)
         Board.setPWMServoAngle(self.SERVO_VERTICAL, self.CENTER_ANGLE)
-        self.horizontal_angle = self.CENTER_ANGLE
-        self.vertical_angle = self.CENTER_ANGLE
+        self._set_instant(horizontal=self.CENTER_ANGLE, vertical=self.CENTER_ANGLE)
 
     # ===== 高级控制 =====
 
@@ -118,9 +183,10 @@ class GimbalController:
             angle: 角度值，范围0-180
         """
         angle = self._clamp_angle(angle)
-        logger.info(f"设置云台水平角度: {angle}°")
+        hal_trace.record(_OP_MOVE_HORIZONTAL, self.horizontal_angle, angle)
+        logger.debug("设置云台水平角度: %s°", angle)
         Board.setPWMServoAngle(self.SERVO_HORIZONTAL, angle)
-        self.horizontal_angle = angle
+        self._set_instant(horizontal=angle)
 
     def set_vertical(self, angle: int) -> None:
         """设置垂直角度
@@ -129,19 +195,145 @@ class GimbalController:
             angle: 角度值，范围0-180
         """
         angle = self._clamp_angle(angle)
-        logger.info(f"设置云台垂直角度: {angle}°")
+        hal_trace.record(_OP_MOVE_VERTICAL, self.vertical_angle, angle)
+        logger.debug("设置云台垂直角度: %s°", angle)
         Board.setPWMServoAngle(self.SERVO_VERTICAL, angle)
-        self.vertical_angle = angle
+        self._set_instant(vertical=angle)
+
+    # ===== 平滑运动 =====
+
+    def move_to(self, horizontal: Optional[float] = None, vertical: Optional[float] = None,
+                duration: float = 0.5) -> CompletionHandle:
+        """平滑转动到目标角度（非阻塞）
+
+        只发送一条带时间的舵机指令，由舵机控制板完成插值，
+        之后 get_position() 按时间估算当前角度。
+
+        Args:
+            horizontal: 水平目标角度，None表示保持不变
+            vertical: 垂直目标角度，None表示保持不变
+            duration: 转动时间（秒），0-30
+
+        Returns:
+            CompletionHandle: 完成句柄，h.wait() 等待转到位
+        """
+        duration = max(0.0, min(30.0, float(duration)))
+        h = self._clamp_angle(round(horizontal)) if horizontal is not None else self.horizontal_angle
+        v = self._clamp_angle(round(vertical)) if vertical is not None else self.vertical_angle
+        duration_ms = int(duration * 1000)
+        hal_trace.record(_OP_MOVE_TO, h, v, duration_ms)
+
+        handle = CompletionHandle('yuntai_move_to', on_cancel=self._on_move_cancel)
+        with self._lock:
+            self._supersede_locked()
+            # 两个舵机合并为一条I2C指令
+            Board.setPWMServosPulse([duration_ms, 2,
+                                     self.SERVO_HORIZONTAL, angle_to_pulse(h),
+                                     self.SERVO_VERTICAL, angle_to_pulse(v)])
+            now = time.monotonic()
+            self._h_motion.retarget(h, duration, now)
+            self._v_motion.retarget(v, duration, now)
+            self.horizontal_angle = h
+            self.vertical_angle = v
+
+            handle._start()
+            self._move_handle = handle
+            self._move_timer = threading.Timer(duration, self._on_move_done, args=(handle,))
+            self._move_timer.daemon = True
+            self._move_timer.start()
+        return handle
+
+    def track_to(self, horizontal: float, vertical: float) -> bool:
+        """跟踪用的连续角度更新（合并写入）
+
+        角度取整后与上次目标相同则不写舵机；否则两个舵机合并为一条
+        带短时间的指令，让舵机在两次更新之间平滑过渡。
+
+        Returns:
+            bool: 是否实际写了舵机
+        """
+        h = self._clamp_angle(round(horizontal))
+        v = self._clamp_angle(round(vertical))
+        with self._lock:
+            if h == self.horizontal_angle and v == self.vertical_angle and self._move_handle is None:
+                return False
+            self._supersede_locked()
+            hal_trace.record(_OP_TRACK, h, v)
+            Board.setPWMServosPulse([self.TRACK_TIME_MS, 2,
+                                     self.SERVO_HORIZONTAL, angle_to_pulse(h),
+                                     self.SERVO_VERTICAL, angle_to_pulse(v)])
+            now = time.monotonic()
+            duration = self.TRACK_TIME_MS / 1000.0
+            self._h_motion.retarget(h, duration, now)
+            self._v_motion.retarget(v, duration, now)
+            self.horizontal_angle = h
+            self.vertical_angle = v
+        return True
+
+    def _set_instant(self, horizontal: Optional[float] = None, vertical: Optional[float] = None) -> None:
+        """记录立即到位的运动（打断正在进行的平滑运动）"""
+        with self._lock:
+            self._supersede_locked()
+            now = time.monotonic()
+            if horizontal is not None:
+                self._h_motion.retarget(horizontal, 0.0, now)
+                self.horizontal_angle = horizontal
+            if vertical is not None:
+                self._v_motion.retarget(vertical, 0.0, now)
+                self.vertical_angle = vertical
+
+    def _supersede_locked(self) -> None:
+        """新指令打断正在进行的平滑运动（调用方持有 _lock）"""
+        if self._move_timer is not None:
+            self._move_timer.cancel()
+            self._move_timer = None
+        if self._move_handle is not None:
+            self._move_handle._finish(CANCELLED)
+            self._move_handle = None
+
+    def _on_move_done(self, handle: CompletionHandle) -> None:
+        """平滑运动到位（定时器线程）：完成句柄并清除当前运动"""
+        with self._lock:
+            if handle is self._move_handle:
+                self._move_handle = None
+                self._move_timer = None
+            handle._finish()
+
+    def _on_move_cancel(self, handle: CompletionHandle) -> None:
+        """取消平滑运动：停在当前估算位置"""
+        with self._lock:
+            if handle is not self._move_handle:
+                return
+            now = time.monotonic()
+            h = round(self._h_motion.position(now))
+            v = round(self._v_motion.position(now))
+            if self._move_timer is not None:
+                self._move_timer.cancel()
+                self._move_timer = None
+            self._move_handle = None
+            Board.setPWMServosPulse([0, 2,
+                                     self.SERVO_HORIZONTAL, angle_to_pulse(h),
+                                     self.SERVO_VERTICAL, angle_to_pulse(v)])
+            self._h_motion.retarget(h, 0.0, now)
+            self._v_motion.retarget(v, 0.0, now)
+            self.horizontal_angle = h
+            self.vertical_angle = v
+
+    def is_moving(self) -> bool:
+        """是否正在平滑转动"""
+        handle = self._move_handle
+        return handle is not None and not handle.done()
 
     def get_position(self) -> dict:
-        """获取云台当前位置
+        """获取云台当前位置（平滑转动过程中为按时间估算的角度，不访问硬件）
 
         Returns:
             dict: 包含水平和垂直角度的字典
         """
+        now = time.monotonic()
         return {
-            'horizontal': self.horizontal_angle,
-            'vertical': self.vertical_angle
+            'horizontal': round(self._h_motion.position(now), 1),
+            'vertical': round(self._v_motion.position(now), 1)
         }
 
 
@@ -241,3 +433,26 @@ def yuntai_you(angle: int = 30) -> None:
 def yuntai_fuwei() -> None:
     """云台复位到初始位置（按设计文档命名）"""
     gimbal_controller.fuwei()
+
+
+def yuntai_zhuandao(horizontal: int = 90, vertical: int = 90, seconds: float = 0.5) -> CompletionHandle:
+    """云台平滑转动到指定角度（立即返回）
+
+    Args:
+        horizontal: 水平角度 (0-180), 90为中位
+        vertical: 垂直角度 (0-180), 90为中位
+        seconds: 转动时间（秒）
+
+    Returns:
+        CompletionHandle: 完成句柄，h.wait() 等待转到位
+    """
+    return gimbal_controller.move_to(horizontal, vertical, seconds)
+
+
+def yuntai_weizhi() -> dict:
+    """获取云台当前角度（转动过程中为估算值）
+
+    Returns:
+        dict: {'horizontal': 水平角度, 'vertical': 垂直角度}
+    """
+    return gimbal_controller.get_position()
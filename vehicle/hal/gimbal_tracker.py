@@ -0,0 +1,161 @@
+"""
+硬件抽象层 - 云台颜色跟踪
+
+在独立线程中让云台跟随指定颜色的目标：
+- 订阅后台视觉线程的颜色结果，每个新的相机帧只检测一次
+- 只有拿到新的检测结果才更新PID（参考 TurboPi/Functions/ColorTracking，
+  但不再以10ms周期空转轮询）
+- 通过 GimbalController.track_to() 合并写入，角度不变时不写舵机
+- 只由 yuntai_tingzhi_genzong()、紧急停止或代码执行结束停止跟踪
+  （tingzhi() 只停车轮，边跟踪边开车再停车时云台继续跟踪）
+"""
+
+import logging
+import threading
+import time
+from typing import Optional
+
+from core.trace import hal_trace
+from core.visual_servo import VisualServo
+
+from .gimbal_controller import gimbal_controller
+from .vision_controller import vision_controller, resolve_color
+
+# 配置日志
+logger = logging.getLogger(__name__)
+
+# 跟踪操作码
+_OP_START = hal_trace.register_op('yuntai_genzong')
+_OP_STOP = hal_trace.register_op('yuntai_tingzhi_genzong', ('frames', 'writes'))
+
+
+class GimbalTracker:
+    """云台颜色跟踪"""
+
+    # 等待新结果的超时（秒），超时后检查是否需要退出
+    RESULT_TIMEOUT = 0.1
+
+    def __init__(self, gimbal, vision):
+        self._gimbal = gimbal
+        self._vision = vision
+        self._servo = VisualServo(gimbal.MIN_ANGLE, gimbal.MAX_ANGLE)
+
+        self._color: Optional[str] = None
+        self._subscription = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # 统计
+        self.frames = 0
+        self.detections = 0
+        self.writes = 0
+        self.target = None
+        self.last_latency = 0.0
+
+    def start(self, color: str) -> None:
+        """开始跟踪指定颜色（已在跟踪时切换颜色）"""
+        if resolve_color(color) is None:
+            raise ValueError(f"未知颜色: {color}")
+        self.stop()
+        self._color = color
+        self._servo.reset()
+        self.frames = self.detections = self.writes = 0
+        self.target = None
+        self._stop_event.clear()
+        self._subscription = self._vision.worker.subscribe('color', color)
+        hal_trace.record(_OP_START)
+        self._thread = threading.Thread(
+            target=self._run,
+            daemon=True,
+            name="GimbalTracker"
+        )
+        self._thread.start()
+        logger.info(f"云台开始跟踪: {color}")
+
+    def stop(self) -> None:
+        """停止跟踪，云台停在当前位置"""
+        thread = self._thread
+        if thread is None:
+            return
+        self._stop_event.set()
+        if thread is not threading.current_thread():
+            thread.join(timeout=1.0)
+        self._thread = None
+        if self._subscription is not None:
+            self._subscription.release()
+            self._subscription = None
+        hal_trace.record(_OP_STOP, self.frames, self.writes)
+        logger.info(f"云台停止跟踪: 处理{self.frames}帧, 写舵机{self.writes}次")
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        subscription = self._subscription
+        last_seq = 0
+        while not self._stop_event.is_set():
+            entry = subscription.wait(last_seq, self.RESULT_TIMEOUT)
+            if entry is None or self._stop_event.is_set():
+                continue
+            last_seq = entry.seq
+            try:
+                self.step(entry)
+            except Exception as e:
+                logger.error(f"云台跟踪异常: {e}")
+                hal_trace.dump_to_log(logger)
+                break
+
+    def step(self, entry) -> None:
+        """处理一帧的检测结果"""
+        result = entry.value
+        frame = self._vision.get_frame()
+        if frame is None:
+            return
+        self.frames += 1
+        if result is None:
+            if self.target is not None:
+                # 丢失目标：清除PID状态，重新找到时不带旧的积分和微分
+                self._servo.reset()
+            self.target = None
+            return
+
+        self.detections += 1
+        self.target = (result[0], result[1])
+        h, v = self._servo.update(self._gimbal.horizontal_angle, self._gimbal.vertical_angle,
+                                  self.target, frame.size)
+        if self._gimbal.track_to(h, v):
+            self.writes += 1
+        # 延迟：从相机采集到舵机指令发出
+        self.last_latency = time.monotonic() - entry.timestamp
+
+    def get_status(self) -> dict:
+        """获取跟踪状态"""
+        return {
+            'running': self.is_running(),
+            'color': self._color,
+            'target': self.target,
+            'frames': self.frames,
+            'detections': self.detections,
+            'writes': self.writes,
+            'latency_ms': round(self.last_latency * 1000, 2),
+        }
+
+
+# 全局实例
+gimbal_tracker = GimbalTracker(gimbal_controller, vision_controller)
+
+
+# 便捷函数
+def yuntai_genzong(color: str = 'hong') -> None:
+    """云台跟踪指定颜色（后台运行，立即返回）
+
+    Args:
+        color: 颜色名称（'hong'-红色, 'lv'-绿色, 'lan'-蓝色,
+               'huang'-黄色, 'cheng'-橙色）
+    """
+    gimbal_tracker.start(color)
+
+
+def yuntai_tingzhi_genzong() -> None:
+    """停止云台跟踪"""
+    gimbal_tracker.stop()
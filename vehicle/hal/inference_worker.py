@@ -0,0 +1,353 @@
+"""
+硬件抽象层 - 人脸/手势识别
+
+一个推理线程运行人脸检测和手部关键点两个 mediapipe 模型：
+- 模型在第一次订阅时才加载（在推理线程中加载，积木调用不会等待），服务启动时不加载
+- 只处理最新的相机帧：推理期间到达的旧帧直接跳过（计为丢帧），结果不会越积越旧
+- 输入先缩小到每个模型各自的宽度再转换为RGB，缩小后的画面在同一帧内共用
+- 检测结果带帧序号和采集时间戳发布到结果板，积木函数只读取最近的结果
+- 只在有积木调用（租约有效）时推理，停止调用后模型保持加载但线程空闲
+
+识别方式参考 TurboPi/Functions/FaceTracking 和 GestureRecognition
+（每帧在主循环中对全分辨率画面同步推理）。
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from core.frame import FrameHandle
+from core.results import ResultsBoard, SubscriptionSet
+
+from .vision_controller import vision_controller
+
+# 配置日志
+logger = logging.getLogger(__name__)
+
+# TurboPi路径
+TURBOPI_PATH = os.getenv('TURBOPI_PATH', './TurboPi')
+if os.path.exists(TURBOPI_PATH):
+    sys.path.insert(0, TURBOPI_PATH)
+    sys.path.insert(0, os.path.join(TURBOPI_PATH, 'HiwonderSDK'))
+
+# 导入视觉SDK - 必须成功，否则服务无法运行（mediapipe 在第一次订阅时才导入）
+try:
+    import cv2
+    import numpy as np
+    from HiwonderSDK.Gesture import GestureFilter, classify_landmarks
+except Exception as e:
+    logger.error(f"视觉推理SDK加载失败: {e}")
+    raise RuntimeError(f"视觉推理SDK加载失败: {e}") from e
+
+
+# 模型输入宽度（像素），画面更宽时先等比缩小
+FACE_INPUT_WIDTH = int(os.getenv('FACE_INPUT_WIDTH', '160'))
+HAND_INPUT_WIDTH = int(os.getenv('HAND_INPUT_WIDTH', '256'))
+
+
+class Face(NamedTuple):
+    """一张人脸（整个画面的像素坐标）"""
+    x: int
+    y: int
+    w: int
+    h: int
+    score: float
+
+    @property
+    def center(self) -> Tuple[int, int]:
+        return self.x + self.w // 2, self.y + self.h // 2
+
+
+class Hand(NamedTuple):
+    """一只手"""
+    landmarks: 'np.ndarray'   # (21, 2) 整个画面的像素坐标
+    gesture: int              # 本帧的手势编号，0表示无法识别
+    score: float
+
+
+class HandResult(NamedTuple):
+    """一帧的手部检测结果"""
+    hands: List[Hand]
+    gesture: int              # 时间平滑后的手势编号（第一只手），0表示没有手势
+
+
+# ===== 模型 =====
+
+def load_face_model():
+    import mediapipe as mp
+    return mp.solutions.face_detection.FaceDetection(min_detection_confidence=0.5)
+
+
+def detect_faces(model, rgb, frame_size: Tuple[int, int]) -> List[Face]:
+    """人脸检测，按面积从大到小排列"""
+    width, height = frame_size
+    results = model.process(rgb)
+    faces = []
+    for detection in results.detections or ():
+        box = detection.location_data.relative_bounding_box
+        faces.append(Face(int(box.xmin * width), int(box.ymin * height),
+                          int(box.width * width), int(box.height * height),
+                          float(detection.score[0])))
+    faces.sort(key=lambda f: f.w * f.h, reverse=True)
+    return faces
+
+
+def load_hand_model():
+    import mediapipe as mp
+    return mp.solutions.hands.Hands(model_complexity=0, min_detection_confidence=0.5,
+                                    min_tracking_confidence=0.5)
+
+
+class HandDetector:
+    """手部关键点检测和手势分类（推理函数）
+
+    所有手的关键点组成 (N, 21, 2) 数组一次分类；第一只手的手势经过时间平滑
+    （最近 window 帧中至少 min_votes 帧相同才切换），单帧误识别不会改变结果。
+    """
+
+    def __init__(self, window: int = 5, min_votes: int = 3):
+        self.filter = GestureFilter(window, min_votes)
+
+    def __call__(self, model, rgb, frame_size: Tuple[int, int]) -> HandResult:
+        width, height = frame_size
+        results = model.process(rgb)
+        detected = results.multi_hand_landmarks or []
+        if not detected:
+            return HandResult([], self.filter.update(0))
+
+        points = np.array([[(p.x, p.y) for p in hand_landmarks.landmark] for hand_landmarks in detected],
+                          dtype=np.float32) * (width, height)
+        gestures = classify_landmarks(points)
+        scores = results.multi_handedness or []
+        hands = [Hand(points[i], int(gestures[i]),
+                      float(scores[i].classification[0].score) if i < len(scores) else 0.0)
+                 for i in range(len(detected))]
+        return HandResult(hands, self.filter.update(hands[0].gesture))
+
+
+class Model:
+    """一个推理模型：加载函数、推理函数和输入宽度"""
+
+    def __init__(self, kind: str, loader: Callable, infer: Callable, input_width: int):
+        self.kind = kind
+        self.loader = loader
+        self.infer = infer
+        self.input_width = input_width
+        self.instance = None
+        self.error: Optional[str] = None
+
+        # 统计
+        self.frames = 0
+        self.infer_time = 0.0
+
+
+class InferenceWorker:
+    """人脸/手势推理线程"""
+
+    # 积木调用的租约有效期（秒）
+    LEASE_TTL = 2.0
+    # 检测结果的有效期（秒），超过时视为没有检测到
+    RESULT_TTL = 1.0
+    # 等待新帧的超时（秒）
+    FRAME_TIMEOUT = 0.2
+
+    def __init__(self, vision):
+        self._vision = vision
+        self.board = ResultsBoard()
+        self._models: Dict[str, Model] = {}
+        self._subs = SubscriptionSet(on_change=self._wakeup)
+
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+        # 统计
+        self.frames = 0
+        self.dropped = 0
+
+    # ===== 模型注册 =====
+
+    def register_model(self, kind: str, loader: Callable, infer: Callable, input_width: int) -> None:
+        """注册模型（不加载），订阅键为 kind
+
+        Args:
+            loader: 无参数，返回模型实例（第一次订阅时在推理线程中调用）
+            infer: (模型, RGB图像, 整个画面尺寸) -> 检测结果
+            input_width: 模型输入宽度
+        """
+        self._models[kind] = Model(kind, loader, infer, input_width)
+
+    # ===== 读取 =====
+
+    def read(self, kind: str):
+        """读取最近的检测结果（续期租约，不等待推理）
+
+        Returns:
+            RESULT_TTL 内的最近结果（人脸为 List[Face]，手为 HandResult）；
+            模型还没有结果或结果过期时返回None
+        """
+        if kind not in self._models:
+            raise ValueError(f"未知的推理模型: {kind}")
+        if self._subs.lease(kind, self.LEASE_TTL):
+            self._ensure_thread()
+        entry = self.board.get(kind)
+        if entry is None or time.monotonic() - entry.timestamp > self.RESULT_TTL:
+            return None
+        return entry.value
+
+    # ===== 推理线程 =====
+
+    def _wakeup(self):
+        with self._cond:
+            self._cond.notify_all()
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run,
+                daemon=True,
+                name="InferenceWorker"
+            )
+            self._thread.start()
+
+    def _run(self):
+        last_seq = self._vision.get_frame_count()
+        while True:
+            for kind in self._subs.expire():
+                self.board.discard(kind)
+            active = [self._models[kind] for kind in self._subs.active()]
+            active = [m for m in active if self._ensure_loaded(m)]
+            if not active:
+                with self._cond:
+                    self._cond.wait(self.FRAME_TIMEOUT * 5)
+                continue
+
+            if not self._vision.wait_next_frame(last_seq, self.FRAME_TIMEOUT):
+                continue
+            frame = self._vision.get_frame()
+            if frame is None:
+                continue
+            if last_seq:
+                self.dropped += max(0, frame.seq - last_seq - 1)
+            last_seq = frame.seq
+            self.step(frame, active)
+
+    def _ensure_loaded(self, model: Model) -> bool:
+        """加载模型（只尝试一次），返回是否可用"""
+        if model.instance is None and model.error is None:
+            t0 = time.perf_counter()
+            try:
+                model.instance = model.loader()
+                logger.info(f"推理模型已加载: {model.kind} ({time.perf_counter() - t0:.1f}秒)")
+            except Exception as e:
+                model.error = str(e)
+                logger.error(f"推理模型加载失败: {model.kind}: {e}")
+        return model.instance is not None
+
+    def step(self, frame: FrameHandle, models: List[Model]) -> None:
+        """对一帧运行各模型并发布结果"""
+        height, width = frame.image.shape[:2]
+        inputs = {}
+        for model in models:
+            rgb = inputs.get(model.input_width)
+            if rgb is None:
+                image = frame.image
+                if width > model.input_width:
+                    size = (model.input_width, max(1, round(height * model.input_width / width)))
+                    image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+                rgb = inputs[model.input_width] = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+            t0 = time.perf_counter()
+            try:
+                value = model.infer(model.instance, rgb, (width, height))
+            except Exception as e:
+                logger.error(f"推理异常: {model.kind}: {e}")
+                continue
+            model.infer_time = time.perf_counter() - t0
+            model.frames += 1
+            self.board.publish(model.kind, frame.seq, frame.timestamp, value)
+        self.frames += 1
+
+    def get_status(self) -> dict:
+        """获取推理状态"""
+        active = self._subs.active()
+        return {
+            'running': self._thread is not None and self._thread.is_alive(),
+            'frames': self.frames,
+            'dropped': self.dropped,
+            'models': {
+                kind: {
+                    'loaded': m.instance is not None,
+                    'active': kind in active,
+                    'error': m.error,
+                    'input_width': m.input_width,
+                    'frames': m.frames,
+                    'infer_ms': round(m.infer_time * 1000, 2),
+                } for kind, m in self._models.items()
+            },
+        }
+
+    # ===== 积木 =====
+
+    def shibie_renlian(self) -> bool:
+        """识别人脸"""
+        return bool(self.read('face'))
+
+    def renlian_weizhi(self) -> Optional[Tuple[int, int]]:
+        """最大的人脸的中心位置"""
+        faces = self.read('face')
+        return faces[0].center if faces else None
+
+    def shibie_shoushi(self) -> int:
+        """识别手势，返回第一只手平滑后的手势编号"""
+        result = self.read('hand')
+        return result.gesture if result is not None else 0
+
+
+# 全局实例
+inference_worker = InferenceWorker(vision_controller)
+inference_worker.register_model('face', load_face_model, detect_faces, FACE_INPUT_WIDTH)
+inference_worker.register_model('hand', load_hand_model, HandDetector(), HAND_INPUT_WIDTH)
+
+
+# 便捷函数
+def shibie_renlian() -> bool:
+    """识别人脸
+
+    立即返回后台推理的最近结果；第一次调用时才加载人脸模型，
+    所以刚开始的一两秒返回False。
+
+    Returns:
+        bool: True表示画面中有人脸
+
+    示例:
+        >>> while not shibie_renlian():
+        ...     dengdai_xinzhen()
+        >>> print('看到人脸了')
+    """
+    return inference_worker.shibie_renlian()
+
+
+def renlian_weizhi() -> Optional[Tuple[int, int]]:
+    """获取最大的人脸的位置
+
+    Returns:
+        Optional[Tuple[int, int]]: 人脸中心 (x, y)，没有人脸时返回None
+    """
+    return inference_worker.renlian_weizhi()
+
+
+def shibie_shoushi() -> int:
+    """识别手势
+
+    Returns:
+        int: 手势编号 1-6（伸出的手指数：1-5，6为“六”的手势），
+             没有手或无法识别时返回0
+
+    示例:
+        >>> if shibie_shoushi() == 1:
+        ...     qianjin(50)
+    """
+    return inference_worker.shibie_shoushi()
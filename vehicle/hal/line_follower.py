@@ -0,0 +1,295 @@
+"""
+硬件抽象层 - 巡线引擎
+
+在独立线程中以固定频率运行的闭环巡线：
+- 读取4路巡线传感器，计算黑线相对车身中心的偏移
+- 对偏移量做PID，输出转向量，与前进速度混合后驱动电机
+- 检测到路口（4路全黑）或脱线时产生事件，供积木程序查询
+
+转向逻辑参考 TurboPi/Functions/LineFollower.move，
+但不依赖 Functions 框架和摄像头。
+"""
+
+import collections
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Callable, List, Optional, Sequence
+
+from core.trace import hal_trace
+
+from .motion_controller import motion_controller
+from .sensor_controller import sensor_controller
+
+# 配置日志
+logger = logging.getLogger(__name__)
+
+# TurboPi路径
+TURBOPI_PATH = os.getenv('TURBOPI_PATH', './TurboPi')
+if os.path.exists(TURBOPI_PATH):
+    sys.path.insert(0, TURBOPI_PATH)
+    sys.path.insert(0, os.path.join(TURBOPI_PATH, 'HiwonderSDK'))
+
+# 导入硬件SDK - 必须成功，否则服务无法运行
+try:
+    import HiwonderSDK.PID as PID
+except Exception as e:
+    logger.error(f"巡线PID模块加载失败: {e}")
+    raise RuntimeError(f"巡线PID模块加载失败: {e}") from e
+
+
+# 事件名称
+EVENT_INTERSECTION = 'lukou'   # 路口（4路全黑）
+EVENT_LOST = 'diuxian'         # 脱线
+EVENT_FOUND = 'zhaodao'        # 脱线后重新找到黑线
+
+# 跟踪操作码
+_OP_START = hal_trace.register_op('xunxian_start', ('speed',))
+_OP_STOP = hal_trace.register_op('xunxian_stop')
+_OP_EVENT = hal_trace.register_op('xunxian_event', ('event', 'offset'))
+_EVENT_CODES = {EVENT_INTERSECTION: 1, EVENT_LOST: 2, EVENT_FOUND: 3}
+
+# 传感器权重: [左1, 左2, 右2, 右1]，负数表示黑线在左侧
+SENSOR_WEIGHTS = (-3.0, -1.0, 1.0, 3.0)
+
+
+def line_offset(states: Sequence[bool]) -> Optional[float]:
+    """根据4路传感器状态计算黑线偏移
+
+    Args:
+        states: [左1, 左2, 右2, 右1]，True表示检测到黑线
+
+    Returns:
+        Optional[float]: 偏移量（-3到3），负数表示黑线偏左；
+                         没有传感器检测到黑线时返回None
+    """
+    total = 0.0
+    count = 0
+    for weight, active in zip(SENSOR_WEIGHTS, states):
+        if active:
+            total += weight
+            count += 1
+    if count == 0:
+        return None
+    return total / count
+
+
+class LineFollowEngine:
+    """闭环巡线引擎
+
+    积木程序调用 start() 后立即返回，巡线在后台线程中持续运行，
+    直到调用 stop() 或 tingzhi()。
+    """
+
+    # 默认PID参数（偏移量 -> 转向量，单位与电机速度相同）
+    DEFAULT_KP = 8.0
+    DEFAULT_KI = 0.0
+    DEFAULT_KD = 0.4
+
+    # 连续脱线超过该时间才判定为脱线（急弯时短暂脱线继续按上次转向行驶）
+    LOST_GRACE = 0.15
+    # 路口事件去抖时间
+    INTERSECTION_DEBOUNCE = 0.5
+
+    def __init__(self, motion, sensor, rate_hz: Optional[float] = None):
+        self._motion = motion
+        self._sensor = sensor
+        self.rate_hz = float(rate_hz or os.getenv('LINE_FOLLOW_RATE', '100'))
+
+        self._pid = PID.PID(P=self.DEFAULT_KP, I=self.DEFAULT_KI, D=self.DEFAULT_KD)
+        self._speed = 0
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+
+        # 事件队列与回调
+        self._events = collections.deque(maxlen=32)
+        self._callbacks: List[Callable[[str, float], None]] = []
+
+        # 运行统计
+        self.loop_count = 0
+        self.max_jitter = 0.0
+
+        # tingzhi() 时一并停止巡线（电机由 tingzhi 自己清零）
+        motion.add_stop_listener(lambda: self.stop(brake=False))
+
+    # ===== 控制 =====
+
+    def start(self, speed: int = 40) -> None:
+        """开始巡线（非阻塞）
+
+        Args:
+            speed: 前进速度，0-100
+        """
+        speed = max(0, min(100, int(speed)))
+        with self._lock:
+            self._speed = speed
+            hal_trace.record(_OP_START, speed)
+            if self.is_running():
+                return
+            self._pid.clear()
+            self._events.clear()
+            self._stop_event.clear()
+            self._thread = threading.Thread(
+                target=self._loop,
+                daemon=True,
+                name="LineFollower"
+            )
+            self._thread.start()
+        logger.info(f"巡线引擎已启动: 速度={speed}, 频率={self.rate_hz}Hz")
+
+    def stop(self, brake: bool = True) -> None:
+        """停止巡线
+
+        Args:
+            brake: 是否同时停止电机
+        """
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+            self._stop_event.set()
+        if thread is None:
+            return
+        hal_trace.record(_OP_STOP)
+        if thread is not threading.current_thread():
+            thread.join(timeout=1.0)
+        if brake:
+            self._motion.drive(0, 0)
+        logger.info("巡线引擎已停止")
+
+    def is_running(self) -> bool:
+        """检查巡线是否正在运行"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def set_pid(self, kp: float, ki: float = 0.0, kd: float = 0.0) -> None:
+        """调整PID参数"""
+        self._pid.setKp(kp)
+        self._pid.setKi(ki)
+        self._pid.setKd(kd)
+
+    # ===== 事件 =====
+
+    def on_event(self, callback: Callable[[str, float], None]) -> None:
+        """注册事件回调 callback(event, timestamp)，在巡线线程中调用"""
+        self._callbacks.append(callback)
+
+    def next_event(self) -> str:
+        """取出最早的未读事件
+
+        Returns:
+            str: 事件名称（'lukou', 'diuxian', 'zhaodao'），没有事件返回空字符串
+        """
+        try:
+            return self._events.popleft()[0]
+        except IndexError:
+            return ''
+
+    def _emit(self, event: str, offset: float = 0.0) -> None:
+        now = time.monotonic()
+        hal_trace.record(_OP_EVENT, _EVENT_CODES[event], offset)
+        self._events.append((event, now))
+        for callback in self._callbacks:
+            try:
+                callback(event, now)
+            except Exception as e:
+                logger.error(f"巡线事件回调失败: {e}")
+
+    # ===== 控制循环 =====
+
+    def _loop(self):
+        """固定频率控制循环（在独立线程中运行）"""
+        period = 1.0 / self.rate_hz
+        next_tick = time.monotonic()
+        last_seen = next_tick
+        last_intersection = 0.0
+        lost = False
+        turn = 0.0
+        last_command = None
+
+        try:
+            while not self._stop_event.is_set():
+                now = time.monotonic()
+                states = self._sensor.xunxian()
+                offset = line_offset(states)
+
+                if offset is None:
+                    # 短暂脱线：保持上次转向；超过宽限时间：停车并产生事件
+                    if not lost and now - last_seen > self.LOST_GRACE:
+                        lost = True
+                        self._emit(EVENT_LOST)
+                    forward = 0 if lost else self._speed
+                else:
+                    if lost:
+                        lost = False
+                        self._pid.clear()
+                        self._emit(EVENT_FOUND, offset)
+                    last_seen = now
+
+                    if all(states):
+                        # 路口：直行通过
+                        if now - last_intersection > self.INTERSECTION_DEBOUNCE:
+                            self._emit(EVENT_INTERSECTION)
+                        last_intersection = now
+                        turn = 0.0
+                    else:
+                        self._pid.update(offset)
+                        turn = max(-self._speed, min(self._speed, -self._pid.output))
+                    forward = self._speed
+
+                # 只在指令变化时写电机，减少I2C通信
+                command = (int(forward), int(turn if not lost else 0))
+                if command != last_command:
+                    self._motion.drive(*command)
+                    last_command = command
+
+                self.loop_count += 1
+                next_tick += period
+                delay = next_tick - time.monotonic()
+                if delay > 0:
+                    self._stop_event.wait(delay)
+                else:
+                    # 处理超时，重新对齐节拍
+                    self.max_jitter = max(self.max_jitter, -delay)
+                    next_tick = time.monotonic()
+        except Exception as e:
+            logger.error(f"巡线引擎异常: {e}")
+            hal_trace.dump_to_log(logger)
+            self._motion.drive(0, 0)
+
+    def get_status(self) -> dict:
+        """获取巡线引擎状态"""
+        return {
+            'running': self.is_running(),
+            'speed': self._speed,
+            'rate_hz': self.rate_hz,
+            'loop_count': self.loop_count,
+            'max_jitter_ms': round(self.max_jitter * 1000, 2),
+            'pending_events': len(self._events),
+        }
+
+
+# 全局实例
+line_follower = LineFollowEngine(motion_controller, sensor_controller)
+
+
+# 便捷函数
+def xunxian_start(speed: int = 40):
+    """开始自动巡线（后台运行，立即返回）"""
+    line_follower.start(speed)
+
+
+def xunxian_stop():
+    """停止自动巡线"""
+    line_follower.stop()
+
+
+def xunxian_shijian() -> str:
+    """读取巡线事件
+
+    Returns:
+        str: 'lukou'-路口, 'diuxian'-脱线, 'zhaodao'-重新找到黑线,
+             没有新事件返回空字符串
+    """
+    return line_follower.next_event()
@@ -5,9 +5,15 @@
 """
 
 import logging
+import math
 import os
 import sys
 
+import numpy as np
+
+from core.calibration import MotorCalibration, CALIBRATION_FILE
+from core.trace import hal_trace
+
 # 配置日志
 logger = logging.getLogger(__name__)
 
@@ -43,6 +49,26 @@ except Exception as e:
     raise RuntimeError(f"硬件SDK加载失败: {e}") from e
 
 
+# 跟踪操作码
+_OP_QIANJIN = hal_trace.register_op('qianjin', ('speed',))
+_OP_HOUTUI = hal_trace.register_op('houtui', ('speed',))
+_OP_ZUOPINGYI = hal_trace.register_op('zuopingyi', ('speed',))
+_OP_YOUPINGYI = hal_trace.register_op('youpingyi', ('speed',))
+_OP_XUANZHUAN = hal_trace.register_op('xuanzhuan', ('speed',))
+_OP_FXUANZHUAN = hal_trace.register_op('fxuanzhuan', ('speed',))
+_OP_TINGZHI = hal_trace.register_op('tingzhi')
+_OP_YIDONG_ANGLE = hal_trace.register_op('yidong_angle', ('angle', 'speed'))
+_OP_YIDONG_XY = hal_trace.register_op('yidong_xy', ('vx', 'vy'))
+_OP_SET_SERVO = hal_trace.register_op('set_servo', ('servo_id', 'angle'))
+_OP_RESET_SERVOS = hal_trace.register_op('reset_servos')
+_OP_DENGDAI = hal_trace.register_op('dengdai', ('seconds',))
+_OP_DRIVE = hal_trace.register_op('drive', ('forward', 'turn'))
+
+# 轮速混合系数，与上面基础运动的接线一致: (左前, 右前, 左后, 右后)
+_MIX_FORWARD = np.array((1, 1, 1, 1), dtype=np.float64)     # 前进
+_MIX_TURN_CW = np.array((1, -1, -1, 1), dtype=np.float64)   # 顺时针旋转
+
+
 class MotionController:
     """运动控制器"""
 
@@ -54,8 +80,41 @@ class MotionController:
         self.max_speed = int(os.getenv('MOTOR_MAX_SPEED', '80'))
         self.servo_max_angle = int(os.getenv('SERVO_MAX_ANGLE', '180'))
 
+        # 每辆车的电机标定（增益、死区、方向）
+        self.calibration_path = os.path.join(TURBOPI_PATH, CALIBRATION_FILE)
+        self.calibration = MotorCalibration.load(self.calibration_path)
+
+        # 最近一次目标速度（标定前）: (左前, 右前, 左后, 右后)
+        self._motor_speeds = [0, 0, 0, 0]
+
+        # 停止回调（后台运动引擎在 tingzhi 时需要一起停下）
+        self._stop_listeners = []
+
         logger.info("运动控制器初始化完成")
 
+    def add_stop_listener(self, callback) -> None:
+        """注册停止回调，tingzhi() 写零速之前调用"""
+        self._stop_listeners.append(callback)
+
+    def set_calibration(self, calibration: MotorCalibration, save: bool = False) -> None:
+        """替换电机标定，下一次写电机时生效"""
+        self.calibration = calibration
+        if save:
+            calibration.save(self.calibration_path)
+
+    def _set_motors(self, speeds) -> None:
+        """写入4个电机速度: (左前, 右前, 左后, 右后)
+
+        限速和标定作为一次数组运算完成，然后依次写入4个电机寄存器。
+        """
+        target = np.clip(np.asarray(speeds, dtype=np.float64), -self.max_speed, self.max_speed)
+        self._motor_speeds = [int(v) for v in target]
+        out = self.calibration.apply(target).tolist()
+        Board.setMotor(1, out[0])   # 左前
+        Board.setMotor(2, out[1])   # 右前
+        Board.setMotor(3, out[2])   # 左后
+        Board.setMotor(4, out[3])   # 右后
+
     def _clamp_speed(self, speed: int) -> int:
         """限制速度范围"""
         return max(-self.max_speed, min(self.max_speed, speed))
@@ -70,91 +129,94 @@ class MotionController:
     def qianjin(self, speed: int = 50) -> None:
         """前进"""
         speed = self._clamp_speed(speed)
-        logger.info(f"前进: 速度={speed}")
+        hal_trace.record(_OP_QIANJIN, speed)
+        logger.debug("前进: 速度=%s", speed)
         # 前进: 所有轮子正转
-        Board.setMotor(1, speed)   # 左前
-        Board.setMotor(2, speed)   # 右前
-        Board.setMotor(3, speed)   # 左后
-        Board.setMotor(4, speed)   # 右后
+        self._set_motors((speed, speed, speed, speed))
 
     def houtui(self, speed: int = 50) -> None:
         """后退"""
         speed = self._clamp_speed(speed)
-        logger.info(f"后退: 速度={speed}")
+        hal_trace.record(_OP_HOUTUI, speed)
+        logger.debug("后退: 速度=%s", speed)
         # 后退: 所有轮子反转
-        Board.setMotor(1, -speed)  # 左前
-        Board.setMotor(2, -speed)  # 右前
-        Board.setMotor(3, -speed)  # 左后
-        Board.setMotor(4, -speed)  # 右后
+        self._set_motors((-speed, -speed, -speed, -speed))
 
     def zuopingyi(self, speed: int = 50) -> None:
         """左平移"""
         speed = self._clamp_speed(speed)
-        logger.info(f"左平移: 速度={speed}")
+        hal_trace.record(_OP_ZUOPINGYI, speed)
+        logger.debug("左平移: 速度=%s", speed)
         # 左平移: LF-, RF+, LB-, RB+
-        Board.setMotor(1, -speed)  # 左前
-        Board.setMotor(2, speed)   # 右前
-        Board.setMotor(3, -speed)  # 左后
-        Board.setMotor(4, speed)   # 右后
+        self._set_motors((-speed, speed, -speed, speed))
 
     def youpingyi(self, speed: int = 50) -> None:
         """右平移"""
         speed = self._clamp_speed(speed)
-        logger.info(f"右平移: 速度={speed}")
+        hal_trace.record(_OP_YOUPINGYI, speed)
+        logger.debug("右平移: 速度=%s", speed)
         # 右平移: LF+, RF-, LB+, RB-
-        Board.setMotor(1, speed)   # 左前
-        Board.setMotor(2, -speed)  # 右前
-        Board.setMotor(3, speed)   # 左后
-        Board.setMotor(4, -speed)  # 右后
+        self._set_motors((speed, -speed, speed, -speed))
 
     def xuanzhuan(self, speed: int = 50) -> None:
         """原地旋转（顺时针）"""
         speed = self._clamp_speed(speed)
-        logger.info(f"旋转(顺时针): 速度={speed}")
+        hal_trace.record(_OP_XUANZHUAN, speed)
+        logger.debug("旋转(顺时针): 速度=%s", speed)
         # 顺时针: LF+, RF-, LB-, RB-
-        Board.setMotor(1, speed)   # 左前
-        Board.setMotor(2, -speed)  # 右前
-        Board.setMotor(3, -speed)  # 左后
-        Board.setMotor(4, speed)   # 右后
+        self._set_motors((speed, -speed, -speed, speed))
 
     def fxuanzhuan(self, speed: int = 50) -> None:
         """原地旋转（逆时针）"""
         speed = self._clamp_speed(speed)
-        logger.info(f"旋转(逆时针): 速度={speed}")
+        hal_trace.record(_OP_FXUANZHUAN, speed)
+        logger.debug("旋转(逆时针): 速度=%s", speed)
         # 逆时针: LF-, RF+, LB+, RB+
-        Board.setMotor(1, -speed)  # 左前
-        Board.setMotor(2, speed)   # 右前
-        Board.setMotor(3, speed)   # 左后
-        Board.setMotor(4, -speed)  # 右后
+        self._set_motors((-speed, speed, speed, -speed))
 
     def tingzhi(self) -> None:
-        """停止所有电机"""
-        logger.info("停止")
-        Board.setMotor(1, 0)
-        Board.setMotor(2, 0)
-        Board.setMotor(3, 0)
-        Board.setMotor(4, 0)
+        """停止所有电机（同时停止巡线等后台运动）"""
+        hal_trace.record(_OP_TINGZHI)
+        logger.debug("停止")
+        for callback in self._stop_listeners:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"停止回调执行失败: {e}")
+        self._set_motors((0, 0, 0, 0))
 
     # ===== 高级运动 =====
 
+    def drive(self, forward: float, turn: float) -> None:
+        """前进+转向混合控制（供后台闭环引擎使用）
+
+        Args:
+            forward: 前进速度，负数为后退
+            turn: 转向量，正数顺时针（右转），负数逆时针（左转）
+        """
+        hal_trace.record(_OP_DRIVE, forward, turn)
+        self._set_motors(forward * _MIX_FORWARD + turn * _MIX_TURN_CW)
+
     def yidong_angle(self, angle: float, speed: int = 50) -> None:
         """按角度移动"""
         speed = self._clamp_speed(speed)
-        logger.info(f"按角度移动: 角度={angle}°, 速度={speed}")
-        # 使用chassis进行角度移动
-        import mecanum
-        chassis = mecanum.MecanumChassis()
-        chassis.set_velocity(velocity=speed, direction=angle, angular_rate=0)
+        hal_trace.record(_OP_YIDONG_ANGLE, angle, speed)
+        logger.debug("按角度移动: 角度=%s°, 速度=%s", angle, speed)
+        # 麦克纳姆轮平移（与 mecanum.MecanumChassis.set_velocity 相同的方向约定）
+        rad = math.radians(angle)
+        self._translate(speed * math.cos(rad), speed * math.sin(rad))
 
     def yidong_xy(self, vx: float, vy: float) -> None:
         """按X/Y方向移动"""
         vx = max(-100, min(100, int(vx)))
         vy = max(-100, min(100, int(vy)))
-        logger.info(f"按XY移动: vx={vx}, vy={vy}")
-        # 使用chassis进行XY移动
-        import mecanum
-        chassis = mecanum.MecanumChassis()
-        chassis.translation(vx, vy)
+        hal_trace.record(_OP_YIDONG_XY, vx, vy)
+        logger.debug("按XY移动: vx=%s, vy=%s", vx, vy)
+        self._translate(vx, vy)
+
+    def _translate(self, vx: float, vy: float) -> None:
+        """麦克纳姆轮平移混合（同 mecanum.MecanumChassis 的公式，不旋转）"""
+        self._set_motors((vy + vx, vy - vx, vy - vx, vy + vx))
 
     # ===== 舵机控制 =====
 
@@ -164,12 +226,14 @@ class MotionController:
             raise ValueError(f"无效的舵机ID: {servo_id}")
 
         angle = self._clamp_angle(angle)
-        logger.info(f"舵机{servo_id}: 角度={angle}°")
+        hal_trace.record(_OP_SET_SERVO, servo_id, angle)
+        logger.debug("舵机%s: 角度=%s°", servo_id, angle)
         Board.setPWMServoAngle(servo_id, angle)
 
     def reset_servos(self) -> None:
         """复位所有舵机"""
-        logger.info("复位所有舵机")
+        hal_trace.record(_OP_RESET_SERVOS)
+        logger.debug("复位所有舵机")
         for i in range(1, 7):
             Board.setPWMServoAngle(i, 90)
 
@@ -256,5 +320,6 @@ def dengdai(seconds: float):
     """
     import time
     seconds = max(0, min(60, float(seconds)))  # 限制在0-60秒
-    logger.info(f"等待: {seconds}秒")
+    hal_trace.record(_OP_DENGDAI, seconds)
+    logger.debug("等待: %s秒", seconds)
     time.sleep(seconds)
@@ -0,0 +1,157 @@
+"""
+硬件抽象层 - 运动检测
+
+检测画面中有东西在动（例如有人在小车前面挥手）：
+- 画面先缩小到 MOTION_WIDTH 宽的灰度图（默认80x60），每帧只处理几千个像素
+- 背景模型用 cv2.accumulateWeighted 逐帧更新（缓慢变化的光照会被吸收）
+- 当前帧与背景相差超过阈值的像素为运动像素，报告运动面积比例和重心位置
+- 作为后台视觉线程的处理函数运行，每个新的相机帧只计算一次
+
+注意：小车或云台自己在动时整个画面都会变化，应在静止时使用。
+"""
+
+import logging
+import os
+import threading
+from typing import NamedTuple, Optional, Tuple
+
+from core.frame import FrameHandle
+
+from .vision_controller import vision_controller
+
+# 配置日志
+logger = logging.getLogger(__name__)
+
+# 导入视觉SDK - 必须成功，否则服务无法运行
+try:
+    import cv2
+    import numpy as np
+except Exception as e:
+    logger.error(f"运动检测模块加载失败: {e}")
+    raise RuntimeError(f"运动检测模块加载失败: {e}") from e
+
+
+# 运动检测的画面宽度（像素）
+MOTION_WIDTH = int(os.getenv('MOTION_WIDTH', '80'))
+
+
+class MotionResult(NamedTuple):
+    """一帧的运动检测结果"""
+    area: float                         # 运动像素占画面的比例（0-1）
+    center: Optional[Tuple[int, int]]   # 运动区域的重心（整个画面的像素坐标），没有运动时为None
+
+
+NO_MOTION = MotionResult(0.0, None)
+
+
+class MotionDetector:
+    """缩小灰度图 + 滑动平均背景的运动检测"""
+
+    # 背景更新速度（每帧新画面占背景的比例）
+    ALPHA = 0.05
+    # 与背景的灰度差超过该值的像素为运动像素
+    THRESHOLD = 25
+    # 两次处理之间跳过的帧数超过该值时重新建立背景（例如停止调用一段时间后）
+    RESEED_GAP = 30
+
+    def __init__(self, width: int = MOTION_WIDTH, alpha: float = ALPHA, threshold: int = THRESHOLD):
+        self.width = width
+        self.alpha = alpha
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._background = None
+        self._last_seq = 0
+        self._last_result = NO_MOTION
+
+    def reset(self) -> None:
+        """清除背景，下一帧重新建立"""
+        with self._lock:
+            self._background = None
+            self._last_seq = 0
+
+    def process(self, image, seq: int) -> MotionResult:
+        """处理一帧（同一帧重复调用直接返回上次结果，背景只更新一次）
+
+        Args:
+            image: BGR 图像
+            seq: 帧序号
+        """
+        with self._lock:
+            if seq == self._last_seq:
+                return self._last_result
+
+            height, width = image.shape[:2]
+            small_size = (self.width, max(1, round(height * self.width / width)))
+            small = cv2.resize(image, small_size, interpolation=cv2.INTER_AREA)
+            gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+            if (self._background is None or self._background.shape != gray.shape
+                    or seq - self._last_seq > self.RESEED_GAP):
+                # 第一帧（或长时间没有处理）：当前画面作为背景
+                self._background = gray.astype(np.float32)
+                result = NO_MOTION
+            else:
+                diff = cv2.absdiff(gray, cv2.convertScaleAbs(self._background))
+                cv2.accumulateWeighted(gray, self._background, self.alpha)
+                _, mask = cv2.threshold(diff, self.threshold, 255, cv2.THRESH_BINARY)
+                moments = cv2.moments(mask, binaryImage=True)
+                if moments['m00'] > 0:
+                    scale = width / small_size[0]
+                    center = (int(moments['m10'] / moments['m00'] * scale),
+                              int(moments['m01'] / moments['m00'] * scale))
+                    result = MotionResult(moments['m00'] / mask.size, center)
+                else:
+                    result = NO_MOTION
+
+            self._last_seq = seq
+            self._last_result = result
+            return result
+
+    def task(self, frame: FrameHandle, param=None) -> MotionResult:
+        """视觉线程的运动检测处理函数"""
+        return self.process(frame.image, frame.seq)
+
+
+# 全局实例
+motion_detector = MotionDetector()
+vision_controller.worker.register_task('motion', motion_detector.task)
+
+
+def _read() -> MotionResult:
+    _, result = vision_controller.worker.read('motion')
+    return result if result is not None else NO_MOTION
+
+
+# 便捷函数
+def jiance_yundong(min_area: float = 1.0) -> bool:
+    """检测画面中是否有东西在动
+
+    第一次调用时开始检测（建立背景），小车静止时使用。
+
+    Args:
+        min_area: 运动区域至少占画面的百分比（0-100），默认1%
+
+    Returns:
+        bool: True表示检测到运动
+
+    示例:
+        >>> while not jiance_yundong():
+        ...     dengdai_xinzhen()
+        >>> qianjin(50)
+    """
+    area = _read().area
+    return area > 0 and area * 100 >= float(min_area)
+
+
+def yundong_mianji() -> float:
+    """运动区域占画面的百分比（0-100）"""
+    return round(_read().area * 100, 1)
+
+
+def yundong_weizhi() -> Optional[Tuple[int, int]]:
+    """运动区域的重心位置
+
+    Returns:
+        Optional[Tuple[int, int]]: (x, y)坐标，没有运动时返回None
+    """
+    return _read().center
@@ -0,0 +1,269 @@
+"""
+硬件抽象层 - 二维码识别
+
+在独立线程中识别相机画面里的二维码，积木函数只读取缓存的最近结果，不会被zbar阻塞：
+- 只在有积木调用（租约有效）时工作，停止调用后自动停下
+- 每秒最多识别 QR_RATE 次，在灰度图上识别，画面宽度超过 QR_DECODE_WIDTH 时先缩小
+- 识别成功后只在二维码所在区域（向外扩展一圈）内识别，连续失败几次后回到整个画面
+- 最近一次识别结果带时间戳缓存，超过 RESULT_TTL 没有再识别到时视为画面中没有二维码
+- pyzbar 在识别线程第一次运行时才导入：没有安装时只有二维码积木不可用（返回None，
+  get_status() 报告错误），不影响其他硬件功能
+
+识别方式参考 TurboPi/Functions/QuickMark.run（每帧在主循环中对全分辨率画面同步识别）。
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Callable, NamedTuple, Optional
+
+from core.frame import FrameHandle
+from core.results import SubscriptionSet
+from core.roi import Rect, RoiTracker
+
+from .vision_controller import vision_controller
+
+# 配置日志
+logger = logging.getLogger(__name__)
+
+# 导入视觉SDK - 必须成功，否则服务无法运行（pyzbar 在第一次识别时才导入）
+try:
+    import cv2
+except Exception as e:
+    logger.error(f"二维码识别模块加载失败: {e}")
+    raise RuntimeError(f"二维码识别模块加载失败: {e}") from e
+
+
+# 每秒最多识别次数
+QR_RATE = float(os.getenv('QR_RATE', '5'))
+# 识别前把画面缩小到的最大宽度（像素）
+QR_DECODE_WIDTH = int(os.getenv('QR_DECODE_WIDTH', '320'))
+
+
+class QrResult(NamedTuple):
+    """一次识别结果"""
+    data: str
+    rect: Rect          # 二维码在整个画面中的位置 (x, y, 宽, 高)
+    seq: int            # 帧序号
+    timestamp: float    # 帧的采集时刻（time.monotonic()）
+
+
+_zbar = None
+
+
+def load_zbar():
+    """导入 pyzbar（只导入一次），返回 (decode, ZBarSymbol)
+
+    Raises:
+        ImportError: 没有安装 pyzbar 或 libzbar
+    """
+    global _zbar
+    if _zbar is None:
+        from pyzbar.pyzbar import ZBarSymbol, decode
+        _zbar = (decode, ZBarSymbol)
+    return _zbar
+
+
+def decode_qr(image, region: Rect, max_width: int = QR_DECODE_WIDTH) -> Optional[QrResult]:
+    """在画面的指定区域内识别二维码
+
+    Args:
+        image: BGR 图像
+        region: 识别区域 (x, y, 宽, 高)
+        max_width: 区域宽度超过该值时先等比缩小
+
+    Returns:
+        Optional[QrResult]: 第一个二维码（seq/timestamp 为0），没有时返回None
+    """
+    x0, y0, w, h = region
+    gray = cv2.cvtColor(image[y0:y0 + h, x0:x0 + w], cv2.COLOR_BGR2GRAY)
+    scale = 1.0
+    if w > max_width:
+        scale = max_width / w
+        gray = cv2.resize(gray, (max_width, max(1, round(h * scale))), interpolation=cv2.INTER_AREA)
+
+    decode, ZBarSymbol = load_zbar()
+    codes = decode(gray, symbols=[ZBarSymbol.QRCODE])
+    if not codes:
+        return None
+    code = codes[0]
+    left, top, width, height = code.rect
+    rect = (x0 + int(left / scale), y0 + int(top / scale),
+            int(round(width / scale)), int(round(height / scale)))
+    return QrResult(code.data.decode('utf-8', errors='replace'), rect, 0, 0.0)
+
+
+class QrReader:
+    """后台二维码识别"""
+
+    # 积木调用的租约有效期（秒）
+    LEASE_TTL = 2.0
+    # 识别结果的有效期（秒）
+    RESULT_TTL = 1.0
+    # 等待新帧的超时（秒）
+    FRAME_TIMEOUT = 0.2
+
+    def __init__(self, vision, rate: float = QR_RATE, max_width: int = QR_DECODE_WIDTH,
+                 decoder: Callable = decode_qr, loader: Callable = load_zbar):
+        """
+        Args:
+            decoder: (图像, 区域, 最大宽度) -> Optional[QrResult]
+            loader: 识别线程开始时调用一次，导入识别库（失败时记录错误，不再重试）
+        """
+        self._vision = vision
+        self.interval = 1.0 / max(0.1, rate)
+        self.max_width = max_width
+        self._decoder = decoder
+        self._loader = loader
+        self.error: Optional[str] = None
+        self._roi = RoiTracker(margin=0.5, max_misses=3)
+        self._subs = SubscriptionSet(on_change=self._wakeup)
+
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._result: Optional[QrResult] = None
+
+        # 统计
+        self.decodes = 0
+        self.roi_decodes = 0
+        self.found = 0
+        self.decode_time = 0.0
+
+    # ===== 积木读取 =====
+
+    def read(self) -> Optional[QrResult]:
+        """读取最近的识别结果（续期租约，不等待识别）
+
+        Returns:
+            Optional[QrResult]: RESULT_TTL 内识别到的最近一个二维码，没有时返回None
+        """
+        if self.error is not None:
+            return None
+        if self._subs.lease('qr', self.LEASE_TTL):
+            self._ensure_thread()
+        result = self._result
+        if result is None or time.monotonic() - result.timestamp > self.RESULT_TTL:
+            return None
+        return result
+
+    def shibie_erweima(self) -> Optional[str]:
+        """识别二维码，返回内容；没有识别到返回None"""
+        result = self.read()
+        return result.data if result is not None else None
+
+    # ===== 识别线程 =====
+
+    def _wakeup(self):
+        with self._cond:
+            self._cond.notify_all()
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run,
+                daemon=True,
+                name="QrReader"
+            )
+            self._thread.start()
+
+    def _run(self):
+        # 识别库只尝试导入一次：失败时积木返回None，状态中报告错误
+        try:
+            self._loader()
+        except Exception as e:
+            self.error = str(e)
+            logger.error(f"二维码识别库加载失败，二维码积木不可用: {e}")
+            return
+
+        last_seq = 0
+        next_due = 0.0
+        while True:
+            self._subs.expire()
+            if not self._subs.active():
+                # 没有积木在读取：清除跟踪区域，等待新的租约
+                self._roi.reset()
+                with self._cond:
+                    self._cond.wait(self.FRAME_TIMEOUT * 5)
+                continue
+
+            # 限制识别频率：到时间后再取最新帧
+            delay = next_due - time.monotonic()
+            if delay > 0:
+                time.sleep(min(delay, self.FRAME_TIMEOUT))
+                continue
+            if not self._vision.wait_next_frame(last_seq, self.FRAME_TIMEOUT):
+                continue
+            frame = self._vision.get_frame()
+            if frame is None:
+                continue
+            last_seq = frame.seq
+            next_due = time.monotonic() + self.interval
+
+            try:
+                self.step(frame)
+            except Exception as e:
+                logger.error(f"二维码识别异常: {e}")
+
+    def step(self, frame: FrameHandle) -> Optional[QrResult]:
+        """识别一帧（在跟踪区域内，没有跟踪区域时在整个画面）"""
+        height, width = frame.image.shape[:2]
+        region = self._roi.region(width, height)
+        tracking = self._roi.tracking
+
+        t0 = time.perf_counter()
+        result = self._decoder(frame.image, region, self.max_width)
+        self.decode_time = time.perf_counter() - t0
+        self.decodes += 1
+        if tracking:
+            self.roi_decodes += 1
+
+        if result is None:
+            self._roi.miss()
+            return None
+
+        result = result._replace(seq=frame.seq, timestamp=frame.timestamp)
+        self._roi.hit(result.rect)
+        self._result = result
+        self.found += 1
+        return result
+
+    def get_status(self) -> dict:
+        """获取识别状态"""
+        result = self._result
+        return {
+            'running': self._thread is not None and self._thread.is_alive(),
+            'active': bool(self._subs.active()),
+            'error': self.error,
+            'tracking': self._roi.tracking,
+            'data': result.data if result is not None else None,
+            'age': round(time.monotonic() - result.timestamp, 2) if result is not None else None,
+            'decodes': self.decodes,
+            'roi_decodes': self.roi_decodes,
+            'found': self.found,
+            'decode_ms': round(self.decode_time * 1000, 2),
+        }
+
+
+# 全局实例
+qr_reader = QrReader(vision_controller)
+
+
+# 便捷函数
+def shibie_erweima() -> Optional[str]:
+    """识别二维码
+
+    立即返回后台识别的最近结果，不等待识别；第一次调用后识别才开始，
+    所以刚开始的几次调用可能返回None。
+
+    Returns:
+        Optional[str]: 二维码内容，画面中没有二维码（或没有安装识别库）时返回None
+
+    示例:
+        >>> while True:
+        ...     dengdai_xinzhen()
+        ...     neirong = shibie_erweima()
+        ...     if neirong == '1':
+        ...         qianjin(50)
+    """
+    return qr_reader.shibie_erweima()
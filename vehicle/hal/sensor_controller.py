@@ -9,6 +9,8 @@ import os
 import sys
 from typing import List
 
+from core.trace import hal_trace
+
 # 配置日志
 logger = logging.getLogger(__name__)
 
@@ -30,6 +32,12 @@ except Exception as e:
     raise RuntimeError(f"硬件传感器SDK加载失败: {e}") from e
 
 
+# 跟踪操作码
+_OP_HESHENGBO = hal_trace.register_op('heshengbo', ('distance',))
+_OP_XUNXIAN = hal_trace.register_op('xunxian', ('bits',))
+_OP_DIANCHI = hal_trace.register_op('dianchi', ('voltage',))
+
+
 class SensorController:
     """传感器控制器"""
 
@@ -47,7 +55,8 @@ class SensorController:
             int: 距离值，单位毫米，范围0-5000
         """
         distance = self.sonar.getDistance()
-        logger.debug(f"超声波距离: {distance}mm")
+        hal_trace.record(_OP_HESHENGBO, distance)
+        logger.debug("超声波距离: %smm", distance)
         return distance
 
     def heshengbo_juli(self) -> float:
@@ -69,7 +78,7 @@ class SensorController:
         """
         current = self.heshengbo()
         result = current < distance
-        logger.debug(f"超声波检测: 当前{current}mm < 阈值{distance}mm = {result}")
+        logger.debug("超声波检测: 当前%smm < 阈值%smm = %s", current, distance, result)
         return result
 
     # ===== 巡线传感器 =====
@@ -82,7 +91,8 @@ class SensorController:
                         [左1, 左2, 右2, 右1]
         """
         states = self.infrared.readData()
-        logger.debug(f"巡线传感器: {states}")
+        hal_trace.record(_OP_XUNXIAN, states[0] | states[1] << 1 | states[2] << 2 | states[3] << 3)
+        logger.debug("巡线传感器: %s", states)
         return states
 
     def xunxian_zhong(self) -> bool:
@@ -143,7 +153,8 @@ class SensorController:
         adc = Board.getBattery()
         # 转换为电压（V）
         voltage = adc / 1000.0
-        logger.debug(f"电池电压: {voltage}V")
+        hal_trace.record(_OP_DIANCHI, voltage)
+        logger.debug("电池电压: %sV", voltage)
         return voltage
 
     def dianchi_dian(self) -> bool:
@@ -0,0 +1,272 @@
+"""
+硬件抽象层 - 轨迹控制器
+
+把 zhuan_jiaodu / zou_juli / hu_xing 规划成带加减速斜坡的电机指令序列，
+由后台调度线程按时间执行：
+- 调用立即返回完成句柄，多次调用按顺序排队执行
+- 斜坡期间每个节拍（默认5ms）更新一次电机指令，指令不变时不写电机
+- 结束时刻先粗睡眠、最后几毫秒自旋等待，保证停止时刻误差小于10ms
+- tingzhi() 会取消正在执行和排队中的轨迹
+- 与其他运动积木一样限制参数而不报错：速度取绝对值并限制在 1 到最大速度之间，
+  角度/距离为0时返回已完成的句柄
+"""
+
+import collections
+import logging
+import threading
+import time
+from typing import Optional
+
+from core.handle import CompletionHandle, CANCELLED, DONE
+from core.trace import hal_trace
+from core.trajectory import MotionModel, Trajectory, rotate, straight, arc
+
+from .motion_controller import motion_controller
+
+# 配置日志
+logger = logging.getLogger(__name__)
+
+# 跟踪操作码
+_OP_ZHUAN_JIAODU = hal_trace.register_op('zhuan_jiaodu', ('degrees', 'speed'))
+_OP_ZOU_JULI = hal_trace.register_op('zou_juli', ('cm', 'speed'))
+_OP_HU_XING = hal_trace.register_op('hu_xing', ('radius', 'degrees', 'speed'))
+_OP_TRAJ_DONE = hal_trace.register_op('trajectory_done', ('duration', 'error_ms'))
+
+
+class TrajectoryController:
+    """轨迹控制器（后台调度）"""
+
+    # 斜坡更新节拍（秒）
+    TICK = 0.005
+    # 截止时刻前改为自旋等待的时间（秒）
+    SPIN_WINDOW = 0.002
+
+    def __init__(self, motion, model: Optional[MotionModel] = None):
+        self._motion = motion
+        # 速度模型优先使用电机标定文件中的 model 段，缺省时取环境变量
+        self.model = model or MotionModel(**{
+            k: v for k, v in motion.calibration.model.items()
+            if k in ('cm_per_unit', 'deg_per_unit', 'accel_units')
+        })
+
+        self._queue = collections.deque()
+        self._cond = threading.Condition()
+        self._wake = threading.Event()
+        self._current: Optional[CompletionHandle] = None
+        self._idle = threading.Event()
+        self._idle.set()
+        self._thread: Optional[threading.Thread] = None
+
+        # 时间精度统计（结束时刻相对计划的偏差）
+        self.completed = 0
+        self.max_error = 0.0
+
+        # tingzhi() 时取消所有轨迹
+        motion.add_stop_listener(self.cancel_all)
+
+    # ===== 提交 =====
+
+    def submit(self, trajectory: Trajectory) -> CompletionHandle:
+        """提交轨迹，立即返回完成句柄"""
+        handle = CompletionHandle(trajectory.name, on_cancel=self._on_cancel)
+        with self._cond:
+            self._queue.append((trajectory, handle))
+            self._ensure_thread()
+            self._cond.notify()
+        return handle
+
+    def _clamp_speed(self, speed) -> int:
+        """速度取绝对值，限制在 1 到最大速度之间（0 或负数不会让轨迹规划报错）"""
+        return max(1, min(self._motion.max_speed, abs(int(speed))))
+
+    @staticmethod
+    def _completed(name: str) -> CompletionHandle:
+        """不需要运动的调用（角度或距离为0）：返回已完成的句柄"""
+        handle = CompletionHandle(name)
+        handle._finish(DONE)
+        return handle
+
+    def zhuan_jiaodu(self, degrees: float, speed: int = 50) -> CompletionHandle:
+        """原地旋转指定角度（正数右转，负数左转）"""
+        degrees = float(degrees)
+        speed = self._clamp_speed(speed)
+        hal_trace.record(_OP_ZHUAN_JIAODU, degrees, speed)
+        if degrees == 0:
+            return self._completed('zhuan_jiaodu')
+        return self.submit(rotate(self.model, degrees, speed))
+
+    def zou_juli(self, cm: float, speed: int = 50) -> CompletionHandle:
+        """直线行驶指定距离（正数前进，负数后退）"""
+        cm = float(cm)
+        speed = self._clamp_speed(speed)
+        hal_trace.record(_OP_ZOU_JULI, cm, speed)
+        if cm == 0:
+            return self._completed('zou_juli')
+        return self.submit(straight(self.model, cm, speed))
+
+    def hu_xing(self, radius: float, degrees: float, speed: int = 50) -> CompletionHandle:
+        """沿圆弧行驶（degrees 正数向右弯，负数向左弯；半径为0时原地旋转）"""
+        radius = abs(float(radius))
+        degrees = float(degrees)
+        speed = self._clamp_speed(speed)
+        hal_trace.record(_OP_HU_XING, radius, degrees, speed)
+        if degrees == 0:
+            return self._completed('hu_xing')
+        if radius == 0:
+            return self.submit(rotate(self.model, degrees, speed))
+        # 外侧轮子不超过最大速度（半径小时整体降速，保持圆弧形状和时间）
+        return self.submit(arc(self.model, radius, degrees, speed, max_wheel=self._motion.max_speed))
+
+    # ===== 取消 =====
+
+    def cancel_all(self) -> None:
+        """取消正在执行和排队中的所有轨迹"""
+        with self._cond:
+            pending = list(self._queue)
+            self._queue.clear()
+            current = self._current
+        for _, handle in pending:
+            handle._finish(CANCELLED)
+        if current is not None:
+            current._finish(CANCELLED)
+            self._wake.set()
+            # 等待调度线程退出当前轨迹，避免之后再写电机
+            self._idle.wait(0.1)
+
+    def _on_cancel(self, handle: CompletionHandle) -> None:
+        """单个句柄被取消"""
+        with self._cond:
+            for item in list(self._queue):
+                if item[1] is handle:
+                    self._queue.remove(item)
+            is_current = handle is self._current
+        if is_current:
+            self._wake.set()
+
+    # ===== 调度线程 =====
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._scheduler_loop,
+                daemon=True,
+                name="TrajectoryScheduler"
+            )
+            self._thread.start()
+
+    def _scheduler_loop(self):
+        """按顺序执行排队的轨迹"""
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                trajectory, handle = self._queue.popleft()
+                self._current = handle
+                self._idle.clear()
+                self._wake.clear()
+            try:
+                if not handle.done():
+                    self._execute(trajectory, handle)
+            except Exception as e:
+                logger.error(f"轨迹执行异常: {e}")
+                hal_trace.dump_to_log(logger)
+                self._motion.drive(0, 0)
+                handle._finish(CANCELLED)
+            finally:
+                with self._cond:
+                    self._current = None
+                self._idle.set()
+
+    def _execute(self, trajectory: Trajectory, handle: CompletionHandle):
+        """执行单条轨迹"""
+        handle._start()
+        start = time.perf_counter()
+        end = start + trajectory.duration
+        last_command = None
+
+        while not handle.done():
+            now = time.perf_counter()
+            if now >= end:
+                break
+            forward, turn = trajectory.command(now - start)
+            command = (round(forward), round(turn))
+            if command != last_command:
+                self._motion.drive(*command)
+                last_command = command
+            self._sleep_until(min(now + self.TICK, end))
+
+        if handle.done():
+            # 被取消：停车由 tingzhi() 或取消方负责，这里补一次保证安全
+            self._motion.drive(0, 0)
+            return
+
+        self._motion.drive(0, 0)
+        error = time.perf_counter() - end
+        self.completed += 1
+        self.max_error = max(self.max_error, error)
+        hal_trace.record(_OP_TRAJ_DONE, trajectory.duration, error * 1000)
+        handle._finish(DONE)
+
+    def _sleep_until(self, deadline: float):
+        """睡眠到指定时刻：先用可中断的等待，最后一小段自旋"""
+        remaining = deadline - time.perf_counter()
+        if remaining > self.SPIN_WINDOW:
+            if self._wake.wait(remaining - self.SPIN_WINDOW):
+                return
+        while time.perf_counter() < deadline:
+            time.sleep(0)
+
+    def get_status(self) -> dict:
+        """获取轨迹调度状态"""
+        return {
+            'busy': not self._idle.is_set(),
+            'queued': len(self._queue),
+            'completed': self.completed,
+            'max_error_ms': round(self.max_error * 1000, 2),
+            'model': self.model.to_dict(),
+        }
+
+
+# 全局实例
+trajectory_controller = TrajectoryController(motion_controller)
+
+
+# 便捷函数
+def zhuan_jiaodu(degrees: float, speed: int = 50) -> CompletionHandle:
+    """原地旋转指定角度
+
+    Args:
+        degrees: 角度，正数右转（顺时针），负数左转；0 时立即完成
+        speed: 最大速度 (1-100)
+
+    Returns:
+        CompletionHandle: 完成句柄，h.wait() 等待转完
+    """
+    return trajectory_controller.zhuan_jiaodu(degrees, speed)
+
+
+def zou_juli(cm: float, speed: int = 50) -> CompletionHandle:
+    """直线行驶指定距离
+
+    Args:
+        cm: 距离（厘米），正数前进，负数后退；0 时立即完成
+        speed: 最大速度 (1-100)
+
+    Returns:
+        CompletionHandle: 完成句柄
+    """
+    return trajectory_controller.zou_juli(cm, speed)
+
+
+def hu_xing(radius: float, degrees: float, speed: int = 50) -> CompletionHandle:
+    """沿圆弧行驶
+
+    Args:
+        radius: 圆弧半径（厘米），0 时原地旋转
+        degrees: 转过的角度，正数向右弯，负数向左弯；0 时立即完成
+        speed: 最大速度 (1-100)
+
+    Returns:
+        CompletionHandle: 完成句柄
+    """
+    return trajectory_controller.hu_xing(radius, degrees, speed)
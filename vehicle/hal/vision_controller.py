@@ -5,8 +5,12 @@
 
 使用帧缓冲池架构：
 - 后台线程持续读取摄像头帧
-- 主线程从缓冲区获取最新帧
+- 每帧以只读的 FrameHandle 发布，读取方直接共享同一帧，不复制
+- 后台视觉线程按订阅处理每一帧，识别函数读取结果板上的最新结果
 - 避免多线程直接访问摄像头资源
+- 摄像头断开后由 CameraSupervisor 按退避时间自动重连，不需要重启服务
+- 可选鱼眼畸变矫正：整个画面矫正（CAMERA_UNDISTORT），或由调用方只矫正需要的区域
+  （undistort_roi）；矫正映射表缓存在磁盘上，不在启动时重新计算
 """
 
 import logging
@@ -14,7 +18,11 @@ import os
 import sys
 import threading
 import time
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Tuple
+
+from core.frame import CaptureMetrics, FrameHandle, FrameSlot
+
+from .vision_worker import VisionWorker
 
 # 配置日志
 logger = logging.getLogger(__name__)
@@ -29,31 +37,44 @@ if os.path.exists(TURBOPI_PATH):
 try:
     import cv2
     import numpy as np
+    import HiwonderSDK.Blob as Blob
+    import HiwonderSDK.ColorModel as ColorModel
+    import HiwonderSDK.Undistort as Undistort
+    from .camera_supervisor import CameraSupervisor
     logger.info("视觉硬件SDK加载成功")
 except Exception as e:
     logger.error(f"视觉硬件SDK加载失败: {e}")
     raise RuntimeError(f"视觉硬件SDK加载失败: {e}") from e
 
 
-# 颜色定义（HSV范围）
-# 格式: (颜色名, (H_min, S_min, V_min), (H_max, S_max, V_max))
-COLOR_RANGES = {
-    'hong': (  # 红色（特殊处理，跨越0°）
-        {'lower1': (0, 100, 100), 'upper1': (10, 255, 255),
-         'lower2': (170, 100, 100), 'upper2': (180, 255, 255)}
-    ),
-    'lv': (  # 绿色
-        (35, 100, 100), (85, 255, 255)
-    ),
-    'lan': (  # 蓝色
-        (100, 100, 100), (130, 255, 255)
-    ),
-    'huang': (  # 黄色
-        (20, 100, 100), (35, 255, 255)
-    ),
-    'cheng': (  # 橙色
-        (10, 100, 100), (25, 255, 255)
-    ),
+# 采集格式（MJPG 占用USB带宽小，YUYV 无需解码；留空使用驱动默认格式）
+CAMERA_FORMAT = os.getenv('CAMERA_FORMAT', '').strip().upper()
+CAMERA_FORMATS = ('MJPG', 'YUYV')
+
+# 是否打开摄像头（关闭时为离线模式：帧由 inject_frame() 送入，用于基准测试和回放）
+CAMERA_ENABLED = os.getenv('CAMERA_ENABLED', 'true').lower() != 'false'
+
+# 是否对整个画面做鱼眼畸变矫正（发布前矫正，所有识别功能都使用矫正后的画面）
+CAMERA_UNDISTORT = os.getenv('CAMERA_UNDISTORT', 'false').lower() == 'true'
+
+# 摄像头标定参数（TurboPi/CameraCalibration 标定程序生成）
+CALIBRATION_PATH = os.getenv('CALIBRATION_PATH',
+                             os.path.join(TURBOPI_PATH, 'CameraCalibration', 'calibration_param.npz'))
+
+
+# 颜色模型：阈值来自 TurboPi 的 lab_config.yaml（与 lab_adjust 调色共用），
+# 编译为LAB三通道位查找表，文件修改后自动重新加载
+color_model = ColorModel.ColorModel(os.path.join(TURBOPI_PATH, 'lab_config.yaml'))
+
+# 积木颜色名 -> lab_config.yaml 中的颜色名
+COLOR_ALIASES = {
+    'hong': 'red',
+    'lv': 'green',
+    'lan': 'blue',
+    'huang': 'yellow',
+    'cheng': 'orange',
+    'hei': 'black',
+    'bai': 'white',
 }
 
 # 颜色中文名映射
@@ -63,8 +84,23 @@ COLOR_NAMES_CN = {
     'lan': '蓝色',
     'huang': '黄色',
     'cheng': '橙色',
+    'hei': '黑色',
+    'bai': '白色',
 }
 
+MORPH_KERNEL = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
+
+
+def resolve_color(color_name: str) -> Optional[str]:
+    """积木颜色名（也接受 lab_config.yaml 中的原名）转换为颜色模型中的名称，未知颜色返回None"""
+    name = COLOR_ALIASES.get(color_name, color_name)
+    return name if name in color_model else None
+
+
+def available_colors() -> List[str]:
+    """颜色模型中已配置的积木颜色名"""
+    return [alias for alias, name in COLOR_ALIASES.items() if name in color_model]
+
 
 class VisionController:
     """视觉控制器 - 颜色识别
@@ -76,38 +112,69 @@ class VisionController:
     # 检测阈值
     MIN_CONTOUR_AREA = 500  # 最小轮廓面积
 
-    def __init__(self):
-        # 尝试打开摄像头，支持多个索引（因为有些系统摄像头是 /dev/video1）
-        self.camera = None
-        for idx in range(3):  # 尝试索引 0, 1, 2
-            cap = cv2.VideoCapture(idx)
-            if cap.isOpened():
-                self.camera = cap
-                logger.info(f"成功打开摄像头: index={idx}")
-                break
-            cap.release()
-
-        if self.camera is None:
-            raise RuntimeError("无法打开摄像头（尝试了索引 0-2）")
-
-        # 设置分辨率
-        self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, 320)
-        self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, 240)
-
-        # 帧缓冲池（线程安全）
-        self._frame_lock = threading.Lock()
-        self._current_frame = None
-        self._frame_count = 0
+    def __init__(self, open_camera: bool = True, undistort: bool = False):
+        """
+        Args:
+            open_camera: 是否打开摄像头；False 为离线模式，帧由 inject_frame() 送入
+            undistort: 是否在发布前矫正整个画面的鱼眼畸变
+        """
+        # 畸变矫正映射表（按画面尺寸，第一次使用时从磁盘缓存加载）
+        self.undistort = undistort
+        self._undistort_lock = threading.Lock()
+        self._undistort_maps: Dict[Tuple[int, int], Optional['Undistort.UndistortMaps']] = {}
+
+        # 摄像头监管：并行探测索引 0-2（有些系统摄像头是 /dev/video1），断线后自动重连
+        self.supervisor = CameraSupervisor(indices=(0, 1, 2), configure=self._configure_camera)
+        if open_camera and not self.supervisor.connect():
+            # 不阻止服务启动：后台读取线程会按退避时间继续尝试
+            logger.error(f"{self.supervisor.last_error}，将在后台自动重试")
+
+        # 帧缓冲池：最新帧通过引用替换发布，读取不需要加锁
+        self._frames = FrameSlot()
+        self._frame_cond = threading.Condition()
+        self.metrics = CaptureMetrics(self.supervisor.get_fps())
+
+        # 后台视觉处理：每帧为所有订阅计算一次，结果发布到结果板
+        self.worker = VisionWorker(self)
+        self.worker.register_task('color', self._color_task)
+
+        # 单帧分析缓存：同一帧的颜色位图、各颜色掩码和检测结果只计算一次，
+        # 新帧到来前重复调用直接返回缓存结果
+        self._analysis_lock = threading.Lock()
+        self._analysis_id = -1
+        self._analysis_model = None
+        self._analysis_bits = None
+        self._analysis_masks = {}
+        self._analysis_results = {}
 
         # 后台读取线程控制
         self._running = False
         self._read_thread = None
 
+        if not open_camera:
+            logger.info("视觉控制器以离线模式启动（不打开摄像头）")
+            return
+
         # 启动后台读取线程
         self._start_background_reader()
 
         logger.info("摄像头初始化成功（帧缓冲池模式）")
 
+    @staticmethod
+    def _configure_camera(camera):
+        """设置采集参数：格式、分辨率、最小驱动缓冲（每次打开设备后调用）"""
+        if CAMERA_FORMAT in CAMERA_FORMATS:
+            camera.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*CAMERA_FORMAT))
+        elif CAMERA_FORMAT:
+            logger.warning(f"不支持的采集格式: {CAMERA_FORMAT}，使用驱动默认格式")
+
+        # 设置分辨率
+        camera.set(cv2.CAP_PROP_FRAME_WIDTH, 320)
+        camera.set(cv2.CAP_PROP_FRAME_HEIGHT, 240)
+
+        # 驱动缓冲只保留1帧，read() 拿到的总是最新画面而不是几帧之前的
+        camera.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
     def _start_background_reader(self):
         """启动后台读取线程"""
         if self._running:
@@ -123,142 +190,252 @@ class VisionController:
         logger.info("后台摄像头读取线程已启动")
 
     def _background_read_loop(self):
-        """后台读取循环（在独立线程中运行）"""
-        consecutive_failures = 0
-        max_failures = 10
+        """后台读取循环（在独立线程中运行）
 
+        设备断开后不退出：清空最新帧（积木函数返回未检测到），由摄像头监管按退避时间重连。
+        任何意外异常只记录日志并稍后继续，读取线程不会因此永久退出。
+        """
         while self._running:
             try:
-                ret, frame = self.camera.read()
-
-                if ret and frame is not None:
-                    # 成功读取帧，更新缓冲区
-                    with self._frame_lock:
-                        self._current_frame = frame
-                        self._frame_count += 1
-                    consecutive_failures = 0
-
-                    # 控制帧率，避免过度占用CPU
-                    time.sleep(0.03)  # 约30fps
+                if not self.supervisor.connected:
+                    self._frames.clear()
+                    self.supervisor.reconnect()
+                    continue
+
+                # read() 阻塞到相机送出下一帧，循环节奏由相机帧率决定
+                t0 = time.monotonic()
+                ret, frame = self.supervisor.read()
+                timestamp = time.monotonic()
+
+                if ret:
+                    # 成功读取帧，发布为只读帧句柄
+                    self._publish(frame, timestamp)
+                    self.metrics.record(timestamp, timestamp - t0)
                 else:
-                    consecutive_failures += 1
-                    if consecutive_failures >= max_failures:
-                        logger.error(f"摄像头连续读取失败 {consecutive_failures} 次，停止后台读取")
-                        break
+                    self.metrics.record_failure()
                     time.sleep(0.1)
-
             except Exception as e:
-                logger.error(f"后台读取摄像头异常: {e}")
-                consecutive_failures += 1
-                if consecutive_failures >= max_failures:
-                    logger.error("达到最大失败次数，停止后台读取")
-                    break
+                logger.error(f"摄像头读取线程异常: {e}")
                 time.sleep(0.5)
 
         logger.info("后台摄像头读取线程已停止")
 
-    def _read_frame(self) -> bool:
-        """从帧缓冲区获取最新图像
+    def _publish(self, image: np.ndarray, timestamp: Optional[float]) -> FrameHandle:
+        """发布一帧（开启整个画面矫正时先矫正）并唤醒等待新帧的线程"""
+        if self.undistort:
+            maps = self.get_undistort_maps((image.shape[1], image.shape[0]))
+            if maps is not None:
+                image = maps.remap(image)
+        frame = self._frames.publish(image, timestamp)
+        with self._frame_cond:
+            self._frame_cond.notify_all()
+        return frame
+
+    def inject_frame(self, image: np.ndarray, timestamp: Optional[float] = None) -> FrameHandle:
+        """离线模式下送入一帧（基准测试、录像回放），与相机读取线程的发布方式相同"""
+        return self._publish(image, timestamp)
+
+    def get_undistort_maps(self, size: Tuple[int, int]) -> Optional['Undistort.UndistortMaps']:
+        """某个画面尺寸 (宽, 高) 的矫正映射表，没有标定参数时返回None（只报告一次错误）"""
+        maps = self._undistort_maps.get(size, False)
+        if maps is not False:
+            return maps
+        with self._undistort_lock:
+            if size not in self._undistort_maps:
+                try:
+                    maps = Undistort.UndistortMaps(CALIBRATION_PATH, size)
+                    logger.info(f"畸变矫正映射表已{'从缓存加载' if maps.cached else '计算并缓存'}: "
+                                f"{size[0]}x{size[1]}")
+                except Exception as e:
+                    maps = None
+                    logger.error(f"畸变矫正映射表加载失败: {e}")
+                self._undistort_maps[size] = maps
+            return self._undistort_maps[size]
+
+    def undistort_roi(self, frame: FrameHandle, roi: Tuple[int, int, int, int]) -> Optional[np.ndarray]:
+        """只矫正画面中的一个区域（不矫正整个画面时，需要矫正坐标的功能只处理自己的区域）
+
+        Args:
+            frame: 帧句柄
+            roi: 矫正后画面中的区域 (x, y, 宽, 高)
+
+        Returns:
+            Optional[np.ndarray]: 该区域的矫正图像；已开启整个画面矫正时直接裁剪；
+            没有标定参数时返回None
+        """
+        x, y, w, h = roi
+        if self.undistort:
+            return frame.image[max(0, y):max(0, y + h), max(0, x):max(0, x + w)]
+        maps = self.get_undistort_maps(frame.size)
+        return maps.remap_roi(frame.image, roi) if maps is not None else None
+
+    def get_frame(self) -> Optional[FrameHandle]:
+        """获取最新帧句柄（非阻塞，不复制）
 
         Returns:
-            bool: 是否成功获取
+            Optional[FrameHandle]: 包含帧序号和只读图像，还没有帧时返回None
         """
-        with self._frame_lock:
-            if self._current_frame is not None:
-                self.current_frame = self._current_frame.copy()
-                return True
-        return False
+        return self._frames.latest
 
     def get_latest_frame(self) -> Optional[np.ndarray]:
-        """获取最新帧（非阻塞）"""
-        with self._frame_lock:
-            if self._current_frame is not None:
-                return self._current_frame.copy()
-        return None
+        """获取最新帧图像（非阻塞，只读，需要修改时请先 copy()）"""
+        frame = self._frames.latest
+        return frame.image if frame is not None else None
 
     def get_frame_count(self) -> int:
         """获取已读取的帧数"""
-        with self._frame_lock:
-            return self._frame_count
+        return self._frames.seq
+
+    def wait_next_frame(self, last_id: Optional[int] = None, timeout: float = 1.0) -> bool:
+        """阻塞等待新的相机帧
+
+        Args:
+            last_id: 已处理的帧号，None表示以调用时的最新帧为准
+            timeout: 最长等待时间（秒）
+
+        Returns:
+            bool: 是否等到了新帧
+        """
+        with self._frame_cond:
+            if last_id is None:
+                last_id = self._frames.seq
+            return self._frame_cond.wait_for(lambda: self._frames.seq != last_id, timeout)
+
+    def get_metrics(self) -> dict:
+        """获取采集统计：实测帧率、丢帧数、读取失败数、最新帧的帧龄"""
+        data = self.metrics.to_dict(self._frames.latest)
+        data['running'] = self.is_background_running()
+        data['format'] = CAMERA_FORMAT or 'default'
+        data['undistort'] = self.undistort
+        data['health'] = self.supervisor.get_status()
+        return data
 
     def is_background_running(self) -> bool:
         """检查后台读取线程是否正在运行"""
         return self._running and self._read_thread is not None and self._read_thread.is_alive()
 
-    def _detect_color_in_frame(self, frame, color_name: str) -> Tuple[bool, Optional[Tuple[int, int, int]]]:
+    @staticmethod
+    def _classify(frame, model):
+        """LAB转换后查表，得到每个像素属于哪些颜色的位图"""
+        return color_model.classify(cv2.cvtColor(frame, cv2.COLOR_BGR2LAB), model)
+
+    @staticmethod
+    def _mask_from_bits(bits, model, color_name: str):
+        """从位图中取出指定颜色的掩码，并做形态学去噪"""
+        mask = color_model.mask(bits, resolve_color(color_name), model)
+        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, MORPH_KERNEL)
+        return cv2.morphologyEx(mask, cv2.MORPH_OPEN, MORPH_KERNEL)
+
+    def _color_mask(self, frame, frame_id: Optional[int], color_name: str):
+        """获取某一帧中指定颜色的掩码（按帧号缓存）
+
+        同一帧第一次调用时做一次LAB转换和查表，得到所有颜色的位图；
+        之后每种颜色只需按位取出并做形态学处理，结果也缓存到下一帧。
+        每个新帧检查一次 lab_config.yaml 是否被修改，同一帧始终使用同一版本的颜色模型。
+        frame_id 为None时不使用缓存。
+        """
+        if frame_id is None:
+            model = color_model.snapshot()
+            return self._mask_from_bits(self._classify(frame, model), model, color_name)
+
+        with self._analysis_lock:
+            if frame_id != self._analysis_id:
+                color_model.maybe_reload()
+                self._analysis_model = color_model.snapshot()
+                self._analysis_bits = self._classify(frame, self._analysis_model)
+                self._analysis_masks = {}
+                self._analysis_results = {}
+                self._analysis_id = frame_id
+
+            mask = self._analysis_masks.get(color_name)
+            if mask is None:
+                mask = self._mask_from_bits(self._analysis_bits, self._analysis_model, color_name)
+                self._analysis_masks[color_name] = mask
+            return mask
+
+    def _detect_color_in_frame(self, frame, color_name: str,
+                               frame_id: Optional[int] = None) -> Tuple[bool, Optional[Tuple[int, int, int]]]:
         """在图像帧中检测指定颜色
 
         Args:
             frame: OpenCV图像（BGR格式）
-            color_name: 颜色名称（'hong', 'lv', 'lan', 'huang', 'cheng'）
+            color_name: 颜色名称（'hong', 'lv', 'lan', 'huang', 'cheng', 'hei', 'bai'）
+            frame_id: 帧号，同一帧的LAB转换、掩码和检测结果会被复用；None表示不缓存
 
         Returns:
             Tuple[bool, Optional[Tuple[int, int, int]]]: (是否检测到, (x, y, area))
         """
-        if color_name not in COLOR_RANGES:
+        if resolve_color(color_name) is None:
             logger.warning(f"未知颜色: {color_name}")
             return False, None
 
-        # 转换为HSV颜色空间
-        hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-
-        # 获取颜色范围
-        color_range = COLOR_RANGES[color_name]
-
-        # 创建掩码
-        if color_name == 'hong':
-            # 红色特殊处理（两个范围）
-            mask1 = cv2.inRange(hsv, color_range['lower1'], color_range['upper1'])
-            mask2 = cv2.inRange(hsv, color_range['lower2'], color_range['upper2'])
-            mask = cv2.bitwise_or(mask1, mask2)
-        else:
-            mask = cv2.inRange(hsv, color_range[0], color_range[1])
-
-        # 形态学操作，去除噪声
-        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
-        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel)
-        mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel)
-
-        # 查找轮廓
-        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-        # 找到最大的轮廓
-        max_area = 0
-        max_contour = None
-        for contour in contours:
-            area = cv2.contourArea(contour)
-            if area > max_area:
-                max_area = area
-                max_contour = contour
-
-        if max_area > self.MIN_CONTOUR_AREA and max_contour is not None:
-            # 计算质心
-            M = cv2.moments(max_contour)
-            if M['m00'] > 0:
-                cx = int(M['m10'] / M['m00'])
-                cy = int(M['m01'] / M['m00'])
-                return True, (cx, cy, max_area)
-
+        key = (color_name, self.MIN_CONTOUR_AREA)
+        if frame_id is not None:
+            with self._analysis_lock:
+                if frame_id == self._analysis_id and key in self._analysis_results:
+                    return self._analysis_results[key]
+
+        result = self._find_blob(self._color_mask(frame, frame_id, color_name))
+
+        if frame_id is not None:
+            with self._analysis_lock:
+                if frame_id == self._analysis_id:
+                    self._analysis_results[key] = result
+        return result
+
+    def _find_blob(self, mask) -> Tuple[bool, Optional[Tuple[int, int, int]]]:
+        """在掩码中找到面积最大的色块（连通域统计，一次C层调用）"""
+        blob = Blob.largest_blob(mask)
+        if blob is not None and blob.area > self.MIN_CONTOUR_AREA:
+            return True, (int(blob.cx), int(blob.cy), blob.area)
         return False, None
 
+    def _color_task(self, frame: FrameHandle, color_name: str) -> Optional[Tuple[int, int, int]]:
+        """视觉线程的颜色处理函数：返回 (x, y, area)，未检测到返回None"""
+        _, result = self._detect_color_in_frame(frame.image, color_name, frame.seq)
+        return result
+
+    def _read_color(self, color_name: str) -> Optional[Tuple[int, int, int]]:
+        """从结果板读取颜色检测结果（自动订阅该颜色）"""
+        if resolve_color(color_name) is None:
+            logger.warning(f"未知颜色: {color_name}")
+            return None
+        seq, result = self.worker.read('color', color_name)
+        if seq == 0:
+            logger.warning("无法读取摄像头图像")
+        return result
+
     def shibieyanse(self, color_name: str) -> bool:
         """识别指定颜色
 
+        读取后台视觉线程发布的最新结果；第一次调用时自动订阅该颜色，
+        停止调用一段时间后订阅过期。
+
         Args:
-            color_name: 颜色名称（'hong', 'lv', 'lan', 'huang', 'cheng'）
+            color_name: 颜色名称（'hong', 'lv', 'lan', 'huang', 'cheng', 'hei', 'bai'）
 
         Returns:
             bool: True表示检测到该颜色
         """
-        cn_name = COLOR_NAMES_CN.get(color_name, color_name)
+        detected = self._read_color(color_name) is not None
+        logger.debug("颜色识别: %s -> %s", COLOR_NAMES_CN.get(color_name, color_name),
+                     '检测到' if detected else '未检测到')
+        return detected
 
-        if not self._read_frame():
-            logger.warning("无法读取摄像头图像")
-            return False
+    def shibieyanse_duo(self, color_names: Optional[List[str]] = None) -> Dict[str, Optional[Tuple[int, int, int]]]:
+        """一次识别多种颜色
 
-        detected, _ = self._detect_color_in_frame(self.current_frame, color_name)
-        logger.debug(f"颜色识别: {cn_name} -> {'检测到' if detected else '未检测到'}")
-        return detected
+        同一帧只做一次LAB转换和查表分类，再分别取出每种颜色的色块。
+
+        Args:
+            color_names: 颜色名称列表，None表示所有颜色
+
+        Returns:
+            dict: {颜色: (x, y, area)}，未检测到的颜色为None
+        """
+        if color_names is None:
+            color_names = available_colors()
+        return {name: self._read_color(name) for name in color_names}
 
     def get_color_position(self, color_name: str) -> Optional[Tuple[int, int]]:
         """获取指定颜色的位置
@@ -269,18 +446,16 @@ class VisionController:
         Returns:
             Optional[Tuple[int, int]]: (x, y)坐标，未检测到返回None
         """
-        if not self._read_frame():
-            return None
-
-        detected, result = self._detect_color_in_frame(self.current_frame, color_name)
-        if detected and result:
+        result = self._read_color(color_name)
+        if result:
             return (result[0], result[1])
         return None
 
     def release(self):
         """释放摄像头资源"""
-        # 停止后台读取线程
+        # 停止后台读取线程（同时中断正在等待的重连）
         self._running = False
+        self.supervisor.stop()
 
         # 等待后台线程结束（最多2秒）
         if self._read_thread and self._read_thread.is_alive():
@@ -289,19 +464,21 @@ class VisionController:
                 logger.warning("后台读取线程未能在超时时间内结束")
 
         # 释放摄像头
-        if self.camera is not None:
-            self.camera.release()
-            self.camera = None
-            logger.info("摄像头已释放")
+        self.supervisor.close()
 
         # 清空缓冲区
-        with self._frame_lock:
-            self._current_frame = None
-            self._frame_count = 0
+        self._frames.clear()
+        self.worker.board.clear()
+        with self._analysis_lock:
+            self._analysis_id = -1
+            self._analysis_model = None
+            self._analysis_bits = None
+            self._analysis_masks = {}
+            self._analysis_results = {}
 
 
 # 全局实例
-vision_controller = VisionController()
+vision_controller = VisionController(open_camera=CAMERA_ENABLED, undistort=CAMERA_UNDISTORT)
 
 
 # 便捷函数
@@ -322,6 +499,23 @@ def shibieyanse(color_name: str) -> bool:
     return vision_controller.shibieyanse(color_name)
 
 
+def shibieyanse_duo(color_names: Optional[List[str]] = None) -> Dict[str, Optional[Tuple[int, int, int]]]:
+    """一次识别多种颜色
+
+    Args:
+        color_names: 颜色名称列表，如 ['hong', 'lv', 'lan']，不填表示所有颜色
+
+    Returns:
+        dict: {颜色: (x, y, 面积)}，未检测到的颜色为None
+
+    示例:
+        >>> jieguo = shibieyanse_duo(['hong', 'lv'])
+        >>> if jieguo['hong']:
+        ...     print('检测到红色')
+    """
+    return vision_controller.shibieyanse_duo(color_names)
+
+
 def get_color_position(color_name: str) -> Optional[Tuple[int, int]]:
     """获取指定颜色的位置
 
@@ -334,6 +528,24 @@ def get_color_position(color_name: str) -> Optional[Tuple[int, int]]:
     return vision_controller.get_color_position(color_name)
 
 
+def dengdai_xinzhen(timeout: float = 1.0) -> bool:
+    """等待摄像头的下一帧（让循环按相机帧率运行，而不是空转）
+
+    Args:
+        timeout: 最长等待时间（秒），最多5秒
+
+    Returns:
+        bool: 是否等到了新帧
+
+    示例:
+        >>> while True:
+        ...     dengdai_xinzhen()
+        ...     if shibieyanse('hong'):
+        ...         break
+    """
+    return vision_controller.wait_next_frame(timeout=max(0.0, min(5.0, timeout)))
+
+
 def release():
     """释放摄像头资源"""
     vision_controller.release()
@@ -0,0 +1,180 @@
+"""
+硬件抽象层 - 后台视觉处理
+
+相机每送出一帧，视觉线程对所有活跃的订阅各处理一次，结果发布到结果板：
+- 订阅按键引用计数，例如 ('color', 'hong')；没有订阅时线程空闲，不做任何计算
+- 积木函数（如 shibieyanse）使用带有效期的租约：程序循环调用时自动续期，
+  停止调用后租约过期，对应的计算也随之停止
+- 处理函数按类型注册（颜色、二维码、视觉巡线等），参数为帧句柄和订阅参数
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+from core.frame import FrameHandle
+from core.results import ResultEntry, ResultsBoard, SubscriptionSet
+
+# 配置日志
+logger = logging.getLogger(__name__)
+
+# 处理函数：(帧句柄, 参数) -> 结果
+Task = Callable[[FrameHandle, Optional[Hashable]], object]
+
+
+class Subscription:
+    """订阅句柄，release() 或退出 with 块时取消"""
+
+    def __init__(self, worker: 'VisionWorker', key: Tuple):
+        self._worker = worker
+        self.key = key
+        self._released = False
+
+    def latest(self) -> Optional[ResultEntry]:
+        """最新结果"""
+        return self._worker.board.get(self.key)
+
+    def wait(self, after_seq: int = 0, timeout: float = 1.0) -> Optional[ResultEntry]:
+        """等待比 after_seq 更新的结果"""
+        return self._worker.board.wait(self.key, after_seq, timeout)
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._worker._release(self.key)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class VisionWorker:
+    """后台视觉处理线程"""
+
+    # 积木调用的租约有效期（秒）
+    LEASE_TTL = 2.0
+    # 等待新帧的超时（秒），超时后检查订阅和租约
+    FRAME_TIMEOUT = 0.2
+
+    def __init__(self, vision):
+        self._vision = vision
+        self.board = ResultsBoard()
+        self._tasks: Dict[str, Task] = {}
+        self._subs = SubscriptionSet(on_change=self._wakeup)
+
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+        # 统计
+        self.frames = 0
+        self.process_time = 0.0
+
+    # ===== 处理函数注册 =====
+
+    def register_task(self, kind: str, task: Task) -> None:
+        """注册一类处理函数，订阅键为 (kind, 参数)"""
+        self._tasks[kind] = task
+
+    # ===== 订阅 =====
+
+    def subscribe(self, kind: str, param: Optional[Hashable] = None) -> Subscription:
+        """订阅一类结果，返回订阅句柄"""
+        key = self._key(kind, param)
+        self._subs.acquire(key)
+        self._ensure_thread()
+        return Subscription(self, key)
+
+    def lease(self, kind: str, param: Optional[Hashable] = None) -> Tuple:
+        """获取或续期租约（积木函数每次调用时使用），返回订阅键"""
+        key = self._key(kind, param)
+        if self._subs.lease(key, self.LEASE_TTL):
+            self._ensure_thread()
+        return key
+
+    def _key(self, kind: str, param) -> Tuple:
+        if kind not in self._tasks:
+            raise ValueError(f"未知的视觉处理类型: {kind}")
+        return (kind, param)
+
+    def _release(self, key: Tuple) -> None:
+        if self._subs.release(key):
+            self.board.discard(key)
+
+    def _wakeup(self):
+        with self._cond:
+            self._cond.notify_all()
+
+    # ===== 读取 =====
+
+    def read(self, kind: str, param: Optional[Hashable] = None) -> Tuple[int, object]:
+        """读取最新帧的结果（积木函数使用）
+
+        续期租约；结果板上已有最新帧的结果时直接返回，
+        否则（刚开始订阅、或视觉线程还没处理到最新帧）在当前线程计算一次。
+
+        Returns:
+            (帧序号, 结果)，还没有相机帧时帧序号为0、结果为None
+        """
+        key = self.lease(kind, param)
+        frame = self._vision.get_frame()
+        if frame is None:
+            return 0, None
+        entry = self.board.get(key)
+        if entry is not None and entry.seq >= frame.seq:
+            return entry.seq, entry.value
+        return frame.seq, self._tasks[kind](frame, param)
+
+    # ===== 处理线程 =====
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run,
+                daemon=True,
+                name="VisionWorker"
+            )
+            self._thread.start()
+
+    def _run(self):
+        last_seq = self._vision.get_frame_count()
+        while True:
+            for key in self._subs.expire():
+                self.board.discard(key)
+            active = self._subs.active()
+            if not active:
+                # 没有订阅：等待新的订阅或租约
+                with self._cond:
+                    self._cond.wait(self.FRAME_TIMEOUT * 5)
+                continue
+
+            if not self._vision.wait_next_frame(last_seq, self.FRAME_TIMEOUT):
+                continue
+            frame = self._vision.get_frame()
+            if frame is None:
+                continue
+            last_seq = frame.seq
+
+            t0 = time.perf_counter()
+            for key in active:
+                kind, param = key
+                try:
+                    value = self._tasks[kind](frame, param)
+                except Exception as e:
+                    logger.error(f"视觉处理异常: {key}: {e}")
+                    continue
+                self.board.publish(key, frame.seq, frame.timestamp, value)
+            self.process_time = time.perf_counter() - t0
+            self.frames += 1
+
+    def get_status(self) -> dict:
+        """获取视觉处理状态"""
+        return {
+            'running': self._thread is not None and self._thread.is_alive(),
+            'active': sorted(f"{kind}:{param}" for kind, param in self._subs.active()),
+            'subscriptions': {f"{kind}:{param}": n for (kind, param), n in self._subs.counts().items()},
+            'frames': self.frames,
+            'process_ms': round(self.process_time * 1000, 2),
+        }
@@ -0,0 +1,116 @@
+"""
+视频流 - 快照规格协商
+
+快照请求可以带 max_width / quality / roi 字段；同时车载根据到网关的往返时间（RTT，
+由心跳测得）给出当前链路能承受的上限，实际规格取两者中较小的一个，
+链路变差时自动降低分辨率和质量，链路恢复后自动回升。
+"""
+
+import os
+import threading
+from typing import Optional, Tuple
+
+# 默认JPEG质量（1-100）
+JPEG_QUALITY = int(os.getenv('JPEG_QUALITY', '80'))
+
+# ROI：画面中的区域 (x, y, 宽, 高)，均为相对画面尺寸的比例（0-1）
+Roi = Tuple[float, float, float, float]
+
+# 链路档位：(RTT上限秒, 最大宽度, JPEG质量)，最大宽度None表示原始分辨率
+TIERS = (
+    (0.15, None, JPEG_QUALITY),
+    (0.40, 240, 65),
+    (1.00, 160, 50),
+    (float('inf'), 120, 40),
+)
+
+
+def clamp_quality(quality) -> int:
+    """JPEG质量限制在 10-95"""
+    return max(10, min(95, int(quality)))
+
+
+def normalize_roi(roi) -> Optional[Roi]:
+    """规范化ROI：裁剪到画面内并保留两位小数（便于缓存复用），整个画面返回None"""
+    if roi is None:
+        return None
+    x, y, w, h = (max(0.0, min(1.0, float(v))) for v in roi)
+    w = min(w, 1.0 - x)
+    h = min(h, 1.0 - y)
+    if w <= 0 or h <= 0:
+        raise ValueError(f"ROI为空: {roi}")
+    roi = (round(x, 2), round(y, 2), round(w, 2), round(h, 2))
+    return None if roi == (0.0, 0.0, 1.0, 1.0) else roi
+
+
+def parse_roi(value) -> Optional[Roi]:
+    """解析ROI：[x, y, w, h] 列表或 "x,y,w,h" 字符串，比例坐标"""
+    if value in (None, ''):
+        return None
+    if isinstance(value, str):
+        value = value.split(',')
+    if len(value) != 4:
+        raise ValueError(f"ROI格式错误: {value}")
+    return normalize_roi(value)
+
+
+class SnapshotPolicy:
+    """根据RTT选择快照规格"""
+
+    # RTT 指数平均系数
+    ALPHA = 0.3
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.rtt: Optional[float] = None
+
+    def record_rtt(self, rtt: float) -> None:
+        """记录一次往返时间（秒）"""
+        with self._lock:
+            self.rtt = rtt if self.rtt is None else (1 - self.ALPHA) * self.rtt + self.ALPHA * rtt
+
+    def limits(self) -> Tuple[Optional[int], int]:
+        """当前链路的 (最大宽度, 质量) 上限；还没有测得RTT时不限制"""
+        rtt = self.rtt
+        if rtt is None:
+            return TIERS[0][1], TIERS[0][2]
+        for limit, max_width, quality in TIERS:
+            if rtt < limit:
+                return max_width, quality
+        return TIERS[-1][1], TIERS[-1][2]
+
+    def resolve(self, options: Optional[dict] = None) -> dict:
+        """请求字段与链路上限合并，得到实际的快照规格
+
+        Args:
+            options: 请求中的 max_width / quality / roi / adaptive 字段
+
+        Returns:
+            dict: {'max_width', 'quality', 'roi'}，可直接传给 JpegCache.get_image()
+        """
+        options = options or {}
+        max_width = options.get('max_width')
+        max_width = max(16, int(max_width)) if max_width else None
+        quality = options.get('quality')
+        quality = clamp_quality(quality) if quality else None
+        roi = parse_roi(options.get('roi'))
+
+        if options.get('adaptive', True):
+            link_width, link_quality = self.limits()
+            if link_width is not None:
+                max_width = link_width if max_width is None else min(max_width, link_width)
+            quality = link_quality if quality is None else min(quality, link_quality)
+
+        return {'max_width': max_width, 'quality': quality, 'roi': roi}
+
+    def get_status(self) -> dict:
+        max_width, quality = self.limits()
+        return {
+            'rtt_ms': round(self.rtt * 1000, 1) if self.rtt is not None else None,
+            'max_width': max_width,
+            'quality': quality,
+        }
+
+
+# 全局实例
+snapshot_policy = SnapshotPolicy()
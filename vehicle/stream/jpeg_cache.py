@@ -0,0 +1,155 @@
+"""
+视频流 - JPEG编码缓存
+
+所有快照路径（HTTP /camera/snapshot、云端快照请求、视频流）共用同一份编码结果：
+按 (帧序号, 质量, 最大宽度, ROI) 缓存JPEG，同一帧同一规格的第一个请求编码，
+之后的请求直接复用。多个请求同时遇到同一规格时只有一个线程编码，其余线程等待它的结果。
+"""
+
+import collections
+import logging
+import threading
+import time
+from typing import NamedTuple, Optional, Tuple
+
+import cv2
+
+from core.frame import FrameHandle
+
+from .adaptive import JPEG_QUALITY, Roi, clamp_quality, normalize_roi
+
+# 配置日志
+logger = logging.getLogger(__name__)
+
+
+class JpegImage(NamedTuple):
+    """编码后的JPEG及其图像尺寸"""
+    data: bytes
+    width: int
+    height: int
+
+
+def render_variant(image, max_width: Optional[int] = None, roi: Optional[Roi] = None):
+    """按ROI裁剪、按最大宽度等比缩小（只缩小不放大）"""
+    if roi is not None:
+        height, width = image.shape[:2]
+        x0, y0 = int(roi[0] * width), int(roi[1] * height)
+        x1 = max(x0 + 1, int((roi[0] + roi[2]) * width))
+        y1 = max(y0 + 1, int((roi[1] + roi[3]) * height))
+        image = image[y0:y1, x0:x1]
+
+    height, width = image.shape[:2]
+    if max_width and width > max_width:
+        size = (max_width, max(1, round(height * max_width / width)))
+        image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+    return image
+
+
+class JpegCache:
+    """按 (帧序号, 质量, 最大宽度, ROI) 缓存的JPEG编码结果"""
+
+    # 等待其他线程编码的最长时间（秒），超时后自己编码
+    ENCODE_WAIT = 0.5
+
+    def __init__(self, capacity: int = 16):
+        self.capacity = capacity
+        self._entries: 'collections.OrderedDict[Tuple, JpegImage]' = collections.OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+
+        # 统计
+        self.hits = 0
+        self.misses = 0
+        self.encode_time = 0.0
+
+    def get(self, frame: FrameHandle, quality: Optional[int] = None) -> Optional[bytes]:
+        """获取整帧的JPEG字节，编码失败返回None"""
+        image = self.get_image(frame, quality)
+        return image.data if image is not None else None
+
+    def get_image(self, frame: FrameHandle, quality: Optional[int] = None,
+                  max_width: Optional[int] = None, roi: Optional[Roi] = None) -> Optional[JpegImage]:
+        """获取帧的某一规格的JPEG，编码失败返回None
+
+        Args:
+            frame: 帧句柄
+            quality: JPEG质量，默认 JPEG_QUALITY
+            max_width: 最大宽度，超过时等比缩小；None表示原始宽度
+            roi: 只编码画面中的区域（比例坐标），None表示整个画面
+        """
+        quality = clamp_quality(JPEG_QUALITY if quality is None else quality)
+        if max_width is not None and max_width >= frame.width:
+            max_width = None
+        roi = normalize_roi(roi)
+        key = (frame.seq, quality, max_width, roi)
+
+        with self._lock:
+            image = self._entries.get(key)
+            if image is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return image
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = self._pending[key] = threading.Event()
+                owner = True
+            else:
+                owner = False
+
+        if not owner:
+            # 其他线程正在编码同一规格：等待并复用它的结果
+            pending.wait(self.ENCODE_WAIT)
+            with self._lock:
+                image = self._entries.get(key)
+                if image is not None:
+                    self.hits += 1
+                    return image
+
+        try:
+            return self._encode(key, frame, quality, max_width, roi)
+        finally:
+            if owner:
+                with self._lock:
+                    self._pending.pop(key, None)
+                pending.set()
+
+    def _encode(self, key, frame: FrameHandle, quality: int,
+                max_width: Optional[int], roi: Optional[Roi]) -> Optional[JpegImage]:
+        t0 = time.perf_counter()
+        variant = render_variant(frame.image, max_width, roi)
+        ret, buf = cv2.imencode('.jpg', variant, [int(cv2.IMWRITE_JPEG_QUALITY), quality])
+        elapsed = time.perf_counter() - t0
+        if not ret:
+            logger.warning("JPEG编码失败")
+            return None
+
+        image = JpegImage(buf.tobytes(), variant.shape[1], variant.shape[0])
+        with self._lock:
+            self.misses += 1
+            self.encode_time = elapsed
+            self._entries[key] = image
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+        return image
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> dict:
+        """命中/未命中统计"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 3) if total else 0.0,
+                'entries': len(self._entries),
+                'encode_ms': round(self.encode_time * 1000, 2),
+                'quality': clamp_quality(JPEG_QUALITY),
+            }
+
+
+# 全局实例
+jpeg_cache = JpegCache()
@@ -0,0 +1,173 @@
+"""
+视频流 - MJPEG推流
+
+一个编码线程服务所有观看者：
+- 每个新的相机帧，对观看者请求的每种质量只编码一次（与快照共用 JpegCache），
+  同一份字节交给所有观看者
+- 每个观看者只有一个槽位，保存还没发出去的最新一帧；
+  慢的观看者来不及取走时直接覆盖旧帧（计为丢帧），不会拖慢编码线程和其他观看者
+- 每个观看者的帧率和质量可以单独限制
+"""
+
+import logging
+import threading
+import time
+from typing import List, Optional
+
+from .adaptive import JPEG_QUALITY, clamp_quality
+from .jpeg_cache import JpegCache
+
+# 配置日志
+logger = logging.getLogger(__name__)
+
+BOUNDARY = 'frame'
+
+
+def multipart_chunk(data: bytes) -> bytes:
+    """multipart/x-mixed-replace 的一个分段"""
+    header = (f"--{BOUNDARY}\r\n"
+              f"Content-Type: image/jpeg\r\n"
+              f"Content-Length: {len(data)}\r\n\r\n").encode('ascii')
+    return header + data + b"\r\n"
+
+
+class StreamClient:
+    """一个观看者：最新帧槽位 + 帧率/质量限制"""
+
+    def __init__(self, max_fps: float, quality: int):
+        self.max_fps = max_fps
+        self.quality = quality
+        self._cond = threading.Condition()
+        self._data: Optional[bytes] = None
+        self._closed = False
+        self.last_offer = 0.0
+
+        # 统计
+        self.sent = 0
+        self.dropped = 0
+
+    def due(self, now: float) -> bool:
+        """按帧率限制，现在是否该给这个观看者新的一帧"""
+        return now - self.last_offer >= 1.0 / self.max_fps
+
+    def offer(self, data: bytes, now: float) -> None:
+        """放入一帧；上一帧还没被取走时直接覆盖"""
+        with self._cond:
+            if self._data is not None:
+                self.dropped += 1
+            self._data = data
+            self.last_offer = now
+            self._cond.notify()
+
+    def next(self, timeout: float = 1.0) -> Optional[bytes]:
+        """取出最新一帧，超时或已关闭返回None"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._data is not None or self._closed, timeout)
+            data, self._data = self._data, None
+        if data is not None:
+            self.sent += 1
+        return data
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+
+class MjpegBroadcaster:
+    """单编码线程的MJPEG分发"""
+
+    # 最大观看者数量
+    MAX_CLIENTS = 32
+    # 帧率上限
+    MAX_FPS = 30.0
+    # 等待新帧的超时（秒）
+    FRAME_TIMEOUT = 0.5
+
+    def __init__(self, vision, cache: JpegCache):
+        self._vision = vision
+        self._cache = cache
+        self._clients: List[StreamClient] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+        # 统计
+        self.frames = 0
+        self.encodes = 0
+
+    def open(self, max_fps: Optional[float] = None, quality: Optional[int] = None) -> Optional[StreamClient]:
+        """添加观看者，超过最大数量时返回None
+
+        Args:
+            max_fps: 帧率上限，默认15，最高 MAX_FPS
+            quality: JPEG质量，默认使用 JPEG_QUALITY
+        """
+        max_fps = max(1.0, min(self.MAX_FPS, float(max_fps or 15.0)))
+        quality = clamp_quality(JPEG_QUALITY if quality is None else quality)
+        client = StreamClient(max_fps, quality)
+        with self._lock:
+            if len(self._clients) >= self.MAX_CLIENTS:
+                return None
+            self._clients.append(client)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True, name="MjpegEncoder")
+                self._thread.start()
+        logger.info(f"视频流观看者加入: fps={max_fps}, quality={quality}")
+        return client
+
+    def close(self, client: StreamClient) -> None:
+        """移除观看者"""
+        client.close()
+        with self._lock:
+            if client in self._clients:
+                self._clients.remove(client)
+        logger.info(f"视频流观看者离开: 发送 {client.sent} 帧，丢弃 {client.dropped} 帧")
+
+    def _run(self):
+        last_seq = 0
+        while True:
+            with self._lock:
+                if not self._clients:
+                    # 没有观看者：线程退出，下一个观看者加入时重新启动
+                    self._thread = None
+                    return
+                clients = list(self._clients)
+
+            if not self._vision.wait_next_frame(last_seq, self.FRAME_TIMEOUT):
+                continue
+            frame = self._vision.get_frame()
+            if frame is None:
+                continue
+            last_seq = frame.seq
+            self.frames += 1
+
+            now = time.monotonic()
+            encoded = {}
+            for client in clients:
+                if not client.due(now):
+                    continue
+                data = encoded.get(client.quality)
+                if data is None:
+                    data = self._cache.get(frame, client.quality)
+                    if data is None:
+                        continue
+                    encoded[client.quality] = data
+                    self.encodes += 1
+                client.offer(data, now)
+
+    def get_status(self) -> dict:
+        """推流状态"""
+        with self._lock:
+            clients = list(self._clients)
+        return {
+            'clients': len(clients),
+            'frames': self.frames,
+            'encodes': self.encodes,
+            'dropped': sum(c.dropped for c in clients),
+            'viewers': [{'fps': c.max_fps, 'quality': c.quality,
+                         'sent': c.sent, 'dropped': c.dropped} for c in clients],
+        }